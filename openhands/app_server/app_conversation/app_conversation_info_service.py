@@ -93,6 +93,16 @@ class AppConversationInfoService(ABC):
         Return the stored info
         """
 
+    async def update_event_sync_cursor(
+        self, conversation_id: UUID, event_sync_cursor: str | None
+    ) -> None:
+        """Store the event sync cursor of a conversation, leaving other fields as
+        they are. Does nothing if the conversation is missing."""
+        info = await self.get_app_conversation_info(conversation_id)
+        if info is not None:
+            info.event_sync_cursor = event_sync_cursor
+            await self.save_app_conversation_info(info)
+
     @abstractmethod
     async def process_stats_event(
         self,
@@ -87,6 +87,10 @@ class AppConversationInfo(BaseModel):
 
     public: bool | None = None
 
+    # When events are polled from the agent server, the timestamp (as reported
+    # by the agent server) of the most recent event synced so far
+    event_sync_cursor: str | None = None
+
     created_at: datetime = Field(default_factory=utc_now)
     updated_at: datetime = Field(default_factory=utc_now)
 
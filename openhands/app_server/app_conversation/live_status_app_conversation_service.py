@@ -486,9 +486,16 @@ class LiveStatusAppConversationService(AppConversationServiceBase):
                 if task.request.conversation_id is not None
                 else None
             )
-            sandbox = await self.sandbox_service.start_sandbox(
+            # Claim a started sandbox from the pool rather than wait for one to start
+            sandbox_maybe = await self.sandbox_service.claim_pooled_sandbox(
                 sandbox_id=sandbox_id_str
             )
+            if sandbox_maybe is None:
+                sandbox = await self.sandbox_service.start_sandbox(
+                    sandbox_id=sandbox_id_str
+                )
+            else:
+                sandbox = sandbox_maybe
             task.sandbox_id = sandbox.id
         else:
             sandbox_info = await self.sandbox_service.get_sandbox(
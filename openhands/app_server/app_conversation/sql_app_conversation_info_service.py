@@ -100,6 +100,7 @@ class StoredConversationMetadata(Base):  # type: ignore
     sandbox_id = Column(String, nullable=True, index=True)
     parent_conversation_id = Column(String, nullable=True, index=True)
     public = Column(Boolean, nullable=True, index=True)
+    event_sync_cursor = Column(String, nullable=True)
 
 
 @dataclass
@@ -348,12 +349,27 @@ class SQLAppConversationInfoService(AppConversationInfoService):
                 else None
             ),
             public=info.public,
+            event_sync_cursor=info.event_sync_cursor,
         )
 
         await self.db_session.merge(stored)
         await self.db_session.commit()
         return info
 
+    async def update_event_sync_cursor(
+        self, conversation_id: UUID, event_sync_cursor: str | None
+    ) -> None:
+        query = await self._secure_select()
+        query = query.where(
+            StoredConversationMetadata.conversation_id == str(conversation_id)
+        )
+        result = await self.db_session.execute(query)
+        stored = result.scalar_one_or_none()
+        if stored is None:
+            return
+        stored.event_sync_cursor = event_sync_cursor
+        await self.db_session.commit()
+
     async def update_conversation_statistics(
         self, conversation_id: UUID, stats: ConversationStats
     ) -> None:
@@ -535,6 +551,7 @@ class SQLAppConversationInfoService(AppConversationInfoService):
             ),
             sub_conversation_ids=sub_conversation_ids or [],
             public=stored.public,
+            event_sync_cursor=stored.event_sync_cursor,
             created_at=created_at,
             updated_at=updated_at,
         )
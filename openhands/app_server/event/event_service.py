@@ -55,6 +55,15 @@ class EventService(ABC):
             *[self.get_event(conversation_id, event_id) for event_id in event_ids]
         )
 
+    async def get_existing_event_ids(
+        self, conversation_id: UUID, event_ids: list[UUID]
+    ) -> set[UUID]:
+        """Given a list of ids, get those of the events which have been saved."""
+        events = await self.batch_get_events(conversation_id, event_ids)
+        return {
+            event_id for event_id, event in zip(event_ids, events) if event is not None
+        }
+
 
 class EventServiceInjector(DiscriminatedUnionMixin, Injector[EventService], ABC):
     pass
@@ -1,12 +1,14 @@
 import asyncio
+import json
+import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from typing import NamedTuple
 from uuid import UUID
 
 from openhands.agent_server.models import EventPage, EventSortOrder
-from openhands.agent_server.sockets import page_iterator
 from openhands.app_server.app_conversation.app_conversation_info_service import (
     AppConversationInfoService,
 )
@@ -17,11 +19,75 @@ from openhands.app_server.event.event_service import EventService
 from openhands.app_server.event_callback.event_callback_models import EventKind
 from openhands.sdk import Event
 
+_logger = logging.getLogger(__name__)
+
+# The name of the index of the events in each conversation directory. It does not
+# end with .json, so it is never mistaken for an event.
+INDEX_NAME = 'index.jsonl'
+
+# Indexes checked for missing events by this process
+_checked_indexes: set[str] = set()
+
+
+class EventIndexEntry(NamedTuple):
+    """What is needed to filter, sort and count an event without loading it.
+
+    Entries are stored one per line in the index, as JSON arrays.
+    """
+
+    id: str
+    kind: str
+    timestamp: str
+
+    @classmethod
+    def from_event(cls, event: Event) -> 'EventIndexEntry':
+        return cls(id=_get_id_hex(event), kind=event.kind, timestamp=event.timestamp)
+
+
+def _get_id_hex(event: Event) -> str:
+    if isinstance(event.id, str):
+        return event.id.replace('-', '')
+    return event.id.hex
+
+
+def _dump_index(entries: list[EventIndexEntry]) -> str:
+    return ''.join(json.dumps(entry) + '\n' for entry in entries)
+
+
+def _parse_index(content: str) -> dict[str, EventIndexEntry]:
+    try:
+        # Parsing all lines at once is several times faster than one at a time
+        rows = json.loads('[' + content.rstrip('\n').replace('\n', ',') + ']')
+        entries = [EventIndexEntry._make(row) for row in rows]
+    except Exception:
+        # e.g. a line partially written when the server stopped
+        entries = []
+        for line in content.splitlines():
+            try:
+                entries.append(EventIndexEntry._make(json.loads(line)))
+            except Exception:
+                continue
+    result: dict[str, EventIndexEntry] = {}
+    for entry in entries:
+        result.setdefault(entry.id, entry)
+    return result
+
 
 @dataclass
 class EventServiceBase(EventService, ABC):
     """Event Service for getting events - the only check on permissions for events is
     in the strict prefix for storage.
+
+    Each conversation has an index of its events (see `EventIndexEntry`), which
+    `save_event` appends to, so that events can be searched and counted without
+    loading them: only the events on the requested page are loaded. The index of
+    a conversation is created from its events the first time they are searched,
+    and checked for missing events once per process, or again after an append to
+    it failed.
+
+    Appending to an index is not free: on Google Cloud Storage, each saved event
+    costs 4 requests for the index (uploading a part, reloading the index,
+    composing them and deleting the part) on top of the 1 storing the event.
     """
 
     prefix: Path
@@ -43,6 +109,18 @@ class EventServiceBase(EventService, ABC):
     def _search_paths(self, prefix: Path) -> list[Path]:
         """Search paths."""
 
+    @abstractmethod
+    def _load_index(self, path: Path) -> str | None:
+        """Get the content of the index at the path given, or None if there is none."""
+
+    @abstractmethod
+    def _append_index(self, path: Path, content: str) -> bool:
+        """Append to the index at the path given, returning False if there is none."""
+
+    @abstractmethod
+    def _create_index(self, path: Path, content: str) -> bool:
+        """Create the index at the path given, returning False if it already exists."""
+
     async def get_conversation_path(self, conversation_id: UUID) -> Path:
         """Get a path for a conversation. Ensure user_id is included if possible."""
         path = self.prefix
@@ -84,24 +162,17 @@ class EventServiceBase(EventService, ABC):
         """Search events matching the given filters."""
         loop = asyncio.get_running_loop()
         prefix = await self.get_conversation_path(conversation_id)
-        paths = await loop.run_in_executor(None, self._search_paths, prefix)
-        events = await asyncio.gather(
-            *[loop.run_in_executor(None, self._load_event, path) for path in paths]
+        entries = await loop.run_in_executor(
+            None,
+            self._search_index,
+            prefix,
+            kind__eq,
+            timestamp__gte,
+            timestamp__lt,
         )
-        items = []
-        for event in events:
-            if not event:
-                continue
-            if kind__eq and event.kind != kind__eq:
-                continue
-            if timestamp__gte and event.timestamp < timestamp__gte:
-                continue
-            if timestamp__lt and event.timestamp >= timestamp__lt:
-                continue
-            items.append(event)
 
         if sort_order:
-            items.sort(
+            entries.sort(
                 key=lambda e: e.timestamp,
                 reverse=(sort_order == EventSortOrder.TIMESTAMP_DESC),
             )
@@ -110,11 +181,19 @@ class EventServiceBase(EventService, ABC):
         next_page_id = None
         if page_id:
             start_offset = int(page_id)
-            paths = paths[start_offset:]
-        if len(paths) > limit:
-            paths = paths[:limit]
+        page = entries[start_offset : start_offset + limit]
+        if len(entries) > start_offset + limit:
             next_page_id = str(start_offset + limit)
 
+        events = await asyncio.gather(
+            *[
+                loop.run_in_executor(
+                    None, self._load_event, prefix / f'{entry.id}.json'
+                )
+                for entry in page
+            ]
+        )
+        items = [event for event in events if event]
         return EventPage(items=items, next_page_id=next_page_id)
 
     async def count_events(
@@ -125,37 +204,108 @@ class EventServiceBase(EventService, ABC):
         timestamp__lt: datetime | None = None,
     ) -> int:
         """Count events matching the given filters."""
-        # If we are not filtering, we can simply count the paths
-        if not (kind__eq or timestamp__gte or timestamp__lt):
-            conversation_path = await self.get_conversation_path(conversation_id)
-            result = await self._count_events_no_filter(conversation_path)
-            return result
-
-        events = page_iterator(
-            self.search_events,
-            conversation_id=conversation_id,
-            kind__eq=kind__eq,
-            timestamp__gte=timestamp__gte,
-            timestamp__lt=timestamp__lt,
+        loop = asyncio.get_running_loop()
+        prefix = await self.get_conversation_path(conversation_id)
+        entries = await loop.run_in_executor(
+            None,
+            self._search_index,
+            prefix,
+            kind__eq,
+            timestamp__gte,
+            timestamp__lt,
         )
-        result = sum(1 for event in events)
-        return result
+        return len(entries)
+
+    async def get_existing_event_ids(
+        self, conversation_id: UUID, event_ids: list[UUID]
+    ) -> set[UUID]:
+        """Given a list of ids, get those of the events which have been saved.
 
-    async def _count_events_no_filter(self, conversation_path: Path) -> int:
-        paths = page_iterator(self._search_paths, conversation_path)
-        result = 0
-        async for _ in paths:
-            result += 1
-        return result
+        This reads the index of the conversation once rather than each event.
+        """
+        loop = asyncio.get_running_loop()
+        prefix = await self.get_conversation_path(conversation_id)
+        entries = await loop.run_in_executor(None, self._get_index, prefix)
+        ids = {entry.id for entry in entries}
+        return {event_id for event_id in event_ids if event_id.hex in ids}
+
+    def _search_index(
+        self,
+        prefix: Path,
+        kind__eq: EventKind | None = None,
+        timestamp__gte: datetime | None = None,
+        timestamp__lt: datetime | None = None,
+    ) -> list[EventIndexEntry]:
+        """Get the index entries of the events matching the given filters."""
+        entries = self._get_index(prefix)
+        # Timestamps are ISO strings, compared as the agent server does
+        timestamp_gte_str = timestamp__gte.isoformat() if timestamp__gte else None
+        timestamp_lt_str = timestamp__lt.isoformat() if timestamp__lt else None
+        return [
+            entry
+            for entry in entries
+            if (not kind__eq or entry.kind == kind__eq)
+            and (timestamp_gte_str is None or entry.timestamp >= timestamp_gte_str)
+            and (timestamp_lt_str is None or entry.timestamp < timestamp_lt_str)
+        ]
+
+    def _get_index(self, prefix: Path) -> list[EventIndexEntry]:
+        """Get the index of the events in a conversation, creating it if necessary.
+
+        The first time an index is read by this process, events missing from it,
+        e.g. because the server stopped before they were indexed, are added.
+        """
+        index_path = prefix / INDEX_NAME
+        content = self._load_index(index_path)
+        entries = _parse_index(content) if content is not None else {}
+        if content is not None and str(index_path) in _checked_indexes:
+            return list(entries.values())
+
+        new_entries = self._index_events(prefix, entries)
+        if content is None:
+            if not self._create_index(
+                index_path, _dump_index(list(new_entries.values()))
+            ):
+                # Created concurrently - it is checked next time
+                return list(new_entries.values())
+            # Events saved while the index was created were not appended to it
+            entries = new_entries
+            new_entries = self._index_events(prefix, entries)
+        missing = [e for id_, e in new_entries.items() if id_ not in entries]
+        if missing:
+            self._append_index(index_path, _dump_index(missing))
+        _checked_indexes.add(str(index_path))
+        return list(new_entries.values())
+
+    def _index_events(
+        self, prefix: Path, entries: dict[str, EventIndexEntry]
+    ) -> dict[str, EventIndexEntry]:
+        """Add entries for the events in a conversation missing from entries."""
+        entries = dict(entries)
+        for path in self._search_paths(prefix):
+            if path.suffix != '.json' or path.stem in entries:
+                continue
+            event = self._load_event(path)
+            if event:
+                entries[path.stem] = EventIndexEntry.from_event(event)
+        return entries
 
     async def save_event(self, conversation_id: UUID, event: Event):
-        if isinstance(event.id, str):
-            id_hex = event.id.replace('-', '')
-        else:
-            id_hex = event.id.hex
-        path = (await self.get_conversation_path(conversation_id)) / f'{id_hex}.json'
+        prefix = await self.get_conversation_path(conversation_id)
+        entry = EventIndexEntry.from_event(event)
         loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, self._store_event, path, event)
+        await loop.run_in_executor(None, self._save_event, prefix, event, entry)
+
+    def _save_event(self, prefix: Path, event: Event, entry: EventIndexEntry):
+        self._store_event(prefix / f'{entry.id}.json', event)
+        try:
+            # If the index does not exist yet, the event is indexed when it is
+            # created
+            self._append_index(prefix / INDEX_NAME, _dump_index([entry]))
+        except Exception:
+            _logger.exception(f'Error indexing event {entry.id}')
+            # Check the index for the event the next time it is read
+            _checked_indexes.discard(str(prefix / INDEX_NAME))
 
     async def batch_get_events(
         self, conversation_id: UUID, event_ids: list[UUID]
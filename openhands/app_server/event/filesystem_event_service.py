@@ -1,5 +1,7 @@
 import glob
 import logging
+import os
+import tempfile
 from dataclasses import dataclass
 from pathlib import Path
 from typing import AsyncGenerator
@@ -40,6 +42,37 @@ class FilesystemEventService(EventServiceBase):
         paths = [Path(file) for file in files]
         return paths
 
+    def _load_index(self, path: Path) -> str | None:
+        try:
+            return path.read_text()
+        except FileNotFoundError:
+            return None
+
+    def _append_index(self, path: Path, content: str) -> bool:
+        try:
+            # Without O_CREAT, so an index is never started part way through
+            fd = os.open(path, os.O_WRONLY | os.O_APPEND)
+        except FileNotFoundError:
+            return False
+        with os.fdopen(fd, 'w') as f:
+            # A single write, so concurrent appends are not interleaved
+            f.write(content)
+        return True
+
+    def _create_index(self, path: Path, content: str) -> bool:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(content)
+            # Linking fails if the index exists, so it is never replaced
+            os.link(tmp_path, path)
+            return True
+        except FileExistsError:
+            return False
+        finally:
+            os.unlink(tmp_path)
+
 
 class FilesystemEventServiceInjector(EventServiceInjector):
     async def inject(
@@ -5,9 +5,10 @@ import logging
 from dataclasses import dataclass
 from pathlib import Path
 from typing import AsyncGenerator, Iterator
+from uuid import uuid4
 
 from fastapi import Request
-from google.api_core.exceptions import NotFound
+from google.api_core.exceptions import NotFound, PreconditionFailed
 from google.cloud import storage
 from google.cloud.storage.blob import Blob
 from google.cloud.storage.bucket import Bucket
@@ -21,12 +22,16 @@ from openhands.sdk import Event
 
 _logger = logging.getLogger(__name__)
 
+# Composite objects may have at most 1024 components
+MAX_INDEX_COMPONENTS = 1000
+
 
 @dataclass
 class GoogleCloudEventService(EventServiceBase):
     """Google Cloud Storage-based implementation of EventService."""
 
     bucket: Bucket
+    index_append_attempts: int = 10
 
     def _load_event(self, path: Path) -> Event | None:
         """Get the event at the path given."""
@@ -57,6 +62,55 @@ class GoogleCloudEventService(EventServiceBase):
         paths = list(Path(blob.name) for blob in blobs)
         return paths
 
+    def _load_index(self, path: Path) -> str | None:
+        blob: Blob = self.bucket.blob(str(path))
+        try:
+            return blob.download_as_text()
+        except NotFound:
+            return None
+
+    def _append_index(self, path: Path, content: str) -> bool:
+        """Append by composing the index with a blob of the content.
+
+        The index is only replaced if it has not changed since it was read,
+        retrying otherwise, so concurrent appends are not lost. Before the index
+        has too many components to compose, it is rewritten as a single one.
+        """
+        index: Blob = self.bucket.blob(str(path))
+        part: Blob = self.bucket.blob(f'{path}.{uuid4().hex}')
+        part.upload_from_string(content)
+        try:
+            for _ in range(self.index_append_attempts):
+                try:
+                    index.reload()
+                except NotFound:
+                    return False
+                generation = index.generation
+                try:
+                    if (index.component_count or 0) < MAX_INDEX_COMPONENTS:
+                        index.compose([index, part], if_generation_match=generation)
+                    else:
+                        existing = index.download_as_text(
+                            if_generation_match=generation
+                        )
+                        index.upload_from_string(
+                            existing + content, if_generation_match=generation
+                        )
+                    return True
+                except PreconditionFailed:
+                    continue
+            raise RuntimeError(f'Index changed too often to append to: {path}')
+        finally:
+            part.delete()
+
+    def _create_index(self, path: Path, content: str) -> bool:
+        blob: Blob = self.bucket.blob(str(path))
+        try:
+            blob.upload_from_string(content, if_generation_match=0)
+            return True
+        except PreconditionFailed:
+            return False
+
 
 class GoogleCloudEventServiceInjector(EventServiceInjector):
     bucket_name: str
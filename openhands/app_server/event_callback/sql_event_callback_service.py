@@ -1,17 +1,26 @@
 # pyright: reportArgumentType=false
-"""SQL implementation of EventCallbackService."""
+"""SQL implementation of EventCallbackService.
+
+The active callbacks for each conversation and event kind are cached in process
+for a few seconds, so executing callbacks for an event does not query the
+database each time. The cache is invalidated when callbacks are created, deleted
+or saved by this process; changes made by other processes are seen once cached
+entries expire.
+"""
 
 from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from dataclasses import dataclass
 from typing import AsyncGenerator
 from uuid import UUID
 
 from fastapi import Request
+from pydantic import Field
 from sqlalchemy import UUID as SQLUUID
-from sqlalchemy import Column, Enum, String, and_, func, or_, select
+from sqlalchemy import Column, Enum, String, and_, func, insert, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from openhands.agent_server.utils import utc_now
@@ -24,6 +33,7 @@ from openhands.app_server.event_callback.event_callback_models import (
     EventKind,
 )
 from openhands.app_server.event_callback.event_callback_result_models import (
+    EventCallbackResult,
     EventCallbackResultStatus,
 )
 from openhands.app_server.event_callback.event_callback_service import (
@@ -68,11 +78,70 @@ class StoredEventCallbackResult(Base):  # type: ignore
     created_at = Column(UtcDateTime, server_default=func.now(), index=True)
 
 
+# How long the active callbacks for a conversation and event kind are cached
+ROUTING_CACHE_TTL = 5.0
+# Expired entries are pruned when the cache grows beyond this many entries
+ROUTING_CACHE_MAX_ENTRIES = 10_000
+
+
+class _CallbackRoutingCache:
+    """The active callbacks for each (conversation id, event kind) pair."""
+
+    def __init__(self):
+        self._entries: dict[tuple[UUID, str], tuple[float, list[EventCallback]]] = {}
+        # Incremented on each invalidation, so callbacks loaded concurrently
+        # with a change are not cached
+        self.generation = 0
+
+    def get(self, conversation_id: UUID, event_kind: str) -> list[EventCallback] | None:
+        entry = self._entries.get((conversation_id, event_kind))
+        if entry is None:
+            return None
+        expires_at, callbacks = entry
+        if expires_at <= time.monotonic():
+            del self._entries[(conversation_id, event_kind)]
+            return None
+        return callbacks
+
+    def put(
+        self,
+        conversation_id: UUID,
+        event_kind: str,
+        callbacks: list[EventCallback],
+        ttl: float,
+        generation: int,
+    ):
+        if generation != self.generation:
+            return
+        now = time.monotonic()
+        if len(self._entries) >= ROUTING_CACHE_MAX_ENTRIES:
+            self._entries = {
+                key: entry for key, entry in self._entries.items() if entry[0] > now
+            }
+            if len(self._entries) >= ROUTING_CACHE_MAX_ENTRIES:
+                self._entries.clear()
+        self._entries[(conversation_id, event_kind)] = (now + ttl, callbacks)
+
+    def invalidate(self, conversation_id: UUID | None = None):
+        """Forget the callbacks of a conversation, or all if conversation_id is None."""
+        self.generation += 1
+        if conversation_id is None:
+            self._entries.clear()
+            return
+        for key in [key for key in self._entries if key[0] == conversation_id]:
+            del self._entries[key]
+
+
+_routing_cache = _CallbackRoutingCache()
+
+
 @dataclass
 class SQLEventCallbackService(EventCallbackService):
     """SQL implementation of EventCallbackService."""
 
     db_session: AsyncSession
+    # How long active callbacks are cached for - 0 disables the cache
+    routing_cache_ttl: float = ROUTING_CACHE_TTL
 
     async def create_event_callback(
         self, request: CreateEventCallbackRequest
@@ -89,6 +158,7 @@ class SQLEventCallbackService(EventCallbackService):
         stored_callback = StoredEventCallback(**event_callback.model_dump())
         self.db_session.add(stored_callback)
         await self.db_session.commit()
+        _routing_cache.invalidate(event_callback.conversation_id)
         await self.db_session.refresh(stored_callback)
         return EventCallback.model_validate(row2dict(stored_callback))
 
@@ -110,8 +180,10 @@ class SQLEventCallbackService(EventCallbackService):
         if stored_callback is None:
             return False
 
+        conversation_id = stored_callback.conversation_id
         await self.db_session.delete(stored_callback)
         await self.db_session.commit()
+        _routing_cache.invalidate(conversation_id)
         return True
 
     async def search_event_callbacks(
@@ -182,15 +254,27 @@ class SQLEventCallbackService(EventCallbackService):
         event_callback.updated_at = utc_now()
         stored_callback = StoredEventCallback(**event_callback.model_dump())
         await self.db_session.merge(stored_callback)
+        _routing_cache.invalidate(event_callback.conversation_id)
         return event_callback
 
-    async def execute_callbacks(self, conversation_id: UUID, event: Event) -> None:
+    async def _get_active_callbacks(
+        self, conversation_id: UUID, event_kind: str
+    ) -> list[EventCallback]:
+        """Get the active callbacks for events of a kind in a conversation.
+
+        The callbacks returned may be cached, so must not be modified.
+        """
+        if self.routing_cache_ttl > 0:
+            callbacks = _routing_cache.get(conversation_id, event_kind)
+            if callbacks is not None:
+                return callbacks
+        generation = _routing_cache.generation
         query = (
             select(StoredEventCallback)
             .where(StoredEventCallback.status == EventCallbackStatus.ACTIVE)
             .where(
                 or_(
-                    StoredEventCallback.event_kind == event.kind,
+                    StoredEventCallback.event_kind == event_kind,
                     StoredEventCallback.event_kind.is_(None),
                 )
             )
@@ -202,41 +286,64 @@ class SQLEventCallbackService(EventCallbackService):
             )
         )
         result = await self.db_session.execute(query)
-        stored_callbacks = result.scalars().all()
-        if stored_callbacks:
-            callbacks = [
-                EventCallback.model_validate(row2dict(cb)) for cb in stored_callbacks
-            ]
-            await asyncio.gather(
-                *[
-                    self.execute_callback(conversation_id, callback, event)
-                    for callback in callbacks
-                ]
+        callbacks = [
+            EventCallback.model_validate(row2dict(cb)) for cb in result.scalars().all()
+        ]
+        if self.routing_cache_ttl > 0:
+            _routing_cache.put(
+                conversation_id,
+                event_kind,
+                callbacks,
+                self.routing_cache_ttl,
+                generation,
             )
+        return callbacks
 
-            # Persist any new changes callbacks may have made to itself
-            for callback in callbacks:
+    async def execute_callbacks(self, conversation_id: UUID, event: Event) -> None:
+        active_callbacks = await self._get_active_callbacks(conversation_id, event.kind)
+        if not active_callbacks:
+            return
+
+        # Callbacks may change themselves, so are executed on copies
+        callbacks = [callback.model_copy(deep=True) for callback in active_callbacks]
+        results = await asyncio.gather(
+            *[
+                self.execute_callback(conversation_id, callback, event)
+                for callback in callbacks
+            ]
+        )
+        rows = [result.model_dump() for result in results if result is not None]
+        if rows:
+            await self.db_session.execute(insert(StoredEventCallbackResult), rows)
+
+        # Persist any changes callbacks made to themselves
+        changed = False
+        for active_callback, callback in zip(active_callbacks, callbacks):
+            if callback != active_callback:
                 await self.save_event_callback(callback)
+                changed = True
+
+        if rows or changed:
             await self.db_session.commit()
+            if changed:
+                # Callbacks loaded before the commit may be out of date
+                _routing_cache.invalidate(conversation_id)
 
     async def execute_callback(
         self, conversation_id: UUID, callback: EventCallback, event: Event
-    ):
+    ) -> EventCallbackResult | None:
+        """Execute a callback, returning the result to store if there is one."""
         try:
-            result = await callback.processor(conversation_id, callback, event)
-            if result is None:
-                return
-            stored_result = StoredEventCallbackResult(**result.model_dump())
+            return await callback.processor(conversation_id, callback, event)
         except Exception as exc:
             _logger.exception(f'Exception in callback {callback.id}', stack_info=True)
-            stored_result = StoredEventCallbackResult(
+            return EventCallbackResult(
                 status=EventCallbackResultStatus.ERROR,
                 event_callback_id=callback.id,
                 event_id=event.id,
                 conversation_id=conversation_id,
                 detail=str(exc),
             )
-        self.db_session.add(stored_result)
 
     async def __aexit__(self, exc_type, exc_value, traceback):
         """Stop using this event callback service."""
@@ -244,10 +351,21 @@ class SQLEventCallbackService(EventCallbackService):
 
 
 class SQLEventCallbackServiceInjector(EventCallbackServiceInjector):
+    routing_cache_ttl: float = Field(
+        default=ROUTING_CACHE_TTL,
+        description=(
+            'How long in seconds the active callbacks for a conversation are cached '
+            'when executing callbacks. Callbacks changed by other processes may be '
+            'missed for this long. 0 disables the cache.'
+        ),
+    )
+
     async def inject(
         self, state: InjectorState, request: Request | None = None
     ) -> AsyncGenerator[EventCallbackService, None]:
         from openhands.app_server.config import get_db_session
 
         async with get_db_session(state) as db_session:
-            yield SQLEventCallbackService(db_session=db_session)
+            yield SQLEventCallbackService(
+                db_session=db_session, routing_cache_ttl=self.routing_cache_ttl
+            )
@@ -2,7 +2,8 @@ import asyncio
 import logging
 import os
 import socket
-from dataclasses import dataclass, field
+import time
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timedelta
 from typing import AsyncGenerator
 
@@ -26,6 +27,12 @@ from openhands.app_server.sandbox.sandbox_models import (
     SandboxPage,
     SandboxStatus,
 )
+from openhands.app_server.sandbox.sandbox_pool import (
+    POOL_REPLENISH_INTERVAL,
+    SandboxPool,
+    get_pooled_sandbox_specs,
+    maintain_sandbox_pool,
+)
 from openhands.app_server.sandbox.sandbox_service import (
     ALLOW_CORS_ORIGINS_VARIABLE,
     SESSION_API_KEY_VARIABLE,
@@ -33,6 +40,7 @@ from openhands.app_server.sandbox.sandbox_service import (
     SandboxService,
     SandboxServiceInjector,
 )
+from openhands.app_server.sandbox.sandbox_spec_models import SandboxSpecInfo
 from openhands.app_server.sandbox.sandbox_spec_service import SandboxSpecService
 from openhands.app_server.services.injector import InjectorState
 from openhands.app_server.utils.docker_utils import (
@@ -41,6 +49,67 @@ from openhands.app_server.utils.docker_utils import (
 
 _logger = logging.getLogger(__name__)
 STARTUP_GRACE_SECONDS = 15
+# How long the result of a health check of a sandbox is reused
+HEALTH_CHECK_TTL = 10.0
+# The interval at which the health of all sandboxes is checked in the background
+HEALTH_CHECK_INTERVAL = 5.0
+health_monitor_task: asyncio.Task | None = None
+pool_replenish_task: asyncio.Task | None = None
+
+
+@dataclass
+class HealthProbeStats:
+    """Metrics on the health checks of sandbox agent servers."""
+
+    probes: int = 0
+    failures: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+
+    @property
+    def mean_latency(self) -> float | None:
+        return self.total_latency / self.probes if self.probes else None
+
+    def record(self, latency: float, healthy: bool):
+        self.probes += 1
+        if not healthy:
+            self.failures += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+
+class SandboxHealthCache:
+    """The results of recent health checks of sandboxes, and probe metrics."""
+
+    def __init__(self):
+        # The health check url, time checked and result, by sandbox id
+        self._entries: dict[str, tuple[str, float, bool]] = {}
+        self.stats = HealthProbeStats()
+
+    def get(self, sandbox_id: str, url: str, ttl: float) -> bool | None:
+        """Get whether a sandbox was healthy, or None if not checked recently."""
+        entry = self._entries.get(sandbox_id)
+        # A different url means the container was restarted on another port
+        if entry is None or entry[0] != url or entry[1] + ttl <= time.monotonic():
+            return None
+        return entry[2]
+
+    def put(self, sandbox_id: str, url: str, healthy: bool):
+        self._entries[sandbox_id] = (url, time.monotonic(), healthy)
+
+    def invalidate(self, sandbox_id: str):
+        self._entries.pop(sandbox_id, None)
+
+    def prune(self, sandbox_ids: set[str]):
+        """Forget sandboxes other than those given, e.g. deleted sandboxes."""
+        for sandbox_id in self._entries.keys() - sandbox_ids:
+            del self._entries[sandbox_id]
+
+
+# Shared by the services injected, and updated by the health monitor
+_health_cache = SandboxHealthCache()
+# Shared by the services injected, and replenished in the background
+_sandbox_pool = SandboxPool()
 
 
 class VolumeMount(BaseModel):
@@ -85,6 +154,17 @@ class DockerSandboxService(SandboxService):
     docker_client: docker.DockerClient = field(default_factory=get_docker_client)
     startup_grace_seconds: int = STARTUP_GRACE_SECONDS
     use_host_network: bool = False
+    health_cache: SandboxHealthCache = field(default_factory=SandboxHealthCache)
+    # How long health checks are reused for - 0 checks sandboxes every time
+    health_check_ttl: float = HEALTH_CHECK_TTL
+    # Pooled containers are named with a prefix other than container_name_prefix,
+    # so they are not listed as sandboxes until they are claimed
+    pool_container_name_prefix: str = 'oh-agent-pool-'
+    # The number of pooled containers for each pooled spec - 0 disables the pool
+    pool_size: int = 0
+    # The sandbox specs to pool containers for - the default spec if empty
+    pool_sandbox_spec_ids: list[str] = field(default_factory=list)
+    sandbox_pool: SandboxPool = field(default_factory=SandboxPool)
 
     def _find_unused_port(self) -> int:
         """Find an unused port on the host machine."""
@@ -207,7 +287,36 @@ class DockerSandboxService(SandboxService):
             created_at=created_at,
         )
 
-    async def _container_to_checked_sandbox_info(self, container) -> SandboxInfo | None:
+    def _is_past_startup_grace(self, sandbox_info: SandboxInfo) -> bool:
+        return sandbox_info.created_at < utc_now() - timedelta(
+            seconds=self.startup_grace_seconds
+        )
+
+    async def _check_health(self, sandbox_info: SandboxInfo, url: str) -> bool:
+        """Check whether the agent server of a sandbox is running, caching the result.
+
+        Failures are only cached once the sandbox is past its startup grace period,
+        so a sandbox is seen as running as soon as it has started.
+        """
+        start = time.perf_counter()
+        try:
+            response = await self.httpx_client.get(url)
+            response.raise_for_status()
+            healthy = True
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            healthy = False
+            if self._is_past_startup_grace(sandbox_info):
+                _logger.info(f'Sandbox server not running: {url} : {exc}')
+        self.health_cache.stats.record(time.perf_counter() - start, healthy)
+        if healthy or self._is_past_startup_grace(sandbox_info):
+            self.health_cache.put(sandbox_info.id, url, healthy)
+        return healthy
+
+    async def _container_to_checked_sandbox_info(
+        self, container, fresh: bool = False
+    ) -> SandboxInfo | None:
         sandbox_info = await self._container_to_sandbox_info(container)
         if (
             sandbox_info
@@ -219,24 +328,19 @@ class DockerSandboxService(SandboxService):
                 for exposed_url in sandbox_info.exposed_urls
                 if exposed_url.name == AGENT_SERVER
             )
-            try:
-                # When running in Docker, replace localhost hostname with host.docker.internal for internal requests
-                app_server_url = replace_localhost_hostname_for_docker(app_server_url)
-
-                response = await self.httpx_client.get(
-                    f'{app_server_url}{self.health_check_path}'
+            # When running in Docker, replace localhost hostname with host.docker.internal for internal requests
+            app_server_url = replace_localhost_hostname_for_docker(app_server_url)
+            url = f'{app_server_url}{self.health_check_path}'
+
+            healthy: bool | None = None
+            if not fresh and self.health_check_ttl > 0:
+                healthy = self.health_cache.get(
+                    sandbox_info.id, url, self.health_check_ttl
                 )
-                response.raise_for_status()
-            except asyncio.CancelledError:
-                raise
-            except Exception as exc:
-                # If the server is
-                if sandbox_info.created_at < utc_now() - timedelta(
-                    seconds=self.startup_grace_seconds
-                ):
-                    _logger.info(
-                        f'Sandbox server not running: {app_server_url} : {exc}'
-                    )
+            if healthy is None:
+                healthy = await self._check_health(sandbox_info, url)
+            if not healthy:
+                if self._is_past_startup_grace(sandbox_info):
                     sandbox_info.status = SandboxStatus.ERROR
                 else:
                     sandbox_info.status = SandboxStatus.STARTING
@@ -244,26 +348,35 @@ class DockerSandboxService(SandboxService):
                 sandbox_info.session_api_key = None
         return sandbox_info
 
+    def _list_containers(self) -> list:
+        """List the containers of sandboxes."""
+        return [
+            container
+            for container in self.docker_client.containers.list(all=True)
+            if container.name and container.name.startswith(self.container_name_prefix)
+        ]
+
     async def search_sandboxes(
         self,
         page_id: str | None = None,
         limit: int = 100,
+        fresh: bool = False,
     ) -> SandboxPage:
-        """Search for sandboxes."""
+        """Search for sandboxes.
+
+        The health of sandboxes is checked concurrently, reusing recent checks
+        unless fresh is True.
+        """
         try:
             # Get all containers with our prefix
-            all_containers = self.docker_client.containers.list(all=True)
-            sandboxes = []
-
-            for container in all_containers:
-                if container.name and container.name.startswith(
-                    self.container_name_prefix
-                ):
-                    sandbox_info = await self._container_to_checked_sandbox_info(
-                        container
-                    )
-                    if sandbox_info:
-                        sandboxes.append(sandbox_info)
+            containers = self._list_containers()
+            sandbox_infos = await asyncio.gather(
+                *[
+                    self._container_to_checked_sandbox_info(container, fresh)
+                    for container in containers
+                ]
+            )
+            sandboxes = [sandbox_info for sandbox_info in sandbox_infos if sandbox_info]
 
             # Sort by creation time (newest first)
             sandboxes.sort(key=lambda x: x.created_at, reverse=True)
@@ -289,16 +402,29 @@ class DockerSandboxService(SandboxService):
         except APIError:
             return SandboxPage(items=[], next_page_id=None)
 
-    async def get_sandbox(self, sandbox_id: str) -> SandboxInfo | None:
-        """Get a single sandbox info."""
+    async def get_sandbox(
+        self, sandbox_id: str, fresh: bool = False
+    ) -> SandboxInfo | None:
+        """Get a single sandbox info, reusing a recent health check unless fresh."""
         try:
             if not sandbox_id.startswith(self.container_name_prefix):
                 return None
             container = self.docker_client.containers.get(sandbox_id)
-            return await self._container_to_checked_sandbox_info(container)
+            return await self._container_to_checked_sandbox_info(container, fresh)
         except (NotFound, APIError):
             return None
 
+    async def check_all_sandboxes(self) -> None:
+        """Check the health of all sandboxes concurrently, refreshing the cache."""
+        containers = await asyncio.to_thread(self._list_containers)
+        self.health_cache.prune({container.name for container in containers})
+        await asyncio.gather(
+            *[
+                self._container_to_checked_sandbox_info(container, fresh=True)
+                for container in containers
+            ]
+        )
+
     async def get_sandbox_by_session_api_key(
         self, session_api_key: str
     ) -> SandboxInfo | None:
@@ -352,8 +478,15 @@ class DockerSandboxService(SandboxService):
         if sandbox_id is None:
             sandbox_id = base62.encodebytes(os.urandom(16))
 
-        # Generate container name and session api key
-        container_name = f'{self.container_name_prefix}{sandbox_id}'
+        container = self._run_container(
+            sandbox_spec, f'{self.container_name_prefix}{sandbox_id}'
+        )
+        sandbox_info = await self._container_to_sandbox_info(container)
+        assert sandbox_info is not None
+        return sandbox_info
+
+    def _run_container(self, sandbox_spec: SandboxSpecInfo, container_name: str):
+        """Create and start the container of a sandbox."""
         session_api_key = base62.encodebytes(os.urandom(32))
 
         # Prepare environment variables
@@ -430,14 +563,117 @@ class DockerSandboxService(SandboxService):
                 # Network mode: 'host' for host networking, None for default bridge
                 network_mode=network_mode,
             )
-
-            sandbox_info = await self._container_to_sandbox_info(container)
-            assert sandbox_info is not None
-            return sandbox_info
+            return container
 
         except APIError as e:
             raise SandboxError(f'Failed to start container: {e}')
 
+    def _pool_enabled(self) -> bool:
+        # Pooled containers would bind the same ports as sandboxes with host networking
+        return self.pool_size > 0 and not self.use_host_network
+
+    def _list_pool_containers(self, sandbox_spec_id: str) -> list:
+        """List the pooled containers of a sandbox spec, oldest first."""
+        containers = [
+            container
+            for container in self.docker_client.containers.list(all=True)
+            if container.name
+            and container.name.startswith(self.pool_container_name_prefix)
+            and (container.labels or {}).get('sandbox_spec_id') == sandbox_spec_id
+        ]
+        containers.sort(key=lambda container: container.attrs.get('Created', ''))
+        return containers
+
+    async def claim_pooled_sandbox(
+        self, sandbox_spec_id: str | None = None, sandbox_id: str | None = None
+    ) -> SandboxInfo | None:
+        """Claim a running pooled container by renaming it as a sandbox.
+
+        Docker only lets one rename of a container to a new name succeed, so a
+        container is claimed once even by several app server processes.
+        """
+        if not self._pool_enabled():
+            return None
+        start = time.perf_counter()
+        sandbox_info = None
+        try:
+            if sandbox_spec_id is None:
+                sandbox_spec = (
+                    await self.sandbox_spec_service.get_default_sandbox_spec()
+                )
+                sandbox_spec_id = sandbox_spec.id
+            containers = [
+                container
+                for container in await asyncio.to_thread(
+                    self._list_pool_containers, sandbox_spec_id
+                )
+                if container.status == 'running'
+            ]
+            if not containers:
+                return None
+
+            # Enforce sandbox limits by cleaning up old sandboxes
+            await self.pause_old_sandboxes(self.max_num_sandboxes - 1)
+
+            if sandbox_id is None:
+                sandbox_id = base62.encodebytes(os.urandom(16))
+            container_name = f'{self.container_name_prefix}{sandbox_id}'
+            for container in containers:
+                try:
+                    container.rename(container_name)
+                except (NotFound, APIError) as exc:
+                    # Claimed by another process, or removed
+                    _logger.debug(f'Could not claim {container.name}: {exc}')
+                    continue
+                container.reload()
+                sandbox_info = await self._container_to_sandbox_info(container)
+                return sandbox_info
+            return None
+        finally:
+            self.sandbox_pool.stats.record_claim(
+                time.perf_counter() - start, sandbox_info is not None
+            )
+            self.sandbox_pool.request_replenish()
+
+    async def replenish_sandbox_pool(self) -> None:
+        """Remove stopped pooled containers, and start containers until the pool
+        for each pooled spec is full."""
+        if not self._pool_enabled():
+            return
+        stats = self.sandbox_pool.stats
+        sandbox_specs = await get_pooled_sandbox_specs(
+            self.sandbox_spec_service, self.pool_sandbox_spec_ids
+        )
+        for sandbox_spec in sandbox_specs:
+            num_pooled = 0
+            for container in await asyncio.to_thread(
+                self._list_pool_containers, sandbox_spec.id
+            ):
+                if container.status in ('running', 'created', 'restarting'):
+                    num_pooled += 1
+                    continue
+                try:
+                    container.remove(force=True)
+                except (NotFound, APIError):
+                    pass
+
+            while num_pooled < self.pool_size:
+                container_name = (
+                    f'{self.pool_container_name_prefix}'
+                    f'{base62.encodebytes(os.urandom(16))}'
+                )
+                try:
+                    await asyncio.to_thread(
+                        self._run_container, sandbox_spec, container_name
+                    )
+                except SandboxError as exc:
+                    stats.failed_starts += 1
+                    _logger.warning(f'Failed to start pooled sandbox: {exc}')
+                    break
+                stats.started += 1
+                num_pooled += 1
+            stats.sizes[sandbox_spec.id] = num_pooled
+
     async def resume_sandbox(self, sandbox_id: str) -> bool:
         """Resume a paused sandbox."""
         # Enforce sandbox limits by cleaning up old sandboxes
@@ -447,6 +683,7 @@ class DockerSandboxService(SandboxService):
             if not sandbox_id.startswith(self.container_name_prefix):
                 return False
             container = self.docker_client.containers.get(sandbox_id)
+            self.health_cache.invalidate(sandbox_id)
 
             if container.status == 'paused':
                 container.unpause()
@@ -463,6 +700,7 @@ class DockerSandboxService(SandboxService):
             if not sandbox_id.startswith(self.container_name_prefix):
                 return False
             container = self.docker_client.containers.get(sandbox_id)
+            self.health_cache.invalidate(sandbox_id)
 
             if container.status == 'running':
                 container.pause()
@@ -477,6 +715,7 @@ class DockerSandboxService(SandboxService):
             if not sandbox_id.startswith(self.container_name_prefix):
                 return False
             container = self.docker_client.containers.get(sandbox_id)
+            self.health_cache.invalidate(sandbox_id)
 
             # Stop the container if it's running
             if container.status in ['running', 'paused']:
@@ -596,6 +835,51 @@ class DockerSandboxServiceInjector(SandboxServiceInjector):
         ),
     )
 
+    health_check_ttl: float = Field(
+        default=HEALTH_CHECK_TTL,
+        description=(
+            'How long in seconds the result of a health check of a sandbox is reused '
+            'when searching and getting sandboxes. 0 checks sandboxes every time.'
+        ),
+    )
+    health_check_interval: float = Field(
+        default=HEALTH_CHECK_INTERVAL,
+        description=(
+            'The interval in seconds at which the health of all sandboxes is checked '
+            'in the background. 0 disables background checks.'
+        ),
+    )
+    pool_size: int = Field(
+        default=0,
+        description=(
+            'The number of started sandboxes to keep unassigned for each pooled '
+            'sandbox spec, so that conversations start without waiting for a '
+            'sandbox to start. Pooled sandboxes do not count towards '
+            'max_num_sandboxes. 0 disables the pool, as does host networking.'
+        ),
+    )
+    pool_sandbox_spec_ids: list[str] = Field(
+        default_factory=list,
+        description=(
+            'The sandbox specs to keep pooled sandboxes for. '
+            'If empty, sandboxes are pooled for the default sandbox spec.'
+        ),
+    )
+    pool_container_name_prefix: str = Field(
+        default='oh-agent-pool-',
+        description=(
+            'The prefix of the names of pooled containers. '
+            'It must not start with container_name_prefix.'
+        ),
+    )
+    pool_replenish_interval: float = Field(
+        default=POOL_REPLENISH_INTERVAL,
+        description=(
+            'The interval in seconds at which the pool is replenished, besides '
+            'after each sandbox claimed from it.'
+        ),
+    )
+
     async def inject(
         self, state: InjectorState, request: Request | None = None
     ) -> AsyncGenerator[SandboxService, None]:
@@ -610,6 +894,26 @@ class DockerSandboxServiceInjector(SandboxServiceInjector):
         config = get_global_config()
         web_url = config.web_url
 
+        if (
+            self.health_check_path is not None
+            and self.health_check_ttl > 0
+            and self.health_check_interval > 0
+        ):
+            global health_monitor_task
+            if health_monitor_task is None:
+                health_monitor_task = asyncio.create_task(
+                    monitor_sandbox_health(self, self.health_check_interval)
+                )
+
+        if self.pool_size > 0:
+            global pool_replenish_task
+            if pool_replenish_task is None:
+                pool_replenish_task = asyncio.create_task(
+                    maintain_sandbox_pool(
+                        self, _sandbox_pool, self.pool_replenish_interval
+                    )
+                )
+
         async with (
             get_httpx_client(state) as httpx_client,
             get_sandbox_spec_service(state) as sandbox_spec_service,
@@ -628,4 +932,41 @@ class DockerSandboxServiceInjector(SandboxServiceInjector):
                 extra_hosts=self.extra_hosts,
                 startup_grace_seconds=self.startup_grace_seconds,
                 use_host_network=self.use_host_network,
+                health_cache=_health_cache,
+                health_check_ttl=self.health_check_ttl,
+                pool_container_name_prefix=self.pool_container_name_prefix,
+                pool_size=self.pool_size,
+                pool_sandbox_spec_ids=self.pool_sandbox_spec_ids,
+                sandbox_pool=_sandbox_pool,
             )
+
+
+async def monitor_sandbox_health(
+    injector: DockerSandboxServiceInjector, interval: float
+):
+    """Check the health of all sandboxes at an interval in the background, so that
+    searching and getting sandboxes reuses recent health checks."""
+    while True:
+        try:
+            try:
+                stats = _health_cache.stats
+                probes, failures = stats.probes, stats.failures
+                start = time.perf_counter()
+                async with injector.context(InjectorState()) as sandbox_service:
+                    assert isinstance(sandbox_service, DockerSandboxService)
+                    await sandbox_service.check_all_sandboxes()
+                _logger.debug(
+                    f'Checked {stats.probes - probes} sandboxes with '
+                    f'{stats.failures - failures} failures in '
+                    f'{time.perf_counter() - start:.3f}s',
+                    extra={**asdict(stats), 'mean_latency': stats.mean_latency},
+                )
+            except Exception as exc:
+                _logger.exception(
+                    f'Error when checking sandbox health: {exc}', stack_info=True
+                )
+
+            await asyncio.sleep(interval)
+
+        except asyncio.CancelledError:
+            return
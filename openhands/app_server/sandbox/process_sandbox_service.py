@@ -1,17 +1,19 @@
 """Process-based sandbox service implementation.
 
 This service creates sandboxes by spawning separate agent server processes,
-each running within a dedicated directory.
+each running within a dedicated directory. A pool of started processes may be
+kept, which are handed over to sandboxes as they are started.
 """
 
 import asyncio
 import logging
 import os
+import shutil
 import socket
 import subprocess
 import sys
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import AsyncGenerator
 
@@ -30,6 +32,12 @@ from openhands.app_server.sandbox.sandbox_models import (
     SandboxPage,
     SandboxStatus,
 )
+from openhands.app_server.sandbox.sandbox_pool import (
+    POOL_REPLENISH_INTERVAL,
+    SandboxPool,
+    get_pooled_sandbox_specs,
+    maintain_sandbox_pool,
+)
 from openhands.app_server.sandbox.sandbox_service import (
     SandboxService,
     SandboxServiceInjector,
@@ -60,6 +68,10 @@ class ProcessInfo(BaseModel):
 
 # Global store
 _processes: dict[str, ProcessInfo] = {}
+# Started processes not yet assigned to a sandbox, by pool id
+_pooled_processes: dict[str, ProcessInfo] = {}
+_sandbox_pool = SandboxPool()
+pool_replenish_task: asyncio.Task | None = None
 
 
 @dataclass
@@ -81,6 +93,11 @@ class ProcessSandboxService(SandboxService):
     agent_server_module: str
     health_check_path: str
     httpx_client: httpx.AsyncClient
+    # The number of pooled processes for each pooled spec - 0 disables the pool
+    pool_size: int = 0
+    # The sandbox specs to pool processes for - the default spec if empty
+    pool_sandbox_spec_ids: list[str] = field(default_factory=list)
+    sandbox_pool: SandboxPool = field(default_factory=SandboxPool)
 
     def __post_init__(self):
         """Initialize the service after dataclass creation."""
@@ -235,6 +252,7 @@ class ProcessSandboxService(SandboxService):
         self,
         page_id: str | None = None,
         limit: int = 100,
+        fresh: bool = False,
     ) -> SandboxPage:
         """Search for sandboxes."""
         # Get all process infos
@@ -267,7 +285,9 @@ class ProcessSandboxService(SandboxService):
 
         return SandboxPage(items=items, next_page_id=next_page_id)
 
-    async def get_sandbox(self, sandbox_id: str) -> SandboxInfo | None:
+    async def get_sandbox(
+        self, sandbox_id: str, fresh: bool = False
+    ) -> SandboxInfo | None:
         """Get a single sandbox."""
         process_info = _processes.get(sandbox_id)
         if process_info is None:
@@ -301,10 +321,26 @@ class ProcessSandboxService(SandboxService):
                 raise ValueError('Sandbox Spec not found')
             sandbox_spec = sandbox_spec_maybe
 
-        # Generate unique sandbox ID and session API key
         # Use provided sandbox_id if available, otherwise generate a random one
         if sandbox_id is None:
             sandbox_id = base62.encodebytes(os.urandom(16))
+
+        process_info = await self._start_process(sandbox_id, sandbox_spec, self.user_id)
+        _processes[sandbox_id] = process_info
+
+        # Wait for server to be ready
+        if not await self._wait_for_server_ready(process_info.port):
+            # Clean up if server didn't start properly
+            await self.delete_sandbox(sandbox_id)
+            raise SandboxError('Agent Server Failed to start properly')
+
+        return await self._process_to_sandbox_info(sandbox_id, process_info)
+
+    async def _start_process(
+        self, sandbox_id: str, sandbox_spec: SandboxSpecInfo, user_id: str | None
+    ) -> ProcessInfo:
+        """Start an agent server process in a new directory for a sandbox."""
+        # Generate unique session API key
         session_api_key = base62.encodebytes(os.urandom(32))
 
         # Find available port
@@ -322,25 +358,95 @@ class ProcessSandboxService(SandboxService):
             sandbox_spec=sandbox_spec,
         )
 
-        # Store process info
-        process_info = ProcessInfo(
+        return ProcessInfo(
             pid=process.pid,
             port=port,
-            user_id=self.user_id,
+            user_id=user_id,
             working_dir=working_dir,
             session_api_key=session_api_key,
             created_at=utc_now(),
             sandbox_spec_id=sandbox_spec.id,
         )
-        _processes[sandbox_id] = process_info
-
-        # Wait for server to be ready
-        if not await self._wait_for_server_ready(port):
-            # Clean up if server didn't start properly
-            await self.delete_sandbox(sandbox_id)
-            raise SandboxError('Agent Server Failed to start properly')
 
-        return await self._process_to_sandbox_info(sandbox_id, process_info)
+    async def claim_pooled_sandbox(
+        self, sandbox_spec_id: str | None = None, sandbox_id: str | None = None
+    ) -> SandboxInfo | None:
+        """Claim a pooled process for a sandbox.
+
+        Pooled processes were ready when started, and an idle agent server is
+        usually sleeping rather than running, so any process which has not exited
+        or been paused is claimed. The process is taken from the pool without
+        awaiting in between, so no other claim in the event loop can take it too.
+        """
+        if self.pool_size <= 0:
+            return None
+        start = time.perf_counter()
+        sandbox_info = None
+        try:
+            if sandbox_spec_id is None:
+                sandbox_spec = (
+                    await self.sandbox_spec_service.get_default_sandbox_spec()
+                )
+                sandbox_spec_id = sandbox_spec.id
+            if sandbox_id is None:
+                sandbox_id = base62.encodebytes(os.urandom(16))
+            for pool_id, process_info in list(_pooled_processes.items()):
+                if process_info.sandbox_spec_id == sandbox_spec_id and (
+                    self._get_process_status(process_info)
+                    not in (SandboxStatus.MISSING, SandboxStatus.PAUSED)
+                ):
+                    del _pooled_processes[pool_id]
+                    process_info = process_info.model_copy(
+                        update={'user_id': self.user_id}
+                    )
+                    _processes[sandbox_id] = process_info
+                    sandbox_info = await self._process_to_sandbox_info(
+                        sandbox_id, process_info
+                    )
+                    return sandbox_info
+            return None
+        finally:
+            self.sandbox_pool.stats.record_claim(
+                time.perf_counter() - start, sandbox_info is not None
+            )
+            self.sandbox_pool.request_replenish()
+
+    async def replenish_sandbox_pool(self) -> None:
+        """Forget pooled processes which exited, and start processes until the pool
+        for each pooled spec is full."""
+        if self.pool_size <= 0:
+            return
+        for pool_id, process_info in list(_pooled_processes.items()):
+            if self._get_process_status(process_info) == SandboxStatus.MISSING:
+                del _pooled_processes[pool_id]
+                self._discard_pooled_process(process_info)
+
+        stats = self.sandbox_pool.stats
+        sandbox_specs = await get_pooled_sandbox_specs(
+            self.sandbox_spec_service, self.pool_sandbox_spec_ids
+        )
+        for sandbox_spec in sandbox_specs:
+            num_pooled = sum(
+                process_info.sandbox_spec_id == sandbox_spec.id
+                for process_info in _pooled_processes.values()
+            )
+            while num_pooled < self.pool_size:
+                pool_id = f'pool-{base62.encodebytes(os.urandom(16))}'
+                try:
+                    process_info = await self._start_process(
+                        pool_id, sandbox_spec, user_id=None
+                    )
+                    if not await self._wait_for_server_ready(process_info.port):
+                        self._discard_pooled_process(process_info)
+                        raise SandboxError('Agent Server Failed to start properly')
+                except SandboxError as exc:
+                    stats.failed_starts += 1
+                    _logger.warning(f'Failed to start pooled sandbox: {exc}')
+                    break
+                _pooled_processes[pool_id] = process_info
+                stats.started += 1
+                num_pooled += 1
+            stats.sizes[sandbox_spec.id] = num_pooled
 
     async def resume_sandbox(self, sandbox_id: str) -> bool:
         """Resume a paused sandbox."""
@@ -377,23 +483,7 @@ class ProcessSandboxService(SandboxService):
             return False
 
         try:
-            # Terminate the process
-            process = psutil.Process(process_info.pid)
-            if process.is_running():
-                # Try graceful termination first
-                process.terminate()
-                try:
-                    process.wait(timeout=10)
-                except psutil.TimeoutExpired:
-                    # Force kill if graceful termination fails
-                    process.kill()
-                    process.wait(timeout=5)
-
-            # Clean up the working directory
-            import shutil
-
-            if os.path.exists(process_info.working_dir):
-                shutil.rmtree(process_info.working_dir, ignore_errors=True)
+            self._stop_process(process_info)
 
             # Remove from our tracking
             del _processes[sandbox_id]
@@ -407,6 +497,31 @@ class ProcessSandboxService(SandboxService):
                 del _processes[sandbox_id]
             return True
 
+    def _stop_process(self, process_info: ProcessInfo):
+        """Terminate an agent server process and remove its working directory."""
+        # Terminate the process
+        process = psutil.Process(process_info.pid)
+        if process.is_running():
+            # Try graceful termination first
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except psutil.TimeoutExpired:
+                # Force kill if graceful termination fails
+                process.kill()
+                process.wait(timeout=5)
+
+        # Clean up the working directory
+        if os.path.exists(process_info.working_dir):
+            shutil.rmtree(process_info.working_dir, ignore_errors=True)
+
+    def _discard_pooled_process(self, process_info: ProcessInfo):
+        try:
+            self._stop_process(process_info)
+        except (psutil.NoSuchProcess, psutil.AccessDenied, OSError) as e:
+            _logger.warning(f'Error stopping pooled process {process_info.pid}: {e}')
+            shutil.rmtree(process_info.working_dir, ignore_errors=True)
+
 
 class ProcessSandboxServiceInjector(SandboxServiceInjector):
     """Dependency injector for process sandbox services."""
@@ -429,6 +544,28 @@ class ProcessSandboxServiceInjector(SandboxServiceInjector):
     health_check_path: str = Field(
         default='/alive', description='Health check endpoint path'
     )
+    pool_size: int = Field(
+        default=0,
+        description=(
+            'The number of started agent server processes to keep unassigned for '
+            'each pooled sandbox spec, so that conversations start without waiting '
+            'for a sandbox to start. 0 disables the pool.'
+        ),
+    )
+    pool_sandbox_spec_ids: list[str] = Field(
+        default_factory=list,
+        description=(
+            'The sandbox specs to keep pooled processes for. '
+            'If empty, processes are pooled for the default sandbox spec.'
+        ),
+    )
+    pool_replenish_interval: float = Field(
+        default=POOL_REPLENISH_INTERVAL,
+        description=(
+            'The interval in seconds at which the pool is replenished, besides '
+            'after each sandbox claimed from it.'
+        ),
+    )
 
     async def inject(
         self, state: InjectorState, request: Request | None = None
@@ -440,6 +577,15 @@ class ProcessSandboxServiceInjector(SandboxServiceInjector):
             get_user_context,
         )
 
+        if self.pool_size > 0:
+            global pool_replenish_task
+            if pool_replenish_task is None:
+                pool_replenish_task = asyncio.create_task(
+                    maintain_sandbox_pool(
+                        self, _sandbox_pool, self.pool_replenish_interval
+                    )
+                )
+
         async with (
             get_httpx_client(state, request) as httpx_client,
             get_sandbox_spec_service(state, request) as sandbox_spec_service,
@@ -455,4 +601,7 @@ class ProcessSandboxServiceInjector(SandboxServiceInjector):
                 agent_server_module=self.agent_server_module,
                 health_check_path=self.health_check_path,
                 httpx_client=httpx_client,
+                pool_size=self.pool_size,
+                pool_sandbox_spec_ids=self.pool_sandbox_spec_ids,
+                sandbox_pool=_sandbox_pool,
             )
@@ -1,7 +1,9 @@
 import asyncio
 import logging
 import os
-from dataclasses import dataclass
+import time
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime, timedelta
 from typing import Any, AsyncGenerator, Union
 from uuid import UUID
 
@@ -12,7 +14,11 @@ from pydantic import Field
 from sqlalchemy import Column, String, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from openhands.agent_server.models import ConversationInfo, EventPage
+from openhands.agent_server.models import (
+    ConversationInfo,
+    EventPage,
+    EventSortOrder,
+)
 from openhands.agent_server.utils import utc_now
 from openhands.app_server.app_conversation.app_conversation_info_service import (
     AppConversationInfoService,
@@ -47,6 +53,7 @@ from openhands.app_server.services.injector import InjectorState
 from openhands.app_server.user.specifiy_user_context import ADMIN, USER_CONTEXT_ATTR
 from openhands.app_server.user.user_context import UserContext
 from openhands.app_server.utils.sql_utils import Base, UtcDateTime
+from openhands.sdk import Event
 from openhands.sdk.utils.paging import page_iterator
 
 _logger = logging.getLogger(__name__)
@@ -71,6 +78,13 @@ VSCODE_PORT = 60001
 WORKER_1_PORT = 12000
 WORKER_2_PORT = 12001
 
+# When polling agent servers for events (see poll_agent_servers)
+MAX_CONCURRENT_REFRESHES = 8
+EVENT_SYNC_PAGE_SIZE = 100
+# Events are pulled again from this long before the sync cursor, in case events
+# were saved out of order on the agent server
+EVENT_SYNC_OVERLAP = timedelta(seconds=5)
+
 
 class StoredRemoteSandbox(Base):  # type: ignore
     """Local storage for remote sandbox info.
@@ -284,6 +298,7 @@ class RemoteSandboxService(SandboxService):
         self,
         page_id: str | None = None,
         limit: int = 100,
+        fresh: bool = False,
     ) -> SandboxPage:
         stmt = await self._secure_select()
 
@@ -327,7 +342,9 @@ class RemoteSandboxService(SandboxService):
 
         return SandboxPage(items=items, next_page_id=next_page_id)
 
-    async def get_sandbox(self, sandbox_id: str) -> Union[SandboxInfo, None]:
+    async def get_sandbox(
+        self, sandbox_id: str, fresh: bool = False
+    ) -> Union[SandboxInfo, None]:
         """Get a single sandbox by checking its corresponding runtime."""
         stored_sandbox = await self._get_stored_sandbox(sandbox_id)
         if stored_sandbox is None:
@@ -576,7 +593,7 @@ class RemoteSandboxService(SandboxService):
         return paused_sandbox_ids
 
     async def batch_get_sandboxes(
-        self, sandbox_ids: list[str]
+        self, sandbox_ids: list[str], fresh: bool = False
     ) -> list[SandboxInfo | None]:
         """Get a batch of sandboxes, returning None for any which were not found."""
         if not sandbox_ids:
@@ -607,15 +624,59 @@ def _build_service_url(url: str, service_name: str):
     return scheme + '://' + service_name + '-' + host_and_path
 
 
-async def poll_agent_servers(api_url: str, api_key: str, sleep_interval: int):
+@dataclass
+class AgentServerSyncStats:
+    """Metrics on a cycle of polling agent servers for events."""
+
+    conversations: int = 0
+    failed_conversations: int = 0
+    # Events received from agent servers, including those synced previously
+    events_pulled: int = 0
+    events_saved: int = 0
+    # The longest time in seconds between an event and it being saved
+    max_sync_lag: float | None = None
+    duration: float = 0.0
+
+    def record_saved_event(self, event: Event):
+        self.events_saved += 1
+        sync_lag = _get_sync_lag(event)
+        if sync_lag is not None and (
+            self.max_sync_lag is None or sync_lag > self.max_sync_lag
+        ):
+            self.max_sync_lag = sync_lag
+
+
+def _parse_event_timestamp(timestamp: str) -> datetime | None:
+    try:
+        return datetime.fromisoformat(timestamp)
+    except ValueError:
+        return None
+
+
+def _get_sync_lag(event: Event) -> float | None:
+    timestamp = _parse_event_timestamp(event.timestamp)
+    if timestamp is None:
+        return None
+    if timestamp.tzinfo is None:
+        # Agent servers run in UTC
+        timestamp = timestamp.replace(tzinfo=UTC)
+    return (utc_now() - timestamp).total_seconds()
+
+
+async def poll_agent_servers(
+    api_url: str,
+    api_key: str,
+    sleep_interval: int,
+    max_concurrent_refreshes: int = MAX_CONCURRENT_REFRESHES,
+):
     """When the app server does not have a public facing url, we poll the agent
     servers for the most recent data.
 
-    This is because webhook callbacks cannot be invoked."""
+    This is because webhook callbacks cannot be invoked. Conversations are
+    refreshed concurrently, each with its own services, as they do not support
+    concurrent use."""
     from openhands.app_server.config import (
         get_app_conversation_info_service,
-        get_event_callback_service,
-        get_event_service,
         get_httpx_client,
     )
 
@@ -625,9 +686,13 @@ async def poll_agent_servers(api_url: str, api_key: str, sleep_interval: int):
             state = InjectorState()
 
             try:
-                # Get the list of running sandboxes using the runtime api /list endpoint.
-                # (This will not return runtimes that have been stopped for a while)
+                start = time.perf_counter()
+                stats = AgentServerSyncStats()
+                # We allow access to all items here
+                setattr(state, USER_CONTEXT_ATTR, ADMIN)
                 async with get_httpx_client(state) as httpx_client:
+                    # Get the list of running sandboxes using the runtime api /list endpoint.
+                    # (This will not return runtimes that have been stopped for a while)
                     response = await httpx_client.get(
                         f'{api_url}/list', headers={'X-API-Key': api_key}
                     )
@@ -641,36 +706,38 @@ async def poll_agent_servers(api_url: str, api_key: str, sleep_interval: int):
                         if runtime['status'] == 'running'
                     }
 
-                # We allow access to all items here
-                setattr(state, USER_CONTEXT_ATTR, ADMIN)
-                async with (
-                    get_app_conversation_info_service(
+                    semaphore = asyncio.Semaphore(max_concurrent_refreshes)
+                    refreshes = []
+                    async with get_app_conversation_info_service(
                         state
-                    ) as app_conversation_info_service,
-                    get_event_service(state) as event_service,
-                    get_event_callback_service(state) as event_callback_service,
-                    get_httpx_client(state) as httpx_client,
-                ):
-                    matches = 0
-                    async for app_conversation_info in page_iterator(
-                        app_conversation_info_service.search_app_conversation_info
-                    ):
-                        runtime = runtimes_by_sandbox_id.get(
-                            app_conversation_info.sandbox_id
-                        )
-                        if runtime:
-                            matches += 1
-                            await refresh_conversation(
-                                app_conversation_info_service=app_conversation_info_service,
-                                event_service=event_service,
-                                event_callback_service=event_callback_service,
-                                app_conversation_info=app_conversation_info,
-                                runtime=runtime,
-                                httpx_client=httpx_client,
+                    ) as app_conversation_info_service:
+                        async for app_conversation_info in page_iterator(
+                            app_conversation_info_service.search_app_conversation_info
+                        ):
+                            runtime = runtimes_by_sandbox_id.get(
+                                app_conversation_info.sandbox_id
                             )
-                    _logger.debug(
-                        f'Matched {len(runtimes_by_sandbox_id)} Runtimes with {matches} Conversations.'
-                    )
+                            if runtime:
+                                refreshes.append(
+                                    _refresh_conversation_with_own_services(
+                                        semaphore=semaphore,
+                                        app_conversation_info=app_conversation_info,
+                                        runtime=runtime,
+                                        httpx_client=httpx_client,
+                                        stats=stats,
+                                    )
+                                )
+                    await asyncio.gather(*refreshes)
+
+                stats.duration = time.perf_counter() - start
+                _logger.debug(
+                    f'Matched {len(runtimes_by_sandbox_id)} Runtimes with {stats.conversations} Conversations.'
+                )
+                _logger.info(
+                    f'Synced {stats.events_saved} of {stats.events_pulled} events '
+                    f'pulled from {stats.conversations} agent servers',
+                    extra=asdict(stats),
+                )
 
             except Exception as exc:
                 _logger.exception(
@@ -684,6 +751,45 @@ async def poll_agent_servers(api_url: str, api_key: str, sleep_interval: int):
             return
 
 
+async def _refresh_conversation_with_own_services(
+    semaphore: asyncio.Semaphore,
+    app_conversation_info: AppConversationInfo,
+    runtime: dict[str, Any],
+    httpx_client: httpx.AsyncClient,
+    stats: AgentServerSyncStats,
+):
+    from openhands.app_server.config import (
+        get_app_conversation_info_service,
+        get_event_callback_service,
+        get_event_service,
+    )
+
+    async with semaphore:
+        state = InjectorState()
+        setattr(state, USER_CONTEXT_ATTR, ADMIN)
+        async with (
+            get_app_conversation_info_service(state) as app_conversation_info_service,
+            get_event_service(state) as event_service,
+            get_event_callback_service(state) as event_callback_service,
+        ):
+            await refresh_conversation(
+                app_conversation_info_service=app_conversation_info_service,
+                event_service=event_service,
+                event_callback_service=event_callback_service,
+                app_conversation_info=app_conversation_info,
+                runtime=runtime,
+                httpx_client=httpx_client,
+                stats=stats,
+            )
+
+
+def _rewind_event_sync_cursor(cursor: str) -> str | None:
+    timestamp = _parse_event_timestamp(cursor)
+    if timestamp is None:
+        return None
+    return (timestamp - EVENT_SYNC_OVERLAP).isoformat()
+
+
 async def refresh_conversation(
     app_conversation_info_service: AppConversationInfoService,
     event_service: EventService,
@@ -691,22 +797,26 @@ async def refresh_conversation(
     app_conversation_info: AppConversationInfo,
     runtime: dict[str, Any],
     httpx_client: httpx.AsyncClient,
+    stats: AgentServerSyncStats | None = None,
 ):
     """Refresh a conversation.
 
-    Grab ConversationInfo and all events from the agent server and make sure they
-    exist in the app server."""
+    Grab ConversationInfo and the events since the last refresh from the agent
+    server and make sure they exist in the app server. The timestamp of the most
+    recent event synced is saved with the conversation as a cursor, and only
+    events from shortly before it are pulled on the next refresh."""
     _logger.debug(f'Started Refreshing Conversation {app_conversation_info.id}')
+    stats = stats or AgentServerSyncStats()
+    stats.conversations += 1
     try:
         url = runtime['url']
+        headers = {'X-Session-API-Key': runtime['session_api_key']}
 
         # TODO: Maybe we can use RemoteConversation here?
 
         # First get conversation...
         conversation_url = f'{url}/api/conversations/{app_conversation_info.id.hex}'
-        response = await httpx_client.get(
-            conversation_url, headers={'X-Session-API-Key': runtime['session_api_key']}
-        )
+        response = await httpx_client.get(conversation_url, headers=headers)
         response.raise_for_status()
 
         updated_conversation_info = ConversationInfo.model_validate(response.json())
@@ -729,38 +839,59 @@ async def refresh_conversation(
             app_conversation_info
         )
 
-        # TODO: It would be nice to have an updated_at__gte filter parameter in the
-        # agent server so that we don't pull the full event list each time
         event_url = (
             f'{url}/api/conversations/{app_conversation_info.id.hex}/events/search'
         )
-
-        async def fetch_events_page(page_id: str | None = None) -> EventPage:
-            """Helper function to fetch a page of events from the agent server."""
-            params: dict[str, str] = {}
+        params = {
+            'sort_order': EventSortOrder.TIMESTAMP.value,
+            'limit': str(EVENT_SYNC_PAGE_SIZE),
+        }
+        cursor = app_conversation_info.event_sync_cursor
+        if cursor:
+            # Events saved out of order shortly before the cursor are pulled
+            # again, and skipped if they were already synced
+            timestamp__gte = _rewind_event_sync_cursor(cursor)
+            if timestamp__gte:
+                params['timestamp__gte'] = timestamp__gte
+
+        page_id = None
+        while True:
             if page_id:
                 params['page_id'] = page_id
-            response = await httpx_client.get(
-                event_url,
-                params=params,
-                headers={'X-Session-API-Key': runtime['session_api_key']},
-            )
+            response = await httpx_client.get(event_url, params=params, headers=headers)
             response.raise_for_status()
-            return EventPage.model_validate(response.json())
+            page = EventPage.model_validate(response.json())
+            stats.events_pulled += len(page.items)
 
-        async for event in page_iterator(fetch_events_page):
-            existing = await event_service.get_event(
-                app_conversation_info.id, UUID(event.id)
+            existing_event_ids = await event_service.get_existing_event_ids(
+                app_conversation_info.id, [UUID(event.id) for event in page.items]
+            )
+            for event in page.items:
+                if UUID(event.id) not in existing_event_ids:
+                    await event_service.save_event(app_conversation_info.id, event)
+                    await event_callback_service.execute_callbacks(
+                        app_conversation_info.id, event
+                    )
+                    stats.record_saved_event(event)
+                if cursor is None or event.timestamp > cursor:
+                    cursor = event.timestamp
+
+            page_id = page.next_page_id
+            if not page_id:
+                break
+
+        # Only the cursor is written now, as callbacks may have updated the
+        # conversation while its events were saved
+        if cursor != app_conversation_info.event_sync_cursor:
+            app_conversation_info.event_sync_cursor = cursor
+            await app_conversation_info_service.update_event_sync_cursor(
+                app_conversation_info.id, cursor
             )
-            if existing is None:
-                await event_service.save_event(app_conversation_info.id, event)
-                await event_callback_service.execute_callbacks(
-                    app_conversation_info.id, event
-                )
 
         _logger.debug(f'Finished Refreshing Conversation {app_conversation_info.id}')
 
     except Exception as exc:
+        stats.failed_conversations += 1
         _logger.exception(f'Error Refreshing Conversation: {exc}', stack_info=True)
 
 
@@ -776,6 +907,13 @@ class RemoteSandboxServiceInjector(SandboxServiceInjector):
             'no public facing web_url'
         ),
     )
+    max_concurrent_refreshes: int = Field(
+        default=MAX_CONCURRENT_REFRESHES,
+        description=(
+            'The maximum number of conversations refreshed concurrently when polling '
+            'agent servers'
+        ),
+    )
     resource_factor: int = Field(
         default=1,
         description='Factor by which to scale resources in sandbox: 1, 2, 4, or 8',
@@ -820,6 +958,7 @@ class RemoteSandboxServiceInjector(SandboxServiceInjector):
                         api_url=self.api_url,
                         api_key=self.api_key,
                         sleep_interval=self.polling_interval,
+                        max_concurrent_refreshes=self.max_concurrent_refreshes,
                     )
                 )
         async with (
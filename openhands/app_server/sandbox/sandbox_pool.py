@@ -0,0 +1,121 @@
+"""Warm pools of started sandboxes, claimed when conversations start.
+
+Starting a sandbox and waiting for its agent server to be ready dominates the
+time to start a conversation. Sandbox services supporting pools keep a number of
+started sandboxes which are not assigned to any conversation for each pooled
+sandbox spec, and hand one over instead of starting a sandbox. Pools are
+replenished in the background after each claim, and at an interval.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import asdict, dataclass, field
+
+from openhands.app_server.sandbox.sandbox_service import SandboxService
+from openhands.app_server.sandbox.sandbox_spec_models import SandboxSpecInfo
+from openhands.app_server.sandbox.sandbox_spec_service import SandboxSpecService
+from openhands.app_server.services.injector import Injector, InjectorState
+from openhands.app_server.user.specifiy_user_context import ADMIN, USER_CONTEXT_ATTR
+
+_logger = logging.getLogger(__name__)
+# The interval at which pools are replenished when no sandbox was claimed
+POOL_REPLENISH_INTERVAL = 30.0
+
+
+@dataclass
+class SandboxPoolStats:
+    """Metrics on a pool of sandboxes."""
+
+    claims: int = 0
+    hits: int = 0
+    total_claim_latency: float = 0.0
+    max_claim_latency: float = 0.0
+    started: int = 0
+    failed_starts: int = 0
+    # The number of sandboxes in the pool, by sandbox spec id
+    sizes: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def hit_rate(self) -> float | None:
+        return self.hits / self.claims if self.claims else None
+
+    @property
+    def mean_claim_latency(self) -> float | None:
+        return self.total_claim_latency / self.claims if self.claims else None
+
+    def record_claim(self, latency: float, hit: bool):
+        self.claims += 1
+        if hit:
+            self.hits += 1
+        self.total_claim_latency += latency
+        self.max_claim_latency = max(self.max_claim_latency, latency)
+
+
+class SandboxPool:
+    """Metrics on a pool of sandboxes, and a signal to replenish it."""
+
+    def __init__(self):
+        self.stats = SandboxPoolStats()
+        self._replenish_requested = asyncio.Event()
+
+    def request_replenish(self):
+        """Replenish the pool now rather than at the next interval."""
+        self._replenish_requested.set()
+
+    async def wait_for_replenish(self, timeout: float):
+        try:
+            await asyncio.wait_for(self._replenish_requested.wait(), timeout)
+        except TimeoutError:
+            pass
+        self._replenish_requested.clear()
+
+
+async def get_pooled_sandbox_specs(
+    sandbox_spec_service: SandboxSpecService, sandbox_spec_ids: list[str]
+) -> list[SandboxSpecInfo]:
+    """Get the sandbox specs to pool sandboxes for - the default if none are given."""
+    if not sandbox_spec_ids:
+        return [await sandbox_spec_service.get_default_sandbox_spec()]
+    sandbox_specs = []
+    for sandbox_spec_id in sandbox_spec_ids:
+        sandbox_spec = await sandbox_spec_service.get_sandbox_spec(sandbox_spec_id)
+        if sandbox_spec is None:
+            _logger.warning(f'Pooled sandbox spec not found: {sandbox_spec_id}')
+        else:
+            sandbox_specs.append(sandbox_spec)
+    return sandbox_specs
+
+
+async def maintain_sandbox_pool(
+    injector: Injector[SandboxService], pool: SandboxPool, interval: float
+):
+    """Replenish a pool of sandboxes in the background, whenever a sandbox is
+    claimed and at an interval."""
+    while True:
+        try:
+            try:
+                state = InjectorState()
+                # Pooled sandboxes are not owned by any user
+                setattr(state, USER_CONTEXT_ATTR, ADMIN)
+                start = time.perf_counter()
+                async with injector.context(state) as sandbox_service:
+                    await sandbox_service.replenish_sandbox_pool()
+                stats = pool.stats
+                _logger.debug(
+                    f'Replenished sandbox pool in {time.perf_counter() - start:.3f}s',
+                    extra={
+                        **asdict(stats),
+                        'hit_rate': stats.hit_rate,
+                        'mean_claim_latency': stats.mean_claim_latency,
+                    },
+                )
+            except Exception as exc:
+                _logger.exception(
+                    f'Error when replenishing sandbox pool: {exc}', stack_info=True
+                )
+
+            await pool.wait_for_replenish(interval)
+
+        except asyncio.CancelledError:
+            return
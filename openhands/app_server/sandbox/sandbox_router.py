@@ -27,22 +27,36 @@ async def search_sandboxes(
         int,
         Query(title='The max number of results in the page', gt=0, lte=100),
     ] = 100,
+    fresh: Annotated[
+        bool,
+        Query(
+            title='Check the status of sandboxes now rather than reuse a recent check'
+        ),
+    ] = False,
     sandbox_service: SandboxService = sandbox_service_dependency,
 ) -> SandboxPage:
     """Search / list sandboxes owned by the current user."""
     assert limit > 0
     assert limit <= 100
-    return await sandbox_service.search_sandboxes(page_id=page_id, limit=limit)
+    return await sandbox_service.search_sandboxes(
+        page_id=page_id, limit=limit, fresh=fresh
+    )
 
 
 @router.get('')
 async def batch_get_sandboxes(
     id: Annotated[list[str], Query()],
+    fresh: Annotated[
+        bool,
+        Query(
+            title='Check the status of sandboxes now rather than reuse a recent check'
+        ),
+    ] = False,
     sandbox_service: SandboxService = sandbox_service_dependency,
 ) -> list[SandboxInfo | None]:
     """Get a batch of sandboxes given their ids, returning null for any missing."""
     assert len(id) < 100
-    sandboxes = await sandbox_service.batch_get_sandboxes(id)
+    sandboxes = await sandbox_service.batch_get_sandboxes(id, fresh=fresh)
     return sandboxes
 
 
@@ -31,12 +31,23 @@ class SandboxService(ABC):
         self,
         page_id: str | None = None,
         limit: int = 100,
+        fresh: bool = False,
     ) -> SandboxPage:
-        """Search for sandboxes."""
+        """Search for sandboxes.
+
+        Implementations which cache the status of sandboxes check it again if
+        fresh is True.
+        """
 
     @abstractmethod
-    async def get_sandbox(self, sandbox_id: str) -> SandboxInfo | None:
-        """Get a single sandbox. Return None if the sandbox was not found."""
+    async def get_sandbox(
+        self, sandbox_id: str, fresh: bool = False
+    ) -> SandboxInfo | None:
+        """Get a single sandbox. Return None if the sandbox was not found.
+
+        Implementations which cache the status of sandboxes check it again if
+        fresh is True.
+        """
 
     @abstractmethod
     async def get_sandbox_by_session_api_key(
@@ -45,11 +56,11 @@ class SandboxService(ABC):
         """Get a single sandbox by session API key. Return None if the sandbox was not found."""
 
     async def batch_get_sandboxes(
-        self, sandbox_ids: list[str]
+        self, sandbox_ids: list[str], fresh: bool = False
     ) -> list[SandboxInfo | None]:
         """Get a batch of sandboxes, returning None for any which were not found."""
         results = await asyncio.gather(
-            *[self.get_sandbox(sandbox_id) for sandbox_id in sandbox_ids]
+            *[self.get_sandbox(sandbox_id, fresh=fresh) for sandbox_id in sandbox_ids]
         )
         return results
 
@@ -64,6 +75,24 @@ class SandboxService(ABC):
         of generating a random one.
         """
 
+    async def claim_pooled_sandbox(
+        self, sandbox_spec_id: str | None = None, sandbox_id: str | None = None
+    ) -> SandboxInfo | None:
+        """Claim a started sandbox from the pool, in place of starting one.
+
+        Return None if there is no pool or no sandbox of the spec in it, in which
+        case a sandbox should be started. The arguments are as for start_sandbox.
+        Implementations must ensure a pooled sandbox is only ever claimed once.
+        """
+        return None
+
+    async def replenish_sandbox_pool(self) -> None:
+        """Start sandboxes until the pool for each pooled sandbox spec is full.
+
+        Does nothing for implementations without a pool.
+        """
+        return None
+
     @abstractmethod
     async def resume_sandbox(self, sandbox_id: str) -> bool:
         """Begin the process of resuming a sandbox.
@@ -80,6 +80,7 @@ from openhands.events.action.agent import (
     RecallAction,
 )
 from openhands.events.event import Event
+from openhands.events.event_filter import EventFilter
 from openhands.events.observation import (
     AgentDelegateObservation,
     AgentStateChangedObservation,
@@ -251,7 +252,10 @@ class AgentController:
                 action.security_risk = ActionSecurityRisk.UNKNOWN
 
     def _add_system_message(self):
-        for event in self.event_stream.search_events(start_id=self.state.start_id):
+        for event in self.event_stream.search_events(
+            start_id=self.state.start_id,
+            filter=EventFilter(include_types=(MessageAction, SystemMessageAction)),
+        ):
             if isinstance(event, MessageAction) and event.source == EventSource.USER:
                 # FIXME: Remove this after 6/1/2025
                 # Do not try to add a system message if we first run into
@@ -1245,7 +1249,10 @@ Loop detected at iteration {self.state.iteration_flag.current_value}
         )
 
     def _is_awaiting_observation(self) -> bool:
-        events = self.event_stream.search_events(reverse=True)
+        events = self.event_stream.search_events(
+            reverse=True,
+            filter=EventFilter(include_types=(AgentStateChangedObservation,)),
+        )
         for event in events:
             if isinstance(event, AgentStateChangedObservation):
                 result = event.agent_state == AgentState.RUNNING
@@ -27,7 +27,7 @@ from openhands.events.action import (
 from openhands.events.action.agent import AgentFinishAction
 from openhands.events.event import Event, EventSource
 from openhands.llm.metrics import Metrics
-from openhands.memory.view import View
+from openhands.memory.view import IncrementalView, View
 from openhands.server.services.conversation_stats import ConversationStats
 from openhands.storage.files import FileStore
 from openhands.storage.locations import get_conversation_agent_state_filename
@@ -204,6 +204,7 @@ class State:
         # history after that gets reloaded.
         state.pop('_history_checksum', None)
         state.pop('_view', None)
+        state.pop('_incremental_view', None)
 
         # Remove deprecated fields before pickling
         state.pop('iteration', None)
@@ -304,15 +305,10 @@ class State:
 
     @property
     def view(self) -> View:
-        # Compute a simple checksum from the history to see if we can re-use any
-        # cached view.
-        history_checksum = len(self.history)
-        old_history_checksum = getattr(self, '_history_checksum', -1)
-
-        # If the history has changed, we need to re-create the view and update
-        # the caching.
-        if history_checksum != old_history_checksum:
-            self._history_checksum = history_checksum
-            self._view = View.from_events(self.history)
-
-        return self._view
+        # The view is updated with the events appended to the history since it was
+        # last requested, rather than rebuilt from the whole history.
+        incremental_view = getattr(self, '_incremental_view', None)
+        if incremental_view is None:
+            incremental_view = IncrementalView()
+            self._incremental_view = incremental_view
+        return incremental_view.update(self.history)
@@ -5,8 +5,9 @@
 #   - V1 application server (in this repo): openhands/app_server/
 # Unless you are working on deprecation, please avoid extending this legacy file and consult the V1 codepaths above.
 # Tag: Legacy-V0
-from dataclasses import dataclass
-from typing import Optional
+from collections import deque
+from dataclasses import dataclass, fields
+from typing import Hashable, NamedTuple, Optional
 
 from openhands.controller.state.state import State
 from openhands.core.logger import openhands_logger as logger
@@ -41,10 +42,15 @@ class StuckDetector:
     def __init__(self, state: State):
         self.state = state
         self.stuck_analysis: Optional[StuckDetector.StuckAnalysis] = None
+        self._history = _RollingHistory()
 
     def is_stuck(self, headless_mode: bool = True) -> bool:
         """Checks if the agent is stuck in a loop.
 
+        The filtered history is kept up to date incrementally, processing only the
+        events added to the state history since the last call, so each check looks
+        at a bounded number of recent events however long the history gets.
+
         Args:
             headless_mode: Matches AgentController's headless_mode.
                           If True: Consider all history (automated/testing)
@@ -53,65 +59,30 @@ class StuckDetector:
         Returns:
             bool: True if the agent is stuck in a loop, False otherwise.
         """
+        self._history.update(self.state.history)
+
         filtered_history_offset = 0
-        if not headless_mode:
-            # In interactive mode, only look at history after the last user message
-            last_user_msg_idx = -1
-            for i, event in enumerate(reversed(self.state.history)):
-                if (
-                    isinstance(event, MessageAction)
-                    and event.source == EventSource.USER
-                ):
-                    last_user_msg_idx = len(self.state.history) - i - 1
-                    break
-            filtered_history_offset = last_user_msg_idx + 1
-            history_to_check = self.state.history[last_user_msg_idx + 1 :]
-        else:
+        if headless_mode:
             # In headless mode, look at all history
-            history_to_check = self.state.history
-
-        # Filter out user messages and null events
-        filtered_history = [
-            event
-            for event in history_to_check
-            if not (
-                # Filter works elegantly in both modes:
-                # - In headless: actively filters out user messages from full history
-                # - In non-headless: no-op since we already sliced after last user message
-                (isinstance(event, MessageAction) and event.source == EventSource.USER)
-                # there might be some NullAction or NullObservation in the history at least for now
-                or isinstance(event, (NullAction, NullObservation))
-            )
-        ]
+            filtered_history = self._history.window()
+        else:
+            # In interactive mode, only look at history after the last user message
+            filtered_history_offset = self._history.last_user_msg_idx + 1
+            filtered_history = self._history.window(self._history.user_msg_boundary)
 
         # it takes 3 actions minimum to detect a loop, otherwise nothing to do here
         if len(filtered_history) < 3:
             return False
 
-        # the first few scenarios detect 3 or 4 repeated steps
-        # prepare the last 4 actions and observations, to check them out
-        last_actions: list[Event] = []
-        last_observations: list[Event] = []
-
-        # retrieve the last four actions and observations starting from the end of history, wherever they are
-        for event in reversed(filtered_history):
-            if isinstance(event, Action) and len(last_actions) < 4:
-                last_actions.append(event)
-            elif isinstance(event, Observation) and len(last_observations) < 4:
-                last_observations.append(event)
-
-            if len(last_actions) == 4 and len(last_observations) == 4:
-                break
-
         # scenario 1: same action, same observation
         if self._is_stuck_repeating_action_observation(
-            last_actions, last_observations, filtered_history, filtered_history_offset
+            filtered_history, filtered_history_offset
         ):
             return True
 
         # scenario 2: same action, errors
         if self._is_stuck_repeating_action_error(
-            last_actions, last_observations, filtered_history, filtered_history_offset
+            filtered_history, filtered_history_offset
         ):
             return True
 
@@ -139,22 +110,22 @@ class StuckDetector:
 
     def _is_stuck_repeating_action_observation(
         self,
-        last_actions: list[Event],
-        last_observations: list[Event],
-        filtered_history: list[Event],
+        filtered_history: '_HistoryWindow | list[Event]',
         filtered_history_offset: int = 0,
     ) -> bool:
         # scenario 1: same action, same observation
         # it takes 4 actions and 4 observations to detect a loop
-        # assert len(last_actions) == 4 and len(last_observations) == 4
+        window = _HistoryWindow.of(filtered_history)
+        last_actions = window.last_actions(4)
+        last_observations = window.last_observations(4)
 
         # Check for a loop of 4 identical action-observation pairs
         if len(last_actions) == 4 and len(last_observations) == 4:
             actions_equal = all(
-                self._eq_no_pid(last_actions[0], action) for action in last_actions
+                self._same(last_actions[0], action) for action in last_actions
             )
             observations_equal = all(
-                self._eq_no_pid(last_observations[0], observation)
+                self._same(last_observations[0], observation)
                 for observation in last_observations
             )
 
@@ -163,7 +134,7 @@ class StuckDetector:
                 self.stuck_analysis = StuckDetector.StuckAnalysis(
                     loop_type='repeating_action_observation',
                     loop_repeat_times=4,
-                    loop_start_idx=filtered_history.index(last_actions[-1])
+                    loop_start_idx=window.index(last_actions[-1].event)
                     + filtered_history_offset,
                 )
                 return True
@@ -172,34 +143,34 @@ class StuckDetector:
 
     def _is_stuck_repeating_action_error(
         self,
-        last_actions: list[Event],
-        last_observations: list[Event],
-        filtered_history: list[Event],
+        filtered_history: '_HistoryWindow | list[Event]',
         filtered_history_offset: int = 0,
     ) -> bool:
         # scenario 2: same action, errors
         # it takes 3 actions and 3 observations to detect a loop
         # check if the last three actions are the same and result in errors
+        window = _HistoryWindow.of(filtered_history)
+        last_actions = window.last_actions(4)
+        last_observations = [entry.event for entry in window.last_observations(3)]
 
         if len(last_actions) < 3 or len(last_observations) < 3:
             return False
 
         # are the last three actions the "same"?
-        if all(self._eq_no_pid(last_actions[0], action) for action in last_actions[:3]):
+        if all(self._same(last_actions[0], action) for action in last_actions[:3]):
             # and the last three observations are all errors?
-            if all(isinstance(obs, ErrorObservation) for obs in last_observations[:3]):
+            if all(isinstance(obs, ErrorObservation) for obs in last_observations):
                 logger.warning('Action, ErrorObservation loop detected')
                 self.stuck_analysis = StuckDetector.StuckAnalysis(
                     loop_type='repeating_action_error',
                     loop_repeat_times=3,
-                    loop_start_idx=filtered_history.index(last_actions[-1])
+                    loop_start_idx=window.index(last_actions[-1].event)
                     + filtered_history_offset,
                 )
                 return True
             # or, are the last three observations all IPythonRunCellObservation with SyntaxError?
             elif all(
-                isinstance(obs, IPythonRunCellObservation)
-                for obs in last_observations[:3]
+                isinstance(obs, IPythonRunCellObservation) for obs in last_observations
             ):
                 warning = 'Action, IPythonRunCellObservation loop detected'
                 for error_message in self.SYNTAX_ERROR_MESSAGES:
@@ -209,7 +180,7 @@ class StuckDetector:
                         if self._check_for_consistent_line_error(
                             [
                                 obs
-                                for obs in last_observations[:3]
+                                for obs in last_observations
                                 if isinstance(obs, IPythonRunCellObservation)
                             ],
                             error_message,
@@ -218,7 +189,7 @@ class StuckDetector:
                             self.stuck_analysis = StuckDetector.StuckAnalysis(
                                 loop_type='repeating_action_error',
                                 loop_repeat_times=3,
-                                loop_start_idx=filtered_history.index(last_actions[-1])
+                                loop_start_idx=window.index(last_actions[-1].event)
                                 + filtered_history_offset,
                             )
                             return True
@@ -228,7 +199,7 @@ class StuckDetector:
                     ) and self._check_for_consistent_invalid_syntax(
                         [
                             obs
-                            for obs in last_observations[:3]
+                            for obs in last_observations
                             if isinstance(obs, IPythonRunCellObservation)
                         ],
                         error_message,
@@ -237,7 +208,7 @@ class StuckDetector:
                         self.stuck_analysis = StuckDetector.StuckAnalysis(
                             loop_type='repeating_action_error',
                             loop_repeat_times=3,
-                            loop_start_idx=filtered_history.index(last_actions[-1])
+                            loop_start_idx=window.index(last_actions[-1].event)
                             + filtered_history_offset,
                         )
                         return True
@@ -316,83 +287,74 @@ class StuckDetector:
         return len(error_lines) == 3 and len(set(error_lines)) == 1
 
     def _is_stuck_monologue(
-        self, filtered_history: list[Event], filtered_history_offset: int = 0
+        self,
+        filtered_history: '_HistoryWindow | list[Event]',
+        filtered_history_offset: int = 0,
     ) -> bool:
         # scenario 3: monologue
         # check for repeated MessageActions with source=AGENT
         # see if the agent is engaged in a good old monologue, telling itself the same thing over and over
-        agent_message_actions = [
-            (i, event)
-            for i, event in enumerate(filtered_history)
-            if isinstance(event, MessageAction) and event.source == EventSource.AGENT
-        ]
+        window = _HistoryWindow.of(filtered_history)
 
         # last three message actions will do for this check
-        if len(agent_message_actions) >= 3:
-            last_agent_message_actions = agent_message_actions[-3:]
-
+        last_agent_message_actions = window.last_agent_messages(3)
+        if len(last_agent_message_actions) == 3:
+            first = last_agent_message_actions[0].entry
             if all(
-                (last_agent_message_actions[0][1] == action[1])
-                for action in last_agent_message_actions
+                first.key == message.entry.key and first.event == message.entry.event
+                for message in last_agent_message_actions
             ):
                 # check if there are any observations between the repeated MessageActions
                 # then it's not yet a loop, maybe it can recover
-                start_index = last_agent_message_actions[0][0]
-                end_index = last_agent_message_actions[-1][0]
-
-                has_observation_between = False
-                for event in filtered_history[start_index + 1 : end_index]:
-                    if isinstance(event, Observation):
-                        has_observation_between = True
-                        break
+                has_observation_between = (
+                    last_agent_message_actions[-1].observations_before
+                    > last_agent_message_actions[0].observations_before
+                )
 
                 if not has_observation_between:
                     logger.warning('Repeated MessageAction with source=AGENT detected')
                     self.stuck_analysis = StuckDetector.StuckAnalysis(
                         loop_type='monologue',
                         loop_repeat_times=3,
-                        loop_start_idx=start_index + filtered_history_offset,
+                        loop_start_idx=first.position
+                        - window.start
+                        + filtered_history_offset,
                     )
                     return True
         return False
 
     def _is_stuck_action_observation_pattern(
-        self, filtered_history: list[Event], filtered_history_offset: int = 0
+        self,
+        filtered_history: '_HistoryWindow | list[Event]',
+        filtered_history_offset: int = 0,
     ) -> bool:
         # scenario 4: action, observation pattern on the last six steps
         # check if the agent repeats the same (Action, Observation)
         # every other step in the last six steps
-        last_six_actions: list[Event] = []
-        last_six_observations: list[Event] = []
+        window = _HistoryWindow.of(filtered_history)
 
         # the end of history is most interesting
-        for event in reversed(filtered_history):
-            if isinstance(event, Action) and len(last_six_actions) < 6:
-                last_six_actions.append(event)
-            elif isinstance(event, Observation) and len(last_six_observations) < 6:
-                last_six_observations.append(event)
-
-            if len(last_six_actions) == 6 and len(last_six_observations) == 6:
-                break
+        last_six_actions = window.last_actions(6)
+        last_six_observations = window.last_observations(6)
 
         # this pattern is every other step, like:
         # (action_1, obs_1), (action_2, obs_2), (action_1, obs_1), (action_2, obs_2),...
         if len(last_six_actions) == 6 and len(last_six_observations) == 6:
             actions_equal = (
                 # action_0 == action_2 == action_4
-                self._eq_no_pid(last_six_actions[0], last_six_actions[2])
-                and self._eq_no_pid(last_six_actions[0], last_six_actions[4])
+                self._same(last_six_actions[0], last_six_actions[2])
+                and self._same(last_six_actions[0], last_six_actions[4])
                 # action_1 == action_3 == action_5
-                and self._eq_no_pid(last_six_actions[1], last_six_actions[3])
-                and self._eq_no_pid(last_six_actions[1], last_six_actions[5])
+                and self._same(last_six_actions[1], last_six_actions[3])
+                and self._same(last_six_actions[1], last_six_actions[5])
             )
             observations_equal = (
                 # obs_0 == obs_2 == obs_4
-                self._eq_no_pid(last_six_observations[0], last_six_observations[2])
-                and self._eq_no_pid(last_six_observations[0], last_six_observations[4])
+                self._same(last_six_observations[0], last_six_observations[2])
+                and self._same(last_six_observations[0], last_six_observations[4])
                 # obs_1 == obs_3 == obs_5
-                and self._eq_no_pid(last_six_observations[1], last_six_observations[3])
-                and self._eq_no_pid(last_six_observations[1], last_six_observations[5])
+                and self._same(last_six_observations[1], last_six_observations[3])
+                and self._same(last_six_observations[1], last_six_observations[5])
             )
 
             if actions_equal and observations_equal:
@@ -400,14 +362,16 @@ class StuckDetector:
                 self.stuck_analysis = StuckDetector.StuckAnalysis(
                     loop_type='repeating_action_observation_pattern',
                     loop_repeat_times=3,
-                    loop_start_idx=filtered_history.index(last_six_actions[-1])
+                    loop_start_idx=window.index(last_six_actions[-1].event)
                     + filtered_history_offset,
                 )
                 return True
         return False
 
     def _is_stuck_context_window_error(
-        self, filtered_history: list[Event], filtered_history_offset: int = 0
+        self,
+        filtered_history: '_HistoryWindow | list[Event]',
+        filtered_history_offset: int = 0,
     ) -> bool:
         """Detects if we're stuck in a loop of context window errors.
 
@@ -422,33 +386,22 @@ class StuckDetector:
         Returns:
             bool: True if we detect a context window error loop
         """
-        # Look for AgentCondensationObservation events
-        condensation_events = [
-            (i, event)
-            for i, event in enumerate(filtered_history)
-            if isinstance(event, AgentCondensationObservation)
-        ]
+        window = _HistoryWindow.of(filtered_history)
+
+        # Get the positions of the last 10 AgentCondensationObservation events
+        last_condensation_events = window.last_condensations(10)
 
         # Need at least 10 condensation events to detect a loop
-        if len(condensation_events) < 10:
+        if len(last_condensation_events) < 10:
             return False
 
-        # Get the last 10 condensation events
-        last_condensation_events = condensation_events[-10:]
-
         # Check if there are any non-condensation events between them
         for i in range(len(last_condensation_events) - 1):
-            start_idx = last_condensation_events[i][0]
-            end_idx = last_condensation_events[i + 1][0]
-
-            # Look for any non-condensation events between these two
-            has_other_events = False
-            for event in filtered_history[start_idx + 1 : end_idx]:
-                if not isinstance(event, AgentCondensationObservation):
-                    has_other_events = True
-                    break
+            start_idx = last_condensation_events[i]
+            end_idx = last_condensation_events[i + 1]
 
-            if not has_other_events:
+            # Any event between two consecutive condensation events is another event
+            if end_idx == start_idx + 1:
                 logger.warning(
                     'Context window error loop detected - repeated condensation events'
                 )
@@ -461,6 +414,11 @@ class StuckDetector:
 
         return False
 
+    def _same(self, entry1: '_HistoryEntry', entry2: '_HistoryEntry') -> bool:
+        # events with different keys are never equal, which rules out most
+        # candidates without comparing the events field by field
+        return entry1.key == entry2.key and self._eq_no_pid(entry1.event, entry2.event)
+
     def _eq_no_pid(self, obj1: Event, obj2: Event) -> bool:
         if isinstance(obj1, IPythonRunCellAction) and isinstance(
             obj2, IPythonRunCellAction
@@ -486,3 +444,167 @@ class StuckDetector:
         else:
             # this is the default comparison
             return obj1 == obj2
+
+
+def _event_key(event: Event) -> Hashable:
+    """Gets a key which is equal for any events `StuckDetector._eq_no_pid` considers equal.
+
+    The key is computed once per event, so that comparisons of events which differ
+    are usually decided by comparing keys.
+    """
+    if isinstance(event, IPythonRunCellAction):
+        # edit actions are compared on the first lines of code only
+        return IPythonRunCellAction
+    if isinstance(event, CmdOutputObservation):
+        return (CmdOutputObservation, event.command, event.exit_code)
+    # equal dataclasses have the same class and equal fields, so equal string fields
+    values = [getattr(event, f.name) for f in fields(event)]
+    return (
+        event.__class__,
+        hash(tuple(str.__hash__(value) for value in values if isinstance(value, str))),
+    )
+
+
+class _HistoryEntry(NamedTuple):
+    position: int  # in the filtered history
+    event: Event
+    key: Hashable
+
+
+class _AgentMessage(NamedTuple):
+    entry: _HistoryEntry
+    observations_before: int  # observations in the filtered history before the message
+
+
+class _RollingHistory:
+    """The filtered history of a state, maintained incrementally.
+
+    User messages and null events are filtered out as events are added to the
+    state history. Alongside the filtered events, bounded windows of the most recent
+    actions, observations, agent messages and condensation observations are kept,
+    which is all the stuck checks need to look at.
+    """
+
+    def __init__(self) -> None:
+        self._reset()
+
+    def _reset(self) -> None:
+        """Forget all events processed so far."""
+        self.events: list[Event] = []
+        self.actions: deque[_HistoryEntry] = deque(maxlen=6)
+        self.observations: deque[_HistoryEntry] = deque(maxlen=6)
+        self.agent_messages: deque[_AgentMessage] = deque(maxlen=3)
+        self.condensations: deque[int] = deque(maxlen=10)
+        self.observation_count = 0
+        # index of the last user message in the state history
+        self.last_user_msg_idx = -1
+        # number of filtered events before the last user message
+        self.user_msg_boundary = 0
+        # the state history events processed so far
+        self._consumed = 0
+        self._first: Event | None = None
+        self._last: Event | None = None
+
+    def update(self, history: list[Event]) -> None:
+        """Process the events added to the history since the last update.
+
+        The filtered history is rebuilt if the history was replaced or truncated.
+        """
+        consumed = self._consumed
+        if consumed and (
+            consumed > len(history)
+            or history[0] is not self._first
+            or history[consumed - 1] is not self._last
+        ):
+            self._reset()
+            consumed = 0
+        for i in range(consumed, len(history)):
+            event = history[i]
+            if isinstance(event, MessageAction) and event.source == EventSource.USER:
+                self.last_user_msg_idx = i
+                self.user_msg_boundary = len(self.events)
+            # there might be some NullAction or NullObservation in the history at least for now
+            elif not isinstance(event, (NullAction, NullObservation)):
+                self.add(event)
+        self._consumed = len(history)
+        if history:
+            self._first = history[0]
+            self._last = history[-1]
+
+    def add(self, event: Event) -> None:
+        """Add an event to the filtered history."""
+        index = len(self.events)
+        self.events.append(event)
+        if isinstance(event, Action):
+            entry = _HistoryEntry(index, event, _event_key(event))
+            self.actions.append(entry)
+            if isinstance(event, MessageAction) and event.source == EventSource.AGENT:
+                self.agent_messages.append(_AgentMessage(entry, self.observation_count))
+        elif isinstance(event, Observation):
+            self.observations.append(_HistoryEntry(index, event, _event_key(event)))
+            self.observation_count += 1
+            if isinstance(event, AgentCondensationObservation):
+                self.condensations.append(index)
+
+    def window(self, start: int = 0) -> '_HistoryWindow':
+        return _HistoryWindow(self, start)
+
+
+class _HistoryWindow:
+    """The filtered history from a given position, e.g. after the last user message.
+
+    Positions returned are relative to the start of the window.
+    """
+
+    def __init__(self, history: _RollingHistory, start: int = 0):
+        self.history = history
+        self.start = start
+
+    @classmethod
+    def of(cls, filtered_history: '_HistoryWindow | list[Event]') -> '_HistoryWindow':
+        if isinstance(filtered_history, _HistoryWindow):
+            return filtered_history
+        history = _RollingHistory()
+        for event in filtered_history:
+            history.add(event)
+        return cls(history)
+
+    def __len__(self) -> int:
+        return len(self.history.events) - self.start
+
+    def index(self, event: Event) -> int:
+        return self.history.events.index(event, self.start) - self.start
+
+    def last_actions(self, count: int) -> list[_HistoryEntry]:
+        """The last actions in the window, most recent first."""
+        return self._last(self.history.actions, count)
+
+    def last_observations(self, count: int) -> list[_HistoryEntry]:
+        """The last observations in the window, most recent first."""
+        return self._last(self.history.observations, count)
+
+    def last_agent_messages(self, count: int) -> list[_AgentMessage]:
+        """The last agent messages in the window, oldest first."""
+        messages = [
+            message
+            for message in self.history.agent_messages
+            if message.entry.position >= self.start
+        ]
+        return messages[-count:]
+
+    def last_condensations(self, count: int) -> list[int]:
+        """The positions of the last condensation observations, oldest first."""
+        positions = [
+            index - self.start
+            for index in self.history.condensations
+            if index >= self.start
+        ]
+        return positions[-count:]
+
+    def _last(self, entries: deque[_HistoryEntry], count: int) -> list[_HistoryEntry]:
+        last: list[_HistoryEntry] = []
+        for entry in reversed(entries):
+            if entry.position < self.start or len(last) == count:
+                break
+            last.append(entry)
+        return last
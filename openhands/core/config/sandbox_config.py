@@ -51,6 +51,9 @@ class SandboxConfig(BaseModel):
         trusted_dirs: List of directories that can be trusted to run the OpenHands CLI.
         vscode_port: The port to use for VSCode. If None, a random port will be chosen.
             This is useful when deploying OpenHands in a remote machine where you need to expose a specific port.
+        use_action_channel: Whether to send actions to the action execution server over a persistent
+            WebSocket, which streams partial command output, instead of one HTTP request per action.
+            Falls back to HTTP if the channel cannot be opened.
     """
 
     remote_runtime_api_url: str | None = Field(default='http://localhost:8000')
@@ -101,6 +104,7 @@ class SandboxConfig(BaseModel):
     )
 
     cuda_visible_devices: str | None = Field(default=None)
+    use_action_channel: bool = Field(default=False)
     model_config = ConfigDict(extra='forbid')
 
     @classmethod
@@ -0,0 +1,307 @@
+"""Shared asyncio dispatcher for delivering EventStream events to subscribers.
+
+By default every `EventStream` runs its own queue thread, and every subscribed
+callback gets a dedicated single-worker thread pool with a private event loop.
+With many concurrent conversations in one process this amounts to thousands of
+mostly idle threads. The asyncio dispatcher instead delivers the events of all
+streams in the process from a single event loop thread:
+
+* Each subscribed callback has its own ordered queue, drained by a task on the
+  shared loop, so a callback sees events in order and one at a time.
+* Coroutine function callbacks are awaited directly on the shared loop.
+* Sync callbacks run on a bounded worker pool shared by all streams. Each worker
+  thread has its own event loop, so callbacks calling
+  `asyncio.get_event_loop().run_until_complete(...)` keep working.
+* Each subscriber queue holds at most a bounded number of events. When it is
+  full, `add_event` called from a thread which is not running an event loop waits
+  (up to a timeout) for the subscriber to catch up. Otherwise, or after the
+  timeout, the event is spilled: only its id is queued, and the event is loaded
+  back from the stream's store when it is delivered.
+* Queue depth, queue wait and callback latency are tracked per subscription and
+  available from `EventDispatcher.get_metrics`.
+
+The dispatcher is chosen per deployment with the ``OPENHANDS_EVENT_DISPATCHER``
+environment variable (``thread`` or ``asyncio``). The worker pool size and queue
+bound can be set with ``OPENHANDS_EVENT_DISPATCHER_WORKERS`` and
+``OPENHANDS_EVENT_DISPATCHER_QUEUE_SIZE``.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from functools import partial
+from typing import Any, Callable
+
+from openhands.core.logger import openhands_logger as logger
+from openhands.events.event import Event
+
+DEFAULT_MAX_QUEUE_SIZE = 1000
+DEFAULT_BACKPRESSURE_TIMEOUT = 5.0
+
+
+class EventDispatcherMode(str, Enum):
+    THREAD = 'thread'
+    ASYNCIO = 'asyncio'
+
+
+def get_event_dispatcher_mode() -> EventDispatcherMode:
+    """Get the dispatcher used by event streams in this deployment."""
+    return EventDispatcherMode(os.environ.get('OPENHANDS_EVENT_DISPATCHER', 'thread'))
+
+
+@dataclass
+class SubscriptionMetrics:
+    """Delivery metrics for a single subscribed callback.
+
+    Attributes:
+        queue_depth: The number of events waiting to be delivered.
+        max_queue_depth: The highest queue depth observed.
+        events_processed: The number of events delivered.
+        errors: The number of deliveries where the callback raised.
+        backpressure_waits: The number of times a producer had to wait for the queue.
+        spilled: The number of events queued by id, as the queue was full.
+        total_queue_wait: Total seconds events spent queued before delivery.
+        total_latency: Total seconds spent in the callback.
+        max_latency: The longest time spent in the callback for a single event.
+    """
+
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    events_processed: int = 0
+    errors: int = 0
+    backpressure_waits: int = 0
+    spilled: int = 0
+    total_queue_wait: float = 0.0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+
+
+class Subscription:
+    """A callback subscribed to an event stream through an `EventDispatcher`."""
+
+    def __init__(
+        self,
+        name: str,
+        callback: Callable[[Event], Any],
+        max_queue_size: int,
+    ):
+        self.name = name
+        self.callback = callback
+        self.is_async = asyncio.iscoroutinefunction(callback)
+        self.metrics = SubscriptionMetrics()
+        self.closed = False
+        # Queued events, or loaders for events which were spilled
+        self.queue: asyncio.Queue[
+            tuple[Event | Callable[[], Event], bool, float] | None
+        ] = asyncio.Queue()
+        self.task: asyncio.Task | None = None
+        # Free queue slots - producers take one before enqueueing an event
+        self.slots = threading.Semaphore(max_queue_size)
+
+
+_callback_context = threading.local()
+
+
+def _is_loop_running() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+class EventDispatcher:
+    """Delivers events to subscribers from a shared event loop and worker pool."""
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        backpressure_timeout: float = DEFAULT_BACKPRESSURE_TIMEOUT,
+    ):
+        self.max_queue_size = max_queue_size
+        self.backpressure_timeout = backpressure_timeout
+        self._subscriptions: set[Subscription] = set()
+        self._lock = threading.Lock()
+        self._worker_loops: list[asyncio.AbstractEventLoop] = []
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='event-callback',
+            initializer=self._init_worker_loop,
+        )
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run_loop, name='event-dispatcher', daemon=True
+        )
+        self._thread.start()
+
+    def _init_worker_loop(self) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        with self._lock:
+            self._worker_loops.append(loop)
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+
+    def subscribe(self, name: str, callback: Callable[[Event], Any]) -> Subscription:
+        subscription = Subscription(name, callback, self.max_queue_size)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        self._loop.call_soon_threadsafe(self._start, subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Stop delivering events to a subscription. Queued events are discarded."""
+        subscription.closed = True
+        with self._lock:
+            self._subscriptions.discard(subscription)
+        if not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._stop, subscription)
+
+    def dispatch(
+        self,
+        subscriptions: list[Subscription],
+        event: Event,
+        load_event: Callable[[int], Event],
+    ) -> None:
+        """Enqueue an event for each of the subscriptions given, in order.
+
+        When a subscription queue is full, waits for a free slot if the calling thread
+        is not running an event loop and is not the callback of that subscription,
+        which would deadlock. Events which still find the queue full are spilled:
+        only their id is queued, and `load_event` loads them back for delivery.
+        """
+        can_wait = not _is_loop_running()
+        current = getattr(_callback_context, 'subscription', None)
+        for subscription in subscriptions:
+            if subscription.closed:
+                continue
+            acquired = subscription.slots.acquire(blocking=False)
+            waited = False
+            if not acquired and can_wait and subscription is not current:
+                waited = True
+                acquired = subscription.slots.acquire(timeout=self.backpressure_timeout)
+            item: Event | Callable[[], Event] = event
+            if not acquired:
+                item = partial(load_event, event.id)
+            self._loop.call_soon_threadsafe(
+                self._enqueue, subscription, item, acquired, waited, time.monotonic()
+            )
+
+    def get_metrics(self) -> dict[str, SubscriptionMetrics]:
+        with self._lock:
+            return {
+                subscription.name: subscription.metrics
+                for subscription in self._subscriptions
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            self.unsubscribe(subscription)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._executor.shutdown()
+        for loop in self._worker_loops:
+            loop.close()
+
+    def _start(self, subscription: Subscription) -> None:
+        if not subscription.closed:
+            subscription.task = self._loop.create_task(self._drain(subscription))
+
+    def _enqueue(
+        self,
+        subscription: Subscription,
+        item: Event | Callable[[], Event],
+        acquired: bool,
+        waited: bool,
+        enqueued_at: float,
+    ) -> None:
+        # Metrics are only updated on the loop thread, so need no locking
+        metrics = subscription.metrics
+        metrics.queue_depth += 1
+        metrics.max_queue_depth = max(metrics.max_queue_depth, metrics.queue_depth)
+        if waited:
+            metrics.backpressure_waits += 1
+        if not acquired:
+            metrics.spilled += 1
+        subscription.queue.put_nowait((item, acquired, enqueued_at))
+
+    def _stop(self, subscription: Subscription) -> None:
+        subscription.queue.put_nowait(None)
+
+    async def _drain(self, subscription: Subscription) -> None:
+        metrics = subscription.metrics
+        while True:
+            item = await subscription.queue.get()
+            if item is None or subscription.closed:
+                return
+            event_or_loader, acquired, enqueued_at = item
+            started_at = time.monotonic()
+            try:
+                if isinstance(event_or_loader, Event):
+                    event = event_or_loader
+                else:
+                    event = await self._loop.run_in_executor(
+                        self._executor, event_or_loader
+                    )
+                if subscription.is_async:
+                    await subscription.callback(event)
+                else:
+                    await self._loop.run_in_executor(
+                        self._executor, self._call_sync, subscription, event
+                    )
+            except Exception as e:
+                metrics.errors += 1
+                logger.error(
+                    f'Error in event callback {subscription.name}: {str(e)}',
+                )
+            finally:
+                latency = time.monotonic() - started_at
+                metrics.queue_depth -= 1
+                metrics.events_processed += 1
+                metrics.total_queue_wait += started_at - enqueued_at
+                metrics.total_latency += latency
+                metrics.max_latency = max(metrics.max_latency, latency)
+                if acquired:
+                    subscription.slots.release()
+
+    @staticmethod
+    def _call_sync(subscription: Subscription, event: Event) -> None:
+        _callback_context.subscription = subscription
+        try:
+            subscription.callback(event)
+        finally:
+            _callback_context.subscription = None
+
+
+_dispatcher: EventDispatcher | None = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_event_dispatcher() -> EventDispatcher:
+    """Get the dispatcher shared by all event streams in this process."""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            max_workers = os.environ.get('OPENHANDS_EVENT_DISPATCHER_WORKERS')
+            _dispatcher = EventDispatcher(
+                max_workers=int(max_workers) if max_workers else None,
+                max_queue_size=int(
+                    os.environ.get(
+                        'OPENHANDS_EVENT_DISPATCHER_QUEUE_SIZE',
+                        DEFAULT_MAX_QUEUE_SIZE,
+                    )
+                ),
+            )
+        return _dispatcher
@@ -2,6 +2,7 @@ import json
 from dataclasses import dataclass
 
 from openhands.events.event import Event
+from openhands.events.event_index import EventIndexEntry
 from openhands.events.serialization.event import event_to_dict
 
 
@@ -84,6 +85,71 @@ class EventFilter:
 
         return True
 
+    def include_dict(self, data: dict) -> bool:
+        """Determine if a serialized event should be included, without deserializing it.
+
+        Args:
+            data: The event as produced by `event_to_dict`.
+
+        Returns:
+            bool: True if the event passes all filter criteria and should be included,
+                  False otherwise.
+        """
+        if not self.include_entry(EventIndexEntry.from_dict(data)):
+            return False
+
+        if self.query:
+            event_str = json.dumps(data).lower()
+            if self.query.lower() not in event_str:
+                return False
+
+        return True
+
+    def include_entry(self, entry: EventIndexEntry) -> bool:
+        """Determine if an indexed event may be included, without loading it.
+
+        All criteria except the text query are checked against the index entry.
+        Events passing this check must still be loaded and checked with `include`
+        when a query is set.
+
+        Args:
+            entry: The EventIndexEntry to check against the filter criteria.
+
+        Returns:
+            bool: False if the event is certainly excluded, True otherwise.
+        """
+        event_class = entry.get_event_class()
+        if event_class is not None:
+            if self.include_types and not issubclass(event_class, self.include_types):
+                return False
+
+            if self.exclude_types is not None and issubclass(
+                event_class, self.exclude_types
+            ):
+                return False
+
+        if self.source and entry.source != self.source:
+            return False
+
+        if (
+            self.start_date
+            and entry.timestamp is not None
+            and entry.timestamp < self.start_date
+        ):
+            return False
+
+        if (
+            self.end_date
+            and entry.timestamp is not None
+            and entry.timestamp > self.end_date
+        ):
+            return False
+
+        if self.exclude_hidden and entry.hidden:
+            return False
+
+        return True
+
     def exclude(self, event: Event) -> bool:
         """Determine if an event should be excluded based on the filter criteria.
 
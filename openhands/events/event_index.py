@@ -0,0 +1,202 @@
+"""Secondary index of event headers for a conversation.
+
+The index holds a small header per event (id, kind, type, source, timestamp,
+hidden flag and, for events stored in a segmented event log, the location of the
+payload) so that filtered searches can find matching ids without deserializing
+every event. It is added to by `EventStream.add_event` and split into chunks of
+fixed id ranges, so each chunk can be located without listing the directory:
+
+    event_index/chunk-0000000000.jsonl    # headers for ids 0 .. chunk_size - 1
+
+Each line is a compact JSON list - see `EventIndexEntry.to_line`. Stores with
+native append get each entry appended as its event is added. Appending to objects
+in S3 or GCS rewrites them whole, so with those stores a chunk is only written
+once it is full, and the events of the last chunk are checked in full instead.
+"""
+
+import json
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+from openhands.events.event import Event
+from openhands.events.serialization.action import ACTION_TYPE_TO_CLASS
+from openhands.events.serialization.observation import OBSERVATION_TYPE_TO_CLASS
+from openhands.storage.files import FileStore
+from openhands.storage.locations import get_conversation_event_index_dir
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class EventIndexEntry:
+    """Header of a stored event.
+
+    Attributes:
+        id: The id of the event.
+        kind: Either 'action' or 'observation'.
+        event_type: The action or observation type (e.g. 'run', 'read').
+        source: The source of the event, if any.
+        timestamp: The ISO format timestamp of the event, if any.
+        hidden: Whether the event is marked as hidden.
+        offset: Offset of the payload within its segment, when stored in a segmented event log.
+        length: Length of the payload, when stored in a segmented event log.
+    """
+
+    id: int
+    kind: str
+    event_type: str
+    source: str | None
+    timestamp: str | None
+    hidden: bool = False
+    offset: int | None = None
+    length: int | None = None
+
+    @classmethod
+    def from_dict(
+        cls,
+        data: dict[str, Any],
+        offset: int | None = None,
+        length: int | None = None,
+    ) -> 'EventIndexEntry':
+        """Build an entry from a serialized event, as produced by `event_to_dict`."""
+        kind = 'action' if 'action' in data else 'observation'
+        body = data.get('args' if kind == 'action' else 'extras') or {}
+        return cls(
+            id=data['id'],
+            kind=kind,
+            event_type=data.get(kind, ''),
+            source=data.get('source'),
+            timestamp=data.get('timestamp'),
+            hidden=bool(body.get('hidden', False)),
+            offset=offset,
+            length=length,
+        )
+
+    def to_line(self) -> str:
+        return (
+            json.dumps(
+                [
+                    self.id,
+                    self.kind,
+                    self.event_type,
+                    self.source,
+                    self.timestamp,
+                    self.hidden,
+                    self.offset,
+                    self.length,
+                ]
+            )
+            + '\n'
+        )
+
+    @classmethod
+    def from_line(cls, line: str) -> 'EventIndexEntry':
+        return cls(*json.loads(line))
+
+    def get_event_class(self) -> type[Event] | None:
+        """Get the class the event deserializes to, or None if the type is unknown."""
+        if self.kind == 'action':
+            return ACTION_TYPE_TO_CLASS.get(self.event_type)
+        return OBSERVATION_TYPE_TO_CLASS.get(self.event_type)
+
+
+class EventIndex:
+    """Append-only, chunked index of event headers for a conversation.
+
+    Searches must check events without an entry in full: entries are missing for
+    events written before the index existed, and for events not yet written in a
+    buffered chunk.
+    """
+
+    sid: str
+    file_store: FileStore
+    user_id: str | None
+    chunk_size: int
+
+    def __init__(
+        self,
+        sid: str,
+        file_store: FileStore,
+        user_id: str | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        self.sid = sid
+        self.file_store = file_store
+        self.user_id = user_id
+        self.chunk_size = chunk_size
+        # Without native append, entries are kept in memory until the chunk is full
+        self.buffered = not file_store.native_append
+        self._lock = threading.Lock()
+        # Chunks which are full (and so can no longer change) or written by this instance
+        self._chunks: dict[int, dict[int, EventIndexEntry]] = {}
+
+    def chunk_start(self, id: int) -> int:
+        return id - id % self.chunk_size
+
+    def is_chunk_end(self, id: int) -> bool:
+        """Whether an id is the last one in its chunk."""
+        return id % self.chunk_size == self.chunk_size - 1
+
+    def append(self, entry: EventIndexEntry) -> None:
+        """Add the entry for an event.
+
+        If the index is buffered, the entry is only stored by `write_chunk`.
+        """
+        start = self.chunk_start(entry.id)
+        with self._lock:
+            entries = self._chunks.get(start)
+            if entries is None:
+                entries = self._read_chunk(start)
+                self._chunks[start] = entries
+            if not self.buffered:
+                self.file_store.append(self._get_chunk_filename(start), entry.to_line())
+            entries[entry.id] = entry
+
+    def missing_ids(self, start: int) -> list[int]:
+        """Get the ids in the chunk starting at `start` which have no entry."""
+        entries = self._load_chunk(start)
+        return [id for id in range(start, start + self.chunk_size) if id not in entries]
+
+    def write_chunk(self, start: int) -> None:
+        """Store all the entries of the chunk starting at `start` at once."""
+        with self._lock:
+            entries = self._chunks.get(start, {})
+            content = ''.join(entries[id].to_line() for id in sorted(entries))
+            self.file_store.write(self._get_chunk_filename(start), content)
+
+    def load(self, start_id: int, end_id: int) -> dict[int, EventIndexEntry]:
+        """Load the entries with ids in the range [start_id, end_id)."""
+        result: dict[int, EventIndexEntry] = {}
+        for start in range(self.chunk_start(start_id), end_id, self.chunk_size):
+            for id, entry in self._load_chunk(start).items():
+                if start_id <= id < end_id:
+                    result[id] = entry
+        return result
+
+    def _load_chunk(self, start: int) -> dict[int, EventIndexEntry]:
+        entries = self._chunks.get(start)
+        if entries is not None:
+            return entries
+        entries = self._read_chunk(start)
+        if len(entries) >= self.chunk_size:
+            self._chunks[start] = entries
+        return entries
+
+    def _read_chunk(self, start: int) -> dict[int, EventIndexEntry]:
+        try:
+            content = self.file_store.read(self._get_chunk_filename(start))
+        except FileNotFoundError:
+            return {}
+        entries = {}
+        for line in content.splitlines():
+            try:
+                entry = EventIndexEntry.from_line(line)
+            except (ValueError, TypeError):
+                # A partially written trailing line
+                continue
+            entries[entry.id] = entry
+        return entries
+
+    def _get_chunk_filename(self, start: int) -> str:
+        return f'{get_conversation_event_index_dir(self.sid, self.user_id)}chunk-{start:010d}.jsonl'
@@ -1,11 +1,18 @@
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Iterable
 
 from openhands.core.logger import openhands_logger as logger
 from openhands.events.event import Event, EventSource
 from openhands.events.event_filter import EventFilter
+from openhands.events.event_index import EventIndex, EventIndexEntry
 from openhands.events.event_store_abc import EventStoreABC
+from openhands.events.segmented_event_log import (
+    EventLogFormat,
+    SegmentedEventLog,
+    get_event_log_format,
+    supports_segmented_log,
+)
 from openhands.events.serialization.event import event_from_dict
 from openhands.storage.files import FileStore
 from openhands.storage.locations import (
@@ -18,7 +25,7 @@ from openhands.utils.shutdown_listener import should_continue
 
 @dataclass(frozen=True)
 class _CachePage:
-    events: list[dict] | None
+    events: list[dict | None] | None
     start: int
     end: int
 
@@ -29,12 +36,17 @@ class _CachePage:
             return False
         return True
 
-    def get_event(self, global_index: int) -> Event | None:
+    def get_data(self, global_index: int) -> dict | None:
         # If there was not actually a cached page, return None
         if not self.events:
             return None
-        local_index = global_index - self.start
-        return event_from_dict(self.events[local_index])
+        return self.events[global_index - self.start]
+
+    def get_event(self, global_index: int) -> Event | None:
+        data = self.get_data(global_index)
+        if data is None:
+            return None
+        return event_from_dict(data)
 
 
 _DUMMY_PAGE = _CachePage(None, 1, -1)
@@ -49,6 +61,15 @@ class EventStore(EventStoreABC):
     user_id: str | None
     cache_size: int = 25
     _cur_id: int | None = None  # Private field to cache the calculated value
+    log_format: EventLogFormat = field(default_factory=get_event_log_format)
+
+    def __post_init__(self) -> None:
+        if self.log_format == EventLogFormat.SEGMENTED and not supports_segmented_log(
+            self.file_store
+        ):
+            self.log_format = EventLogFormat.FILE_PER_EVENT
+        self._event_log = SegmentedEventLog(self.sid, self.file_store, self.user_id)
+        self._event_index = EventIndex(self.sid, self.file_store, self.user_id)
 
     @property
     def cur_id(self) -> int:
@@ -64,6 +85,12 @@ class EventStore(EventStoreABC):
 
     def _calculate_cur_id(self) -> int:
         """Calculate the current event ID based on file system content."""
+        log_next_id = self._event_log.next_id()
+        if log_next_id and self.log_format == EventLogFormat.SEGMENTED:
+            # Once a conversation is written to the segmented log, all new events go
+            # there, so there is no need to list the legacy events directory.
+            return log_next_id
+
         events = []
         try:
             events_dir = get_conversation_events_dir(self.sid, self.user_id)
@@ -72,7 +99,7 @@ class EventStore(EventStoreABC):
             logger.debug(f'No events found for session {self.sid} at {events_dir}')
 
         if not events:
-            return 0
+            return log_next_id
 
         # if we have events, we need to find the highest id to prepare for new events
         max_id = -1
@@ -80,7 +107,7 @@ class EventStore(EventStoreABC):
             id = self._get_id_from_filename(event_str)
             if id >= max_id:
                 max_id = id
-        return max_id + 1
+        return max(max_id + 1, log_next_id)
 
     def search_events(
         self,
@@ -93,53 +120,160 @@ class EventStore(EventStoreABC):
         """Retrieve events from the event stream, optionally filtering out events of a given type
         and events marked as hidden.
 
+        Events which the index or the stored header (type, source, timestamp, hidden)
+        already exclude are never deserialized. All other events are checked with
+        `EventFilter.include`.
+
         Args:
             start_id: The ID of the first event to retrieve. Defaults to 0.
             end_id: The ID of the last event to retrieve. Defaults to the last event in the stream.
             reverse: Whether to retrieve events in reverse order. Defaults to False.
             filter: EventFilter to use
+            limit: The maximum number of events to retrieve. Defaults to no limit.
 
         Yields:
             Events from the stream that match the criteria.
         """
+        num_results = 0
+        for data in self._search_candidate_dicts(start_id, end_id, reverse, filter):
+            event = event_from_dict(data)
+            if filter and not filter.include(event):
+                continue
+            yield event
+            num_results += 1
+            if limit and limit <= num_results:
+                return
+
+    def search_event_dicts(
+        self,
+        start_id: int = 0,
+        end_id: int | None = None,
+        reverse: bool = False,
+        filter: EventFilter | None = None,
+        limit: int | None = None,
+    ) -> Iterable[dict]:
+        """Retrieve serialized events, as stored, without deserializing them.
+
+        Takes the same arguments as `search_events`. The dicts are those written by
+        `event_to_dict`, so callers which only forward events (e.g. to a socket) can
+        skip the round trip through event objects. The filter is evaluated with
+        `EventFilter.include_dict`, so a query is matched against the stored dict.
+        """
+        num_results = 0
+        for data in self._search_candidate_dicts(start_id, end_id, reverse, filter):
+            if filter and not filter.include_dict(data):
+                continue
+            yield data
+            num_results += 1
+            if limit and limit <= num_results:
+                return
+
+    def _search_candidate_dicts(
+        self,
+        start_id: int,
+        end_id: int | None,
+        reverse: bool,
+        filter: EventFilter | None,
+    ) -> Iterable[dict]:
+        """Yield the stored dicts of the events which may match the filter.
+
+        Events are excluded using only their header, so callers must still check
+        the rest of the filter (e.g. the query).
+        """
         if end_id is None:
             end_id = self.cur_id
         else:
             end_id += 1  # From inclusive to exclusive
 
-        if reverse:
-            step = -1
-            start_id, end_id = end_id, start_id
-            start_id -= 1
-            end_id -= 1
+        candidates: Iterable[tuple[int, EventIndexEntry | None]]
+        if filter:
+            # Use the index to skip events which cannot match, without loading them
+            candidates = self._search_index(start_id, end_id, reverse, filter)
         else:
-            step = 1
+            ids = range(start_id, end_id)
+            candidates = ((id, None) for id in (reversed(ids) if reverse else ids))
 
         cache_page = _DUMMY_PAGE
-        num_results = 0
-        for index in range(start_id, end_id, step):
+        segment_start, segment_content = -1, ''
+        for index, entry in candidates:
             if not should_continue():
                 return
-            if not cache_page.covers(index):
-                cache_page = self._load_cache_page_for_index(index)
-            event = cache_page.get_event(index)
-            if event is None:
+            data = None
+            if (
+                entry is not None
+                and entry.offset is not None
+                and entry.length is not None
+            ):
+                # The payload location is in the index, so read only that event
+                start = self._event_log.segment_start(index)
+                if start != segment_start:
+                    segment_start = start
+                    segment_content = self._event_log.read_content(start)
+                payload = segment_content[entry.offset : entry.offset + entry.length]
+                if payload:
+                    data = json.loads(payload)
+            if data is None:
+                if not cache_page.covers(index):
+                    cache_page = self._load_page_for_index(index)
+                data = cache_page.get_data(index)
+            if data is None:
                 try:
-                    event = self.get_event(index)
+                    data = self._get_event_data(index)
                 except FileNotFoundError:
-                    event = None
-            if event:
-                if not filter or filter.include(event):
-                    yield event
-                    num_results += 1
-                    if limit and limit <= num_results:
-                        return
+                    continue
+            if (
+                filter
+                and entry is None
+                and not filter.include_entry(EventIndexEntry.from_dict(data))
+            ):
+                continue
+            yield data
+
+    def _search_index(
+        self, start_id: int, end_id: int, reverse: bool, filter: EventFilter
+    ) -> Iterable[tuple[int, EventIndexEntry | None]]:
+        """Yield the ids in [start_id, end_id) which may match the filter.
+
+        Ids with an entry in the index are only yielded if the entry passes the
+        filter. Ids without one (e.g. events written before the index existed, or
+        not yet indexed) are yielded without an entry so that they are checked in full.
+        """
+        chunk_size = self._event_index.chunk_size
+        chunk_starts = range(
+            self._event_index.chunk_start(start_id), end_id, chunk_size
+        )
+        for chunk_start in reversed(chunk_starts) if reverse else chunk_starts:
+            lo = max(start_id, chunk_start)
+            hi = min(end_id, chunk_start + chunk_size)
+            entries = self._event_index.load(lo, hi)
+            candidates = [
+                (id, entries.get(id))
+                for id in range(lo, hi)
+                if id not in entries or filter.include_entry(entries[id])
+            ]
+            if reverse:
+                candidates.reverse()
+            yield from candidates
 
     def get_event(self, id: int) -> Event:
+        return event_from_dict(self._get_event_data(id))
+
+    def _get_event_data(self, id: int) -> dict:
+        if self.log_format == EventLogFormat.SEGMENTED:
+            content = self._event_log.read(id)
+            if content is not None:
+                return json.loads(content)
         filename = self._get_filename_for_id(id, self.user_id)
-        content = self.file_store.read(filename)
-        data = json.loads(content)
-        return event_from_dict(data)
+        try:
+            content = self.file_store.read(filename)
+        except FileNotFoundError:
+            # The event may have been written by a deployment using the segmented log
+            if self.log_format == EventLogFormat.SEGMENTED:
+                raise
+            content = self._event_log.read(id)
+            if content is None:
+                raise
+        return json.loads(content)
 
     def get_latest_event(self) -> Event:
         return self.get_event(self.cur_id - 1)
@@ -169,6 +303,19 @@ class EventStore(EventStoreABC):
         page = _CachePage(events, start, end)
         return page
 
+    def _load_page_for_index(self, index: int) -> _CachePage:
+        if self.log_format == EventLogFormat.SEGMENTED:
+            start = self._event_log.segment_start(index)
+            contents = self._event_log.read_segment(start)
+            if contents:
+                end = start + self._event_log.segment_size
+                events = [
+                    json.loads(contents[id]) if id in contents else None
+                    for id in range(start, end)
+                ]
+                return _CachePage(events, start, end)
+        return self._load_cache_page_for_index(index)
+
     def _load_cache_page_for_index(self, index: int) -> _CachePage:
         offset = index % self.cache_size
         index -= offset
@@ -0,0 +1,113 @@
+from typing import Any, Iterable, TypeVar
+
+SECRET_PLACEHOLDER = '<secret_hidden>'
+
+_S = TypeVar('_S', str, bytes)
+
+
+def _mask_occurrences(value: _S, secrets: list[_S], placeholder: _S) -> _S:
+    """Replace every occurrence of the secrets in value with the placeholder.
+
+    Occurrences which overlap, of the same or different secrets, are replaced
+    together by a single placeholder, so no part of any secret is left.
+    """
+    spans = []
+    for secret in secrets:
+        start = value.find(secret)
+        while start != -1:
+            spans.append((start, start + len(secret)))
+            start = value.find(secret, start + 1)
+    spans.sort()
+    parts = []
+    unmasked_start = 0
+    masked_start, masked_end = spans[0]
+    for start, end in spans[1:]:
+        if start < masked_end:
+            masked_end = max(masked_end, end)
+            continue
+        parts += [value[unmasked_start:masked_start], placeholder]
+        unmasked_start = masked_end
+        masked_start, masked_end = start, end
+    parts += [value[unmasked_start:masked_start], placeholder, value[masked_end:]]
+    return value[:0].join(parts)
+
+
+class SecretMasker:
+    """Masks a fixed set of secrets in serialized events.
+
+    The secrets are deduplicated and encoded once, when they are set. Strings
+    shorter than the shortest secret are skipped outright, and other strings are
+    checked for which secrets they contain with a substring search per secret, so
+    the cost is proportional to the number of secrets times the length of the
+    string. Most strings contain no secret, and these searches run in C, so they
+    are faster than a single scan with a combined regular expression (see
+    scripts/benchmark_secret_masking.py). The occurrences of the secrets present
+    are then masked together, with overlapping occurrences merged into one
+    placeholder, so masking one secret never exposes part of another.
+
+    Dicts and lists are masked in place. Strings, bytes and tuples are immutable,
+    so masked copies are returned.
+    """
+
+    def __init__(self, secrets: Iterable[str]):
+        self._secrets = sorted(
+            {secret for secret in secrets if secret}, key=len, reverse=True
+        )
+        self._secrets_bytes = [secret.encode('utf-8') for secret in self._secrets]
+        self._placeholder_bytes = SECRET_PLACEHOLDER.encode('utf-8')
+        # Strings shorter than this cannot contain any secret
+        self._min_length = len(self._secrets[-1]) if self._secrets else 0
+
+    def __bool__(self) -> bool:
+        return bool(self._secrets)
+
+    def mask_str(self, value: str) -> str:
+        if len(value) < self._min_length:
+            return value
+        present = [secret for secret in self._secrets if secret in value]
+        if not present:
+            return value
+        return _mask_occurrences(value, present, SECRET_PLACEHOLDER)
+
+    def mask_bytes(self, value: bytes) -> bytes:
+        if len(value) < self._min_length:
+            return value
+        present = [secret for secret in self._secrets_bytes if secret in value]
+        if not present:
+            return value
+        return _mask_occurrences(value, present, self._placeholder_bytes)
+
+    def mask(self, value: Any) -> tuple[Any, bool]:
+        """Mask secrets in a value, recursing into dicts, lists and tuples.
+
+        Returns:
+            The masked value and whether any secret was found.
+        """
+        if isinstance(value, str):
+            masked_str = self.mask_str(value)
+            return masked_str, masked_str is not value
+        if isinstance(value, bytes):
+            masked_bytes = self.mask_bytes(value)
+            return masked_bytes, masked_bytes is not value
+        found = False
+        if isinstance(value, dict):
+            for key, item in value.items():
+                masked, item_found = self.mask(item)
+                if item_found:
+                    value[key] = masked
+                    found = True
+        elif isinstance(value, list):
+            for i, item in enumerate(value):
+                masked, item_found = self.mask(item)
+                if item_found:
+                    value[i] = masked
+                    found = True
+        elif isinstance(value, tuple):
+            items = []
+            for item in value:
+                masked, item_found = self.mask(item)
+                items.append(masked)
+                found = found or item_found
+            if found:
+                return tuple(items), True
+        return value, found
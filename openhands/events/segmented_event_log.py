@@ -0,0 +1,398 @@
+"""Append-only segmented storage for conversation events.
+
+The legacy layout writes one JSON file per event under ``events/``, which means
+thousands of tiny files for long conversations and a full directory listing to
+find the next event id on a cold load. The segmented layout instead appends
+length-prefixed records to rolling segment files under ``event_log/``:
+
+    event_log/segment-0000000000.log    # records for ids 0 .. segment_size - 1
+    event_log/segment-0000000000.idx    # sidecar offset index for that segment
+
+Each record in a segment is a header line ``"<id> <length>\\n"`` followed by the
+JSON payload and a trailing newline. Each line in the sidecar index is
+``"<id> <offset> <length>\\n"`` where ``offset`` points at the first character of
+the payload in the decoded segment. The sidecar can always be rebuilt by scanning
+the segment headers.
+
+The format used for new writes is chosen per deployment with the
+``OPENHANDS_EVENT_LOG_FORMAT`` environment variable (``file`` or ``segmented``).
+Appending to a segment rewrites it whole on stores without native append (S3,
+GCS), so those keep writing one file per event - see `supports_segmented_log`.
+Reads are transparent: conversations written in the legacy layout remain readable
+in either mode. Existing conversations can be converted offline with:
+
+    python -m openhands.events.segmented_event_log --file-store local \\
+        --file-store-path ~/.openhands [--conversation-id ID] [--delete-legacy]
+"""
+
+import argparse
+import functools
+import json
+import os
+import threading
+from enum import Enum
+from typing import Iterable
+
+from openhands.core.logger import openhands_logger as logger
+from openhands.events.event_index import EventIndex, EventIndexEntry
+from openhands.storage.files import FileStore
+from openhands.storage.locations import (
+    CONVERSATION_BASE_DIR,
+    get_conversation_dir,
+    get_conversation_event_log_dir,
+    get_conversation_events_dir,
+)
+
+DEFAULT_SEGMENT_SIZE = 1000
+_SEGMENT_PREFIX = 'segment-'
+_SEGMENT_SUFFIX = '.log'
+_INDEX_SUFFIX = '.idx'
+
+
+class EventLogFormat(str, Enum):
+    FILE_PER_EVENT = 'file'
+    SEGMENTED = 'segmented'
+
+
+def get_event_log_format() -> EventLogFormat:
+    """Get the event log format used for new writes in this deployment."""
+    return EventLogFormat(os.environ.get('OPENHANDS_EVENT_LOG_FORMAT', 'file'))
+
+
+def supports_segmented_log(file_store: FileStore) -> bool:
+    """Whether events can be written to a segmented event log in a file store.
+
+    Without native append, each event would rewrite its whole segment and sidecar
+    index, so writes would grow quadratically with the segment size.
+    """
+    if file_store.native_append:
+        return True
+    _warn_segmented_log_unsupported(type(file_store).__name__)
+    return False
+
+
+@functools.cache
+def _warn_segmented_log_unsupported(file_store_type: str) -> None:
+    logger.warning(
+        f'{file_store_type} does not support native append, so events are written '
+        'one file per event rather than to a segmented event log'
+    )
+
+
+class SegmentedEventLog:
+    """Append-only event log split into fixed-size segments with a sidecar offset index.
+
+    Segments cover a fixed range of ids, so the segment holding any id can be
+    located without listing the directory. Indexes of full (sealed) segments never
+    change and are cached in memory; the active segment is re-read on each access
+    unless this instance is the one writing to it.
+    """
+
+    sid: str
+    file_store: FileStore
+    user_id: str | None
+    segment_size: int
+
+    def __init__(
+        self,
+        sid: str,
+        file_store: FileStore,
+        user_id: str | None = None,
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+    ):
+        self.sid = sid
+        self.file_store = file_store
+        self.user_id = user_id
+        self.segment_size = segment_size
+        self._lock = threading.Lock()
+        self._indexes: dict[int, dict[int, tuple[int, int]]] = {}
+        self._active_start: int | None = None
+        self._active_end_offset = 0
+
+    def segment_start(self, id: int) -> int:
+        return id - id % self.segment_size
+
+    def list_segments(self) -> list[int]:
+        """List the start ids of all segments, in ascending order."""
+        try:
+            filenames = self.file_store.list(self._get_dir())
+        except FileNotFoundError:
+            return []
+        starts = []
+        for filename in filenames:
+            name = filename.rstrip('/').split('/')[-1]
+            if not (
+                name.startswith(_SEGMENT_PREFIX) and name.endswith(_SEGMENT_SUFFIX)
+            ):
+                continue
+            try:
+                starts.append(int(name[len(_SEGMENT_PREFIX) : -len(_SEGMENT_SUFFIX)]))
+            except ValueError:
+                logger.warning(f'Ignoring unexpected event log file: {filename}')
+        starts.sort()
+        return starts
+
+    def next_id(self) -> int:
+        """Get the id following the last event stored in the log, or 0 if it is empty."""
+        for start in reversed(self.list_segments()):
+            index = self._load_index(start)
+            if index:
+                return max(index) + 1
+        return 0
+
+    def append(self, id: int, payload: str) -> tuple[int, int]:
+        """Append the JSON payload for an event to the segment covering its id.
+
+        Returns:
+            The offset and length of the payload within the segment.
+        """
+        start = self.segment_start(id)
+        header = f'{id} {len(payload)}\n'
+        with self._lock:
+            if self._active_start != start:
+                self._open_for_write(start)
+            offset = self._active_end_offset + len(header)
+            self.file_store.append(
+                self._get_segment_filename(start), f'{header}{payload}\n'
+            )
+            self.file_store.append(
+                self._get_index_filename(start), f'{id} {offset} {len(payload)}\n'
+            )
+            self._indexes[start][id] = (offset, len(payload))
+            self._active_end_offset = offset + len(payload) + 1
+        return offset, len(payload)
+
+    def segment_ids(self, start: int) -> set[int]:
+        """Get the ids of the events stored in the segment starting at `start`."""
+        return set(self._load_index(start))
+
+    def locate(self, id: int) -> tuple[int, int] | None:
+        """Get the offset and length of the payload for an event within its segment."""
+        return self._load_index(self.segment_start(id)).get(id)
+
+    def read(self, id: int) -> str | None:
+        """Read the JSON payload for a single event, or None if the log does not hold it."""
+        location = self.locate(id)
+        if location is None:
+            return None
+        offset, length = location
+        content = self.read_content(self.segment_start(id))
+        return content[offset : offset + length]
+
+    def read_segment(self, start: int) -> dict[int, str]:
+        """Read the JSON payloads of all events in the segment starting at `start`."""
+        content = self.read_content(start)
+        if not content:
+            return {}
+        index = self._load_index(start)
+        if not index:
+            index = _scan_segment(content)[0]
+        return {
+            id: content[offset : offset + length]
+            for id, (offset, length) in index.items()
+        }
+
+    def read_content(self, start: int) -> str:
+        """Read the raw content of the segment starting at `start`."""
+        try:
+            return self.file_store.read(self._get_segment_filename(start))
+        except FileNotFoundError:
+            return ''
+
+    def _open_for_write(self, start: int) -> None:
+        """Prepare to append to a segment, repairing it if a previous write was interrupted."""
+        content = self.read_content(start)
+        index, end_offset = _scan_segment(content)
+        if end_offset != len(content):
+            logger.warning(
+                f'Truncating partial record in event log segment {start} for {self.sid}'
+            )
+            self.file_store.write(
+                self._get_segment_filename(start), content[:end_offset]
+            )
+        if index != self._read_index_file(start):
+            self.file_store.write(
+                self._get_index_filename(start),
+                ''.join(
+                    f'{id} {offset} {length}\n'
+                    for id, (offset, length) in index.items()
+                ),
+            )
+        self._indexes[start] = index
+        self._active_start = start
+        self._active_end_offset = end_offset
+
+    def _load_index(self, start: int) -> dict[int, tuple[int, int]]:
+        index = self._indexes.get(start)
+        if index is not None:
+            return index
+        index = self._read_index_file(start)
+        if not index:
+            # The sidecar is missing or empty - fall back to scanning the segment
+            index = _scan_segment(self.read_content(start))[0]
+        if len(index) >= self.segment_size:
+            self._indexes[start] = index
+        return index
+
+    def _read_index_file(self, start: int) -> dict[int, tuple[int, int]]:
+        try:
+            content = self.file_store.read(self._get_index_filename(start))
+        except FileNotFoundError:
+            return {}
+        index = {}
+        for line in content.splitlines():
+            parts = line.split(' ')
+            if len(parts) != 3:
+                # A partially written trailing line
+                continue
+            try:
+                index[int(parts[0])] = (int(parts[1]), int(parts[2]))
+            except ValueError:
+                continue
+        return index
+
+    def _get_dir(self) -> str:
+        return get_conversation_event_log_dir(self.sid, self.user_id)
+
+    def _get_segment_filename(self, start: int) -> str:
+        return f'{self._get_dir()}{_SEGMENT_PREFIX}{start:010d}{_SEGMENT_SUFFIX}'
+
+    def _get_index_filename(self, start: int) -> str:
+        return f'{self._get_dir()}{_SEGMENT_PREFIX}{start:010d}{_INDEX_SUFFIX}'
+
+
+def _scan_segment(content: str) -> tuple[dict[int, tuple[int, int]], int]:
+    """Rebuild the offset index of a segment from its record headers.
+
+    Returns the index and the offset just past the last complete record.
+    """
+    index: dict[int, tuple[int, int]] = {}
+    pos = 0
+    while pos < len(content):
+        header_end = content.find('\n', pos)
+        if header_end < 0:
+            break
+        parts = content[pos:header_end].split(' ')
+        try:
+            id, length = int(parts[0]), int(parts[1])
+        except (IndexError, ValueError):
+            break
+        offset = header_end + 1
+        record_end = offset + length
+        if record_end >= len(content) or content[record_end] != '\n':
+            break
+        index[id] = (offset, length)
+        pos = record_end + 1
+    return index, pos
+
+
+def migrate_conversation(
+    file_store: FileStore,
+    sid: str,
+    user_id: str | None = None,
+    segment_size: int = DEFAULT_SEGMENT_SIZE,
+    delete_legacy: bool = False,
+) -> int:
+    """Copy the per-event files of a conversation into a segmented event log.
+
+    Copied events are also added to the event index. Events already present in the
+    log are skipped, so an interrupted migration can simply be run again. This must
+    not run while the conversation is active.
+
+    Returns:
+        The number of events copied.
+
+    Raises:
+        ValueError: If the file store does not support a segmented event log.
+    """
+    if not supports_segmented_log(file_store):
+        raise ValueError(
+            f'{type(file_store).__name__} does not support a segmented event log'
+        )
+    events_dir = get_conversation_events_dir(sid, user_id)
+    try:
+        filenames = file_store.list(events_dir)
+    except FileNotFoundError:
+        return 0
+
+    ids = []
+    for filename in filenames:
+        try:
+            ids.append(int(filename.split('/')[-1].split('.')[0]))
+        except ValueError:
+            logger.warning(f'Skipping unexpected event file: {filename}')
+    ids.sort()
+
+    event_log = SegmentedEventLog(sid, file_store, user_id, segment_size)
+    existing_ids: set[int] = set()
+    for start in event_log.list_segments():
+        existing_ids.update(event_log.segment_ids(start))
+    event_index = EventIndex(sid, file_store, user_id)
+    num_copied = 0
+    for id in ids:
+        if id in existing_ids:
+            continue
+        payload = file_store.read(f'{events_dir}{id}.json')
+        offset, length = event_log.append(id, payload)
+        event_index.append(
+            EventIndexEntry.from_dict(json.loads(payload), offset, length)
+        )
+        num_copied += 1
+
+    if delete_legacy:
+        file_store.delete(events_dir)
+        file_store.delete(f'{get_conversation_dir(sid, user_id)}event_cache/')
+    return num_copied
+
+
+def _iter_conversations(file_store: FileStore) -> Iterable[tuple[str, str | None]]:
+    try:
+        for path in file_store.list(f'{CONVERSATION_BASE_DIR}/'):
+            yield path.rstrip('/').split('/')[-1], None
+    except FileNotFoundError:
+        pass
+    try:
+        user_dirs = file_store.list('users/')
+    except FileNotFoundError:
+        return
+    for user_dir in user_dirs:
+        user_id = user_dir.rstrip('/').split('/')[-1]
+        try:
+            for path in file_store.list(f'users/{user_id}/conversations/'):
+                yield path.rstrip('/').split('/')[-1], user_id
+        except FileNotFoundError:
+            continue
+
+
+if __name__ == '__main__':
+    from openhands.storage import get_file_store
+
+    parser = argparse.ArgumentParser(
+        description='Migrate conversations from per-event files to a segmented event log'
+    )
+    parser.add_argument('--file-store', type=str, default='local')
+    parser.add_argument('--file-store-path', type=str, default='~/.openhands')
+    parser.add_argument('--conversation-id', type=str, default=None)
+    parser.add_argument('--user-id', type=str, default=None)
+    parser.add_argument('--segment-size', type=int, default=DEFAULT_SEGMENT_SIZE)
+    parser.add_argument('--delete-legacy', action='store_true', default=False)
+    args = parser.parse_args()
+
+    store = get_file_store(args.file_store, args.file_store_path)
+    if not supports_segmented_log(store):
+        parser.error(f'{args.file_store} does not support a segmented event log')
+    if args.conversation_id:
+        conversations: Iterable[tuple[str, str | None]] = [
+            (args.conversation_id, args.user_id)
+        ]
+    else:
+        conversations = _iter_conversations(store)
+    for conversation_id, conversation_user_id in conversations:
+        count = migrate_conversation(
+            store,
+            conversation_id,
+            conversation_user_id,
+            segment_size=args.segment_size,
+            delete_legacy=args.delete_legacy,
+        )
+        print(f'{conversation_id}: migrated {count} events')
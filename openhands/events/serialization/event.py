@@ -1,4 +1,5 @@
-from dataclasses import asdict
+import copy
+from dataclasses import fields, is_dataclass
 from datetime import datetime
 from enum import Enum
 from typing import Any
@@ -97,14 +98,62 @@ def _convert_pydantic_to_dict(obj: BaseModel | dict) -> dict:
     return obj
 
 
+# Values which `dataclasses.asdict` would deep copy, but which are immutable
+_ATOMIC_TYPES = frozenset({str, int, float, bool, type(None)})
+
+# The dataclass fields serialized into args / extras, for each event class
+_PROP_FIELDS: dict[type, tuple[str, ...]] = {}
+
+
+def _get_prop_fields(cls: type) -> tuple[str, ...]:
+    prop_fields = _PROP_FIELDS.get(cls)
+    if prop_fields is None:
+        prop_fields = tuple(f.name for f in fields(cls) if f.name not in TOP_KEYS)
+        _PROP_FIELDS[cls] = prop_fields
+    return prop_fields
+
+
+def _field_to_dict(value: Any) -> Any:
+    """Convert a field value the way `dataclasses.asdict` does.
+
+    Containers and nested dataclasses are copied, but immutable values are returned
+    as is rather than passed through `copy.deepcopy`.
+    """
+    value_type = type(value)
+    if value_type in _ATOMIC_TYPES or isinstance(value, Enum):
+        return value
+    if value_type is list:
+        return [_field_to_dict(v) for v in value]
+    if value_type is dict:
+        return {_field_to_dict(k): _field_to_dict(v) for k, v in value.items()}
+    if is_dataclass(value):
+        return {
+            name: _field_to_dict(getattr(value, name))
+            for name in (f.name for f in fields(value))
+        }
+    if isinstance(value, tuple) and hasattr(value, '_fields'):
+        return value_type(*[_field_to_dict(v) for v in value])
+    if isinstance(value, (list, tuple)):
+        return value_type(_field_to_dict(v) for v in value)
+    if isinstance(value, dict):
+        return value_type(
+            (_field_to_dict(k), _field_to_dict(v)) for k, v in value.items()
+        )
+    return copy.deepcopy(value)
+
+
 def event_to_dict(event: 'Event') -> dict:
-    props = asdict(event)
+    props = {
+        name: _field_to_dict(getattr(event, name))
+        for name in _get_prop_fields(type(event))
+    }
     d = {}
     for key in TOP_KEYS:
-        if hasattr(event, key) and getattr(event, key) is not None:
-            d[key] = getattr(event, key)
-        elif hasattr(event, f'_{key}') and getattr(event, f'_{key}') is not None:
-            d[key] = getattr(event, f'_{key}')
+        value = getattr(event, key, None)
+        if value is None:
+            value = getattr(event, f'_{key}', None)
+        if value is not None:
+            d[key] = value
         if key == 'id' and d.get('id') == -1:
             d.pop('id', None)
         if key == 'timestamp' and 'timestamp' in d:
@@ -118,7 +167,6 @@ def event_to_dict(event: 'Event') -> dict:
             d['tool_call_metadata'] = d['tool_call_metadata'].model_dump()
         if key == 'llm_metrics' and 'llm_metrics' in d:
             d['llm_metrics'] = d['llm_metrics'].get()
-        props.pop(key, None)
 
     if 'security_risk' in props and props['security_risk'] is None:
         props.pop('security_risk')
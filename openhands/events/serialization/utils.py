@@ -1,3 +1,7 @@
+import copy
+from typing import Any
+
+
 def remove_fields(obj: dict | list | tuple, fields: set[str]) -> None:
     """Remove fields from an object.
 
@@ -18,3 +22,20 @@ def remove_fields(obj: dict | list | tuple, fields: set[str]) -> None:
         raise ValueError(
             'Object must not contain dataclass, consider converting to dict first'
         )
+
+
+def copy_value(obj: Any) -> Any:
+    """Copy a value like `copy.deepcopy`, for values made of dicts and lists.
+
+    Dicts and lists are copied recursively and strings, numbers, booleans and None
+    are returned as is, which is much faster than `copy.deepcopy` for large
+    structures. Any other value falls back to `copy.deepcopy`.
+    """
+    obj_type = type(obj)
+    if obj_type is dict:
+        return {key: copy_value(value) for key, value in obj.items()}
+    if obj_type is list:
+        return [copy_value(item) for item in obj]
+    if obj_type in (str, int, float, bool) or obj is None:
+        return obj
+    return copy.deepcopy(obj)
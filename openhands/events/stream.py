@@ -9,7 +9,17 @@ from typing import Any, Callable
 
 from openhands.core.logger import openhands_logger as logger
 from openhands.events.event import Event, EventSource
+from openhands.events.event_dispatcher import (
+    EventDispatcher,
+    EventDispatcherMode,
+    Subscription,
+    get_event_dispatcher,
+    get_event_dispatcher_mode,
+)
+from openhands.events.event_index import EventIndexEntry
 from openhands.events.event_store import EventStore
+from openhands.events.secret_masker import SecretMasker
+from openhands.events.segmented_event_log import EventLogFormat
 from openhands.events.serialization.event import event_from_dict, event_to_dict
 from openhands.io import json
 from openhands.storage import FileStore
@@ -40,8 +50,21 @@ async def session_exists(
         return False
 
 
+# Fields that should not have secrets replaced (only at top level - system metadata)
+TOP_LEVEL_PROTECTED_FIELDS = {
+    'timestamp',
+    'id',
+    'source',
+    'cause',
+    'action',
+    'observation',
+    'message',
+}
+
+
 class EventStream(EventStore):
     secrets: dict[str, str]
+    _secret_masker: SecretMasker
     # For each subscriber ID, there is a map of callback functions - useful
     # when there are multiple listeners
     _subscribers: dict[str, dict[str, Callable]]
@@ -51,9 +74,18 @@ class EventStream(EventStore):
     _queue_loop: asyncio.AbstractEventLoop | None
     _thread_pools: dict[str, dict[str, ThreadPoolExecutor]]
     _thread_loops: dict[str, dict[str, asyncio.AbstractEventLoop]]
+    _dispatcher: EventDispatcher | None
+    _subscriptions: dict[str, dict[str, Subscription]]
     _write_page_cache: list[dict]
+    _index_checked: bool
 
-    def __init__(self, sid: str, file_store: FileStore, user_id: str | None = None):
+    def __init__(
+        self,
+        sid: str,
+        file_store: FileStore,
+        user_id: str | None = None,
+        dispatcher_mode: EventDispatcherMode | None = None,
+    ):
         super().__init__(sid, file_store, user_id)
         self._stop_flag = threading.Event()
         self._queue: queue.Queue[Event] = queue.Queue()
@@ -62,11 +94,21 @@ class EventStream(EventStore):
         self._queue_loop = None
         self._queue_thread = threading.Thread(target=self._run_queue_loop)
         self._queue_thread.daemon = True
-        self._queue_thread.start()
+        self._subscriptions = {}
+        self._dispatcher = None
+        if dispatcher_mode is None:
+            dispatcher_mode = get_event_dispatcher_mode()
+        if dispatcher_mode == EventDispatcherMode.ASYNCIO:
+            # Events are delivered by the process wide dispatcher, so no queue thread is needed
+            self._dispatcher = get_event_dispatcher()
+        else:
+            self._queue_thread.start()
         self._subscribers = {}
         self._lock = threading.Lock()
         self.secrets = {}
+        self._secret_masker = SecretMasker([])
         self._write_page_cache = []
+        self._index_checked = False
 
     def _init_thread_loop(self, subscriber_id: str, callback_id: str) -> None:
         loop = asyncio.new_event_loop()
@@ -97,6 +139,12 @@ class EventStream(EventStore):
         if callback_id not in self._subscribers[subscriber_id]:
             logger.warning(f'Callback not found during cleanup: {callback_id}')
             return
+        if self._dispatcher is not None and callback_id in self._subscriptions.get(
+            subscriber_id, {}
+        ):
+            self._dispatcher.unsubscribe(
+                self._subscriptions[subscriber_id].pop(callback_id)
+            )
         if (
             subscriber_id in self._thread_loops
             and callback_id in self._thread_loops[subscriber_id]
@@ -130,14 +178,18 @@ class EventStream(EventStore):
     def subscribe(
         self,
         subscriber_id: EventStreamSubscriber,
-        callback: Callable[[Event], None],
+        callback: Callable[[Event], Any],
         callback_id: str,
     ) -> None:
-        initializer = partial(self._init_thread_loop, subscriber_id, callback_id)
-        pool = ThreadPoolExecutor(max_workers=1, initializer=initializer)
+        """Subscribe a callback to events added to the stream.
+
+        The callback may be a regular function or a coroutine function. Each callback
+        receives events in the order they were added, one at a time.
+        """
         if subscriber_id not in self._subscribers:
             self._subscribers[subscriber_id] = {}
             self._thread_pools[subscriber_id] = {}
+            self._subscriptions[subscriber_id] = {}
 
         if callback_id in self._subscribers[subscriber_id]:
             raise ValueError(
@@ -145,6 +197,17 @@ class EventStream(EventStore):
             )
 
         self._subscribers[subscriber_id][callback_id] = callback
+        if self._dispatcher is not None:
+            self._subscriptions[subscriber_id][callback_id] = (
+                self._dispatcher.subscribe(
+                    f'{self.sid}/{getattr(subscriber_id, "value", subscriber_id)}/{callback_id}',
+                    callback,
+                )
+            )
+            return
+
+        initializer = partial(self._init_thread_loop, subscriber_id, callback_id)
+        pool = ThreadPoolExecutor(max_workers=1, initializer=initializer)
         self._thread_pools[subscriber_id][callback_id] = pool
 
     def unsubscribe(
@@ -167,7 +230,11 @@ class EventStream(EventStore):
             )
         event._timestamp = datetime.now().isoformat()
         event._source = source  # type: ignore [attr-defined]
+        repair_index_before = None
         with self._lock:
+            if not self._index_checked:
+                self._index_checked = True
+                repair_index_before = self.cur_id
             event._id = self.cur_id  # type: ignore [attr-defined]
             self.cur_id += 1
 
@@ -175,8 +242,9 @@ class EventStream(EventStore):
             current_write_page = self._write_page_cache
 
             data = event_to_dict(event)
-            data = self._replace_secrets(data)
-            event = event_from_dict(data)
+            if self._mask_secrets(data):
+                # Subscribers must only see the masked values
+                event = event_from_dict(data)
             current_write_page.append(data)
 
             # If the page is full, create a new page for future events / other threads to use
@@ -196,11 +264,73 @@ class EventStream(EventStore):
                         'size': len(event_json),
                     },
                 )
-            self.file_store.write(filename, event_json)
+            offset: int | None = None
+            length: int | None = None
+            if self.log_format == EventLogFormat.SEGMENTED:
+                # Segments are read whole, so there is no need for separate cache pages
+                offset, length = self._event_log.append(event.id, event_json)
+            else:
+                self.file_store.write(filename, event_json)
+
+                # Store the cache page last - if it is not present during reads then it will simply be bypassed.
+                self._store_cache_page(current_write_page)
+
+            if repair_index_before is not None and not self._event_index.buffered:
+                self._repair_index(repair_index_before)
+
+            # Index the event after it is stored, so the index never refers to missing events
+            self._index_event(EventIndexEntry.from_dict(data, offset, length))
+        if self._dispatcher is not None:
+            self._dispatcher.dispatch(
+                [
+                    subscription
+                    for key in sorted(self._subscriptions.keys())
+                    for subscription in list(self._subscriptions[key].values())
+                ],
+                event,
+                self.get_event,
+            )
+        else:
+            self._queue.put(event)
 
-            # Store the cache page last - if it is not present during reads then it will simply be bypassed.
-            self._store_cache_page(current_write_page)
-        self._queue.put(event)
+    def _index_event(self, entry: EventIndexEntry) -> None:
+        self._event_index.append(entry)
+        if not self._event_index.buffered or not self._event_index.is_chunk_end(
+            entry.id
+        ):
+            return
+        # The chunk is full, so store it in a single write. Entries are missing
+        # for events added before this stream was created, e.g. before a restart.
+        start = self._event_index.chunk_start(entry.id)
+        self._index_stored_events(self._event_index.missing_ids(start))
+        self._event_index.write_chunk(start)
+
+    def _repair_index(self, next_id: int) -> None:
+        """Index events which were stored but never indexed, e.g. after a crash.
+
+        Conversations created before the index existed are left unindexed - searches
+        fall back to checking those events in full.
+        """
+        chunk_size = self._event_index.chunk_size
+        entries = self._event_index.load(max(0, next_id - chunk_size), next_id)
+        if not entries:
+            return
+        self._index_stored_events(list(range(max(entries) + 1, next_id)))
+
+    def _index_stored_events(self, ids: list[int]) -> None:
+        """Add index entries for stored events, reading them a page at a time."""
+        if not ids:
+            return
+        logger.info(f'Indexing {len(ids)} unindexed events for {self.sid}')
+        wanted = set(ids)
+        for data in self.search_event_dicts(min(ids), max(ids)):
+            if data['id'] not in wanted:
+                continue
+            location = None
+            if self.log_format == EventLogFormat.SEGMENTED:
+                location = self._event_log.locate(data['id'])
+            offset, length = location if location is not None else (None, None)
+            self._event_index.append(EventIndexEntry.from_dict(data, offset, length))
 
     def _store_cache_page(self, current_write_page: list[dict]):
         """Store a page in the cache. Reading individual events is slow when there are a lot of them, so we use pages."""
@@ -214,34 +344,37 @@ class EventStream(EventStore):
 
     def set_secrets(self, secrets: dict[str, str]) -> None:
         self.secrets = secrets.copy()
+        self._secret_masker = SecretMasker(self.secrets.values())
 
     def update_secrets(self, secrets: dict[str, str]) -> None:
         self.secrets.update(secrets)
+        self._secret_masker = SecretMasker(self.secrets.values())
 
     def _replace_secrets(
         self, data: dict[str, Any], is_top_level: bool = True
     ) -> dict[str, Any]:
-        # Fields that should not have secrets replaced (only at top level - system metadata)
-        TOP_LEVEL_PROTECTED_FIELDS = {
-            'timestamp',
-            'id',
-            'source',
-            'cause',
-            'action',
-            'observation',
-            'message',
-        }
-
-        for key in data:
+        self._mask_secrets(data, is_top_level)
+        return data
+
+    def _mask_secrets(self, data: dict[str, Any], is_top_level: bool = True) -> bool:
+        """Mask secrets in a serialized event in place.
+
+        Returns:
+            Whether any secret was found.
+        """
+        masker = self._secret_masker
+        if not masker:
+            return False
+        found = False
+        for key, value in data.items():
             if is_top_level and key in TOP_LEVEL_PROTECTED_FIELDS:
                 # Skip secret replacement for protected system fields at top level only
                 continue
-            elif isinstance(data[key], dict):
-                data[key] = self._replace_secrets(data[key], is_top_level=False)
-            elif isinstance(data[key], str):
-                for secret in self.secrets.values():
-                    data[key] = data[key].replace(secret, '<secret_hidden>')
-        return data
+            masked, value_found = masker.mask(value)
+            if value_found:
+                data[key] = masked
+                found = True
+        return found
 
     def _run_queue_loop(self) -> None:
         self._queue_loop = asyncio.new_event_loop()
@@ -269,11 +402,26 @@ class EventStream(EventStore):
                     if callback_id in callbacks:
                         callback = callbacks[callback_id]
                         pool = self._thread_pools[key][callback_id]
+                        if asyncio.iscoroutinefunction(callback):
+                            callback = partial(
+                                self._run_coroutine_callback, key, callback_id, callback
+                            )
                         future = pool.submit(callback, event)
                         future.add_done_callback(
                             self._make_error_handler(callback_id, key)
                         )
 
+    def _run_coroutine_callback(
+        self,
+        subscriber_id: str,
+        callback_id: str,
+        callback: Callable[[Event], Any],
+        event: Event,
+    ) -> None:
+        # Runs on the callback's pool thread, on the loop created for it
+        loop = self._thread_loops[subscriber_id][callback_id]
+        loop.run_until_complete(callback(event))
+
     def _make_error_handler(
         self, callback_id: str, subscriber_id: str
     ) -> Callable[[Any], None]:
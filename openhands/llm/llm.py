@@ -7,9 +7,12 @@
 # Tag: Legacy-V0
 # V1 replacement for this module lives in the Software Agent SDK.
 import copy
+import hashlib
+import json
 import os
 import time
 import warnings
+from collections import OrderedDict
 from functools import partial
 from typing import Any, Callable, cast
 
@@ -60,6 +63,9 @@ LLM_RETRY_EXCEPTIONS: tuple[type[Exception], ...] = (
     LLMNoResponseError,
 )
 
+# the number of per-message token counts kept by each LLM
+TOKEN_COUNT_CACHE_SIZE = 10_000
+
 
 class LLM(RetryMixin, DebugMixin):
     """The LLM class represents a Language Model instance.
@@ -118,6 +124,12 @@ class LLM(RetryMixin, DebugMixin):
             self.tokenizer = create_pretrained_tokenizer(self.config.custom_tokenizer)
         else:
             self.tokenizer = None
+        # token counts of single messages, keyed by model, tokenizer and message hash
+        self._token_counts: OrderedDict[tuple[str, str | None, str], int] = (
+            OrderedDict()
+        )
+        # tokens counted once per request, i.e. the token count of no messages
+        self._token_count_overhead: int | None = None
 
         # set up the completion function
         kwargs: dict[str, Any] = {
@@ -278,7 +290,8 @@ class LLM(RetryMixin, DebugMixin):
             kwargs['messages'] = messages
 
             # handle conversion of to non-function calling messages if needed
-            original_fncall_messages = copy.deepcopy(messages)
+            # the conversion works on a copy, so the original messages can be logged as is
+            original_fncall_messages = messages
             mock_fncall_tools = None
             # if the agent or caller has defined tools, and we mock via prompting, convert the messages
             if mock_function_calling and 'tools' in kwargs:
@@ -354,7 +367,7 @@ class LLM(RetryMixin, DebugMixin):
             response_id = resp.get('id', 'unknown')
             self.metrics.add_response_latency(latency, response_id)
 
-            non_fncall_response = copy.deepcopy(resp)
+            non_fncall_response = resp
 
             # if we mocked function calling, and we have tools, convert the response back to function calling format
             if mock_function_calling and mock_fncall_tools is not None:
@@ -364,6 +377,10 @@ class LLM(RetryMixin, DebugMixin):
                         + str(resp)
                     )
 
+                # the response is converted in place, keep the original only if it will be logged
+                if self.config.log_completions:
+                    non_fncall_response = copy.deepcopy(resp)
+
                 non_fncall_response_message = resp.choices[0].message
                 # messages is already a list with proper typing from line 223
                 fn_call_messages_with_response = (
@@ -694,12 +711,46 @@ class LLM(RetryMixin, DebugMixin):
     def get_token_count(self, messages: list[dict] | list[Message]) -> int:
         """Get the number of tokens in a list of messages. Use dicts for better token counting.
 
+        Messages are counted one at a time and the counts are cached, so counting a
+        growing history only tokenizes the messages which are new or changed.
+
         Args:
             messages (list): A list of messages, either as a list of dicts or as a list of Message objects.
 
         Returns:
             int: The number of tokens.
         """
+        try:
+            counts = self._count_message_tokens(self._messages_to_dicts(messages))
+            if len(counts) == 1:
+                return counts[0]
+            # each single message count includes the tokens counted once per request
+            return sum(counts) - (len(counts) - 1) * self._get_token_count_overhead()
+        except Exception as e:
+            self._log_token_count_error(e)
+            return 0
+
+    def get_token_counts(self, messages: list[dict] | list[Message]) -> list[int]:
+        """Get the number of tokens in each of a list of messages.
+
+        The counts exclude the few tokens counted once per request, so they add up
+        to slightly less than `get_token_count` for the same messages.
+
+        Args:
+            messages (list): A list of messages, either as a list of dicts or as a list of Message objects.
+
+        Returns:
+            list[int]: The number of tokens in each message.
+        """
+        try:
+            counts = self._count_message_tokens(self._messages_to_dicts(messages))
+            overhead = self._get_token_count_overhead()
+            return [count - overhead for count in counts]
+        except Exception as e:
+            self._log_token_count_error(e)
+            return [0] * len(messages)
+
+    def _messages_to_dicts(self, messages: list[dict] | list[Message]) -> list[dict]:
         # attempt to convert Message objects to dicts, litellm expects dicts
         if (
             isinstance(messages, list)
@@ -717,29 +768,57 @@ class LLM(RetryMixin, DebugMixin):
             # We've already asserted that messages is a list of Message objects
             # Use explicit typing to satisfy mypy
             messages_typed: list[Message] = messages  # type: ignore
-            messages = self.format_messages_for_llm(messages_typed)
+            return self.format_messages_for_llm(messages_typed)
+        return cast(list[dict], messages)
 
-        # try to get the token count with the default litellm tokenizers
-        # or the custom tokenizer if set for this LLM configuration
-        try:
-            return int(
+    def _count_message_tokens(self, messages: list[dict]) -> list[int]:
+        """Count the tokens of each message on its own, using cached counts where possible."""
+        counts = []
+        for message in messages:
+            digest = hashlib.sha256(
+                json.dumps(message, sort_keys=True, default=str).encode()
+            ).hexdigest()
+            key = (self.config.model, self.config.custom_tokenizer, digest)
+            count = self._token_counts.get(key)
+            if count is None:
+                # use the default litellm tokenizers
+                # or the custom tokenizer if set for this LLM configuration
+                count = int(
+                    litellm.token_counter(
+                        model=self.config.model,
+                        messages=[message],
+                        custom_tokenizer=self.tokenizer,
+                    )
+                )
+                self._token_counts[key] = count
+                if len(self._token_counts) > TOKEN_COUNT_CACHE_SIZE:
+                    self._token_counts.popitem(last=False)
+            else:
+                self._token_counts.move_to_end(key)
+            counts.append(count)
+        return counts
+
+    def _get_token_count_overhead(self) -> int:
+        if self._token_count_overhead is None:
+            self._token_count_overhead = int(
                 litellm.token_counter(
                     model=self.config.model,
-                    messages=messages,
+                    messages=[],
                     custom_tokenizer=self.tokenizer,
                 )
             )
-        except Exception as e:
-            # limit logspam in case token count is not supported
-            logger.error(
-                f'Error getting token count for\n model {self.config.model}\n{e}'
-                + (
-                    f'\ncustom_tokenizer: {self.config.custom_tokenizer}'
-                    if self.config.custom_tokenizer is not None
-                    else ''
-                )
+        return self._token_count_overhead
+
+    def _log_token_count_error(self, e: Exception) -> None:
+        # limit logspam in case token count is not supported
+        logger.error(
+            f'Error getting token count for\n model {self.config.model}\n{e}'
+            + (
+                f'\ncustom_tokenizer: {self.config.custom_tokenizer}'
+                if self.config.custom_tokenizer is not None
+                else ''
             )
-            return 0
+        )
 
     def _is_local(self) -> bool:
         """Determines if the system is using a locally running LLM.
@@ -1,3 +1,5 @@
+import operator
+from dataclasses import dataclass
 from typing import Generator
 
 from litellm import ModelResponse
@@ -54,12 +56,32 @@ from openhands.utils.prompt import (
 )
 
 
+@dataclass
+class _MessageCache:
+    """The state of `process_events` after converting a list of events.
+
+    Attributes:
+        events: The events converted, after any system / initial user message was inserted.
+        options: The conversion options the events were converted with.
+        messages: The messages produced, before filtering and formatting.
+        pending_tool_call_action_messages: Tool call messages still waiting for their results.
+        tool_call_id_to_message: Tool results still waiting for their tool call message.
+    """
+
+    events: list[Event]
+    options: tuple
+    messages: list[Message]
+    pending_tool_call_action_messages: dict[str, Message]
+    tool_call_id_to_message: dict[str, Message]
+
+
 class ConversationMemory:
     """Processes event history into a coherent conversation for the agent."""
 
     def __init__(self, config: AgentConfig, prompt_manager: PromptManager):
         self.agent_config = config
         self.prompt_manager = prompt_manager
+        self._message_cache: _MessageCache | None = None
 
     @staticmethod
     def _is_valid_image_url(url: str | None) -> bool:
@@ -108,14 +130,35 @@ class ConversationMemory:
         # log visual browsing status
         logger.debug(f'Visual browsing: {self.agent_config.enable_som_visual_browsing}')
 
-        # Initialize empty messages list
-        messages = []
-
-        # Process regular events
-        pending_tool_call_action_messages: dict[str, Message] = {}
-        tool_call_id_to_message: dict[str, Message] = {}
+        # Each step usually appends a few events to the events of the previous step,
+        # so resume from the messages already converted for that prefix if possible.
+        # Converting an event only depends on the events before it.
+        options = (
+            max_message_chars,
+            vision_is_active,
+            self.agent_config.enable_som_visual_browsing,
+        )
+        cache = self._message_cache
+        if (
+            cache is not None
+            and cache.options == options
+            and len(cache.events) <= len(events)
+            and all(map(operator.is_, cache.events, events))
+        ):
+            start_index = len(cache.events)
+            messages = list(cache.messages)
+            pending_tool_call_action_messages = dict(
+                cache.pending_tool_call_action_messages
+            )
+            tool_call_id_to_message = dict(cache.tool_call_id_to_message)
+        else:
+            start_index = 0
+            messages = []
+            pending_tool_call_action_messages = {}
+            tool_call_id_to_message = {}
 
-        for i, event in enumerate(events):
+        for i in range(start_index, len(events)):
+            event = events[i]
             # create a regular message from an event
             if isinstance(event, Action):
                 messages_to_add = self._process_action(
@@ -164,6 +207,14 @@ class ConversationMemory:
 
             messages += messages_to_add
 
+        self._message_cache = _MessageCache(
+            events=list(events),
+            options=options,
+            messages=list(messages),
+            pending_tool_call_action_messages=dict(pending_tool_call_action_messages),
+            tool_call_id_to_message=dict(tool_call_id_to_message),
+        )
+
         # Apply final filtering so that the messages in context don't have unmatched tool calls
         # and tool responses, for example
         messages = list(ConversationMemory._filter_unmatched_tool_calls(messages))
@@ -174,12 +225,17 @@ class ConversationMemory:
         return messages
 
     def _apply_user_message_formatting(self, messages: list[Message]) -> list[Message]:
-        """Applies formatting rules, such as adding newlines between consecutive user messages."""
+        """Applies formatting rules, such as adding newlines between consecutive user messages.
+
+        Messages are cached across calls to `process_events`, so those which need
+        formatting are copied rather than modified.
+        """
         formatted_messages = []
         prev_role = None
         for msg in messages:
             # Add double newline between consecutive user messages
             if msg.role == 'user' and prev_role == 'user' and len(msg.content) > 0:
+                msg = msg.model_copy(deep=True)
                 # Find the first TextContent in the message to add newlines
                 for content_item in msg.content:
                     if isinstance(content_item, TextContent):
@@ -699,15 +755,27 @@ class ConversationMemory:
         For new Anthropic API, we only need to mark the last user or tool message as cacheable.
         """
         if len(messages) > 0 and messages[0].role == 'system':
-            messages[0].content[-1].cache_prompt = True
+            messages[0] = self._with_cache_prompt(messages[0])
         # NOTE: this is only needed for anthropic
-        for message in reversed(messages):
-            if message.role in ('user', 'tool'):
-                message.content[
-                    -1
-                ].cache_prompt = True  # Last item inside the message content
+        for i in range(len(messages) - 1, -1, -1):
+            if messages[i].role in ('user', 'tool'):
+                # Last item inside the message content
+                messages[i] = self._with_cache_prompt(messages[i])
                 break
 
+    @staticmethod
+    def _with_cache_prompt(message: Message) -> Message:
+        """Copy a message, marking its last content item as cacheable.
+
+        Messages are cached across calls to `process_events`, so the breakpoint must
+        not be set on the cached message itself.
+        """
+        if not message.content:
+            return message
+        content = list(message.content)
+        content[-1] = content[-1].model_copy(update={'cache_prompt': True})
+        return message.model_copy(update={'content': content})
+
     def _filter_agents_in_microagent_obs(
         self, obs: RecallObservation, current_index: int, events: list[Event]
     ) -> list[MicroagentKnowledge]:
@@ -94,3 +94,93 @@ class View(BaseModel):
             unhandled_condensation_request=unhandled_condensation_request,
             forgotten_event_ids=forgotten_event_ids,
         )
+
+
+class IncrementalView:
+    """Maintains the view of a history which only grows by appending events.
+
+    `View.from_events` rescans the whole history each time it is called. This instead
+    applies the events appended since the last update, so the cost of each update is
+    proportional to the number of new events (plus copying the kept event list). If
+    the history was replaced or truncated rather than appended to, the view is
+    rebuilt from scratch.
+
+    The events in the resulting views are the same objects across updates,
+    including the summary observation, so consumers can cache work done on a
+    prefix of the view.
+    """
+
+    def __init__(self) -> None:
+        self._reset()
+
+    def _reset(self) -> None:
+        self._num_events = 0
+        self._first_event: Event | None = None
+        self._last_event: Event | None = None
+        self._kept_events: list[Event] = []
+        self._forgotten_event_ids: set[int] = set()
+        self._summary_event: AgentCondensationObservation | None = None
+        self._summary_offset: int | None = None
+        self._unhandled_condensation_request = False
+        self._view: View | None = None
+
+    def update(self, history: list[Event]) -> View:
+        """Get the view of the given history, applying any newly appended events."""
+        if (
+            len(history) < self._num_events
+            or (self._num_events and history[0] is not self._first_event)
+            or (
+                self._num_events
+                and history[self._num_events - 1] is not self._last_event
+            )
+        ):
+            self._reset()
+
+        if self._view is not None and len(history) == self._num_events:
+            return self._view
+
+        forgotten_changed = False
+        for event in history[self._num_events :]:
+            if isinstance(event, CondensationAction):
+                newly_forgotten = set(event.forgotten)
+                # Make sure we also forget the condensation action itself
+                newly_forgotten.add(event.id)
+                self._forgotten_event_ids.update(newly_forgotten)
+                forgotten_changed = True
+                self._kept_events = [
+                    kept for kept in self._kept_events if kept.id not in newly_forgotten
+                ]
+                if event.summary is not None and event.summary_offset is not None:
+                    logger.info(f'Inserting summary at offset {event.summary_offset}')
+                    self._summary_event = AgentCondensationObservation(
+                        content=event.summary
+                    )
+                    self._summary_offset = event.summary_offset
+                self._unhandled_condensation_request = False
+            elif isinstance(event, CondensationRequestAction):
+                self._forgotten_event_ids.add(event.id)
+                forgotten_changed = True
+                self._unhandled_condensation_request = True
+            elif event.id not in self._forgotten_event_ids:
+                self._kept_events.append(event)
+
+        if history:
+            self._first_event = history[0]
+            self._last_event = history[-1]
+        self._num_events = len(history)
+
+        events = list(self._kept_events)
+        if self._summary_event is not None and self._summary_offset is not None:
+            events.insert(self._summary_offset, self._summary_event)
+
+        # The events are already known to be valid, so skip re-validating every one
+        self._view = View.model_construct(
+            events=events,
+            unhandled_condensation_request=self._unhandled_condensation_request,
+            forgotten_event_ids=(
+                set(self._forgotten_event_ids)
+                if forgotten_changed or self._view is None
+                else self._view.forgotten_event_ids
+            ),
+        )
+        return self._view
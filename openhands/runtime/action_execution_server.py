@@ -12,24 +12,31 @@ import mimetypes
 import os
 import shutil
 import sys
-import tempfile
 import time
 from contextlib import asynccontextmanager
 from pathlib import Path
-from zipfile import ZipFile
+from typing import Any, AsyncIterator, Callable, Iterator
 
 import puremagic
 from binaryornot.check import is_binary
-from fastapi import Depends, FastAPI, HTTPException, Request, UploadFile
+from fastapi import (
+    Depends,
+    FastAPI,
+    HTTPException,
+    Request,
+    UploadFile,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.security import APIKeyHeader
 from openhands_aci.editor.editor import OHEditor
 from openhands_aci.editor.exceptions import ToolError
 from openhands_aci.editor.results import ToolResult
 from openhands_aci.utils.diff import get_diff
 from pydantic import BaseModel
-from starlette.background import BackgroundTask
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from uvicorn import run
 
@@ -67,8 +74,18 @@ from openhands.runtime.file_viewer_server import start_file_viewer_server
 from openhands.runtime.mcp.proxy import MCPProxyManager
 from openhands.runtime.plugins import ALL_PLUGINS, JupyterPlugin, Plugin, VSCodePlugin
 from openhands.runtime.utils import find_available_tcp_port
+from openhands.runtime.utils.archive import (
+    Manifest,
+    TarStream,
+    build_manifest,
+    extract_tar_stream,
+    get_available_compressions,
+    iter_zip,
+)
 from openhands.runtime.utils.bash import BashSession
 from openhands.runtime.utils.files import insert_lines, read_lines
+from openhands.runtime.utils.git_changes_cache import GitChangesCache
+from openhands.runtime.utils.latency_histogram import LatencyHistograms
 from openhands.runtime.utils.memory_monitor import MemoryMonitor
 from openhands.runtime.utils.runtime_init import init_user_and_working_directory
 from openhands.runtime.utils.system_stats import (
@@ -85,18 +102,52 @@ class ActionRequest(BaseModel):
     action: dict
 
 
+class ArchiveManifestRequest(BaseModel):
+    path: str
+    include: list[str] | None = None
+    exclude: list[str] | None = None
+    with_hashes: bool = False
+
+
+class ArchiveDownloadRequest(BaseModel):
+    path: str
+    include: list[str] | None = None
+    exclude: list[str] | None = None
+    manifest: Manifest | None = None
+    compression: str | None = None
+
+
 ROOT_GID = 0
 
 SESSION_API_KEY = os.environ.get('SESSION_API_KEY')
 api_key_header = APIKeyHeader(name='X-Session-API-Key', auto_error=False)
 
 
+# Per action type latency of running actions, whether over HTTP or the action channel
+action_latency = LatencyHistograms()
+
+
 def verify_api_key(api_key: str = Depends(api_key_header)):
     if SESSION_API_KEY and api_key != SESSION_API_KEY:
         raise HTTPException(status_code=403, detail='Invalid API Key')
     return api_key
 
 
+def _iter_from_async(
+    chunks: AsyncIterator[bytes], loop: asyncio.AbstractEventLoop
+) -> Iterator[bytes]:
+    """Iterate an async iterator running on loop from another thread."""
+
+    async def next_chunk() -> bytes:
+        return await chunks.__anext__()
+
+    while True:
+        try:
+            yield asyncio.run_coroutine_threadsafe(next_chunk(), loop).result()
+        except StopAsyncIteration:
+            return
+
+
 def _execute_file_editor(
     editor: OHEditor,
     command: str,
@@ -186,6 +237,12 @@ class ActionExecutor:
         )
         if _updated_user_id is not None:
             self.user_id = _updated_user_id
+        # Run git as the sandbox user, who owns the workspace, when running as root
+        self.git_changes_cache = GitChangesCache(
+            user=self.user_id
+            if sys.platform != 'win32' and os.geteuid() == 0 and self.user_id != 0
+            else None
+        )
 
         self.bash_session: BashSession | 'WindowsPowershellSession' | None = None  # type: ignore[name-defined]
         self.lock = asyncio.Lock()
@@ -284,6 +341,8 @@ class ActionExecutor:
                     os.environ.get('NO_CHANGE_TIMEOUT_SECONDS', 10)
                 ),
                 max_memory_mb=self.max_memory_gb * 1024 if self.max_memory_gb else None,
+                use_output_log=os.environ.get('BASH_USE_OUTPUT_LOG', 'False').lower()
+                in ['true', '1', 'yes'],
             )
             bash_session.initialize()
             return bash_session
@@ -376,20 +435,37 @@ class ActionExecutor:
             assert obs.exit_code == 0
         logger.debug('Bash init commands completed')
 
-    async def run_action(self, action) -> Observation:
+    async def run_action(
+        self, action, output_callback: Callable[[str], None] | None = None
+    ) -> Observation:
+        """Run an action, one at a time.
+
+        Args:
+            action: The action to run.
+            output_callback: Called from a worker thread with partial output of a
+                CmdRunAction while it runs.
+        """
         async with self.lock:
             action_type = action.action
+            if output_callback and isinstance(action, CmdRunAction):
+                return await self.run(action, output_callback)
             observation = await getattr(self, action_type)(action)
             return observation
 
     async def run(
-        self, action: CmdRunAction
+        self,
+        action: CmdRunAction,
+        output_callback: Callable[[str], None] | None = None,
     ) -> CmdOutputObservation | ErrorObservation:
         try:
             bash_session = self.bash_session
             if action.is_static:
                 bash_session = self._create_bash_session(action.cwd)
             assert bash_session is not None
+            if output_callback and isinstance(bash_session, BashSession):
+                return await call_sync_from_async(
+                    bash_session.execute, action, output_callback
+                )
             obs = await call_sync_from_async(bash_session.execute, action)
             return obs
         except Exception as e:
@@ -811,16 +887,26 @@ if __name__ == '__main__':
         logger.info('Server info endpoint response: %s', response)
         return response
 
+    async def _execute_action(
+        action_dict: dict, output_callback: Callable[[str], None] | None = None
+    ) -> dict:
+        assert client is not None
+        action = event_from_dict(action_dict)
+        if not isinstance(action, Action):
+            raise HTTPException(status_code=400, detail='Invalid action type')
+        client.last_execution_time = time.time()
+        start_time = time.monotonic()
+        try:
+            observation = await client.run_action(action, output_callback)
+        finally:
+            action_latency.record(action.action, time.monotonic() - start_time)
+            client.git_changes_cache.invalidate()
+        return event_to_dict(observation)
+
     @app.post('/execute_action')
     async def execute_action(action_request: ActionRequest):
-        assert client is not None
         try:
-            action = event_from_dict(action_request.action)
-            if not isinstance(action, Action):
-                raise HTTPException(status_code=400, detail='Invalid action type')
-            client.last_execution_time = time.time()
-            observation = await client.run_action(action)
-            return event_to_dict(observation)
+            return await _execute_action(action_request.action)
         except Exception as e:
             logger.exception(f'Error while running /execute_action: {str(e)}')
             raise HTTPException(
@@ -830,6 +916,83 @@ if __name__ == '__main__':
         finally:
             update_last_execution_time()
 
+    @app.websocket('/action_channel')
+    async def action_channel(websocket: WebSocket):
+        """Run actions sent over a persistent WebSocket.
+
+        Each message is `{'id': ..., 'action': ..., 'stream_output': ...}` and is
+        answered with `{'id': ..., 'observation': ...}` or `{'id': ..., 'error': ...}`.
+        Requests may be pipelined, though actions still run one at a time. With
+        stream_output set, partial command output is sent as
+        `{'id': ..., 'output': ...}` messages while the command runs.
+        """
+        # The HTTP middleware does not apply to WebSockets, so authenticate here
+        if (
+            SESSION_API_KEY
+            and websocket.headers.get('X-Session-API-Key') != SESSION_API_KEY
+        ):
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+        await websocket.accept()
+        loop = asyncio.get_running_loop()
+        send_lock = asyncio.Lock()
+        tasks: set[asyncio.Task] = set()
+
+        async def send(message: dict[str, Any]) -> None:
+            try:
+                async with send_lock:
+                    await websocket.send_text(json.dumps(message))
+            except Exception as e:
+                logger.debug(f'Failed to send on action channel: {e}')
+
+        async def handle(request: dict[str, Any]) -> None:
+            request_id = request.get('id')
+            output_callback = None
+            if request.get('stream_output'):
+
+                def output_callback(output: str) -> None:
+                    asyncio.run_coroutine_threadsafe(
+                        send({'id': request_id, 'output': output}), loop
+                    )
+
+            try:
+                observation = await _execute_action(request['action'], output_callback)
+                await send({'id': request_id, 'observation': observation})
+            except Exception as e:
+                logger.exception(f'Error while running action from channel: {e}')
+                await send({'id': request_id, 'error': str(e)})
+            finally:
+                update_last_execution_time()
+
+        try:
+            while True:
+                request = await websocket.receive_json()
+                # Running actions are not cancelled on disconnect, as that would
+                # release the action lock while their command is still running
+                task = asyncio.create_task(handle(request))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except WebSocketDisconnect:
+            logger.debug('Action channel disconnected')
+
+    @app.get('/action_latency')
+    async def get_action_latency():
+        return action_latency.to_dict()
+
+    @app.get('/git_changes')
+    async def git_changes(cwd: str):
+        """Get the git changes in the workspace at cwd, see `GitChangesCache`."""
+        assert client is not None
+        if not os.path.isabs(cwd):
+            raise HTTPException(status_code=400, detail='cwd must be an absolute path')
+        try:
+            return await call_sync_from_async(
+                client.git_changes_cache.get_git_changes, cwd
+            )
+        except Exception as e:
+            logger.exception(f'Error getting git changes in {cwd}')
+            raise HTTPException(status_code=500, detail=str(e))
+
     @app.post('/update_mcp_server')
     async def update_mcp_server(request: Request):
         # Check if we're on Windows
@@ -926,6 +1089,7 @@ if __name__ == '__main__':
                 with open(file_path, 'wb') as buffer:
                     shutil.copyfileobj(file.file, buffer)
                 logger.debug(f'Uploaded file {file.filename} to {destination}')
+            client.git_changes_cache.invalidate()
 
             return JSONResponse(
                 content={
@@ -951,23 +1115,87 @@ if __name__ == '__main__':
             if not os.path.exists(path):
                 raise HTTPException(status_code=404, detail='File not found')
 
-            with tempfile.NamedTemporaryFile(suffix='.zip', delete=False) as temp_zip:
-                with ZipFile(temp_zip, 'w') as zipf:
-                    for root, _, files in os.walk(path):
-                        for file in files:
-                            file_path = os.path.join(root, file)
-                            zipf.write(
-                                file_path, arcname=os.path.relpath(file_path, path)
-                            )
-                return FileResponse(
-                    path=temp_zip.name,
-                    media_type='application/zip',
-                    filename=f'{os.path.basename(path)}.zip',
-                    background=BackgroundTask(lambda: os.unlink(temp_zip.name)),
-                )
+            return StreamingResponse(
+                iter_zip(path),
+                media_type='application/zip',
+                headers={
+                    'Content-Disposition': f'attachment; filename="{os.path.basename(path)}.zip"'
+                },
+            )
+
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
+    # ================================
+    # Streaming archives (see openhands.runtime.utils.archive)
+    # ================================
+
+    @app.get('/archive_info')
+    async def archive_info():
+        return {'compressions': get_available_compressions()}
+
+    @app.post('/archive_manifest')
+    async def archive_manifest(request: ArchiveManifestRequest):
+        if not os.path.isabs(request.path):
+            raise HTTPException(status_code=400, detail='Path must be an absolute path')
+        return await call_sync_from_async(
+            build_manifest,
+            request.path,
+            request.include,
+            request.exclude,
+            request.with_hashes,
+        )
+
+    @app.post('/upload_archive')
+    async def upload_archive(
+        request: Request, destination: str, compression: str | None = None
+    ):
+        """Extract a tar stream into destination as it is received."""
+        assert client is not None
+        if not os.path.isabs(destination):
+            raise HTTPException(
+                status_code=400, detail='Destination must be an absolute path'
+            )
+        if compression and compression not in get_available_compressions():
+            raise HTTPException(
+                status_code=415, detail=f'Unsupported compression: {compression}'
+            )
+        chunks = _iter_from_async(request.stream(), asyncio.get_running_loop())
+        try:
+            files = await call_sync_from_async(
+                extract_tar_stream, chunks, destination, compression
+            )
         except Exception as e:
+            logger.exception(f'Error extracting archive into {destination}')
             raise HTTPException(status_code=500, detail=str(e))
+        finally:
+            client.git_changes_cache.invalidate()
+        logger.debug(f'Extracted {files} files into {destination}')
+        return {'destination': destination, 'files': files}
+
+    @app.post('/download_archive')
+    def download_archive(request: ArchiveDownloadRequest):
+        """Stream the files under path as a tar archive, skipping any in the manifest."""
+        if not os.path.isabs(request.path):
+            raise HTTPException(status_code=400, detail='Path must be an absolute path')
+        if not os.path.exists(request.path):
+            raise HTTPException(status_code=404, detail='File not found')
+        if (
+            request.compression
+            and request.compression not in get_available_compressions()
+        ):
+            raise HTTPException(
+                status_code=415,
+                detail=f'Unsupported compression: {request.compression}',
+            )
+        stream = TarStream(
+            request.path,
+            include=request.include,
+            exclude=request.exclude,
+            manifest=request.manifest,
+            compression=request.compression,
+        )
+        return StreamingResponse(stream, media_type='application/x-tar')
 
     @app.get('/alive')
     async def alive():
@@ -0,0 +1,149 @@
+import json
+import threading
+from typing import Any, Callable, Mapping
+
+from openhands.core.exceptions import (
+    AgentRuntimeDisconnectedError,
+    AgentRuntimeError,
+    AgentRuntimeTimeoutError,
+)
+from openhands.core.logger import openhands_logger as logger
+
+
+class _PendingRequest:
+    def __init__(self, output_callback: Callable[[str], None] | None):
+        self.output_callback = output_callback
+        self.done = threading.Event()
+        self.response: dict[str, Any] | None = None
+
+
+class ActionChannel:
+    """A long lived WebSocket connection to the action execution server.
+
+    Actions are sent as `{'id': ..., 'action': ..., 'stream_output': ...}`
+    messages and may be pipelined: each request has its own id, and responses are
+    matched back to requests by id, so several threads can wait on the channel at
+    once. While a command runs the server may send `{'id': ..., 'output': ...}`
+    messages with the output produced so far, followed by a single
+    `{'id': ..., 'observation': ...}` or `{'id': ..., 'error': ...}` message.
+
+    Requires the optional `websockets` package.
+    """
+
+    def __init__(
+        self, url: str, headers: Mapping[str, str], open_timeout: float = 10
+    ) -> None:
+        from websockets.sync.client import connect
+
+        self.url = url
+        self._connection = connect(
+            url,
+            additional_headers=dict(headers),
+            open_timeout=open_timeout,
+            max_size=None,
+        )
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._next_id = 0
+        self._pending: dict[int, _PendingRequest] = {}
+        self._closed = False
+        self._reader = threading.Thread(
+            target=self._read, name='action-channel', daemon=True
+        )
+        self._reader.start()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def execute(
+        self,
+        action: dict[str, Any],
+        timeout: float,
+        output_callback: Callable[[str], None] | None = None,
+    ) -> dict[str, Any]:
+        """Run a serialized action on the server and return the serialized observation.
+
+        Args:
+            action: The action, as serialized by `event_to_dict`.
+            timeout: Seconds to wait for the observation.
+            output_callback: Called with partial command output as it is produced.
+
+        Raises:
+            AgentRuntimeTimeoutError: If no observation arrived within the timeout.
+            AgentRuntimeDisconnectedError: If the connection was lost.
+            AgentRuntimeError: If the server failed to run the action.
+        """
+        pending = _PendingRequest(output_callback)
+        with self._lock:
+            if self._closed:
+                raise AgentRuntimeDisconnectedError('Action channel is closed')
+            request_id = self._next_id
+            self._next_id += 1
+            self._pending[request_id] = pending
+        try:
+            message = {
+                'id': request_id,
+                'action': action,
+                'stream_output': output_callback is not None,
+            }
+            try:
+                with self._send_lock:
+                    self._connection.send(json.dumps(message))
+            except Exception as e:
+                self.close()
+                raise AgentRuntimeDisconnectedError(
+                    f'Failed to send action over channel: {e}'
+                ) from e
+            if not pending.done.wait(timeout):
+                raise AgentRuntimeTimeoutError(
+                    f'Runtime failed to return execute_action before the requested timeout of {timeout}s'
+                )
+        finally:
+            with self._lock:
+                self._pending.pop(request_id, None)
+
+        response = pending.response
+        if response is None:
+            raise AgentRuntimeDisconnectedError(
+                'Action channel closed before the action completed'
+            )
+        if 'error' in response:
+            raise AgentRuntimeError(
+                f'Error while running action over channel: {response["error"]}'
+            )
+        return response['observation']
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            pending = list(self._pending.values())
+        self._connection.close()
+        # Wake any threads still waiting, they will find no response
+        for request in pending:
+            request.done.set()
+
+    def _read(self) -> None:
+        try:
+            for raw in self._connection:
+                message = json.loads(raw)
+                with self._lock:
+                    pending = self._pending.get(message.get('id'))
+                if pending is None:
+                    continue
+                if 'output' in message:
+                    if pending.output_callback:
+                        try:
+                            pending.output_callback(message['output'])
+                        except Exception:
+                            logger.exception('Error in action output callback')
+                    continue
+                pending.response = message
+                pending.done.set()
+        except Exception as e:
+            if not self._closed:
+                logger.warning(f'Action channel to {self.url} lost: {e}')
+        finally:
+            self.close()
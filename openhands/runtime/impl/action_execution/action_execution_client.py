@@ -1,6 +1,8 @@
 import os
 import tempfile
 import threading
+import time
+from functools import partial
 from pathlib import Path
 from typing import Any
 from zipfile import ZipFile
@@ -45,7 +47,15 @@ from openhands.events.serialization.action import ACTION_TYPE_TO_CLASS
 from openhands.integrations.provider import PROVIDER_TOKEN_TYPE
 from openhands.llm.llm_registry import LLMRegistry
 from openhands.runtime.base import Runtime
+from openhands.runtime.impl.action_execution.action_channel import ActionChannel
 from openhands.runtime.plugins import PluginRequirement
+from openhands.runtime.utils.archive import (
+    TarStream,
+    build_manifest,
+    extract_tar_stream,
+    get_available_compressions,
+)
+from openhands.runtime.utils.latency_histogram import LatencyHistograms
 from openhands.runtime.utils.request import send_request
 from openhands.runtime.utils.system_stats import update_last_execution_time
 from openhands.utils.http_session import HttpSession
@@ -63,6 +73,10 @@ class ActionExecutionClient(Runtime):
 
     This class contains shared logic between DockerRuntime and RemoteRuntime
     for interacting with the HTTP server defined in action_execution_server.py.
+
+    With `sandbox.use_action_channel` enabled, actions are sent over a persistent
+    WebSocket (see ActionChannel) instead of one HTTP request each, falling back to
+    HTTP if the channel cannot be opened.
     """
 
     def __init__(
@@ -84,6 +98,15 @@ class ActionExecutionClient(Runtime):
         self._runtime_closed: bool = False
         self._vscode_token: str | None = None  # initial dummy value
         self._last_updated_mcp_stdio_servers: list[MCPStdioServerConfig] = []
+        self._action_channel: ActionChannel | None = None
+        self._action_channel_unavailable = False
+        # Whether the server supports streaming archives, None until probed
+        self._archive_support: bool | None = None
+        self._archive_compression: str | None = None
+        # Set if the server has no /git_changes endpoint
+        self._git_changes_unavailable = False
+        # Per action type latency of send_action_for_execution
+        self.action_latency = LatencyHistograms()
         super().__init__(
             config,
             event_stream,
@@ -183,12 +206,100 @@ class ActionExecutionClient(Runtime):
         except httpx.TimeoutException:
             raise TimeoutError('Copy operation timed out')
 
+    def copy_tree_from(
+        self,
+        sandbox_src: str,
+        host_dest: str,
+        include: list[str] | None = None,
+        exclude: list[str] | None = None,
+        resume: bool = True,
+    ) -> int:
+        """Copy the files under a sandbox path into a host directory.
+
+        The files are streamed as a tar archive and extracted as they arrive.
+
+        Args:
+            sandbox_src: The file or directory in the sandbox to copy.
+            host_dest: The host directory to copy the files into.
+            include: If set, only copy files matching one of these globs.
+            exclude: Do not copy files or directories matching these globs.
+            resume: Skip files already present in host_dest with the same size
+                and modification time.
+
+        Returns:
+            The number of files copied.
+        """
+        if not self._supports_archives():
+            if include or exclude:
+                self.log(
+                    'warning',
+                    'Runtime does not support streaming archives, copying all files',
+                )
+            zip_path = self.copy_from(sandbox_src)
+            try:
+                with ZipFile(zip_path) as zipf:
+                    zipf.extractall(host_dest)
+                    return sum(1 for info in zipf.infolist() if not info.is_dir())
+            finally:
+                zip_path.unlink()
+
+        manifest = build_manifest(host_dest, include, exclude) if resume else None
+        try:
+            with self.session.stream(
+                'POST',
+                f'{self.action_execution_server_url}/download_archive',
+                json={
+                    'path': sandbox_src,
+                    'include': include,
+                    'exclude': exclude,
+                    'manifest': manifest,
+                    'compression': self._archive_compression,
+                },
+                timeout=300,
+            ) as response:
+                response.raise_for_status()
+                files = extract_tar_stream(
+                    response.iter_bytes(), host_dest, self._archive_compression
+                )
+        except httpx.TimeoutException:
+            raise TimeoutError('Copy operation timed out')
+        self.log(
+            'debug',
+            f'Copied {files} files: runtime:{sandbox_src} -> host:{host_dest}',
+        )
+        return files
+
     def copy_to(
-        self, host_src: str, sandbox_dest: str, recursive: bool = False
+        self,
+        host_src: str,
+        sandbox_dest: str,
+        recursive: bool = False,
+        *,
+        include: list[str] | None = None,
+        exclude: list[str] | None = None,
+        resume: bool = False,
     ) -> None:
+        """Copy a file or directory from the host into a sandbox directory.
+
+        Recursive copies are streamed as a tar archive when the server supports
+        it, otherwise they are uploaded as a zip file.
+
+        Args:
+            host_src: The file or directory on the host to copy.
+            sandbox_dest: The sandbox directory to copy into.
+            recursive: Whether host_src is a directory to copy with its contents.
+            include: If set, only copy files matching one of these globs.
+            exclude: Do not copy files or directories matching these globs.
+            resume: Skip files already present in the sandbox with the same size
+                and modification time.
+        """
         if not os.path.exists(host_src):
             raise FileNotFoundError(f'Source file {host_src} does not exist')
 
+        if recursive and self._supports_archives():
+            self._upload_archive(host_src, sandbox_dest, include, exclude, resume)
+            return
+
         temp_zip_path: str | None = None  # Define temp_zip_path outside the try block
 
         try:
@@ -255,6 +366,104 @@ class ActionExecutionClient(Runtime):
                         f'Failed to delete temporary zip file {temp_zip_path}: {e}',
                     )
 
+    def _supports_archives(self) -> bool:
+        """Whether the server supports streaming archives. Probed on first use."""
+        if self._archive_support is not None:
+            return self._archive_support
+        try:
+            # Not _send_action_server_request: a 404 from an older server is an
+            # answer here, not an error to retry
+            response = self.session.get(
+                f'{self.action_execution_server_url}/archive_info', timeout=10
+            )
+        except httpx.HTTPError as e:
+            self.log('debug', f'Failed to probe archive support: {e}')
+            return False
+        if response.status_code != 200:
+            self._archive_support = False
+            return False
+        compressions = response.json().get('compressions', [])
+        self._archive_compression = next(
+            (c for c in get_available_compressions() if c in compressions), None
+        )
+        self._archive_support = True
+        return True
+
+    def _upload_archive(
+        self,
+        host_src: str,
+        sandbox_dest: str,
+        include: list[str] | None,
+        exclude: list[str] | None,
+        resume: bool,
+    ) -> None:
+        name = os.path.basename(os.path.normpath(host_src))
+        manifest = None
+        if resume:
+            response = self._send_action_server_request(
+                'POST',
+                f'{self.action_execution_server_url}/archive_manifest',
+                json={
+                    'path': f'{sandbox_dest.rstrip("/")}/{name}',
+                    'include': include,
+                    'exclude': exclude,
+                },
+                timeout=60,
+            )
+            manifest = response.json()
+        stream = TarStream(
+            host_src,
+            arc_prefix=name if os.path.isdir(host_src) else '',
+            include=include,
+            exclude=exclude,
+            manifest=manifest,
+            compression=self._archive_compression,
+        )
+        params = {'destination': sandbox_dest}
+        if self._archive_compression:
+            params['compression'] = self._archive_compression
+        start = time.monotonic()
+        response = self._send_action_server_request(
+            'POST',
+            f'{self.action_execution_server_url}/upload_archive',
+            content=stream,
+            params=params,
+            headers={'Content-Type': 'application/x-tar'},
+            timeout=300,
+        )
+        self.log(
+            'debug',
+            f'Copy completed in {time.monotonic() - start:.2f}s: host:{host_src} -> '
+            f'runtime:{sandbox_dest}, {stream.files_sent} files sent, '
+            f'{stream.files_skipped} unchanged',
+        )
+
+    def get_git_changes(self, cwd: str) -> list[dict[str, str]] | None:
+        """Get the git changes from the server, which caches them between actions.
+
+        Falls back to running the git changes script for older servers.
+        """
+        if self._git_changes_unavailable:
+            return super().get_git_changes(cwd)
+        try:
+            # Not _send_action_server_request: a 404 from an older server is an
+            # answer here, not an error to retry
+            response = self.session.get(
+                f'{self.action_execution_server_url}/git_changes',
+                params={'cwd': cwd},
+                timeout=60,
+            )
+        except httpx.HTTPError as e:
+            self.log('error', f'Failed to get git changes: {e}')
+            return None
+        if response.status_code == 404:
+            self._git_changes_unavailable = True
+            return super().get_git_changes(cwd)
+        if response.status_code != 200:
+            self.log('error', f'Failed to get git changes: {response.text}')
+            return None
+        return response.json()
+
     def get_vscode_token(self) -> str:
         if self.vscode_enabled and self.runtime_initialized:
             if self._vscode_token is not None:  # cached value
@@ -316,21 +525,11 @@ class ActionExecutionClient(Runtime):
 
             assert action.timeout is not None
 
+            start_time = time.monotonic()
             try:
-                execution_action_body: dict[str, Any] = {
-                    'action': event_to_dict(action),
-                }
-                response = self._send_action_server_request(
-                    'POST',
-                    f'{self.action_execution_server_url}/execute_action',
-                    json=execution_action_body,
-                    # wait a few more seconds to get the timeout error from client side
-                    timeout=action.timeout + 5,
-                )
-                assert response.is_closed
-                output = response.json()
+                output = self._execute_action(action)
                 if getattr(action, 'hidden', False):
-                    output.get('extras')['hidden'] = True
+                    output['extras']['hidden'] = True
                 obs = observation_from_dict(output)
                 obs._cause = action.id  # type: ignore[attr-defined]
             except httpx.TimeoutException:
@@ -338,9 +537,74 @@ class ActionExecutionClient(Runtime):
                     f'Runtime failed to return execute_action before the requested timeout of {action.timeout}s'
                 )
             finally:
+                self.action_latency.record(action_type, time.monotonic() - start_time)
                 update_last_execution_time()
             return obs
 
+    def _execute_action(self, action: Action) -> dict[str, Any]:
+        """Run an action on the action execution server and return the observation dict."""
+        assert action.timeout is not None
+        # wait a few more seconds to get the timeout error from client side
+        timeout = action.timeout + 5
+        channel = self._get_action_channel()
+        if channel is not None:
+            output_callback = None
+            if isinstance(action, CmdRunAction):
+                output_callback = partial(self.on_action_output, action)
+            return channel.execute(
+                event_to_dict(action), timeout, output_callback=output_callback
+            )
+
+        execution_action_body: dict[str, Any] = {
+            'action': event_to_dict(action),
+        }
+        response = self._send_action_server_request(
+            'POST',
+            f'{self.action_execution_server_url}/execute_action',
+            json=execution_action_body,
+            timeout=timeout,
+        )
+        assert response.is_closed
+        return response.json()
+
+    def _get_action_channel(self) -> ActionChannel | None:
+        """Get the channel to send actions over, if enabled, (re)connecting if needed."""
+        if not self.config.sandbox.use_action_channel:
+            return None
+        if self._action_channel_unavailable:
+            return None
+        if self._action_channel is None or self._action_channel.closed:
+            url = self.action_execution_server_url
+            url = 'ws' + url.removeprefix('http') + '/action_channel'
+            try:
+                self._action_channel = ActionChannel(url, self.session.headers)
+            except Exception as e:
+                self.log(
+                    'warning',
+                    f'Action channel unavailable, sending actions over HTTP: {e}',
+                )
+                self._action_channel_unavailable = True
+                return None
+        return self._action_channel
+
+    def on_action_output(self, action: CmdRunAction, output: str) -> None:
+        """Called with partial output of a command while it runs.
+
+        Only called for actions sent over the action channel. Subclasses may
+        override this to surface progress - the observation returned for the
+        action still contains the complete output.
+        """
+        self.log('debug', f'Partial output of command {action.id}: {output!r}')
+
+    def get_server_action_latency(self) -> dict[str, dict[str, Any]]:
+        """Get the per action type latency histograms of the action execution server."""
+        response = self._send_action_server_request(
+            'GET',
+            f'{self.action_execution_server_url}/action_latency',
+            timeout=10,
+        )
+        return response.json()
+
     def run(self, action: CmdRunAction) -> Observation:
         return self.send_action_for_execution(action)
 
@@ -490,4 +754,6 @@ class ActionExecutionClient(Runtime):
         if self._runtime_closed:
             return
         self._runtime_closed = True
+        if self._action_channel is not None:
+            self._action_channel.close()
         self.session.close()
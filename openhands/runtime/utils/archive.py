@@ -0,0 +1,300 @@
+"""Streaming archives for copying file trees to and from the sandbox.
+
+Archives are produced straight from `os.walk`, one chunk at a time, and
+extracted as they are received, so copying a tree never writes a temporary
+archive to disk on either side.
+
+Trees are sent as tar streams, compressed with zstd when the `zstandard` package
+is installed on both sides. Copies can be narrowed with include / exclude globs,
+and resumed with a manifest of the files already present at the destination:
+files whose size and mtime (or, failing that, sha256) match the manifest are not
+sent again.
+
+Globs without a `/` match the name of a file or directory at any depth, e.g.
+`node_modules` or `*.pyc`. Globs with a `/` match the path relative to the root
+of the tree, e.g. `src/*.py`; as with `fnmatch`, `*` also matches `/`. An
+excluded directory is not descended into.
+"""
+
+import fnmatch
+import hashlib
+import io
+import os
+import tarfile
+import zipfile
+from typing import Any, Iterable, Iterator, TypedDict
+
+from openhands.core.logger import openhands_logger as logger
+
+CHUNK_SIZE = 1024 * 1024
+ZSTD = 'zstd'
+
+
+class ManifestEntry(TypedDict, total=False):
+    size: int
+    mtime: int
+    sha256: str
+
+
+Manifest = dict[str, ManifestEntry]
+
+
+def get_available_compressions() -> list[str]:
+    """Get the compressions supported for tar streams in this environment."""
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        return []
+    return [ZSTD]
+
+
+def _matches(relpath: str, patterns: Iterable[str]) -> bool:
+    name = relpath.rsplit('/', 1)[-1]
+    for pattern in patterns:
+        if fnmatch.fnmatchcase(relpath if '/' in pattern else name, pattern):
+            return True
+    return False
+
+
+def walk_files(
+    root: str,
+    include: list[str] | None = None,
+    exclude: list[str] | None = None,
+) -> Iterator[tuple[str, str]]:
+    """Yield (relative posix path, absolute path) for each file under root.
+
+    If root is a file, it is yielded under its own name.
+    """
+    if os.path.isfile(root):
+        yield os.path.basename(root), root
+        return
+    for dirpath, dirnames, filenames in os.walk(root):
+        reldir = os.path.relpath(dirpath, root).replace(os.sep, '/')
+        reldir = '' if reldir == '.' else reldir + '/'
+        if exclude:
+            dirnames[:] = [d for d in dirnames if not _matches(reldir + d, exclude)]
+        dirnames.sort()
+        for filename in sorted(filenames):
+            relpath = reldir + filename
+            if exclude and _matches(relpath, exclude):
+                continue
+            if include and not _matches(relpath, include):
+                continue
+            yield relpath, os.path.join(dirpath, filename)
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_manifest(
+    root: str,
+    include: list[str] | None = None,
+    exclude: list[str] | None = None,
+    with_hashes: bool = False,
+) -> Manifest:
+    """Describe the files under root, for resuming a copy into root."""
+    manifest: Manifest = {}
+    if not os.path.exists(root):
+        return manifest
+    for relpath, path in walk_files(root, include, exclude):
+        try:
+            st = os.stat(path)
+            entry: ManifestEntry = {'size': st.st_size, 'mtime': int(st.st_mtime)}
+            if with_hashes:
+                entry['sha256'] = file_sha256(path)
+        except OSError:
+            continue
+        manifest[relpath] = entry
+    return manifest
+
+
+def is_unchanged(entry: ManifestEntry | None, path: str, st: os.stat_result) -> bool:
+    """Whether a file matches its manifest entry, so need not be copied."""
+    if entry is None or entry.get('size') != st.st_size:
+        return False
+    if entry.get('mtime') == int(st.st_mtime):
+        return True
+    sha256 = entry.get('sha256')
+    return sha256 is not None and sha256 == file_sha256(path)
+
+
+class TarStream:
+    """A tar archive of a file tree, produced chunk by chunk as it is iterated.
+
+    Each iteration walks the tree afresh, so the stream can be sent again if a
+    request is retried.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        arc_prefix: str = '',
+        include: list[str] | None = None,
+        exclude: list[str] | None = None,
+        manifest: Manifest | None = None,
+        compression: str | None = None,
+    ):
+        self.root = root
+        self.arc_prefix = arc_prefix
+        self.include = include
+        self.exclude = exclude
+        self.manifest = manifest
+        self.compression = compression
+        self.files_sent = 0
+        self.files_skipped = 0
+
+    def __iter__(self) -> Iterator[bytes]:
+        chunks = self._iter_tar()
+        if self.compression == ZSTD:
+            import zstandard
+
+            compressor = zstandard.ZstdCompressor().compressobj()
+            for chunk in chunks:
+                compressed = compressor.compress(chunk)
+                if compressed:
+                    yield compressed
+            yield compressor.flush()
+        elif self.compression:
+            raise ValueError(f'Unsupported compression: {self.compression}')
+        else:
+            yield from chunks
+
+    def _iter_tar(self) -> Iterator[bytes]:
+        self.files_sent = 0
+        self.files_skipped = 0
+        for relpath, path in walk_files(self.root, self.include, self.exclude):
+            try:
+                f = open(path, 'rb')
+            except OSError as e:
+                logger.debug(f'Skipping unreadable file {path}: {e}')
+                continue
+            with f:
+                st = os.fstat(f.fileno())
+                if self.manifest and is_unchanged(self.manifest.get(relpath), path, st):
+                    self.files_skipped += 1
+                    continue
+                info = tarfile.TarInfo(
+                    f'{self.arc_prefix}/{relpath}' if self.arc_prefix else relpath
+                )
+                info.size = st.st_size
+                info.mtime = int(st.st_mtime)
+                info.mode = st.st_mode & 0o777
+                yield info.tobuf(tarfile.PAX_FORMAT, 'utf-8', 'surrogateescape')
+                # Send exactly the size in the header, even if the file changes
+                remaining = st.st_size
+                while remaining > 0:
+                    chunk = f.read(min(CHUNK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    yield chunk
+                if remaining > 0:
+                    yield bytes(remaining)
+                padding = -st.st_size % tarfile.BLOCKSIZE
+                if padding:
+                    yield bytes(padding)
+                self.files_sent += 1
+        yield bytes(2 * tarfile.BLOCKSIZE)
+
+
+class _ChunkReader(io.RawIOBase):
+    """A readable file over an iterator of byte chunks."""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        self._buffer = memoryview(b'')
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b: Any) -> int:
+        while not self._buffer:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._buffer = memoryview(chunk)
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+
+def _decompress(chunks: Iterable[bytes], compression: str | None) -> Iterator[bytes]:
+    if compression == ZSTD:
+        import zstandard
+
+        decompressor = zstandard.ZstdDecompressor().decompressobj()
+        for chunk in chunks:
+            decompressed = decompressor.decompress(chunk)
+            if decompressed:
+                yield decompressed
+    elif compression:
+        raise ValueError(f'Unsupported compression: {compression}')
+    else:
+        yield from chunks
+
+
+def extract_tar_stream(
+    chunks: Iterable[bytes], dest: str, compression: str | None = None
+) -> int:
+    """Extract a tar stream into dest as it is read, returning the number of files.
+
+    Members which would be written outside dest, links and special files are
+    rejected, as by the `data` extraction filter.
+    """
+    os.makedirs(dest, exist_ok=True)
+    reader = io.BufferedReader(_ChunkReader(_decompress(chunks, compression)))
+    count = 0
+    with tarfile.open(fileobj=reader, mode='r|') as tar:
+        for member in tar:
+            tar.extract(member, dest, filter='data')
+            if member.isfile():
+                count += 1
+    return count
+
+
+class _ChunkWriter(io.RawIOBase):
+    """A write-only, unseekable file collecting what is written."""
+
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b: Any) -> int:
+        self.chunks.append(bytes(b))
+        return len(b)
+
+    def take(self) -> bytes:
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def iter_zip(root: str) -> Iterator[bytes]:
+    """Produce a zip archive of the files under root, chunk by chunk.
+
+    Paths in the archive are relative to root. Unreadable files are skipped.
+    """
+    writer = _ChunkWriter()
+    with zipfile.ZipFile(writer, 'w') as zipf:
+        for relpath, path in walk_files(root):
+            try:
+                src = open(path, 'rb')
+            except OSError as e:
+                logger.debug(f'Skipping unreadable file {path}: {e}')
+                continue
+            with src, zipf.open(zipfile.ZipInfo.from_file(path, relpath), 'w') as dst:
+                while chunk := src.read(CHUNK_SIZE):
+                    dst.write(chunk)
+                    if writer.chunks:
+                        yield writer.take()
+            if writer.chunks:
+                yield writer.take()
+    yield writer.take()
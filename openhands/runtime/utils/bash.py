@@ -1,9 +1,14 @@
 import os
 import re
+import select
+import shlex
+import shutil
+import tempfile
+import threading
 import time
 import uuid
 from enum import Enum
-from typing import Any
+from typing import Any, Callable
 
 import bashlex
 import libtmux
@@ -181,9 +186,135 @@ def _remove_command_prefix(command_output: str, command: str) -> str:
     return command_output.lstrip().removeprefix(command.lstrip()).lstrip()
 
 
+# Escape sequences in raw terminal output: CSI (colors, cursor moves, modes), OSC
+# (titles), character set selection and other two-byte sequences
+_TERMINAL_ESCAPE = re.compile(
+    r'\x1b(?:\[[0-?]*[ -/]*[@-~]|\][^\x07\x1b]*(?:\x07|\x1b\\)|[()][0-9A-Za-z]|[@-Z\\-_])'
+)
+_TERMINAL_CONTROL = re.compile(r'[\x00-\x08\x0b-\x1f\x7f]')
+
+
+def _render_terminal_output(output: str) -> str:
+    """Approximate how raw terminal output is displayed, as `capture-pane` shows it.
+
+    Escape sequences are removed, and a carriage return within a line moves back
+    to its start, so the text after it overwrites the line (e.g. progress bars).
+    """
+    output = _TERMINAL_ESCAPE.sub('', output)
+    lines = []
+    for raw_line in output.replace('\r\n', '\n').split('\n'):
+        line = ''
+        for segment in raw_line.split('\r'):
+            line = segment + line[len(segment) :]
+        lines.append(_TERMINAL_CONTROL.sub('', line).rstrip())
+    return '\n'.join(lines)
+
+
+class PaneOutputLog:
+    """The raw output of a tmux pane, collected as it is produced.
+
+    `tmux pipe-pane` writes everything written to the pane into a FIFO, which a
+    reader thread drains into memory. Waiting for output blocks until the reader
+    has some, and the output since the log was last cleared is rendered as text,
+    so a command's output can be followed without capturing the pane.
+    """
+
+    # The oldest output is dropped once this many bytes are held
+    MAX_SIZE = 64 * 1024 * 1024
+    _PS1_END = CMD_OUTPUT_PS1_END.strip().encode()
+
+    def __init__(self, pane: libtmux.Pane):
+        self._dir = tempfile.mkdtemp(prefix='openhands-pane-')
+        self.path = os.path.join(self._dir, 'output')
+        os.mkfifo(self.path)
+        # The read end is opened first so that opening the write end does not
+        # block, and a write end is held so that reads never see end of file
+        self._fd = os.open(self.path, os.O_RDONLY | os.O_NONBLOCK)
+        self._write_fd = os.open(self.path, os.O_WRONLY)
+        self._stop_r, self._stop_w = os.pipe()
+        self._condition = threading.Condition()
+        self._data = bytearray()
+        self._unseen = 0  # bytes at the end of _data not yet returned by wait
+        self._unstreamed = 0  # bytes at the end of _data not yet returned by read_new
+        self._reader = threading.Thread(
+            target=self._read_output, name='pane-output-log', daemon=True
+        )
+        self._reader.start()
+        result = pane.cmd('pipe-pane', f'cat > {shlex.quote(self.path)}')
+        if result.stderr:
+            self.close()
+            raise RuntimeError(f'Failed to pipe pane output: {result.stderr}')
+
+    def _read_output(self) -> None:
+        while True:
+            readable, _, _ = select.select([self._fd, self._stop_r], [], [])
+            if self._stop_r in readable:
+                return
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                continue
+            with self._condition:
+                self._data += data
+                self._unseen += len(data)
+                self._unstreamed += len(data)
+                if len(self._data) > self.MAX_SIZE:
+                    del self._data[: len(self._data) - self.MAX_SIZE // 2]
+                    self._unseen = min(self._unseen, len(self._data))
+                    self._unstreamed = min(self._unstreamed, len(self._data))
+                self._condition.notify_all()
+
+    def wait(self, timeout: float) -> tuple[bool, bool]:
+        """Wait up to timeout seconds for new output.
+
+        Returns:
+            Whether there was new output, and whether it may end with a new PS1
+            prompt.
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._unseen, timeout):
+                return False, False
+            # Include the end of the earlier output, in case the marker is split
+            window_size = self._unseen + len(self._PS1_END) - 1
+            window = bytes(self._data[-window_size:])
+            self._unseen = 0
+        return True, self._PS1_END in window
+
+    def text(self) -> str:
+        """The output since the log was last cleared, as displayed in the pane."""
+        with self._condition:
+            data = bytes(self._data)
+        return _render_terminal_output(data.decode('utf-8', errors='replace'))
+
+    def read_new(self) -> str:
+        """The complete lines of output added since the last call, as displayed."""
+        with self._condition:
+            new = self._data[len(self._data) - self._unstreamed :]
+            end = new.rfind(b'\n') + 1
+            data = bytes(new[:end])
+            self._unstreamed -= end
+        return _render_terminal_output(data.decode('utf-8', errors='replace'))
+
+    def clear(self) -> None:
+        """Discard the output logged so far."""
+        with self._condition:
+            self._data.clear()
+            self._unseen = 0
+            self._unstreamed = 0
+
+    def close(self) -> None:
+        if self._reader.is_alive():
+            os.write(self._stop_w, b'\0')
+            self._reader.join()
+        for fd in (self._fd, self._write_fd, self._stop_r, self._stop_w):
+            os.close(fd)
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+
 class BashSession:
     POLL_INTERVAL = 0.5
     HISTORY_LIMIT = 10_000
+    SCREEN_LINES = 1000
     PS1 = CmdOutputMetadata.to_ps1_prompt()
 
     def __init__(
@@ -192,12 +323,28 @@ class BashSession:
         username: str | None = None,
         no_change_timeout_seconds: int = 30,
         max_memory_mb: int | None = None,
+        use_output_log: bool = False,
     ):
+        """Create a bash session, started by `initialize`.
+
+        Args:
+            work_dir: The initial working directory.
+            username: The user to run the shell as.
+            no_change_timeout_seconds: Seconds without new output after which a
+                non-blocking command returns.
+            max_memory_mb: Memory limit for the session (not enforced yet).
+            use_output_log: Follow command output through a `PaneOutputLog`
+                rather than capturing the whole pane every `POLL_INTERVAL`. The
+                observation and streamed output are then built from the log,
+                with terminal escape sequences removed.
+        """
         self.NO_CHANGE_TIMEOUT_SECONDS = no_change_timeout_seconds
         self.work_dir = work_dir
         self.username = username
         self._initialized = False
         self.max_memory_mb = max_memory_mb
+        self.use_output_log = use_output_log
+        self._output_log: PaneOutputLog | None = None
 
     def initialize(self) -> None:
         self.server = libtmux.Server()
@@ -226,7 +373,7 @@ class BashSession:
             start_directory=self.work_dir,  # This parameter is supported by libtmux
             kill_session=True,
             x=1000,
-            y=1000,
+            y=self.SCREEN_LINES,
         )
 
         # Set history limit to a large number to avoid losing history
@@ -244,6 +391,12 @@ class BashSession:
         logger.debug(f'pane: {self.pane}; history_limit: {self.session.history_limit}')
         _initial_window.kill()
 
+        if self.use_output_log:
+            try:
+                self._output_log = PaneOutputLog(self.pane)
+            except (OSError, RuntimeError) as e:
+                logger.warning(f'Falling back to polling the pane for output: {e}')
+
         # Configure bash to use simple PS1 and disable PS2
         self.pane.send_keys(
             f'export PROMPT_COMMAND=\'export PS1="{self.PS1}"\'; export PS2=""'
@@ -276,11 +429,22 @@ class BashSession:
         )
         return content
 
+    def _get_output(self) -> str:
+        """Get the output since the screen was last cleared."""
+        if self._output_log is not None:
+            # Truncate long output to the pane's history and screen, as capturing
+            # the pane would
+            lines = self._output_log.text().split('\n')
+            return '\n'.join(lines[-(self.HISTORY_LIMIT + self.SCREEN_LINES) :])
+        return self._get_pane_content()
+
     def close(self) -> None:
         """Clean up the session."""
         if self._closed:
             return
         self.session.kill()
+        if self._output_log is not None:
+            self._output_log.close()
         self._closed = True
 
     @property
@@ -295,6 +459,9 @@ class BashSession:
 
     def _clear_screen(self) -> None:
         """Clear the tmux pane screen and history."""
+        if self._output_log is not None:
+            # Keep the prompt redrawn after clearing, as the pane does
+            self._output_log.clear()
         self.pane.send_keys('C-l', enter=False)
         time.sleep(0.1)
         self.pane.cmd('clear-history')
@@ -491,8 +658,18 @@ class BashSession:
         logger.debug(f'COMBINED OUTPUT: {combined_output}')
         return combined_output
 
-    def execute(self, action: CmdRunAction) -> CmdOutputObservation | ErrorObservation:
-        """Execute a command in the bash session."""
+    def execute(
+        self,
+        action: CmdRunAction,
+        output_callback: Callable[[str], None] | None = None,
+    ) -> CmdOutputObservation | ErrorObservation:
+        """Execute a command in the bash session.
+
+        Args:
+            action: The command to run.
+            output_callback: Called with new output as it appears while the
+                command runs. The observation returned is still the full output.
+        """
         if not self._initialized:
             raise RuntimeError('Bash session is not initialized')
 
@@ -532,7 +709,7 @@ class BashSession:
             )
 
         # Get initial state before sending command
-        initial_pane_output = self._get_pane_content()
+        initial_pane_output = self._get_output()
         initial_ps1_matches = CmdOutputMetadata.matches_ps1_metadata(
             initial_pane_output
         )
@@ -544,6 +721,9 @@ class BashSession:
         last_pane_output = (
             initial_pane_output  # Use initial output as the starting point
         )
+        streamed_pane_output = initial_pane_output
+        if self._output_log is not None:
+            self._output_log.read_new()  # Only stream output from now on
 
         # When prev command is still running, and we are trying to send a new command
         if (
@@ -607,10 +787,40 @@ class BashSession:
                 )
 
         # Loop until the command completes or times out
+        check_pane = True  # The command may have completed already
+        stream_pending = False
+        last_stream_time = 0.0
         while should_continue():
+            if self._output_log is not None and not check_pane:
+                has_output, check_pane = self._output_log.wait(self.POLL_INTERVAL)
+                now = time.time()
+                if has_output:
+                    last_change_time = now
+                    stream_pending = output_callback is not None
+                if (
+                    output_callback
+                    and stream_pending
+                    and now - last_stream_time >= self.POLL_INTERVAL
+                ):
+                    new_output = self._output_log.read_new()
+                    if new_output:
+                        output_callback(new_output)
+                    stream_pending = False
+                    last_stream_time = now
+                no_change_timeout_due = (
+                    not action.blocking
+                    and now - last_change_time >= self.NO_CHANGE_TIMEOUT_SECONDS
+                )
+                hard_timeout_due = bool(
+                    action.timeout and now - start_time >= action.timeout
+                )
+                if not (check_pane or no_change_timeout_due or hard_timeout_due):
+                    continue
+            check_pane = False
+
             _start_time = time.time()
             logger.debug(f'GETTING PANE CONTENT at {_start_time}')
-            cur_pane_output = self._get_pane_content()
+            cur_pane_output = self._get_output()
             logger.debug(
                 f'PANE CONTENT GOT after {time.time() - _start_time:.2f} seconds'
             )
@@ -623,7 +833,8 @@ class BashSession:
             ps1_matches = CmdOutputMetadata.matches_ps1_metadata(cur_pane_output)
             current_ps1_count = len(ps1_matches)
 
-            if cur_pane_output != last_pane_output:
+            # With an output log, changes are detected from the log instead
+            if self._output_log is None and cur_pane_output != last_pane_output:
                 last_pane_output = cur_pane_output
                 last_change_time = time.time()
                 logger.debug(f'CONTENT UPDATED DETECTED at {last_change_time}')
@@ -643,6 +854,16 @@ class BashSession:
                     hidden=getattr(action, 'hidden', False),
                 )
 
+            # The command is still running, so pass on any output it has added
+            if (
+                self._output_log is None
+                and output_callback
+                and cur_pane_output != streamed_pane_output
+            ):
+                if cur_pane_output.startswith(streamed_pane_output):
+                    output_callback(cur_pane_output[len(streamed_pane_output) :])
+                streamed_pane_output = cur_pane_output
+
             # Timeout checks should only trigger if a new prompt hasn't appeared yet.
 
             # 2) Execution timed out since there's no change in output
@@ -676,6 +897,7 @@ class BashSession:
                     timeout=action.timeout,
                 )
 
-            logger.debug(f'SLEEPING for {self.POLL_INTERVAL} seconds for next poll')
-            time.sleep(self.POLL_INTERVAL)
+            if self._output_log is None:
+                logger.debug(f'SLEEPING for {self.POLL_INTERVAL} seconds for next poll')
+                time.sleep(self.POLL_INTERVAL)
         raise RuntimeError('Bash session was likely interrupted...')
@@ -24,7 +24,11 @@ from openhands.events.observation import (
 from openhands.linter import DefaultLinter
 from openhands.llm.llm import LLM
 from openhands.llm.llm_registry import LLMRegistry
-from openhands.utils.chunk_localizer import Chunk, get_top_k_chunk_matches
+from openhands.utils.chunk_localizer import (
+    Chunk,
+    get_language_for_file,
+    get_top_k_chunk_matches,
+)
 
 USER_MSG = """
 Code changes will be provided in the form of a draft. You will need to apply the draft to the original code.
@@ -337,6 +341,7 @@ class FileEditRuntimeMixin(FileEditRuntimeInterface):
                 query=action.content,  # edit draft as query
                 k=3,
                 max_chunk_size=20,  # lines
+                language=get_language_for_file(action.path),
             )
             error_msg += (
                 'Here are some snippets that maybe relevant to the provided edit.\n'
@@ -7,12 +7,28 @@ import glob
 import json
 import os
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable
 
+# Maximum number of repositories queried at once
+MAX_WORKERS = 8
 
-def run(cmd: str, cwd: str) -> str:
+
+def run(cmd: str, cwd: str, user: int | None = None) -> str:
+    env = None
+    if user is not None:
+        import pwd
+
+        env = {**os.environ, 'HOME': pwd.getpwuid(user).pw_dir}
     result = subprocess.run(
-        args=cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=cwd
+        args=cmd,
+        shell=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        cwd=cwd,
+        user=user,
+        env=env,
     )
     byte_content = result.stderr or result.stdout or b''
 
@@ -23,17 +39,21 @@ def run(cmd: str, cwd: str) -> str:
     return byte_content.decode().strip()
 
 
-def get_valid_ref(repo_dir: str) -> str | None:
+def get_valid_ref(repo_dir: str, user: int | None = None) -> str | None:
     refs = []
     try:
-        current_branch = run('git --no-pager rev-parse --abbrev-ref HEAD', repo_dir)
+        current_branch = run(
+            'git --no-pager rev-parse --abbrev-ref HEAD', repo_dir, user
+        )
         refs.append(f'origin/{current_branch}')
     except RuntimeError:
         pass
 
     try:
         default_branch = (
-            run('git --no-pager remote show origin | grep "HEAD branch"', repo_dir)
+            run(
+                'git --no-pager remote show origin | grep "HEAD branch"', repo_dir, user
+            )
             .split()[-1]
             .strip()
         )
@@ -53,7 +73,7 @@ def get_valid_ref(repo_dir: str) -> str | None:
     # Find a ref that exists...
     for ref in refs:
         try:
-            result = run(f'git --no-pager rev-parse --verify {ref}', repo_dir)
+            result = run(f'git --no-pager rev-parse --verify {ref}', repo_dir, user)
             return result
         except RuntimeError:
             # invalid ref - try next
@@ -62,16 +82,17 @@ def get_valid_ref(repo_dir: str) -> str | None:
     return None
 
 
-def get_changes_in_repo(repo_dir: str) -> list[dict[str, str]]:
+def get_changes_in_repo(repo_dir: str, user: int | None = None) -> list[dict[str, str]]:
     # Gets the status relative to the origin default branch - not the same as `git status`
+    # If user is set, git is run as that user
 
-    ref = get_valid_ref(repo_dir)
+    ref = get_valid_ref(repo_dir, user)
     if not ref:
         return []
 
     # Get changed files
     changed_files = run(
-        f'git --no-pager diff --name-status {ref}', repo_dir
+        f'git --no-pager diff --name-status {ref}', repo_dir, user
     ).splitlines()
     changes = []
     for line in changed_files:
@@ -144,7 +165,7 @@ def get_changes_in_repo(repo_dir: str) -> list[dict[str, str]]:
 
     # Get untracked files
     untracked_files = run(
-        'git --no-pager ls-files --others --exclude-standard', repo_dir
+        'git --no-pager ls-files --others --exclude-standard', repo_dir, user
     ).splitlines()
     for path in untracked_files:
         if path:
@@ -153,19 +174,35 @@ def get_changes_in_repo(repo_dir: str) -> list[dict[str, str]]:
     return changes
 
 
-def get_git_changes(cwd: str) -> list[dict[str, str]]:
-    git_dirs = {
-        os.path.dirname(f)[2:]
-        for f in glob.glob('./*/.git', root_dir=cwd, recursive=True)
-    }
-
-    # First try the workspace directory
-    changes = get_changes_in_repo(cwd)
+def get_git_changes(
+    cwd: str,
+    get_repo_changes: Callable[[str], list[dict[str, str]]] = get_changes_in_repo,
+) -> list[dict[str, str]]:
+    """Get the changes in the workspace and in each git repository directly under it.
+
+    Args:
+        cwd: The workspace directory.
+        get_repo_changes: Gets the changes in a single repository. The
+            repositories are queried in parallel.
+    """
+    git_dirs = sorted(
+        {
+            os.path.dirname(f)[2:]
+            for f in glob.glob('./*/.git', root_dir=cwd, recursive=True)
+        }
+    )
+    repo_dirs = [cwd] + [str(Path(cwd, git_dir)) for git_dir in git_dirs]
+    with ThreadPoolExecutor(min(MAX_WORKERS, len(repo_dirs))) as executor:
+        # Copy the changes, as get_repo_changes may return cached lists
+        workspace_changes, *git_dirs_changes = [
+            [dict(change) for change in changes]
+            for changes in executor.map(get_repo_changes, repo_dirs)
+        ]
 
     # Filter out any changes which are in one of the git directories
     changes = [
         change
-        for change in changes
+        for change in workspace_changes
         if next(
             iter(git_dir for git_dir in git_dirs if change['path'].startswith(git_dir)),
             None,
@@ -174,8 +211,7 @@ def get_git_changes(cwd: str) -> list[dict[str, str]]:
     ]
 
     # Add changes from git directories
-    for git_dir in git_dirs:
-        git_dir_changes = get_changes_in_repo(str(Path(cwd, git_dir)))
+    for git_dir, git_dir_changes in zip(git_dirs, git_dirs_changes):
         for change in git_dir_changes:
             change['path'] = git_dir + '/' + change['path']
             changes.append(change)
@@ -0,0 +1,129 @@
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from openhands.runtime.utils.git_changes import get_changes_in_repo, get_git_changes
+
+# Files in the git directory which change when HEAD, the index or the refs that
+# changes are computed against change
+GIT_STATE_FILES = ('HEAD', 'index', 'packed-refs', 'FETCH_HEAD', 'ORIG_HEAD')
+
+
+def _find_git_dir(path: str) -> Path | None:
+    """Find the .git of the repository containing path, as git would."""
+    current = Path(path).absolute()
+    while True:
+        git_dir = current / '.git'
+        if git_dir.exists():
+            return git_dir
+        if current.parent == current:
+            return None
+        current = current.parent
+
+
+def _stat_key(path: Path) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def get_git_state(git_dir: Path) -> tuple | None:
+    """Fingerprint the HEAD, index and refs of a repository.
+
+    Returns None if the state cannot be determined, e.g. for worktrees where .git
+    is a file.
+    """
+    if not git_dir.is_dir():
+        return None
+    try:
+        head = (git_dir / 'HEAD').read_text()
+    except OSError:
+        return None
+    state: list = [head]
+    state.extend(_stat_key(git_dir / name) for name in GIT_STATE_FILES)
+    if head.startswith('ref: '):
+        ref = head.removeprefix('ref: ').strip()
+        branch = ref.removeprefix('refs/heads/')
+        state.append(_stat_key(git_dir / ref))
+        state.append(_stat_key(git_dir / 'refs' / 'remotes' / 'origin' / branch))
+    # Changes when remote refs are added or removed
+    state.append(_stat_key(git_dir / 'refs' / 'remotes' / 'origin'))
+    return tuple(state)
+
+
+@dataclass
+class _CachedChanges:
+    git_state: tuple
+    generation: int
+    time: float
+    changes: list[dict[str, str]]
+
+
+class GitChangesCache:
+    """The git changes in a workspace, recomputed only for repositories which may have changed.
+
+    The changes in a repository are reused while its HEAD, index and refs are
+    unchanged, no action has run since they were computed (see `invalidate`),
+    and they are less than max_age seconds old. The age limit bounds how long
+    edits made other than by actions, e.g. in VSCode, can go unnoticed.
+
+    Repositories are queried in parallel, see `git_changes.get_git_changes`.
+
+    Args:
+        user: Run git as this user, e.g. when the server runs as root but the
+            workspace belongs to the sandbox user.
+        max_age: Seconds for which changes may be reused.
+    """
+
+    def __init__(self, user: int | None = None, max_age: float = 10):
+        self.user = user
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._generation = 0
+        self._cache: dict[str, _CachedChanges] = {}
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        """Note that files in the workspace may have changed, e.g. as an action ran."""
+        with self._lock:
+            self._generation += 1
+
+    def get_git_changes(self, cwd: str) -> list[dict[str, str]]:
+        return get_git_changes(cwd, self._get_changes_in_repo)
+
+    def _get_changes_in_repo(self, repo_dir: str) -> list[dict[str, str]]:
+        git_dir = _find_git_dir(repo_dir)
+        if git_dir is None:
+            # Not in a repository, so git would find no changes
+            return []
+        # Read the generation first, so an action finishing while the changes
+        # are computed is not missed
+        with self._lock:
+            generation = self._generation
+            cached = self._cache.get(repo_dir)
+        now = time.monotonic()
+        git_state = get_git_state(git_dir)
+        if (
+            cached is not None
+            and git_state is not None
+            and cached.git_state == git_state
+            and cached.generation == generation
+            and now - cached.time < self.max_age
+        ):
+            with self._lock:
+                self.hits += 1
+            return cached.changes
+
+        changes = get_changes_in_repo(repo_dir, self.user)
+        with self._lock:
+            self.misses += 1
+            if git_state is not None:
+                self._cache[repo_dir] = _CachedChanges(
+                    git_state, generation, now, changes
+                )
+        return changes
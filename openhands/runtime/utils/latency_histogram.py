@@ -0,0 +1,91 @@
+import bisect
+import threading
+from typing import Any
+
+# Upper bounds in seconds of the histogram buckets. Latencies above the last
+# bound are counted in an overflow bucket.
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+)
+
+
+class LatencyHistogram:
+    """A fixed bucket histogram of latencies in seconds."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile as the upper bound of the bucket it falls in."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.buckets[i] if i < len(self.buckets) else self.max
+        return self.max
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'count': self.count,
+            'total': self.total,
+            'max': self.max,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+            'buckets': {
+                **{
+                    str(bound): count for bound, count in zip(self.buckets, self.counts)
+                },
+                '+Inf': self.counts[-1],
+            },
+        }
+
+
+class LatencyHistograms:
+    """Latency histograms keyed by name, e.g. by action type. Thread safe."""
+
+    def __init__(self) -> None:
+        self._histograms: dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram()
+            histogram.record(seconds)
+
+    def to_dict(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return {
+                name: histogram.to_dict()
+                for name, histogram in sorted(self._histograms.items())
+            }
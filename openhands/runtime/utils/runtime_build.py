@@ -4,17 +4,22 @@ import os
 import shutil
 import string
 import tempfile
+import time
 from enum import Enum
 from pathlib import Path
 
 import docker
-from dirhash import dirhash
 from jinja2 import Environment, FileSystemLoader
 
 import openhands
 from openhands.core.exceptions import AgentRuntimeBuildError
 from openhands.core.logger import openhands_logger as logger
 from openhands.runtime.builder import DockerRuntimeBuilder, RuntimeBuilder
+from openhands.runtime.utils.source_hash import (
+    FileHashCache,
+    default_cache_file,
+    hash_directory,
+)
 from openhands.version import get_version
 
 
@@ -180,17 +185,25 @@ def build_runtime_image_in_folder(
     extra_build_args: list[str] | None = None,
     enable_browser: bool = True,
 ) -> str:
+    start = time.perf_counter()
     runtime_image_repo, _ = get_runtime_image_repo_and_tag(base_image)
     lock_tag = (
         f'oh_v{get_version()}_{get_hash_for_lock_files(base_image, enable_browser)}'
     )
+    lock_hash_time = time.perf_counter() - start
     versioned_tag = (
         # truncate the base image to 96 characters to fit in the tag max length (128 characters)
         f'oh_v{get_version()}_{get_tag_for_versioned_image(base_image)}'
     )
     versioned_image_name = f'{runtime_image_repo}:{versioned_tag}'
+    start = time.perf_counter()
     source_tag = f'{lock_tag}_{get_hash_for_source_files()}'
+    source_hash_time = time.perf_counter() - start
     hash_image_name = f'{runtime_image_repo}:{source_tag}'
+    logger.info(
+        f'Computed image tags in {lock_hash_time + source_hash_time:.3f}s '
+        f'(lock files: {lock_hash_time:.3f}s, source files: {source_hash_time:.3f}s)'
+    )
 
     logger.info(f'Building image: {hash_image_name}')
     if force_rebuild:
@@ -321,23 +334,44 @@ def truncate_hash(hash: str) -> str:
     return ''.join(result)
 
 
-def get_hash_for_lock_files(base_image: str, enable_browser: bool = True) -> str:
+def _lock_file_paths() -> list[Path]:
     openhands_source_dir = Path(openhands.__file__).parent
+    paths = []
+    for file in ['pyproject.toml', 'poetry.lock']:
+        src = Path(openhands_source_dir, file)
+        if not src.exists():
+            src = Path(openhands_source_dir.parent, file)
+        paths.append(src)
+    return paths
+
+
+# Lock file hashes by base image, browser flag and the stat of the lock files
+_lock_hashes: dict[tuple, str] = {}
+
+
+def get_hash_for_lock_files(base_image: str, enable_browser: bool = True) -> str:
+    paths = _lock_file_paths()
+    stats = []
+    for path in paths:
+        st = os.stat(path)
+        stats.append((str(path), st.st_size, st.st_mtime_ns, st.st_ino))
+    key = (base_image, enable_browser, tuple(stats))
+    if key in _lock_hashes:
+        return _lock_hashes[key]
+
     md5 = hashlib.md5()
     md5.update(base_image.encode())
     # Only include enable_browser in hash when it's False for backward compatibility
     if not enable_browser:
         md5.update(str(enable_browser).encode())
-    for file in ['pyproject.toml', 'poetry.lock']:
-        src = Path(openhands_source_dir, file)
-        if not src.exists():
-            src = Path(openhands_source_dir.parent, file)
+    for src in paths:
         with open(src, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b''):
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
                 md5.update(chunk)
     # We get away with truncation because we want something that is unique
     # rather than something that is cryptographically secure
     result = truncate_hash(md5.hexdigest())
+    _lock_hashes[key] = result
     return result
 
 
@@ -345,16 +379,27 @@ def get_tag_for_versioned_image(base_image: str) -> str:
     return base_image.replace('/', '_s_').replace(':', '_t_').lower()[-96:]
 
 
+SOURCE_HASH_IGNORE = [
+    '.*/',  # hidden directories
+    '__pycache__/',
+    '*.pyc',
+]
+
+
 def get_hash_for_source_files() -> str:
-    openhands_source_dir = Path(openhands.__file__).parent
-    dir_hash = dirhash(
-        openhands_source_dir,
-        'md5',
-        ignore=[
-            '.*/',  # hidden directories
-            '__pycache__/',
-            '*.pyc',
-        ],
+    """Hash the openhands package, rehashing only the files changed since the last call.
+
+    The hash is the same as `dirhash` of the package. File hashes are cached
+    on disk, see `source_hash.default_cache_file`.
+    """
+    openhands_source_dir = str(Path(openhands.__file__).parent)
+    cache = FileHashCache('md5', default_cache_file(openhands_source_dir))
+    start = time.perf_counter()
+    dir_hash = hash_directory(openhands_source_dir, SOURCE_HASH_IGNORE, cache)
+    cache.save()
+    logger.debug(
+        f'Hashed source files in {time.perf_counter() - start:.3f}s '
+        f'({cache.hits} cached, {cache.misses} rehashed)'
     )
     # We get away with truncation because we want something that is unique
     # rather than something that is cryptographically secure
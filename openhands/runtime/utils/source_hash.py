@@ -0,0 +1,215 @@
+"""Incremental hashing of source trees, for tagging runtime images.
+
+`hash_directory` computes exactly the same value as `dirhash.dirhash` with the
+default protocol (entry names and data) and name-based ignore patterns, so image
+tags are unchanged. File hashes are kept in a `FileHashCache` keyed by the size,
+mtime and inode of each file, which can be saved between runs, so only files
+which changed since the last run are read again. Files missing from the cache
+are hashed in parallel.
+"""
+
+import fnmatch
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from openhands.core.logger import openhands_logger as logger
+
+CHUNK_SIZE = 1024 * 1024
+MAX_WORKERS = 8
+CACHE_VERSION = 1
+
+# The separators used by dirhash to describe the entries of a directory
+_PROPERTY_SEPARATOR = '\000'
+_ENTRY_SEPARATOR = '\000\000'
+
+
+def default_cache_file(root: str, algorithm: str = 'md5') -> str:
+    """Where the file hashes for a tree are saved between runs."""
+    key = hashlib.md5(os.path.abspath(root).encode()).hexdigest()[:16]
+    return os.path.join(
+        tempfile.gettempdir(), f'openhands_source_hash_{algorithm}_{key}.json'
+    )
+
+
+def _file_key(st: os.stat_result) -> list[int]:
+    return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+
+class FileHashCache:
+    """Hashes of files, reused while their size, mtime and inode are unchanged.
+
+    Args:
+        algorithm: The hashlib algorithm to hash files with.
+        cache_file: A JSON file to load the hashes from and save them to. If
+            None, hashes are only kept in memory.
+    """
+
+    def __init__(self, algorithm: str = 'md5', cache_file: str | None = None):
+        self.algorithm = algorithm
+        self.cache_file = cache_file
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[str, tuple[list[int], str]] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        if cache_file:
+            self._load()
+
+    def _load(self) -> None:
+        assert self.cache_file is not None
+        try:
+            with open(self.cache_file) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.debug(f'Ignoring unreadable hash cache {self.cache_file}: {e}')
+            return
+        if (
+            data.get('version') != CACHE_VERSION
+            or data.get('algorithm') != self.algorithm
+        ):
+            return
+        self._entries = {
+            path: (key, digest) for path, (key, digest) in data['files'].items()
+        }
+
+    def save(self) -> None:
+        """Write the hashes to the cache file, if any were computed."""
+        if not self.cache_file or not self._dirty:
+            return
+        data = {
+            'version': CACHE_VERSION,
+            'algorithm': self.algorithm,
+            'files': self._entries,
+        }
+        # Write to a temporary file first, so concurrent builds never read a
+        # partially written cache
+        tmp_file = f'{self.cache_file}.{os.getpid()}.tmp'
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_file, self.cache_file)
+            self._dirty = False
+        except OSError as e:
+            logger.debug(f'Could not save hash cache {self.cache_file}: {e}')
+
+    def lookup(self, path: str, st: os.stat_result) -> str | None:
+        entry = self._entries.get(path)
+        if entry is not None and entry[0] == _file_key(st):
+            self.hits += 1
+            return entry[1]
+        return None
+
+    def hash_file(self, path: str, st: os.stat_result) -> str:
+        digest = hashlib.new(self.algorithm)
+        with open(path, 'rb') as f:
+            while chunk := f.read(CHUNK_SIZE):
+                digest.update(chunk)
+        result = digest.hexdigest()
+        with self._lock:
+            self.misses += 1
+            self._entries[path] = (_file_key(st), result)
+            self._dirty = True
+        return result
+
+    def prune(self, paths: set[str]) -> None:
+        """Forget the hashes of files other than paths, e.g. deleted files."""
+        stale = self._entries.keys() - paths
+        for path in stale:
+            del self._entries[path]
+        if stale:
+            self._dirty = True
+
+
+def _ignored(name: str, is_dir: bool, ignore: list[str]) -> bool:
+    for pattern in ignore:
+        if pattern.endswith('/'):
+            if is_dir and fnmatch.fnmatchcase(name, pattern[:-1]):
+                return True
+        elif fnmatch.fnmatchcase(name, pattern):
+            return True
+    return False
+
+
+def _describe(entries: list[tuple[str, str, str]]) -> str:
+    """Describe the entries (kind, name, hash) of a directory as dirhash does."""
+    descriptors = [
+        _PROPERTY_SEPARATOR.join(sorted([f'{kind}:{digest}', f'name:{name}']))
+        for kind, name, digest in entries
+    ]
+    return _ENTRY_SEPARATOR.join(sorted(descriptors))
+
+
+def hash_directory(
+    root: str,
+    ignore: list[str] | None = None,
+    cache: FileHashCache | None = None,
+    max_workers: int = MAX_WORKERS,
+) -> str:
+    """Compute the `dirhash.dirhash` of a directory, reusing cached file hashes.
+
+    Args:
+        root: The directory to hash.
+        ignore: Patterns of names to ignore at any depth, e.g. `*.pyc`. Patterns
+            ending with `/` only match directories, e.g. `__pycache__/`.
+        cache: The file hashes to reuse and update. Stale entries are pruned.
+        max_workers: The number of threads hashing files missing from the cache.
+
+    Raises:
+        ValueError: If there are no files to hash.
+    """
+    ignore = ignore or []
+    cache = cache or FileHashCache()
+    root = os.path.abspath(root)
+
+    # Map each directory to its (name, path) subdirectories and files
+    tree: dict[str, tuple[list[tuple[str, str]], list[tuple[str, str]]]] = {}
+    file_hashes: dict[str, str] = {}
+    missing: list[tuple[str, os.stat_result]] = []
+    for dirpath, dirnames, filenames in os.walk(root, followlinks=True):
+        dirnames[:] = [d for d in dirnames if not _ignored(d, True, ignore)]
+        subdirs = [(d, os.path.join(dirpath, d)) for d in dirnames]
+        files = []
+        for filename in filenames:
+            if _ignored(filename, False, ignore):
+                continue
+            path = os.path.join(dirpath, filename)
+            st = os.stat(path)
+            digest = cache.lookup(path, st)
+            if digest is None:
+                missing.append((path, st))
+                digest = ''
+            file_hashes[path] = digest
+            files.append((filename, path))
+        tree[dirpath] = (subdirs, files)
+
+    if missing:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for (path, _), digest in zip(
+                missing, executor.map(lambda args: cache.hash_file(*args), missing)
+            ):
+                file_hashes[path] = digest
+    cache.prune(set(file_hashes))
+
+    def dir_hash(dirpath: str) -> str | None:
+        subdirs, files = tree[dirpath]
+        entries = [('data', name, file_hashes[path]) for name, path in files]
+        for name, path in subdirs:
+            digest = dir_hash(path)
+            # Directories without files to hash are left out
+            if digest is not None:
+                entries.append(('dirhash', name, digest))
+        if not entries:
+            return None
+        descriptor = _describe(entries)
+        return hashlib.new(cache.algorithm, descriptor.encode('utf-8')).hexdigest()
+
+    result = dir_hash(root)
+    if result is None:
+        raise ValueError(f'{root}: Nothing to hash')
+    return result
@@ -7,6 +7,7 @@
 # Tag: Legacy-V0
 # This module belongs to the old V0 web server. The V1 application server lives under openhands/app_server/.
 import asyncio
+import threading
 import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
@@ -21,9 +22,11 @@ from openhands.core.logger import openhands_logger as logger
 from openhands.core.schema.agent import AgentState
 from openhands.core.schema.observation import ObservationType
 from openhands.events.action import MessageAction
+from openhands.events.observation import AgentStateChangedObservation
 from openhands.events.observation.commands import CmdOutputObservation
 from openhands.events.stream import EventStreamSubscriber, session_exists
 from openhands.llm.llm_registry import LLMRegistry
+from openhands.llm.metrics import Metrics
 from openhands.runtime import get_runtime_cls
 from openhands.server.config.server_config import ServerConfig
 from openhands.server.constants import ROOM_KEY
@@ -40,6 +43,7 @@ from openhands.storage.files import FileStore
 from openhands.utils.async_utils import (
     GENERAL_TIMEOUT,
     call_async_from_sync,
+    call_sync_from_async,
     run_in_loop,
     wait_all,
 )
@@ -54,9 +58,27 @@ from openhands.utils.utils import create_registry_and_conversation_stats
 from .conversation_manager import ConversationManager
 
 _CLEANUP_INTERVAL = 15
+# Minimum seconds between conversation metadata writes for the events of a conversation
+_METADATA_UPDATE_INTERVAL = 5
 UPDATED_AT_CALLBACK_ID = 'updated_at_callback_id'
 
 
+@dataclass
+class _PendingConversationUpdate:
+    """Conversation metadata changes from events, not yet written to the store."""
+
+    user_id: str | None
+    settings: Settings
+    llm_registry: LLMRegistry
+    last_updated_at: datetime | None = None
+    llm_metrics: Metrics | None = None
+    check_branch: bool = False
+    # monotonic time of the last write, None if never written
+    last_flushed_at: float | None = None
+    # held while writing, so writes of a conversation never interleave
+    flush_lock: threading.Lock = field(default_factory=threading.Lock)
+
+
 @dataclass
 class StandaloneConversationManager(ConversationManager):
     """Default implementation of ConversationManager for single-server deployments.
@@ -82,6 +104,12 @@ class StandaloneConversationManager(ConversationManager):
     _cleanup_task: asyncio.Task | None = None
     _conversation_store_class: type[ConversationStore] | None = None
     _loop: asyncio.AbstractEventLoop | None = None
+    _pending_conversation_updates: dict[str, _PendingConversationUpdate] = field(
+        default_factory=dict
+    )
+    _pending_conversation_updates_lock: threading.Lock = field(
+        default_factory=threading.Lock
+    )
 
     async def __aenter__(self):
         # Grab a reference to the main event loop. This is the loop in which `await sio.emit` must be called
@@ -169,6 +197,9 @@ class StandaloneConversationManager(ConversationManager):
         )
         await self.sio.enter_room(connection_id, ROOM_KEY.format(sid=sid))
         self._local_connection_id_to_session_id[connection_id] = sid
+        session = self._local_agent_loops_by_sid.get(sid)
+        if session:
+            session.notify_client_joined()
         agent_loop_info = await self.maybe_start_agent_loop(sid, settings, user_id)
         return agent_loop_info
 
@@ -452,6 +483,8 @@ class StandaloneConversationManager(ConversationManager):
             await self.sio.disconnect(connection_id)
             self._local_connection_id_to_session_id.pop(connection_id, None)
 
+        await self._flush_pending_conversation_update(sid)
+
         session = self._local_agent_loops_by_sid.pop(sid, None)
         if not session:
             logger.warning(f'no_session_to_close:{sid}', extra={'session_id': sid})
@@ -486,33 +519,122 @@ class StandaloneConversationManager(ConversationManager):
         llm_registry: LLMRegistry,
     ) -> Callable:
         def callback(event, *args, **kwargs):
-            call_async_from_sync(
-                self._update_conversation_for_event,
-                GENERAL_TIMEOUT,
-                user_id,
-                conversation_id,
-                settings,
-                llm_registry,
-                event,
+            pending = self._record_conversation_update(
+                user_id, conversation_id, settings, llm_registry, event
             )
+            if pending:
+                with pending.flush_lock:
+                    call_async_from_sync(
+                        self._flush_conversation_update,
+                        GENERAL_TIMEOUT,
+                        conversation_id,
+                        pending,
+                    )
 
         return callback
 
-    async def _update_conversation_for_event(
+    def _record_conversation_update(
         self,
-        user_id: str,
+        user_id: str | None,
+        conversation_id: str,
+        settings: Settings,
+        llm_registry: LLMRegistry,
+        event,
+    ) -> _PendingConversationUpdate | None:
+        """Merge the metadata changes from an event into the pending update.
+
+        Returns:
+            The pending update if it should be written now: for the first event of
+            the conversation, on agent state changes, or once the update interval
+            has passed since the last write. Otherwise None.
+        """
+        with self._pending_conversation_updates_lock:
+            pending = self._pending_conversation_updates.get(conversation_id)
+            if pending is None:
+                pending = _PendingConversationUpdate(user_id, settings, llm_registry)
+                self._pending_conversation_updates[conversation_id] = pending
+            pending.last_updated_at = datetime.now(timezone.utc)
+            # metrics are accumulated, so the latest ones include all earlier events
+            if event and getattr(event, 'llm_metrics', None):
+                pending.llm_metrics = event.llm_metrics
+            if self._is_git_related_event(event):
+                pending.check_branch = True
+            if (
+                pending.last_flushed_at is None
+                or isinstance(event, AgentStateChangedObservation)
+                or time.monotonic() - pending.last_flushed_at
+                >= _METADATA_UPDATE_INTERVAL
+            ):
+                return pending
+            return None
+
+    async def _flush_conversation_update(
+        self, conversation_id: str, pending: _PendingConversationUpdate
+    ):
+        with self._pending_conversation_updates_lock:
+            if pending.last_updated_at is None:
+                return  # Nothing changed since the last write
+            last_updated_at = pending.last_updated_at
+            llm_metrics = pending.llm_metrics
+            check_branch = pending.check_branch
+            pending.last_updated_at = None
+            pending.llm_metrics = None
+            pending.check_branch = False
+            pending.last_flushed_at = time.monotonic()
+        try:
+            await self._update_conversation(
+                pending.user_id,
+                conversation_id,
+                pending.settings,
+                pending.llm_registry,
+                last_updated_at,
+                llm_metrics,
+                check_branch,
+            )
+        except BaseException:
+            # Keep the changes for the next write, unless newer ones replaced them
+            with self._pending_conversation_updates_lock:
+                if pending.last_updated_at is None:
+                    pending.last_updated_at = last_updated_at
+                if pending.llm_metrics is None:
+                    pending.llm_metrics = llm_metrics
+                pending.check_branch = pending.check_branch or check_branch
+            raise
+
+    async def _flush_pending_conversation_update(self, conversation_id: str):
+        """Write any pending metadata changes for a conversation which is closing."""
+        with self._pending_conversation_updates_lock:
+            pending = self._pending_conversation_updates.pop(conversation_id, None)
+        if pending is None:
+            return
+        await call_sync_from_async(pending.flush_lock.acquire)
+        try:
+            await self._flush_conversation_update(conversation_id, pending)
+        except Exception:
+            logger.exception(
+                f'Error updating conversation metadata: {conversation_id}',
+                extra={'session_id': conversation_id},
+            )
+        finally:
+            pending.flush_lock.release()
+
+    async def _update_conversation(
+        self,
+        user_id: str | None,
         conversation_id: str,
         settings: Settings,
         llm_registry: LLMRegistry,
-        event=None,
+        last_updated_at: datetime,
+        llm_metrics: Metrics | None = None,
+        check_branch: bool = False,
     ):
         conversation_store = await self._get_conversation_store(user_id)
         conversation = await conversation_store.get_metadata(conversation_id)
-        conversation.last_updated_at = datetime.now(timezone.utc)
+        conversation.last_updated_at = last_updated_at
 
         # Update cost/token metrics if event has llm_metrics
-        if event and hasattr(event, 'llm_metrics') and event.llm_metrics:
-            metrics = event.llm_metrics
+        if llm_metrics:
+            metrics = llm_metrics
 
             # Update accumulated cost
             if hasattr(metrics, 'accumulated_cost'):
@@ -527,14 +649,11 @@ class StandaloneConversationManager(ConversationManager):
                     token_usage.prompt_tokens + token_usage.completion_tokens
                 )
 
-        # Check for branch changes if this is a git-related event
-        if event and self._is_git_related_event(event):
+        # Check for branch changes if there were git-related events
+        if check_branch:
             logger.info(
                 f'Git-related event detected, updating conversation branch for {conversation_id}',
-                extra={
-                    'session_id': conversation_id,
-                    'command': getattr(event, 'command', 'unknown'),
-                },
+                extra={'session_id': conversation_id},
             )
             await self._update_conversation_branch(conversation)
 
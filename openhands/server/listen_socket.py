@@ -7,37 +7,37 @@
 # Tag: Legacy-V0
 # This module belongs to the old V0 web server. The V1 application server lives under openhands/app_server/.
 import asyncio
+import itertools
+import json
 import os
-from typing import Any
+import time
+import zlib
+from typing import Any, Iterable, Iterator
 from urllib.parse import parse_qs
 
 from socketio.exceptions import ConnectionRefusedError
 
 from openhands.core.logger import openhands_logger as logger
-from openhands.events.action import (
-    NullAction,
-)
-from openhands.events.action.agent import RecallAction
-from openhands.events.async_event_store_wrapper import AsyncEventStoreWrapper
+from openhands.core.schema import ActionType, ObservationType
 from openhands.events.event_store import EventStore
-from openhands.events.observation import (
-    NullObservation,
-)
-from openhands.events.observation.agent import (
-    AgentStateChangedObservation,
-)
-from openhands.events.serialization import event_to_dict
 from openhands.integrations.service_types import ProviderType
 from openhands.server.services.conversation_service import (
     setup_init_conversation_settings,
 )
 from openhands.server.shared import (
     conversation_manager,
+    monitoring_listener,
     sio,
 )
 from openhands.storage.conversation.conversation_validator import (
     create_conversation_validator,
 )
+from openhands.utils.async_utils import call_sync_from_async
+
+# Events are read from the store this many at a time when replaying one by one
+REPLAY_READ_SIZE = 100
+# The largest batch a client may request with the replay_batch_size query parameter
+MAX_REPLAY_BATCH_SIZE = 1000
 
 
 @sio.event
@@ -93,36 +93,18 @@ async def connect(connection_id: str, environ: dict) -> None:
             )
             raise ConnectionRefusedError(f'Failed to access conversation events: {e}')
 
+        replay_batch_size = _get_replay_batch_size(query_params)
         logger.info(
             f'Replaying event stream for conversation {conversation_id} with connection_id {connection_id}...'
         )
-        agent_state_changed = None
-
-        # Create an async store to replay events
-        async_store = AsyncEventStoreWrapper(event_store, latest_event_id + 1)
-
-        # Process all available events
-        async for event in async_store:
-            logger.debug(f'oh_event: {event.__class__.__name__}')
-
-            if isinstance(
-                event,
-                (NullAction, NullObservation, RecallAction),
-            ):
-                continue
-            elif isinstance(event, AgentStateChangedObservation):
-                agent_state_changed = event
-            else:
-                await sio.emit('oh_event', event_to_dict(event), to=connection_id)
-
-        # Send the agent state changed event last if we have one
-        if agent_state_changed:
-            await sio.emit(
-                'oh_event', event_to_dict(agent_state_changed), to=connection_id
-            )
-
+        start_time = time.monotonic()
+        num_events, num_batches = await _replay_events(
+            connection_id, event_store, latest_event_id + 1, replay_batch_size
+        )
+        duration = time.monotonic() - start_time
+        monitoring_listener.on_event_replay(num_events, num_batches, duration)
         logger.info(
-            f'Finished replaying event stream for conversation {conversation_id}'
+            f'Finished replaying {num_events} events in {num_batches} batches for conversation {conversation_id} in {duration:.3f}s'
         )
 
         conversation_init_data = await setup_init_conversation_settings(
@@ -166,6 +148,95 @@ async def disconnect(connection_id: str) -> None:
     await conversation_manager.disconnect_from_session(connection_id)
 
 
+async def _replay_events(
+    connection_id: str,
+    event_store: EventStore,
+    start_id: int,
+    batch_size: int | None,
+) -> tuple[int, int]:
+    """Send the stored events from start_id onwards to a connection.
+
+    Events are forwarded as stored, without being deserialized. By default each
+    event is sent as its own oh_event message. Clients which advertise a
+    replay_batch_size instead receive oh_event_batch messages of up to that many
+    events, as zlib compressed JSON.
+
+    The latest agent state change is always sent last, so the client ends up in
+    the current agent state.
+
+    Returns:
+        The number of events and the number of messages sent.
+    """
+    replay = _ReplayEvents(event_store.search_event_dicts(start_id=start_id))
+    read_size = batch_size or REPLAY_READ_SIZE
+    num_events = 0
+    num_batches = 0
+    while True:
+        events = await call_sync_from_async(replay.read, read_size)
+        if not events:
+            break
+        num_events += len(events)
+        if batch_size:
+            payload = await call_sync_from_async(_encode_event_batch, events)
+            await sio.emit('oh_event_batch', payload, to=connection_id)
+            num_batches += 1
+        else:
+            for event in events:
+                await sio.emit('oh_event', event, to=connection_id)
+            num_batches += len(events)
+    return num_events, num_batches
+
+
+class _ReplayEvents:
+    """Reads the events to replay, holding back agent state changes until the end."""
+
+    def __init__(self, events: Iterable[dict]):
+        self._events = self._filter(events)
+        self._agent_state_changed: dict | None = None
+
+    def read(self, count: int) -> list[dict]:
+        events = list(itertools.islice(self._events, count))
+        if len(events) < count and self._agent_state_changed is not None:
+            events.append(self._agent_state_changed)
+            self._agent_state_changed = None
+        return events
+
+    def _filter(self, events: Iterable[dict]) -> Iterator[dict]:
+        for event in events:
+            action = event.get('action')
+            observation = event.get('observation')
+            if action in (ActionType.NULL, ActionType.RECALL):
+                continue
+            if observation == ObservationType.NULL:
+                continue
+            if observation == ObservationType.AGENT_STATE_CHANGED:
+                self._agent_state_changed = event
+                continue
+            yield event
+
+
+def _encode_event_batch(events: list[dict]) -> dict[str, Any]:
+    return {
+        'encoding': 'zlib',
+        'count': len(events),
+        'data': zlib.compress(json.dumps(events).encode('utf-8')),
+    }
+
+
+def _get_replay_batch_size(query_params: dict[str, list[Any]]) -> int | None:
+    value = query_params.get('replay_batch_size', [None])[0]
+    if value is None:
+        return None
+    try:
+        batch_size = int(value)
+    except ValueError:
+        logger.debug(f'Invalid replay_batch_size value: {value}, replaying unbatched')
+        return None
+    if batch_size < 1:
+        return None
+    return min(batch_size, MAX_REPLAY_BATCH_SIZE)
+
+
 def _invalid_session_api_key(query_params: dict[str, list[Any]]):
     session_api_key = os.getenv('SESSION_API_KEY')
     if not session_api_key:
@@ -35,6 +35,15 @@ class MonitoringListener:
         """
         pass
 
+    def on_event_replay(
+        self, num_events: int, num_batches: int, duration: float
+    ) -> None:
+        """Track the replay of stored events to a newly connected socket.
+        Duration is the time in seconds taken to send num_events events in
+        num_batches messages.
+        """
+        pass
+
     def on_create_conversation(self) -> None:
         """Track the beginning of conversation creation.
         Does not currently capture whether it succeed.
@@ -123,6 +123,7 @@ class WebSession:
             self._monitor_publish_queue()
         )
         self._wait_websocket_initial_complete: bool = True
+        self._client_joined = asyncio.Event()
 
     async def close(self) -> None:
         if self.sio:
@@ -382,55 +383,36 @@ class WebSession:
     async def send(self, data: dict[str, object]) -> None:
         self._publish_queue.put_nowait(data)
 
+    def notify_client_joined(self) -> None:
+        """Signal that a client has joined the room of this session."""
+        self._client_joined.set()
+
     async def _monitor_publish_queue(self):
         try:
             while True:
-                data: dict = await self._publish_queue.get()
-                await self._send(data)
+                batch: list[dict] = [await self._publish_queue.get()]
+                while not self._publish_queue.empty():
+                    batch.append(self._publish_queue.get_nowait())
+                await self._send_batch(_coalesce_status_messages(batch))
         except asyncio.CancelledError:
             return
 
-    async def _send(self, data: dict[str, object]) -> bool:
+    async def _send_batch(self, batch: list[dict]) -> bool:
         try:
             if not self.is_alive:
                 return False
 
-            _start_time = time.time()
-            _waiting_times = 1
-
             if self.sio:
-                # Get timeout from configuration, default to 30 seconds
-                client_wait_timeout = self.config.client_wait_timeout
-                self.logger.debug(
-                    f'Using client wait timeout: {client_wait_timeout}s for session {self.sid}'
-                )
-
-                # Wait once during initialization to avoid event push failures during websocket connection intervals
-                while self._wait_websocket_initial_complete and (
-                    time.time() - _start_time < client_wait_timeout
-                ):
-                    if bool(
-                        self.sio.manager.rooms.get('/', {}).get(
-                            ROOM_KEY.format(sid=self.sid)
-                        )
-                    ):
-                        break
-
-                    # Progressive backoff: start with 0.1s, increase to 1s after 10 attempts
-                    sleep_duration = 0.1 if _waiting_times <= 10 else 1.0
-
-                    # Log every 2 seconds to reduce spam
-                    if _waiting_times % (20 if sleep_duration == 0.1 else 2) == 0:
-                        self.logger.debug(
-                            f'There is no listening client in the current room,'
-                            f' waiting for the {_waiting_times}th attempt (timeout: {client_wait_timeout}s): {self.sid}'
-                        )
-                    _waiting_times += 1
-                    await asyncio.sleep(sleep_duration)
-                self._wait_websocket_initial_complete = False
-                await self.sio.emit('oh_event', data, to=ROOM_KEY.format(sid=self.sid))
-
-            await asyncio.sleep(0.001)  # This flushes the data to the client
+                if self._wait_websocket_initial_complete:
+                    # Wait once during initialization to avoid event push failures during websocket connection intervals
+                    await self._wait_for_client()
+                    self._wait_websocket_initial_complete = False
+                room = ROOM_KEY.format(sid=self.sid)
+                for data in batch:
+                    await self.sio.emit('oh_event', data, to=room)
+
+            # Let the socket writers flush the data to the client
+            await asyncio.sleep(0)
             self.last_active_ts = int(time.time())
             return True
         except RuntimeError as e:
@@ -438,6 +420,22 @@ class WebSession:
             self.is_alive = False
             return False
 
+    async def _wait_for_client(self) -> None:
+        assert self.sio is not None
+        if self.sio.manager.rooms.get('/', {}).get(ROOM_KEY.format(sid=self.sid)):
+            return
+        # Get timeout from configuration, default to 30 seconds
+        client_wait_timeout = self.config.client_wait_timeout
+        self.logger.debug(
+            f'There is no listening client in the current room, waiting up to {client_wait_timeout}s: {self.sid}'
+        )
+        try:
+            await asyncio.wait_for(self._client_joined.wait(), client_wait_timeout)
+        except asyncio.TimeoutError:
+            self.logger.debug(
+                f'No client joined the room within {client_wait_timeout}s: {self.sid}'
+            )
+
     async def send_error(self, message: str) -> None:
         """Sends an error message to the client."""
         await self.send({'error': True, 'message': message})
@@ -473,6 +471,26 @@ class WebSession:
         )
 
 
+def _coalesce_status_messages(batch: list[dict]) -> list[dict]:
+    """Drop info status updates superseded by a later one in the same batch.
+
+    The client only displays the latest status, so of several info updates queued
+    together only the last is sent. Error status updates are always sent.
+    """
+    last_info = None
+    for i, data in enumerate(batch):
+        if data.get('status_update') and data.get('type') == 'info':
+            last_info = i
+    if last_info is None:
+        return batch
+    return [
+        data
+        for i, data in enumerate(batch)
+        if i >= last_info
+        or not (data.get('status_update') and data.get('type') == 'info')
+    ]
+
+
 # Backward-compatible alias for external imports that still reference
 # openhands.server.session.session import Session
 Session = WebSession
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import json
 from dataclasses import dataclass
 from pathlib import Path
@@ -24,15 +25,46 @@ from openhands.utils.search_utils import offset_to_page_id, page_id_to_offset
 
 conversation_metadata_type_adapter = TypeAdapter(ConversationMetadata)
 
+# Directory in the metadata directory holding the index: an empty record file per
+# conversation, named after its sort key and id. Names starting with '.' are not
+# conversations.
+INDEX_DIRNAME = '.conversation_index'
+# File in the index directory written once the index covers every conversation
+INDEX_BUILT_FILENAME = '.built'
+
 
 @dataclass
 class FileConversationStore(ConversationStore):
+    """Stores conversation metadata in a file store.
+
+    Besides the metadata file of each conversation, the metadata directory holds an
+    index of the conversations by creation date, with one record per conversation
+    written by `save_metadata` and removed by `delete_metadata`. As no record is
+    ever read and written back, stores shared by several processes cannot lose
+    each other's updates. `search` lists the index, sorts it and only loads the
+    metadata of the conversations on the requested page. It never writes.
+
+    The index of a store written without one is built by the first
+    `save_metadata`, and until then `search` loads the metadata of every
+    conversation. Changes made without updating the index afterwards are only
+    picked up by `repair_index`.
+    """
+
     file_store: FileStore
 
     async def save_metadata(self, metadata: ConversationMetadata) -> None:
         json_str = conversation_metadata_type_adapter.dump_json(metadata)
         path = self.get_conversation_metadata_filename(metadata.conversation_id)
         await call_sync_from_async(self.file_store.write, path, json_str)
+        await call_sync_from_async(
+            self.file_store.write,
+            self.get_index_record_filename(
+                metadata.conversation_id, _sort_key(metadata)
+            ),
+            '',
+        )
+        if not await call_sync_from_async(self._is_index_built):
+            await self.repair_index()
 
     async def get_metadata(self, conversation_id: str) -> ConversationMetadata:
         path = self.get_conversation_metadata_filename(conversation_id)
@@ -55,6 +87,12 @@ class FileConversationStore(ConversationStore):
             Path(self.get_conversation_metadata_filename(conversation_id)).parent
         )
         await call_sync_from_async(self.file_store.delete, path)
+        records = await call_sync_from_async(self._list_index_records)
+        for sort_key in records.get(conversation_id, ()):
+            await call_sync_from_async(
+                self.file_store.delete,
+                self.get_index_record_filename(conversation_id, sort_key),
+            )
 
     async def exists(self, conversation_id: str) -> bool:
         path = self.get_conversation_metadata_filename(conversation_id)
@@ -69,31 +107,167 @@ class FileConversationStore(ConversationStore):
         page_id: str | None = None,
         limit: int = 20,
     ) -> ConversationMetadataResultSet:
-        conversations: list[ConversationMetadata] = []
-        metadata_dir = self.get_conversation_metadata_dir()
+        if not await call_sync_from_async(self._is_index_built):
+            return await self._search_without_index(page_id, limit)
+        entries = await self._load_index()
+        num_conversations = len(entries)
+        start = page_id_to_offset(page_id)
+        end = min(limit + start, num_conversations)
+        # entries are sorted oldest first
+        page = entries[num_conversations - end : num_conversations - start]
+        results = await asyncio.gather(
+            *(
+                self._try_get_metadata(conversation_id)
+                for _, conversation_id in reversed(page)
+            )
+        )
+        conversations = [result for result in results if result is not None]
+        next_page_id = offset_to_page_id(end, end < num_conversations)
+        return ConversationMetadataResultSet(conversations, next_page_id)
+
+    async def repair_index(self) -> None:
+        """Bring the index in line with the conversations in the store.
+
+        Conversations without a record, or with several (left by a change of
+        creation date), have their metadata loaded to write the right record.
+        Records of conversations no longer in the store are deleted.
+        """
+        # Records are listed first, so that any record listed belongs to a
+        # conversation which is listed too, unless it was deleted since
+        records = await call_sync_from_async(self._list_index_records)
+        try:
+            conversation_ids = set(
+                await call_sync_from_async(self._list_conversation_ids)
+            )
+        except FileNotFoundError:
+            conversation_ids = set()
+
+        unindexed_ids = [
+            conversation_id
+            for conversation_id in conversation_ids
+            if len(records.get(conversation_id, ())) != 1
+        ]
+        results = await asyncio.gather(
+            *(
+                self._try_get_metadata(conversation_id)
+                for conversation_id in unindexed_ids
+            )
+        )
+        stale_records = [
+            (conversation_id, sort_key)
+            for conversation_id, sort_keys in records.items()
+            if conversation_id not in conversation_ids
+            for sort_key in sort_keys
+        ]
+        for metadata in results:
+            if metadata is None:
+                continue
+            conversation_id = metadata.conversation_id
+            sort_key = _sort_key(metadata)
+            sort_keys = records.get(conversation_id, [])
+            stale_records.extend(
+                (conversation_id, key) for key in sort_keys if key != sort_key
+            )
+            if sort_key not in sort_keys:
+                await call_sync_from_async(
+                    self.file_store.write,
+                    self.get_index_record_filename(conversation_id, sort_key),
+                    '',
+                )
+        for conversation_id, sort_key in stale_records:
+            await call_sync_from_async(
+                self.file_store.delete,
+                self.get_index_record_filename(conversation_id, sort_key),
+            )
+        await call_sync_from_async(
+            self.file_store.write,
+            f'{self.get_index_dir()}/{INDEX_BUILT_FILENAME}',
+            '',
+        )
+
+    async def _load_index(self) -> list[tuple[str, str]]:
+        """List the (sort key, conversation id) pairs in the index, sorted oldest
+        first.
+
+        Only conversations with several records have their metadata loaded, to
+        find the record matching their creation date.
+        """
+        records = await call_sync_from_async(self._list_index_records)
+        duplicated_ids = [
+            conversation_id
+            for conversation_id, sort_keys in records.items()
+            if len(sort_keys) > 1
+        ]
+        results = await asyncio.gather(
+            *(
+                self._try_get_metadata(conversation_id)
+                for conversation_id in duplicated_ids
+            )
+        )
+        for conversation_id, metadata in zip(duplicated_ids, results):
+            if metadata is not None:
+                records[conversation_id] = [_sort_key(metadata)]
+        return sorted(
+            (max(sort_keys), conversation_id)
+            for conversation_id, sort_keys in records.items()
+        )
+
+    async def _search_without_index(
+        self, page_id: str | None, limit: int
+    ) -> ConversationMetadataResultSet:
         try:
-            conversation_ids = [
-                Path(path).name
-                for path in self.file_store.list(metadata_dir)
-                if not Path(path).name.startswith('.')
-            ]
+            conversation_ids = await call_sync_from_async(self._list_conversation_ids)
         except FileNotFoundError:
             return ConversationMetadataResultSet([])
         num_conversations = len(conversation_ids)
         start = page_id_to_offset(page_id)
         end = min(limit + start, num_conversations)
-        conversations = []
-        for conversation_id in conversation_ids:
-            try:
-                conversations.append(await self.get_metadata(conversation_id))
-            except Exception:
-                logger.warning(
-                    f'Could not load conversation metadata: {conversation_id}'
-                )
+        results = await asyncio.gather(
+            *(
+                self._try_get_metadata(conversation_id)
+                for conversation_id in conversation_ids
+            )
+        )
+        conversations = [result for result in results if result is not None]
         conversations.sort(key=_sort_key, reverse=True)
-        conversations = conversations[start:end]
         next_page_id = offset_to_page_id(end, end < num_conversations)
-        return ConversationMetadataResultSet(conversations, next_page_id)
+        return ConversationMetadataResultSet(conversations[start:end], next_page_id)
+
+    async def _try_get_metadata(
+        self, conversation_id: str
+    ) -> ConversationMetadata | None:
+        try:
+            return await self.get_metadata(conversation_id)
+        except Exception:
+            logger.warning(f'Could not load conversation metadata: {conversation_id}')
+            return None
+
+    def _is_index_built(self) -> bool:
+        try:
+            self.file_store.read(f'{self.get_index_dir()}/{INDEX_BUILT_FILENAME}')
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _list_conversation_ids(self) -> list[str]:
+        return [
+            Path(path).name
+            for path in self.file_store.list(self.get_conversation_metadata_dir())
+            if not Path(path).name.startswith('.')
+        ]
+
+    def _list_index_records(self) -> dict[str, list[str]]:
+        """List the sort keys recorded in the index for each conversation id."""
+        try:
+            paths = self.file_store.list(self.get_index_dir())
+        except FileNotFoundError:
+            return {}
+        records: dict[str, list[str]] = {}
+        for path in paths:
+            sort_key, _, conversation_id = Path(path).name.partition('_')
+            if conversation_id:
+                records.setdefault(conversation_id, []).append(sort_key)
+        return records
 
     def get_conversation_metadata_dir(self) -> str:
         return CONVERSATION_BASE_DIR
@@ -101,6 +275,12 @@ class FileConversationStore(ConversationStore):
     def get_conversation_metadata_filename(self, conversation_id: str) -> str:
         return get_conversation_metadata_filename(conversation_id)
 
+    def get_index_dir(self) -> str:
+        return f'{self.get_conversation_metadata_dir()}/{INDEX_DIRNAME}'
+
+    def get_index_record_filename(self, conversation_id: str, sort_key: str) -> str:
+        return f'{self.get_index_dir()}/{sort_key}_{conversation_id}'
+
     @classmethod
     async def get_instance(
         cls, config: OpenHandsConfig, user_id: str | None
@@ -118,5 +298,6 @@ class FileConversationStore(ConversationStore):
 def _sort_key(conversation: ConversationMetadata) -> str:
     created_at = conversation.created_at
     if created_at:
-        return created_at.isoformat()  # YYYY-MM-DDTHH:MM:SS for sorting
+        # YYYY-MM-DDTHHMMSS for sorting, without colons as it is part of a filename
+        return created_at.isoformat().replace(':', '')
     return ''
@@ -2,6 +2,9 @@ from abc import abstractmethod
 
 
 class FileStore:
+    # Whether append() appends in place, rather than rewriting the whole file
+    native_append: bool = False
+
     @abstractmethod
     def write(self, path: str, contents: str | bytes) -> None:
         pass
@@ -17,3 +20,16 @@ class FileStore:
     @abstractmethod
     def delete(self, path: str) -> None:
         pass
+
+    def append(self, path: str, contents: str) -> None:
+        """Append contents to the end of a file, creating it if it does not exist.
+
+        The default implementation is a read-modify-write, which is what object
+        stores without native append (S3, GCS) need. Stores that can append in
+        place should override it.
+        """
+        try:
+            existing = self.read(path)
+        except FileNotFoundError:
+            existing = ''
+        self.write(path, existing + contents)
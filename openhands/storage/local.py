@@ -7,6 +7,7 @@ from openhands.storage.files import FileStore
 
 class LocalFileStore(FileStore):
     root: str
+    native_append = True
 
     def __init__(self, root: str):
         if root.startswith('~'):
@@ -26,6 +27,12 @@ class LocalFileStore(FileStore):
         with open(full_path, mode) as f:
             f.write(contents)
 
+    def append(self, path: str, contents: str) -> None:
+        full_path = self.get_full_path(path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, 'a') as f:
+            f.write(contents)
+
     def read(self, path: str) -> str:
         full_path = self.get_full_path(path)
         with open(full_path, 'r') as f:
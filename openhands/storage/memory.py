@@ -6,6 +6,7 @@ from openhands.storage.files import FileStore
 
 class InMemoryFileStore(FileStore):
     files: dict[str, str]
+    native_append = True
 
     def __init__(self, files: dict[str, str] | None = None) -> None:
         self.files = {}
@@ -17,6 +18,9 @@ class InMemoryFileStore(FileStore):
             contents = contents.decode('utf-8')
         self.files[path] = contents
 
+    def append(self, path: str, contents: str) -> None:
+        self.files[path] = self.files.get(path, '') + contents
+
     def read(self, path: str) -> str:
         if path not in self.files:
             raise FileNotFoundError(path)
@@ -2,14 +2,53 @@
 
 This is primarily used to localize the most relevant chunks in a file
 for a given query (e.g. edit draft produced by the agent).
+
+Files are split into chunks of at most a given number of lines, along the
+boundaries of syntax nodes when the language is supported by tree-sitter.
+Computing the LCS of the query with every chunk of a large file is slow, so
+for files with many chunks, chunks are first shortlisted by how many of their
+lines appear in the query, and the LCS is only computed for the shortlist.
 """
 
+import heapq
+import os
+
 from pydantic import BaseModel
 from rapidfuzz.distance import LCSseq
+from tree_sitter import Node, Tree
 from tree_sitter_language_pack import get_parser
 
 from openhands.core.logger import openhands_logger as logger
 
+# Languages to chunk files with, by file extension
+EXTENSION_TO_LANGUAGE = {
+    '.c': 'c',
+    '.cc': 'cpp',
+    '.cpp': 'cpp',
+    '.cs': 'csharp',
+    '.go': 'go',
+    '.h': 'c',
+    '.hpp': 'cpp',
+    '.java': 'java',
+    '.js': 'javascript',
+    '.jsx': 'javascript',
+    '.kt': 'kotlin',
+    '.php': 'php',
+    '.py': 'python',
+    '.rb': 'ruby',
+    '.rs': 'rust',
+    '.scala': 'scala',
+    '.sh': 'bash',
+    '.swift': 'swift',
+    '.ts': 'typescript',
+    '.tsx': 'tsx',
+}
+
+# The LCS is computed for at least this many chunks, and at least
+# PREFILTER_FACTOR * k, so the prefilter only applies to files with many chunks
+PREFILTER_MIN_CANDIDATES = 32
+PREFILTER_FACTOR = 4
+
 
 class Chunk(BaseModel):
     text: str
@@ -25,6 +64,11 @@ class Chunk(BaseModel):
         return ret
 
 
+def get_language_for_file(path: str) -> str | None:
+    """Get the tree-sitter language to chunk a file with, if any."""
+    return EXTENSION_TO_LANGUAGE.get(os.path.splitext(path)[1].lower())
+
+
 def _create_chunks_from_raw_string(content: str, size: int):
     lines = content.split('\n')
     ret = []
@@ -39,12 +83,89 @@ def _create_chunks_from_raw_string(content: str, size: int):
     return ret
 
 
+def _split_node(
+    node: Node, start: int, end: int, max_lines: int
+) -> list[tuple[int, int]]:
+    """Split the lines start to end (0-indexed, inclusive) of a node into spans.
+
+    The lines are split where the children of the node start, and consecutive
+    children are grouped into spans of at most max_lines lines. Children
+    spanning more lines are split along their own children in turn.
+    """
+    if end - start + 1 <= max_lines:
+        return [(start, end)]
+    # The children starting on each line
+    children: dict[int, list[Node]] = {}
+    for child in node.children:
+        line = max(child.start_point[0], start)
+        if line <= end:
+            children.setdefault(line, []).append(child)
+    boundaries = sorted(line for line in children if line > start)
+    if not boundaries:
+        if len(children.get(start, [])) == 1:
+            child = children[start][0]
+            if child.children:
+                return _split_node(child, start, end, max_lines)
+        # Nothing to split along, so split into fixed-size spans
+        return [
+            (i, min(i + max_lines - 1, end)) for i in range(start, end + 1, max_lines)
+        ]
+
+    spans: list[tuple[int, int]] = []
+    group: tuple[int, int] | None = None
+    for piece_start, piece_end in zip(
+        [start] + boundaries, [line - 1 for line in boundaries] + [end]
+    ):
+        if piece_end - piece_start + 1 <= max_lines:
+            if group is not None and piece_end - group[0] + 1 <= max_lines:
+                group = (group[0], piece_end)
+                continue
+            if group is not None:
+                spans.append(group)
+            group = (piece_start, piece_end)
+            continue
+        if piece_start in children:
+            # Split along the largest child starting on the first line
+            child = max(children[piece_start], key=lambda c: c.end_point[0])
+            piece_spans = _split_node(child, piece_start, piece_end, max_lines)
+        else:
+            piece_spans = _split_node(node, piece_start, piece_end, max_lines)
+        if group is not None:
+            # Keep e.g. the signature of a function with the start of its body
+            if piece_spans[0][1] - group[0] + 1 <= max_lines:
+                piece_spans[0] = (group[0], piece_spans[0][1])
+            else:
+                spans.append(group)
+            group = None
+        spans.extend(piece_spans)
+    if group is not None:
+        spans.append(group)
+    return spans
+
+
+def _create_chunks_from_tree_sitter(
+    tree: Tree, content: str, max_chunk_lines: int
+) -> list[Chunk]:
+    """Chunk content along the boundaries of its syntax nodes.
+
+    Small definitions are grouped together into chunks of up to
+    max_chunk_lines lines, and large ones are split along their statements.
+    The chunks cover every line of the content.
+    """
+    lines = content.split('\n')
+    spans = _split_node(tree.root_node, 0, len(lines) - 1, max_chunk_lines)
+    return [
+        Chunk(text='\n'.join(lines[start : end + 1]), line_range=(start + 1, end + 1))
+        for start, end in spans
+    ]
+
+
 def create_chunks(
     text: str, size: int = 100, language: str | None = None
 ) -> list[Chunk]:
     try:
-        parser = get_parser(language) if language is not None else None
-    except AttributeError:
+        parser = get_parser(language) if language is not None else None  # type: ignore[arg-type]
+    except (AttributeError, LookupError):
         logger.debug(f'Language {language} not supported. Falling back to raw string.')
         parser = None
 
@@ -52,9 +173,9 @@ def create_chunks(
         # fallback to raw string
         return _create_chunks_from_raw_string(text, size)
 
-    # TODO: implement tree-sitter chunking
-    # return _create_chunks_from_tree_sitter(parser.parse(bytes(text, 'utf-8')), max_chunk_lines=size)
-    raise NotImplementedError('Tree-sitter chunking not implemented yet.')
+    return _create_chunks_from_tree_sitter(
+        parser.parse(bytes(text, 'utf-8')), text, max_chunk_lines=size
+    )
 
 
 def normalized_lcs(chunk: str, query: str) -> float:
@@ -71,8 +192,28 @@ def normalized_lcs(chunk: str, query: str) -> float:
     return _score / len(chunk)
 
 
+def _line_set(text: str) -> set[str]:
+    return {stripped for line in text.split('\n') if (stripped := line.strip())}
+
+
+def line_containment(chunk: str, query_lines: set[str]) -> float:
+    """The fraction of the non-blank lines of the chunk which appear in the query.
+
+    Like the normalized LCS, this measures how much of the chunk is covered by
+    the query, but in linear time. Lines are compared ignoring indentation.
+    """
+    chunk_lines = _line_set(chunk)
+    if not chunk_lines:
+        return 0.0
+    return len(chunk_lines & query_lines) / len(chunk_lines)
+
+
 def get_top_k_chunk_matches(
-    text: str, query: str, k: int = 3, max_chunk_size: int = 100
+    text: str,
+    query: str,
+    k: int = 3,
+    max_chunk_size: int = 100,
+    language: str | None = None,
 ) -> list[Chunk]:
     """Get the top k chunks in the text that match the query.
 
@@ -83,19 +224,32 @@ def get_top_k_chunk_matches(
         query: The query to search for in the text.
         k: The number of top chunks to return.
         max_chunk_size: The maximum number of lines in a chunk.
+        language: The tree-sitter language to chunk the text with, see
+            `get_language_for_file`.
     """
-    raw_chunks = create_chunks(text, max_chunk_size)
-    chunks_with_lcs: list[Chunk] = [
+    raw_chunks = create_chunks(text, max_chunk_size, language)
+    num_candidates = max(PREFILTER_MIN_CANDIDATES, k * PREFILTER_FACTOR)
+    if len(raw_chunks) > num_candidates:
+        query_lines = _line_set(query)
+        scores = [line_containment(chunk.text, query_lines) for chunk in raw_chunks]
+        # If no line of the query is in the text, there is nothing to go by
+        if max(scores) > 0:
+            shortlist = heapq.nlargest(
+                num_candidates, range(len(raw_chunks)), key=scores.__getitem__
+            )
+            # Keep the chunks in order, so ties are broken by position
+            raw_chunks = [raw_chunks[i] for i in sorted(shortlist)]
+
+    chunks_with_lcs = (
         Chunk(
             text=chunk.text,
             line_range=chunk.line_range,
             normalized_lcs=normalized_lcs(chunk.text, query),
         )
         for chunk in raw_chunks
-    ]
-    sorted_chunks = sorted(
+    )
+    return heapq.nlargest(
+        k,
         chunks_with_lcs,
         key=lambda x: x.normalized_lcs,  # type: ignore
-        reverse=True,
     )
-    return sorted_chunks[:k]
@@ -0,0 +1,76 @@
+"""Benchmark localizing edit drafts in large source files.
+
+Concatenates the Python sources of the openhands package into one large file,
+then localizes drafts made by copying snippets of the file and changing some of
+their lines. Reports the time to get the top chunks computing the LCS for every
+chunk (as before chunks were prefiltered), with the prefilter, and with
+tree-sitter chunking, and how often the prefilter finds the same best chunk.
+
+    python scripts/benchmark_chunk_localizer.py [--lines 20000] [--drafts 20]
+"""
+
+import argparse
+import random
+import time
+from pathlib import Path
+
+import openhands
+from openhands.utils import chunk_localizer
+
+
+def _make_draft(lines: list[str], rng: random.Random, draft_lines: int) -> str:
+    start = rng.randrange(len(lines) - draft_lines)
+    draft = lines[start : start + draft_lines]
+    for i in rng.sample(range(draft_lines), max(1, draft_lines // 5)):
+        draft[i] = draft[i].replace('self', 'obj') + '  # changed'
+    return '\n'.join(draft)
+
+
+def _localize(
+    text: str, drafts: list[str], chunk_size: int, language: str | None = None
+) -> tuple[float, list[float]]:
+    best = []
+    start = time.perf_counter()
+    for draft in drafts:
+        matches = chunk_localizer.get_top_k_chunk_matches(
+            text, draft, k=3, max_chunk_size=chunk_size, language=language
+        )
+        best.append(matches[0].normalized_lcs)
+    return (time.perf_counter() - start) / len(drafts), best
+
+
+def benchmark(num_lines: int, num_drafts: int, draft_lines: int, chunk_size: int):
+    source_dir = Path(openhands.__file__).parent
+    lines: list[str] = []
+    for path in sorted(source_dir.rglob('*.py')):
+        lines.extend(path.read_text().split('\n'))
+        if len(lines) >= num_lines:
+            break
+    lines = lines[:num_lines]
+    text = '\n'.join(lines)
+    rng = random.Random(0)
+    drafts = [_make_draft(lines, rng, draft_lines) for _ in range(num_drafts)]
+
+    min_candidates = chunk_localizer.PREFILTER_MIN_CANDIDATES
+    chunk_localizer.PREFILTER_MIN_CANDIDATES = len(lines)
+    full, full_best = _localize(text, drafts, chunk_size)
+    chunk_localizer.PREFILTER_MIN_CANDIDATES = min_candidates
+    prefiltered, prefiltered_best = _localize(text, drafts, chunk_size)
+    tree_sitter, _ = _localize(text, drafts, chunk_size, language='python')
+    same_best = sum(a == b for a, b in zip(full_best, prefiltered_best))
+
+    print(f'{len(lines)} lines, {num_drafts} drafts of {draft_lines} lines')
+    print(f'every chunk       {full * 1000:>10.1f} ms')
+    print(f'prefiltered       {prefiltered * 1000:>10.1f} ms')
+    print(f'tree-sitter       {tree_sitter * 1000:>10.1f} ms')
+    print(f'same best chunk   {same_best:>7}/{num_drafts}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the chunk localizer')
+    parser.add_argument('--lines', type=int, default=20000)
+    parser.add_argument('--drafts', type=int, default=20)
+    parser.add_argument('--draft-lines', type=int, default=40)
+    parser.add_argument('--chunk-size', type=int, default=20)
+    args = parser.parse_args()
+    benchmark(args.lines, args.drafts, args.draft_lines, args.chunk_size)
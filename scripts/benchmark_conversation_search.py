@@ -0,0 +1,63 @@
+"""Benchmark FileConversationStore.search over many conversations.
+
+Creates synthetic conversations in a local file store, then reports the time to
+check the conversation index against the store with `repair_index`, to load a
+page of conversations with the index, and to load every conversation's metadata
+(the cost of a search before the index is built).
+
+    python scripts/benchmark_conversation_search.py [--conversations 10000]
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from openhands.storage.conversation.file_conversation_store import (
+    FileConversationStore,
+)
+from openhands.storage.data_models.conversation_metadata import ConversationMetadata
+from openhands.storage.local import LocalFileStore
+
+
+async def benchmark(num_conversations: int, limit: int, pages: int) -> None:
+    with tempfile.TemporaryDirectory() as root:
+        store = FileConversationStore(LocalFileStore(root))
+        created_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        for i in range(num_conversations):
+            await store.save_metadata(
+                ConversationMetadata(
+                    conversation_id=f'conversation-{i:06d}',
+                    selected_repository='owner/repo',
+                    title=f'Conversation {i}',
+                    created_at=created_at + timedelta(minutes=i),
+                )
+            )
+
+        start = time.perf_counter()
+        await store.repair_index()
+        print(f'check index          {time.perf_counter() - start:>10.3f} s')
+
+        page_id = None
+        start = time.perf_counter()
+        for _ in range(pages):
+            result = await store.search(page_id=page_id, limit=limit)
+            page_id = result.next_page_id
+        elapsed = (time.perf_counter() - start) / pages
+        print(f'search page of {limit:<5} {elapsed * 1000:>10.2f} ms')
+
+        conversation_ids = await asyncio.to_thread(store._list_conversation_ids)
+        start = time.perf_counter()
+        for conversation_id in conversation_ids:
+            await store.get_metadata(conversation_id)
+        print(f'load all metadata    {time.perf_counter() - start:>10.3f} s')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark conversation search')
+    parser.add_argument('--conversations', type=int, default=10_000)
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--pages', type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(benchmark(args.conversations, args.limit, args.pages))
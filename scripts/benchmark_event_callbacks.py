@@ -0,0 +1,116 @@
+"""Benchmark executing event callbacks against SQLite.
+
+Creates conversations with a callback for pause events, then executes callbacks
+for a stream of events, most of which no callback applies to. Reports the events
+processed per second querying the active callbacks for each event (as before
+they were cached) and with the routing cache.
+
+    python scripts/benchmark_event_callbacks.py [--conversations 100] [--events 5000]
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import tempfile
+import time
+from pathlib import Path
+from uuid import UUID, uuid4
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from openhands.app_server.event_callback import sql_event_callback_service
+from openhands.app_server.event_callback.event_callback_models import (
+    CreateEventCallbackRequest,
+    LoggingCallbackProcessor,
+)
+from openhands.app_server.event_callback.sql_event_callback_service import (
+    SQLEventCallbackService,
+)
+from openhands.app_server.utils.sql_utils import Base
+from openhands.sdk import Event
+from openhands.sdk.event import PauseEvent, TokenEvent
+
+
+async def _execute(
+    session_maker: async_sessionmaker,
+    events: list[tuple[UUID, Event]],
+    routing_cache_ttl: float,
+) -> float:
+    sql_event_callback_service._routing_cache.invalidate()
+    async with session_maker() as db_session:
+        service = SQLEventCallbackService(
+            db_session=db_session, routing_cache_ttl=routing_cache_ttl
+        )
+        start = time.perf_counter()
+        for conversation_id, event in events:
+            await service.execute_callbacks(conversation_id, event)
+        return len(events) / (time.perf_counter() - start)
+
+
+async def benchmark(
+    db_path: Path, num_conversations: int, num_events: int, pause_fraction: float
+):
+    engine = create_async_engine(f'sqlite+aiosqlite:///{db_path}')
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, class_=AsyncSession)
+
+    conversation_ids = [uuid4() for _ in range(num_conversations)]
+    async with session_maker() as db_session:
+        service = SQLEventCallbackService(db_session=db_session)
+        for conversation_id in conversation_ids:
+            await service.create_event_callback(
+                CreateEventCallbackRequest(
+                    conversation_id=conversation_id,
+                    processor=LoggingCallbackProcessor(),
+                    event_kind='PauseEvent',
+                )
+            )
+
+    rng = random.Random(0)
+    events: list[tuple[UUID, Event]] = []
+    for i in range(num_events):
+        event: Event
+        if rng.random() < pause_fraction:
+            event = PauseEvent(source='user')
+        else:
+            event = TokenEvent(
+                source='agent', prompt_token_ids=[i], response_token_ids=[i]
+            )
+        events.append((rng.choice(conversation_ids), event))
+
+    uncached = await _execute(session_maker, events, routing_cache_ttl=0)
+    cached = await _execute(
+        session_maker,
+        events,
+        routing_cache_ttl=sql_event_callback_service.ROUTING_CACHE_TTL,
+    )
+    await engine.dispose()
+
+    print(
+        f'{num_events} events in {num_conversations} conversations, '
+        f'{pause_fraction:.0%} with a callback'
+    )
+    print(f'uncached     {uncached:>10.0f} events/s')
+    print(f'cached       {cached:>10.0f} events/s')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark event callbacks')
+    parser.add_argument('--conversations', type=int, default=100)
+    parser.add_argument('--events', type=int, default=5000)
+    parser.add_argument('--pause-fraction', type=float, default=0.1)
+    args = parser.parse_args()
+
+    # The processor logs each event it is invoked for
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as root:
+        asyncio.run(
+            benchmark(
+                Path(root) / 'benchmark.db',
+                args.conversations,
+                args.events,
+                args.pause_fraction,
+            )
+        )
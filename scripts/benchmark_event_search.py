@@ -0,0 +1,127 @@
+"""Benchmark searching and counting the events of a large conversation.
+
+Stores synthetic events in a conversation, then reports the time to build the
+event index from scratch (as on the first search of a conversation without an
+index), to search a page of events and count events with the index, and to load
+every event (the cost of each search and filtered count without an index).
+
+Uses a temporary directory by default. Pass a bucket to benchmark Google Cloud
+Storage instead; the events are stored under a unique prefix and deleted
+afterwards.
+
+    python scripts/benchmark_event_search.py [--events 20000] [--gcs-bucket NAME]
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from uuid import uuid4
+
+from openhands.agent_server.models import EventSortOrder
+from openhands.app_server.event.event_service_base import EventServiceBase
+from openhands.app_server.event.filesystem_event_service import FilesystemEventService
+from openhands.sdk.event import PauseEvent, TokenEvent
+
+
+async def _store_events(
+    service: EventServiceBase, prefix: Path, num_events: int, concurrency: int
+) -> None:
+    """Store events without indexing them, as before events were indexed."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def store(i: int) -> None:
+        if i % 10:
+            event = TokenEvent(
+                source='agent', prompt_token_ids=[i], response_token_ids=[i]
+            )
+        else:
+            event = PauseEvent(source='user')
+        async with semaphore:
+            await asyncio.to_thread(
+                service._store_event,
+                prefix / f'{event.id.replace("-", "")}.json',
+                event,
+            )
+
+    await asyncio.gather(*[store(i) for i in range(num_events)])
+
+
+async def benchmark(
+    service: EventServiceBase, num_events: int, limit: int, concurrency: int
+) -> None:
+    conversation_id = uuid4()
+    prefix = await service.get_conversation_path(conversation_id)
+    start = time.perf_counter()
+    await _store_events(service, prefix, num_events, concurrency)
+    print(f'store {num_events} events  {time.perf_counter() - start:>10.3f} s')
+
+    start = time.perf_counter()
+    await service.count_events(conversation_id)
+    print(f'build index          {time.perf_counter() - start:>10.3f} s')
+
+    start = time.perf_counter()
+    await service.search_events(
+        conversation_id, sort_order=EventSortOrder.TIMESTAMP_DESC, limit=limit
+    )
+    print(f'search page of {limit:<5} {(time.perf_counter() - start) * 1000:>10.2f} ms')
+
+    start = time.perf_counter()
+    await service.count_events(conversation_id, kind__eq='PauseEvent')
+    print(f'count by kind        {(time.perf_counter() - start) * 1000:>10.2f} ms')
+
+    start = time.perf_counter()
+    paths = await asyncio.to_thread(service._search_paths, prefix)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def load(path: Path) -> None:
+        async with semaphore:
+            await asyncio.to_thread(service._load_event, path)
+
+    await asyncio.gather(*[load(path) for path in paths if path.suffix == '.json'])
+    print(f'load all events      {time.perf_counter() - start:>10.3f} s')
+
+
+def _gcs_service(bucket_name: str, prefix: Path) -> EventServiceBase:
+    from google.cloud import storage
+
+    from openhands.app_server.event.google_cloud_event_service import (
+        GoogleCloudEventService,
+    )
+
+    return GoogleCloudEventService(
+        prefix=prefix,
+        user_id=None,
+        app_conversation_info_service=None,
+        app_conversation_info_load_tasks={},
+        bucket=storage.Client().bucket(bucket_name),
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark event search')
+    parser.add_argument('--events', type=int, default=20_000)
+    parser.add_argument('--limit', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--gcs-bucket', help='Benchmark this GCS bucket')
+    args = parser.parse_args()
+
+    if args.gcs_bucket:
+        prefix = Path('benchmarks', uuid4().hex)
+        service = _gcs_service(args.gcs_bucket, prefix)
+        try:
+            asyncio.run(benchmark(service, args.events, args.limit, args.concurrency))
+        finally:
+            bucket = service.bucket  # type: ignore[attr-defined]
+            for blob in bucket.list_blobs(prefix=str(prefix)):
+                blob.delete()
+    else:
+        with tempfile.TemporaryDirectory() as root:
+            service = FilesystemEventService(
+                prefix=Path(root),
+                user_id=None,
+                app_conversation_info_service=None,
+                app_conversation_info_load_tasks={},
+            )
+            asyncio.run(benchmark(service, args.events, args.limit, args.concurrency))
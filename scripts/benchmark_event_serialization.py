@@ -0,0 +1,95 @@
+"""Benchmark event serialization throughput.
+
+Reports events/sec for `event_to_dict`, `event_from_dict` and
+`EventStream.add_event` with command output and browser observations, alongside
+`dataclasses.asdict` as a reference for the cost of deep copying the fields.
+
+    python scripts/benchmark_event_serialization.py [--iterations 2000]
+"""
+
+import argparse
+import time
+from dataclasses import asdict
+from typing import Callable
+
+from openhands.events import EventSource, EventStream
+from openhands.events.event import Event
+from openhands.events.observation import (
+    BrowserOutputObservation,
+    CmdOutputMetadata,
+    CmdOutputObservation,
+)
+from openhands.events.serialization import event_from_dict, event_to_dict
+from openhands.storage.memory import InMemoryFileStore
+
+
+def make_cmd_output() -> CmdOutputObservation:
+    return CmdOutputObservation(
+        command='ls -la',
+        content='\n'.join(
+            f'-rw-r--r-- 1 user user {i} file_{i}.py' for i in range(500)
+        ),
+        metadata=CmdOutputMetadata(exit_code=0, pid=42, working_dir='/workspace'),
+    )
+
+
+def make_browser_output() -> BrowserOutputObservation:
+    nodes = [
+        {
+            'nodeId': str(i),
+            'role': {'value': 'link'},
+            'name': {'value': f'Link {i}'},
+            'properties': [{'name': 'focusable', 'value': {'value': True}}],
+            'childIds': [str(i + 1)],
+        }
+        for i in range(500)
+    ]
+    return BrowserOutputObservation(
+        url='https://example.com',
+        trigger_by_action='browse',
+        content='Example page text ' * 200,
+        screenshot='data:image/png;base64,' + 'A' * 200_000,
+        set_of_marks='data:image/png;base64,' + 'B' * 200_000,
+        axtree_object={'nodes': nodes},
+        dom_object={'documents': [{'nodes': nodes}]},
+        extra_element_properties={str(i): {'visibility': 1.0} for i in range(500)},
+        open_pages_urls=['https://example.com'],
+    )
+
+
+def measure(fn: Callable[[], object], iterations: int) -> float:
+    """Run `fn` repeatedly and return the number of calls per second."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - start)
+
+
+def benchmark(name: str, make_event: Callable[[], Event], iterations: int) -> None:
+    event = make_event()
+    data = event_to_dict(event)
+    stream = EventStream('benchmark', InMemoryFileStore())
+    events = [make_event() for _ in range(iterations)]
+    pending = iter(events)
+
+    results = {
+        'dataclasses.asdict': measure(lambda: asdict(event), iterations),
+        'event_to_dict': measure(lambda: event_to_dict(event), iterations),
+        'event_from_dict': measure(lambda: event_from_dict(data), iterations),
+        'EventStream.add_event': measure(
+            lambda: stream.add_event(next(pending), EventSource.AGENT), iterations
+        ),
+    }
+    stream.close()
+    print(name)
+    for label, rate in results.items():
+        print(f'  {label:<24} {rate:>12,.0f} events/sec')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark event serialization')
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    benchmark('CmdOutputObservation', make_cmd_output, args.iterations)
+    benchmark('BrowserOutputObservation', make_browser_output, args.iterations)
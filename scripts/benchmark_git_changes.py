@@ -0,0 +1,77 @@
+"""Benchmark getting the git changes in a workspace containing many repositories.
+
+Clones a local origin repository into the workspace many times, modifying a file
+and adding an untracked file in each clone, then reports the time to get the
+changes querying the repositories one at a time (as before they were queried in
+parallel), in parallel, and from a GitChangesCache when nothing has changed.
+
+    python scripts/benchmark_git_changes.py [--repos 20]
+"""
+
+import argparse
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from openhands.runtime.utils import git_changes
+from openhands.runtime.utils.git_changes_cache import GitChangesCache
+
+
+def _git(cwd: Path, *args: str) -> None:
+    subprocess.run(
+        ['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com', *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+    )
+
+
+def _time(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def benchmark(num_repos: int, num_files: int, repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as root:
+        origin = Path(root, 'origin')
+        origin.mkdir()
+        _git(origin, 'init', '-b', 'main')
+        for i in range(num_files):
+            Path(origin, f'file_{i}.txt').write_text(f'file {i}\n')
+        _git(origin, 'add', '.')
+        _git(origin, 'commit', '-m', 'initial')
+
+        workspace = Path(root, 'workspace')
+        workspace.mkdir()
+        for i in range(num_repos):
+            _git(workspace, 'clone', str(origin), f'repo_{i}')
+            Path(workspace, f'repo_{i}', 'file_0.txt').write_text('modified\n')
+            Path(workspace, f'repo_{i}', 'untracked.txt').write_text('new\n')
+        cwd = str(workspace)
+
+        max_workers = git_changes.MAX_WORKERS
+        git_changes.MAX_WORKERS = 1
+        sequential = _time(lambda: git_changes.get_git_changes(cwd), repeat)
+        git_changes.MAX_WORKERS = max_workers
+        parallel = _time(lambda: git_changes.get_git_changes(cwd), repeat)
+
+        cache = GitChangesCache()
+        cache.get_git_changes(cwd)
+        cached = _time(lambda: cache.get_git_changes(cwd), repeat)
+
+        print(f'{num_repos} repositories of {num_files} files')
+        print(f'sequential           {sequential * 1000:>10.1f} ms')
+        print(f'parallel ({max_workers} workers) {parallel * 1000:>10.1f} ms')
+        print(f'cached               {cached * 1000:>10.1f} ms')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark getting git changes')
+    parser.add_argument('--repos', type=int, default=20)
+    parser.add_argument('--files', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    benchmark(args.repos, args.files, args.repeat)
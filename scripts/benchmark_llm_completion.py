@@ -0,0 +1,121 @@
+"""Benchmark the overhead of the LLM completion wrapper.
+
+litellm's completion is replaced with a stub returning a canned response, so the
+timings only cover the work `LLM.completion` does around the provider call:
+formatting, function calling conversion, logging and cost bookkeeping. Reports
+the mean time per call and the peak memory allocated during a call, with native
+and mocked function calling, with and without `log_completions`.
+
+    python scripts/benchmark_llm_completion.py [--messages 300] [--iterations 20]
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from typing import Any
+from unittest.mock import patch
+
+from litellm.types.utils import ModelResponse
+
+from openhands.core.config import LLMConfig
+from openhands.llm.llm import LLM
+
+TOOLS = [
+    {
+        'type': 'function',
+        'function': {
+            'name': 'execute_bash',
+            'description': 'Run a bash command.',
+            'parameters': {
+                'type': 'object',
+                'properties': {'command': {'type': 'string'}},
+                'required': ['command'],
+            },
+        },
+    }
+]
+
+
+def make_messages(count: int) -> list[dict[str, Any]]:
+    """Make a conversation of roughly 500 tokens per message."""
+    messages: list[dict[str, Any]] = [
+        {'role': 'system', 'content': 'You are a helpful assistant.'}
+    ]
+    for i in range(count):
+        role = 'user' if i % 2 == 0 else 'assistant'
+        text = f'Message {i}: ' + 'lorem ipsum dolor sit amet ' * 100
+        messages.append({'role': role, 'content': [{'type': 'text', 'text': text}]})
+    return messages
+
+
+def stub_completion(*args: Any, **kwargs: Any) -> ModelResponse:
+    return ModelResponse(
+        id='benchmark',
+        choices=[
+            {
+                'message': {
+                    'role': 'assistant',
+                    'content': '<function=execute_bash>\n'
+                    '<parameter=command>ls</parameter>\n</function>',
+                }
+            }
+        ],
+        model='benchmark',
+        usage={'prompt_tokens': 150_000, 'completion_tokens': 20},
+    )
+
+
+def benchmark(
+    name: str, model: str, log_completions: bool, messages: list, iterations: int
+) -> None:
+    with tempfile.TemporaryDirectory() as log_folder:
+        config = LLMConfig(
+            model=model,
+            api_key='benchmark',
+            log_completions=log_completions,
+            log_completions_folder=log_folder,
+        )
+        with patch('openhands.llm.llm.litellm_completion', stub_completion):
+            llm = LLM(config, service_id='benchmark')
+        # warm up
+        llm.completion(messages=messages, tools=TOOLS)
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            llm.completion(messages=messages, tools=TOOLS)
+        elapsed = (time.perf_counter() - start) / iterations
+
+        tracemalloc.start()
+        llm.completion(messages=messages, tools=TOOLS)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    print(
+        f'{name:<40} {elapsed * 1000:>10.2f} ms/call {peak / 1024 / 1024:>10.1f} MiB peak'
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark LLM completion overhead')
+    parser.add_argument('--messages', type=int, default=300)
+    parser.add_argument('--iterations', type=int, default=20)
+    args = parser.parse_args()
+
+    messages = make_messages(args.messages)
+    for log_completions in (False, True):
+        suffix = ', log_completions' if log_completions else ''
+        benchmark(
+            f'native function calling{suffix}',
+            'gpt-4o',
+            log_completions,
+            messages,
+            args.iterations,
+        )
+        benchmark(
+            f'mocked function calling{suffix}',
+            'custom-model',
+            log_completions,
+            messages,
+            args.iterations,
+        )
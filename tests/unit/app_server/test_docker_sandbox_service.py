@@ -9,7 +9,8 @@ This module tests the Docker sandbox service implementation, focusing on:
 - Edge cases with malformed container data
 """
 
-from datetime import datetime
+import time
+from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
@@ -1091,6 +1092,231 @@ class TestDockerSandboxService:
         service.httpx_client.get.assert_not_called()
 
 
+class TestDockerSandboxServiceHealthCache:
+    """Test cases for reusing health checks of sandboxes."""
+
+    async def test_get_sandbox_reuses_health_check(
+        self, service, mock_running_container
+    ):
+        """Test that recent health checks are reused unless fresh is requested."""
+        service.docker_client.containers.get.return_value = mock_running_container
+
+        for _ in range(2):
+            result = await service.get_sandbox('oh-test-abc123')
+            assert result.status == SandboxStatus.RUNNING
+        assert service.httpx_client.get.call_count == 1
+
+        result = await service.get_sandbox('oh-test-abc123', fresh=True)
+        assert result.status == SandboxStatus.RUNNING
+        assert service.httpx_client.get.call_count == 2
+        assert service.health_cache.stats.probes == 2
+        assert service.health_cache.stats.failures == 0
+
+    async def test_health_check_ttl(self, service, mock_running_container):
+        """Test that health checks expire, and are not reused with a ttl of 0."""
+        service.docker_client.containers.get.return_value = mock_running_container
+        await service.get_sandbox('oh-test-abc123')
+
+        with patch(
+            'openhands.app_server.sandbox.docker_sandbox_service.time.monotonic',
+            return_value=time.monotonic() + service.health_check_ttl,
+        ):
+            await service.get_sandbox('oh-test-abc123')
+        assert service.httpx_client.get.call_count == 2
+
+        service.health_check_ttl = 0
+        await service.get_sandbox('oh-test-abc123')
+        assert service.httpx_client.get.call_count == 3
+
+    async def test_failures_are_cached_after_startup_grace(
+        self, service, mock_running_container
+    ):
+        """Test that a starting sandbox is checked again until it is running."""
+        service.httpx_client.get.side_effect = httpx.HTTPError('Not started')
+        service.docker_client.containers.get.return_value = mock_running_container
+        mock_running_container.attrs['Created'] = datetime.now(timezone.utc).isoformat()
+
+        for _ in range(2):
+            result = await service.get_sandbox('oh-test-abc123')
+            assert result.status == SandboxStatus.STARTING
+        assert service.httpx_client.get.call_count == 2
+
+        service.startup_grace_seconds = 0
+        for _ in range(2):
+            result = await service.get_sandbox('oh-test-abc123')
+            assert result.status == SandboxStatus.ERROR
+            assert result.exposed_urls is None
+        assert service.httpx_client.get.call_count == 3
+        assert service.health_cache.stats.failures == 3
+
+    async def test_restarted_container_is_checked_again(
+        self, service, mock_running_container
+    ):
+        """Test that a health check is not reused once the agent server port changes."""
+        service.docker_client.containers.get.return_value = mock_running_container
+        await service.get_sandbox('oh-test-abc123')
+        mock_running_container.attrs['NetworkSettings']['Ports']['8000/tcp'] = [
+            {'HostPort': '23456'}
+        ]
+
+        await service.get_sandbox('oh-test-abc123')
+        assert service.httpx_client.get.call_count == 2
+
+    async def test_pause_sandbox_forgets_health_check(
+        self, service, mock_running_container
+    ):
+        """Test that changing the state of a sandbox forgets its health check."""
+        service.docker_client.containers.get.return_value = mock_running_container
+        await service.get_sandbox('oh-test-abc123')
+        await service.pause_sandbox('oh-test-abc123')
+        mock_running_container.status = 'running'
+
+        await service.get_sandbox('oh-test-abc123')
+        assert service.httpx_client.get.call_count == 2
+
+    async def test_check_all_sandboxes(
+        self, service, mock_running_container, mock_paused_container
+    ):
+        """Test that checking all sandboxes refreshes the cache for searches."""
+        second_container = MagicMock()
+        second_container.name = 'oh-test-xyz789'
+        second_container.status = 'running'
+        second_container.image.tags = ['spec456']
+        second_container.attrs = {
+            **mock_running_container.attrs,
+            'NetworkSettings': {'Ports': {'8000/tcp': [{'HostPort': '12347'}]}},
+        }
+        service.docker_client.containers.list.return_value = [
+            mock_running_container,
+            second_container,
+            mock_paused_container,
+        ]
+        service.health_cache.put('oh-test-deleted', 'http://localhost:1/health', True)
+
+        await service.check_all_sandboxes()
+        assert service.httpx_client.get.call_count == 2
+        assert (
+            service.health_cache.get(
+                'oh-test-deleted', 'http://localhost:1/health', service.health_check_ttl
+            )
+            is None
+        )
+
+        result = await service.search_sandboxes()
+        assert [sandbox.status for sandbox in result.items].count(
+            SandboxStatus.RUNNING
+        ) == 2
+        assert service.httpx_client.get.call_count == 2
+
+        await service.search_sandboxes(fresh=True)
+        assert service.httpx_client.get.call_count == 4
+
+
+def _pooled_container(name, status='running', created='2024-01-15T10:30:00Z'):
+    container = MagicMock()
+    container.name = name
+    container.status = status
+    container.labels = {'sandbox_spec_id': 'test-image:latest'}
+    container.image.tags = ['test-image:latest']
+    container.attrs = {
+        'Created': created,
+        'Config': {'Env': ['OH_SESSION_API_KEYS_0=pooled_key']},
+        'NetworkSettings': {'Ports': {'8000/tcp': [{'HostPort': '12345'}]}},
+    }
+    return container
+
+
+class TestDockerSandboxServicePool:
+    """Test cases for the pool of started containers."""
+
+    async def test_pool_disabled(self, service):
+        """Test that nothing is pooled or claimed with a pool size of 0."""
+        await service.replenish_sandbox_pool()
+        assert await service.claim_pooled_sandbox() is None
+        service.docker_client.containers.list.assert_not_called()
+        service.docker_client.containers.run.assert_not_called()
+
+    async def test_claim_renames_oldest_running_container(self, service):
+        """Test that the oldest running pooled container of the spec is claimed."""
+        service.pool_size = 2
+        newer = _pooled_container('oh-agent-pool-newer', created='2024-01-16T00:00:00Z')
+        older = _pooled_container('oh-agent-pool-older')
+        starting = _pooled_container('oh-agent-pool-starting', status='created')
+        other_spec = _pooled_container('oh-agent-pool-other')
+        other_spec.labels = {'sandbox_spec_id': 'other-image:latest'}
+        service.docker_client.containers.list.return_value = [
+            newer,
+            starting,
+            other_spec,
+            older,
+        ]
+        older.rename.side_effect = lambda name: setattr(older, 'name', name)
+
+        result = await service.claim_pooled_sandbox(sandbox_id='abc')
+
+        older.rename.assert_called_once_with('oh-test-abc')
+        newer.rename.assert_not_called()
+        assert result.id == 'oh-test-abc'
+        assert result.session_api_key == 'pooled_key'
+        stats = service.sandbox_pool.stats
+        assert (stats.claims, stats.hits) == (1, 1)
+        assert service.sandbox_pool._replenish_requested.is_set()
+
+    async def test_claim_skips_containers_claimed_elsewhere(self, service):
+        """Test that a container another process renamed first is skipped."""
+        service.pool_size = 1
+        claimed = _pooled_container('oh-agent-pool-claimed')
+        claimed.rename.side_effect = NotFound('Container not found')
+        service.docker_client.containers.list.return_value = [claimed]
+
+        assert await service.claim_pooled_sandbox(sandbox_id='abc') is None
+        assert await service.claim_pooled_sandbox(sandbox_id='abc') is None
+
+        stats = service.sandbox_pool.stats
+        assert (stats.claims, stats.hits, stats.hit_rate) == (2, 0, 0.0)
+
+    async def test_claim_disabled_with_host_network(self, service):
+        """Test that containers are not pooled when they would share ports."""
+        service.pool_size = 1
+        service.use_host_network = True
+        await service.replenish_sandbox_pool()
+        assert await service.claim_pooled_sandbox() is None
+        service.docker_client.containers.run.assert_not_called()
+
+    async def test_replenish_sandbox_pool(self, service):
+        """Test that stopped containers are removed and the pool is filled."""
+        service.pool_size = 3
+        running = _pooled_container('oh-agent-pool-running')
+        exited = _pooled_container('oh-agent-pool-exited', status='exited')
+        service.docker_client.containers.list.return_value = [running, exited]
+
+        await service.replenish_sandbox_pool()
+
+        exited.remove.assert_called_once_with(force=True)
+        running.remove.assert_not_called()
+        run_calls = service.docker_client.containers.run.call_args_list
+        assert len(run_calls) == 2
+        for call in run_calls:
+            assert call.kwargs['name'].startswith('oh-agent-pool-')
+            assert call.kwargs['labels'] == {'sandbox_spec_id': 'test-image:latest'}
+        stats = service.sandbox_pool.stats
+        assert stats.started == 2
+        assert stats.sizes == {'test-image:latest': 3}
+
+    async def test_replenish_stops_on_failure(self, service):
+        """Test that a failure to start a container is recorded."""
+        service.pool_size = 2
+        service.docker_client.containers.list.return_value = []
+        service.docker_client.containers.run.side_effect = APIError('No space')
+
+        await service.replenish_sandbox_pool()
+
+        assert service.docker_client.containers.run.call_count == 1
+        stats = service.sandbox_pool.stats
+        assert (stats.started, stats.failed_starts) == (0, 1)
+        assert stats.sizes == {'test-image:latest': 0}
+
+
 class TestVolumeMount:
     """Test cases for VolumeMount model."""
 
@@ -5,12 +5,16 @@ focusing on search functionality.
 """
 
 import tempfile
+from datetime import datetime
 from pathlib import Path
-from uuid import uuid4
+from unittest.mock import patch
+from uuid import UUID, uuid4
 
 import pytest
 
 from openhands.agent_server.models import EventPage, EventSortOrder
+from openhands.app_server.event import event_service_base
+from openhands.app_server.event.event_service_base import INDEX_NAME
 from openhands.app_server.event.filesystem_event_service import FilesystemEventService
 from openhands.sdk.event import PauseEvent, TokenEvent
 
@@ -217,3 +221,142 @@ class TestFilesystemEventServiceIntegration:
 
         result = await service.search_events(conversation_id)
         assert len(result.items) == 3
+
+
+class TestFilesystemEventServiceIndex:
+    """Test cases for searching and counting events via the index."""
+
+    @pytest.mark.asyncio
+    async def test_search_events_pages_results(self, service: FilesystemEventService):
+        """Test that pages contain only the requested events, in order."""
+        conversation_id = uuid4()
+        events = [create_token_event() for _ in range(5)]
+        for event in events:
+            await service.save_event(conversation_id, event)
+
+        ids = []
+        page_id = None
+        while True:
+            page = await service.search_events(
+                conversation_id, page_id=page_id, limit=2
+            )
+            assert len(page.items) <= 2
+            ids.extend(item.id for item in page.items)
+            page_id = page.next_page_id
+            if page_id is None:
+                break
+
+        expected = sorted(events, key=lambda e: e.timestamp)
+        assert ids == [event.id for event in expected]
+
+    @pytest.mark.asyncio
+    async def test_search_events_loads_only_the_page(
+        self, service: FilesystemEventService
+    ):
+        """Test that only the events on the requested page are loaded."""
+        conversation_id = uuid4()
+        for _ in range(10):
+            await service.save_event(conversation_id, create_token_event())
+        # The first search creates the index
+        await service.search_events(conversation_id, limit=3)
+
+        with patch.object(
+            service, '_load_event', wraps=service._load_event
+        ) as load_event:
+            page = await service.search_events(conversation_id, limit=3)
+
+        assert len(page.items) == 3
+        assert page.next_page_id == '3'
+        assert load_event.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_count_events_with_filters(self, service: FilesystemEventService):
+        """Test that count_events applies kind and timestamp filters."""
+        conversation_id = uuid4()
+        token_events = [create_token_event() for _ in range(3)]
+        pause_event = create_pause_event()
+        for event in token_events:
+            await service.save_event(conversation_id, event)
+        await service.save_event(conversation_id, pause_event)
+
+        assert await service.count_events(conversation_id) == 4
+        assert await service.count_events(conversation_id, kind__eq='PauseEvent') == 1
+        since = datetime.fromisoformat(token_events[1].timestamp)
+        assert await service.count_events(conversation_id, timestamp__gte=since) == 3
+        assert await service.count_events(conversation_id, timestamp__lt=since) == 1
+
+    @pytest.mark.asyncio
+    async def test_index_is_created_for_existing_events(
+        self, service: FilesystemEventService
+    ):
+        """Test that events stored before the index existed are indexed."""
+        conversation_id = uuid4()
+        conversation_path = await service.get_conversation_path(conversation_id)
+        events = [create_token_event() for _ in range(3)]
+        for event in events:
+            service._store_event(
+                conversation_path / f'{event.id.replace("-", "")}.json', event
+            )
+
+        assert await service.count_events(conversation_id) == 3
+        assert (conversation_path / INDEX_NAME).exists()
+
+        # Events saved afterwards are appended to the index
+        await service.save_event(conversation_id, create_pause_event())
+        with patch.object(service, '_load_event') as load_event:
+            assert await service.count_events(conversation_id) == 4
+        load_event.assert_not_called()
+        index = (conversation_path / INDEX_NAME).read_text().splitlines()
+        assert len(index) == 4
+
+    @pytest.mark.asyncio
+    async def test_index_is_checked_for_missing_events(
+        self, service: FilesystemEventService
+    ):
+        """Test that events which were not indexed are found by a new process."""
+        conversation_id = uuid4()
+        await service.save_event(conversation_id, create_token_event())
+        assert await service.count_events(conversation_id) == 1
+
+        # e.g. the server stopped after storing the event, before indexing it
+        conversation_path = await service.get_conversation_path(conversation_id)
+        event = create_pause_event()
+        service._store_event(
+            conversation_path / f'{event.id.replace("-", "")}.json', event
+        )
+        assert await service.count_events(conversation_id) == 1
+
+        with patch.object(event_service_base, '_checked_indexes', set()):
+            assert await service.count_events(conversation_id) == 2
+        assert await service.count_events(conversation_id, kind__eq='PauseEvent') == 1
+
+    @pytest.mark.asyncio
+    async def test_index_is_checked_after_failed_append(
+        self, service: FilesystemEventService
+    ):
+        """Test that an event which could not be appended to the index is found."""
+        conversation_id = uuid4()
+        await service.save_event(conversation_id, create_token_event())
+        assert await service.count_events(conversation_id) == 1
+
+        with patch.object(service, '_append_index', side_effect=OSError('Failed')):
+            await service.save_event(conversation_id, create_pause_event())
+        assert await service.count_events(conversation_id) == 2
+        assert await service.count_events(conversation_id, kind__eq='PauseEvent') == 1
+
+    @pytest.mark.asyncio
+    async def test_get_existing_event_ids(self, service: FilesystemEventService):
+        """Test that saved events are found in the index without loading them."""
+        conversation_id = uuid4()
+        saved = [create_token_event() for _ in range(3)]
+        for event in saved:
+            await service.save_event(conversation_id, event)
+        unsaved = create_pause_event()
+        # The first search creates the index
+        assert await service.count_events(conversation_id) == 3
+        event_ids = [UUID(event.id) for event in saved[:2] + [unsaved]]
+
+        with patch.object(service, '_load_event') as load_event:
+            existing = await service.get_existing_event_ids(conversation_id, event_ids)
+        load_event.assert_not_called()
+        assert existing == {UUID(saved[0].id), UUID(saved[1].id)}
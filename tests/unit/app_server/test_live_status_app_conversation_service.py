@@ -18,6 +18,7 @@ from openhands.app_server.app_conversation.app_conversation_models import (
     AgentType,
     AppConversationInfo,
     AppConversationStartRequest,
+    AppConversationStartTask,
 )
 from openhands.app_server.app_conversation.live_status_app_conversation_service import (
     LiveStatusAppConversationService,
@@ -1286,6 +1287,47 @@ class TestLiveStatusAppConversationService:
         # Verify service calls - should call search_events for each page
         assert self.mock_event_service.search_events.call_count == total_pages
 
+    async def test_wait_for_sandbox_start_claims_pooled_sandbox(self):
+        """Test that a pooled sandbox is claimed instead of starting one."""
+        conversation_id = uuid4()
+        task = AppConversationStartTask(
+            created_by_user_id='test_user_123',
+            request=AppConversationStartRequest(conversation_id=conversation_id),
+        )
+        self.mock_sandbox.id = 'pooled_sandbox'
+        self.mock_sandbox_service.claim_pooled_sandbox = AsyncMock(
+            return_value=self.mock_sandbox
+        )
+        self.mock_sandbox_service.start_sandbox = AsyncMock()
+        self.mock_sandbox_service.wait_for_sandbox_running = AsyncMock()
+
+        tasks = [task async for task in self.service._wait_for_sandbox_start(task)]
+
+        assert tasks[0].sandbox_id == 'pooled_sandbox'
+        self.mock_sandbox_service.claim_pooled_sandbox.assert_called_once_with(
+            sandbox_id=conversation_id.hex
+        )
+        self.mock_sandbox_service.start_sandbox.assert_not_called()
+        self.mock_sandbox_service.wait_for_sandbox_running.assert_called_once()
+
+    async def test_wait_for_sandbox_start_without_pooled_sandbox(self):
+        """Test that a sandbox is started when there is none in the pool."""
+        task = AppConversationStartTask(
+            created_by_user_id='test_user_123',
+            request=AppConversationStartRequest(),
+        )
+        self.mock_sandbox.id = 'new_sandbox'
+        self.mock_sandbox_service.claim_pooled_sandbox = AsyncMock(return_value=None)
+        self.mock_sandbox_service.start_sandbox = AsyncMock(
+            return_value=self.mock_sandbox
+        )
+        self.mock_sandbox_service.wait_for_sandbox_running = AsyncMock()
+
+        tasks = [task async for task in self.service._wait_for_sandbox_start(task)]
+
+        assert tasks[0].sandbox_id == 'new_sandbox'
+        self.mock_sandbox_service.start_sandbox.assert_called_once_with(sandbox_id=None)
+
     @patch(
         'openhands.app_server.app_conversation.live_status_app_conversation_service.AsyncRemoteWorkspace'
     )
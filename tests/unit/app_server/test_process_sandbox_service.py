@@ -1,6 +1,9 @@
 """Tests for ProcessSandboxService."""
 
+import asyncio
 import os
+import subprocess
+import sys
 import tempfile
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -13,6 +16,8 @@ from openhands.app_server.sandbox.process_sandbox_service import (
     ProcessInfo,
     ProcessSandboxService,
     ProcessSandboxServiceInjector,
+    _pooled_processes,
+    _processes,
 )
 from openhands.app_server.sandbox.sandbox_models import SandboxStatus
 
@@ -351,6 +356,136 @@ class TestProcessSandboxService:
             assert sandbox_info.exposed_urls is None
 
 
+@pytest.fixture
+def pooled_processes():
+    """Clear the global store of pooled processes after a test."""
+    yield _pooled_processes
+    _pooled_processes.clear()
+
+
+class TestProcessSandboxServicePool:
+    """Test cases for the pool of started processes."""
+
+    def _patch_start(self, process_sandbox_service, ready: bool = True):
+        mock_process = MagicMock()
+        mock_process.pid = 1234
+        return (
+            patch.object(
+                process_sandbox_service,
+                '_start_agent_process',
+                return_value=mock_process,
+            ),
+            patch.object(
+                process_sandbox_service, '_wait_for_server_ready', return_value=ready
+            ),
+            patch.object(
+                process_sandbox_service,
+                '_get_process_status',
+                return_value=SandboxStatus.RUNNING,
+            ),
+        )
+
+    @pytest.mark.asyncio
+    async def test_pool_disabled(self, process_sandbox_service, pooled_processes):
+        """Test that nothing is pooled or claimed with a pool size of 0."""
+        await process_sandbox_service.replenish_sandbox_pool()
+        assert pooled_processes == {}
+        assert await process_sandbox_service.claim_pooled_sandbox() is None
+        assert process_sandbox_service.sandbox_pool.stats.claims == 0
+
+    @pytest.mark.asyncio
+    async def test_claim_pooled_sandbox(
+        self, process_sandbox_service, pooled_processes
+    ):
+        """Test that a pooled process is handed over to a sandbox only once."""
+        process_sandbox_service.pool_size = 1
+        process_sandbox_service.httpx_client.get.return_value = MagicMock(
+            status_code=200
+        )
+        start, wait, status = self._patch_start(process_sandbox_service)
+        with start as mock_start, wait, status:
+            await process_sandbox_service.replenish_sandbox_pool()
+            await process_sandbox_service.replenish_sandbox_pool()
+            assert mock_start.call_count == 1
+            assert len(pooled_processes) == 1
+            assert next(iter(pooled_processes.values())).user_id is None
+
+            result = await process_sandbox_service.claim_pooled_sandbox(
+                sandbox_id='claimed_sandbox_id'
+            )
+            assert result.id == 'claimed_sandbox_id'
+            assert result.status == SandboxStatus.RUNNING
+            assert pooled_processes == {}
+            assert _processes.pop('claimed_sandbox_id').user_id == 'test-user-id'
+
+            assert await process_sandbox_service.claim_pooled_sandbox() is None
+
+        stats = process_sandbox_service.sandbox_pool.stats
+        assert (stats.claims, stats.hits, stats.hit_rate) == (2, 1, 0.5)
+        assert stats.started == 1
+        assert stats.sizes == {'test-spec': 1}
+
+    @pytest.mark.asyncio
+    async def test_claim_sleeping_pooled_process(
+        self, process_sandbox_service, pooled_processes
+    ):
+        """Test that an idle pooled process, which psutil reports as sleeping, is
+        claimed."""
+        process_sandbox_service.pool_size = 1
+        process = subprocess.Popen(
+            [sys.executable, '-c', 'import time; time.sleep(60)']
+        )
+        try:
+            with (
+                patch.object(
+                    process_sandbox_service,
+                    '_start_agent_process',
+                    return_value=process,
+                ),
+                patch.object(
+                    process_sandbox_service,
+                    '_wait_for_server_ready',
+                    return_value=True,
+                ),
+            ):
+                await process_sandbox_service.replenish_sandbox_pool()
+            # Wait for the interpreter to start up and go to sleep
+            for _ in range(100):
+                if psutil.Process(process.pid).status() == psutil.STATUS_SLEEPING:
+                    break
+                await asyncio.sleep(0.05)
+            assert psutil.Process(process.pid).status() == psutil.STATUS_SLEEPING
+
+            result = await process_sandbox_service.claim_pooled_sandbox(
+                sandbox_id='claimed_sandbox_id'
+            )
+            assert result.id == 'claimed_sandbox_id'
+            assert pooled_processes == {}
+            assert _processes.pop('claimed_sandbox_id').pid == process.pid
+            assert process_sandbox_service.sandbox_pool.stats.hits == 1
+        finally:
+            process.kill()
+            process.wait()
+
+    @pytest.mark.asyncio
+    @patch('psutil.Process')
+    async def test_replenish_discards_processes_not_ready(
+        self, mock_process_class, process_sandbox_service, pooled_processes
+    ):
+        """Test that a pooled process which does not become ready is stopped."""
+        process_sandbox_service.pool_size = 2
+        mock_process_class.return_value.is_running.return_value = False
+        start, wait, status = self._patch_start(process_sandbox_service, ready=False)
+        with start as mock_start, wait, status:
+            await process_sandbox_service.replenish_sandbox_pool()
+
+        assert mock_start.call_count == 1
+        assert pooled_processes == {}
+        stats = process_sandbox_service.sandbox_pool.stats
+        assert (stats.started, stats.failed_starts) == (0, 1)
+        assert stats.sizes == {'test-spec': 0}
+
+
 class TestProcessSandboxServiceInjector:
     """Test cases for ProcessSandboxServiceInjector."""
 
@@ -14,19 +14,26 @@ This module tests the RemoteSandboxService implementation, focusing on:
 from datetime import datetime, timezone
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import UUID
 
 import httpx
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from openhands.agent_server.models import EventPage
+from openhands.app_server.app_conversation.app_conversation_models import (
+    AppConversationInfo,
+)
 from openhands.app_server.errors import SandboxError
 from openhands.app_server.sandbox.remote_sandbox_service import (
     ALLOW_CORS_ORIGINS_VARIABLE,
     POD_STATUS_MAPPING,
     STATUS_MAPPING,
     WEBHOOK_CALLBACK_VARIABLE,
+    AgentServerSyncStats,
     RemoteSandboxService,
     StoredRemoteSandbox,
+    refresh_conversation,
 )
 from openhands.app_server.sandbox.sandbox_models import (
     AGENT_SERVER,
@@ -38,6 +45,7 @@ from openhands.app_server.sandbox.sandbox_models import (
 )
 from openhands.app_server.sandbox.sandbox_spec_models import SandboxSpecInfo
 from openhands.app_server.user.user_context import UserContext
+from openhands.sdk.event import PauseEvent
 
 
 @pytest.fixture
@@ -1012,6 +1020,137 @@ class TestUtilityFunctions:
         assert result == 'http://work-1-localhost:8000'
 
 
+def create_event_page_response(events, next_page_id=None) -> MagicMock:
+    response = MagicMock()
+    response.json.return_value = EventPage(
+        items=events, next_page_id=next_page_id
+    ).model_dump(mode='json')
+    return response
+
+
+class TestRefreshConversation:
+    """Test cases for syncing conversations from polled agent servers."""
+
+    @pytest.fixture
+    def app_conversation_info(self):
+        return AppConversationInfo(created_by_user_id=None, sandbox_id='sandbox-1')
+
+    @pytest.fixture
+    def event_service(self):
+        service = AsyncMock()
+        service.get_existing_event_ids.return_value = set()
+        return service
+
+    async def _refresh(self, app_conversation_info, event_service, pages):
+        app_conversation_info_service = AsyncMock()
+        event_callback_service = AsyncMock()
+        httpx_client = AsyncMock(spec=httpx.AsyncClient)
+        httpx_client.get.side_effect = [MagicMock()] + pages
+        stats = AgentServerSyncStats()
+        with patch(
+            'openhands.app_server.sandbox.remote_sandbox_service.ConversationInfo'
+        ):
+            await refresh_conversation(
+                app_conversation_info_service=app_conversation_info_service,
+                event_service=event_service,
+                event_callback_service=event_callback_service,
+                app_conversation_info=app_conversation_info,
+                runtime={'url': 'https://agent.example.com', 'session_api_key': 'k'},
+                httpx_client=httpx_client,
+                stats=stats,
+            )
+        return (
+            httpx_client,
+            app_conversation_info_service,
+            event_callback_service,
+            stats,
+        )
+
+    @pytest.mark.asyncio
+    async def test_saves_new_events_and_advances_cursor(
+        self, app_conversation_info, event_service
+    ):
+        """Test that only unsynced events are saved and the cursor is saved."""
+        events = [
+            PauseEvent(source='user', timestamp=f'2026-01-01T00:00:0{i}')
+            for i in range(3)
+        ]
+        event_service.get_existing_event_ids.side_effect = [
+            {UUID(events[0].id)},
+            set(),
+        ]
+        pages = [
+            create_event_page_response(events[:2], next_page_id='2'),
+            create_event_page_response(events[2:]),
+        ]
+
+        (
+            httpx_client,
+            app_conversation_info_service,
+            event_callback_service,
+            stats,
+        ) = await self._refresh(app_conversation_info, event_service, pages)
+
+        params = httpx_client.get.call_args_list[1].kwargs['params']
+        assert 'timestamp__gte' not in params
+        assert httpx_client.get.call_args_list[2].kwargs['params']['page_id'] == '2'
+        saved = [call.args[1].id for call in event_service.save_event.call_args_list]
+        assert saved == [events[1].id, events[2].id]
+        assert event_callback_service.execute_callbacks.call_count == 2
+        event_service.get_event.assert_not_called()
+        assert app_conversation_info.event_sync_cursor == '2026-01-01T00:00:02'
+        app_conversation_info_service.save_app_conversation_info.assert_called_once()
+        app_conversation_info_service.update_event_sync_cursor.assert_called_once_with(
+            app_conversation_info.id, '2026-01-01T00:00:02'
+        )
+        assert (stats.conversations, stats.events_pulled, stats.events_saved) == (
+            1,
+            3,
+            2,
+        )
+        assert stats.max_sync_lag is not None and stats.max_sync_lag > 0
+
+    @pytest.mark.asyncio
+    async def test_pulls_events_from_the_cursor(
+        self, app_conversation_info, event_service
+    ):
+        """Test that events are pulled from shortly before the cursor."""
+        app_conversation_info.event_sync_cursor = '2026-01-01T00:01:00'
+        event = PauseEvent(source='user', timestamp='2026-01-01T00:01:00')
+        event_service.get_existing_event_ids.return_value = {UUID(event.id)}
+
+        httpx_client, app_conversation_info_service, _, stats = await self._refresh(
+            app_conversation_info,
+            event_service,
+            [create_event_page_response([event])],
+        )
+
+        params = httpx_client.get.call_args_list[1].kwargs['params']
+        assert params['timestamp__gte'] == '2026-01-01T00:00:55'
+        event_service.save_event.assert_not_called()
+        assert app_conversation_info.event_sync_cursor == '2026-01-01T00:01:00'
+        app_conversation_info_service.update_event_sync_cursor.assert_not_called()
+        assert (stats.events_pulled, stats.events_saved) == (1, 0)
+
+    @pytest.mark.asyncio
+    async def test_cursor_is_not_saved_on_error(
+        self, app_conversation_info, event_service
+    ):
+        """Test that the cursor is unchanged when events cannot be pulled."""
+        response = MagicMock()
+        response.raise_for_status.side_effect = httpx.HTTPError('unavailable')
+
+        _, app_conversation_info_service, _, stats = await self._refresh(
+            app_conversation_info, event_service, [response]
+        )
+
+        assert app_conversation_info.event_sync_cursor is None
+        # The conversation info is saved before events are pulled, the cursor is not
+        app_conversation_info_service.save_app_conversation_info.assert_called_once()
+        app_conversation_info_service.update_event_sync_cursor.assert_not_called()
+        assert stats.failed_conversations == 1
+
+
 class TestConstants:
     """Test cases for constants and mappings."""
 
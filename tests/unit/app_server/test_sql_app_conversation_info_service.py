@@ -95,6 +95,7 @@ def sample_conversation_info() -> AppConversationInfo:
         pr_number=[123, 456],
         llm_model='gpt-4',
         metrics=None,
+        event_sync_cursor='2024-01-01T12:29:59.123456',
         created_at=datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc),
         updated_at=datetime(2024, 1, 1, 12, 30, 0, tzinfo=timezone.utc),
     )
@@ -166,6 +167,10 @@ class TestSQLAppConversationInfoService:
         assert retrieved_info.trigger == sample_conversation_info.trigger
         assert retrieved_info.pr_number == sample_conversation_info.pr_number
         assert retrieved_info.llm_model == sample_conversation_info.llm_model
+        assert (
+            retrieved_info.event_sync_cursor
+            == sample_conversation_info.event_sync_cursor
+        )
 
     @pytest.mark.asyncio
     async def test_get_nonexistent_conversation_info(
@@ -513,6 +518,30 @@ class TestSQLAppConversationInfoService:
         # Verify other fields remain unchanged
         assert retrieved_info.sandbox_id == sample_conversation_info.sandbox_id
 
+    @pytest.mark.asyncio
+    async def test_update_event_sync_cursor(
+        self,
+        service: SQLAppConversationInfoService,
+        sample_conversation_info: AppConversationInfo,
+    ):
+        """Test that updating the event sync cursor leaves other fields as stored."""
+        await service.save_app_conversation_info(sample_conversation_info)
+
+        # A copy with a stale title, as held by a refresh which started earlier
+        stale_info = sample_conversation_info.model_copy()
+        updated_info = sample_conversation_info.model_copy()
+        updated_info.title = 'Updated Title'
+        await service.save_app_conversation_info(updated_info)
+
+        await service.update_event_sync_cursor(stale_info.id, '2024-01-01T13:00:00')
+
+        retrieved_info = await service.get_app_conversation_info(
+            sample_conversation_info.id
+        )
+        assert retrieved_info is not None
+        assert retrieved_info.event_sync_cursor == '2024-01-01T13:00:00'
+        assert retrieved_info.title == 'Updated Title'
+
     @pytest.mark.asyncio
     async def test_search_with_invalid_page_id(
         self,
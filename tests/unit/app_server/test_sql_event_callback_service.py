@@ -7,22 +7,35 @@ using SQLite as a mock database.
 
 from datetime import datetime, timezone
 from typing import AsyncGenerator
-from uuid import uuid4
+from unittest.mock import patch
+from uuid import UUID, uuid4
 
 import pytest
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import StaticPool
 
+from openhands.app_server.event_callback import sql_event_callback_service
 from openhands.app_server.event_callback.event_callback_models import (
     CreateEventCallbackRequest,
     EventCallback,
     EventCallbackProcessor,
+    EventCallbackStatus,
     LoggingCallbackProcessor,
 )
+from openhands.app_server.event_callback.event_callback_result_models import (
+    EventCallbackResult,
+    EventCallbackResultStatus,
+)
 from openhands.app_server.event_callback.sql_event_callback_service import (
     SQLEventCallbackService,
+    StoredEventCallback,
+    StoredEventCallbackResult,
+    _CallbackRoutingCache,
 )
 from openhands.app_server.utils.sql_utils import Base
+from openhands.sdk import Event
+from openhands.sdk.event import PauseEvent
 
 
 @pytest.fixture
@@ -653,3 +666,160 @@ class TestSQLEventCallbackService:
         retrieved_callback = await service.get_event_callback(sample_callback.id)
         assert retrieved_callback is not None
         assert retrieved_callback.id == sample_callback.id
+
+
+class CompletingCallbackProcessor(EventCallbackProcessor):
+    """Processor which marks its callback as completed."""
+
+    async def __call__(
+        self,
+        conversation_id: UUID,
+        callback: EventCallback,
+        event: Event,
+    ) -> EventCallbackResult | None:
+        callback.status = EventCallbackStatus.COMPLETED
+        return None
+
+
+class FailingCallbackProcessor(EventCallbackProcessor):
+    """Processor which raises an exception."""
+
+    async def __call__(
+        self,
+        conversation_id: UUID,
+        callback: EventCallback,
+        event: Event,
+    ) -> EventCallbackResult | None:
+        raise ValueError('failed')
+
+
+class TestExecuteCallbacks:
+    """Test cases for executing callbacks through the routing cache."""
+
+    @pytest.fixture(autouse=True)
+    def routing_cache(self):
+        with patch.object(
+            sql_event_callback_service, '_routing_cache', _CallbackRoutingCache()
+        ) as routing_cache:
+            yield routing_cache
+
+    async def _get_results(self, service: SQLEventCallbackService):
+        result = await service.db_session.execute(select(StoredEventCallbackResult))
+        return result.scalars().all()
+
+    async def test_results_are_stored(self, service: SQLEventCallbackService):
+        """Test that the results of all matching callbacks are stored."""
+        conversation_id = uuid4()
+        for processor in [LoggingCallbackProcessor(), FailingCallbackProcessor()]:
+            await service.create_event_callback(
+                CreateEventCallbackRequest(
+                    conversation_id=conversation_id, processor=processor
+                )
+            )
+        await service.create_event_callback(
+            CreateEventCallbackRequest(
+                conversation_id=uuid4(), processor=LoggingCallbackProcessor()
+            )
+        )
+        event = PauseEvent(source='user')
+
+        await service.execute_callbacks(conversation_id, event)
+
+        results = await self._get_results(service)
+        assert {result.status for result in results} == {
+            EventCallbackResultStatus.ERROR,
+            EventCallbackResultStatus.SUCCESS,
+        }
+        assert all(result.event_id == event.id for result in results)
+
+    async def test_callbacks_are_cached(self, service: SQLEventCallbackService):
+        """Test that the callbacks are only queried once per conversation and kind."""
+        conversation_id = uuid4()
+        await service.create_event_callback(
+            CreateEventCallbackRequest(
+                conversation_id=conversation_id,
+                processor=LoggingCallbackProcessor(),
+                event_kind='PauseEvent',
+            )
+        )
+
+        with patch.object(
+            service.db_session, 'execute', wraps=service.db_session.execute
+        ) as execute:
+            for _ in range(3):
+                await service.execute_callbacks(
+                    conversation_id, PauseEvent(source='user')
+                )
+        # One query for the callbacks, and one insert of results per event
+        assert execute.call_count == 4
+        assert len(await self._get_results(service)) == 3
+
+    async def test_cache_is_invalidated_on_change(
+        self, service: SQLEventCallbackService
+    ):
+        """Test that callbacks created or deleted after caching are seen."""
+        conversation_id = uuid4()
+        await service.execute_callbacks(conversation_id, PauseEvent(source='user'))
+        assert await self._get_results(service) == []
+
+        callback = await service.create_event_callback(
+            CreateEventCallbackRequest(
+                conversation_id=conversation_id, processor=LoggingCallbackProcessor()
+            )
+        )
+        await service.execute_callbacks(conversation_id, PauseEvent(source='user'))
+        assert len(await self._get_results(service)) == 1
+
+        await service.delete_event_callback(callback.id)
+        await service.execute_callbacks(conversation_id, PauseEvent(source='user'))
+        assert len(await self._get_results(service)) == 1
+
+    async def test_cache_can_be_disabled(self, service: SQLEventCallbackService):
+        """Test that callbacks are queried for each event without the cache."""
+        service.routing_cache_ttl = 0
+        conversation_id = uuid4()
+        await service.execute_callbacks(conversation_id, PauseEvent(source='user'))
+        # e.g. created by another process
+        service.db_session.add(
+            StoredEventCallback(
+                **EventCallback(
+                    conversation_id=conversation_id,
+                    processor=LoggingCallbackProcessor(),
+                ).model_dump()
+            )
+        )
+        await service.db_session.commit()
+
+        await service.execute_callbacks(conversation_id, PauseEvent(source='user'))
+        assert len(await self._get_results(service)) == 1
+
+    async def test_only_changed_callbacks_are_saved(
+        self, service: SQLEventCallbackService
+    ):
+        """Test that callbacks are saved only when they changed themselves."""
+        conversation_id = uuid4()
+        completing = await service.create_event_callback(
+            CreateEventCallbackRequest(
+                conversation_id=conversation_id,
+                processor=CompletingCallbackProcessor(),
+            )
+        )
+        await service.create_event_callback(
+            CreateEventCallbackRequest(
+                conversation_id=conversation_id, processor=LoggingCallbackProcessor()
+            )
+        )
+
+        with patch.object(
+            service, 'save_event_callback', wraps=service.save_event_callback
+        ) as save_event_callback:
+            await service.execute_callbacks(conversation_id, PauseEvent(source='user'))
+            await service.execute_callbacks(conversation_id, PauseEvent(source='user'))
+
+        saved = [call.args[0].id for call in save_event_callback.call_args_list]
+        assert saved == [completing.id]
+        stored = await service.get_event_callback(completing.id)
+        assert stored is not None
+        assert stored.status == EventCallbackStatus.COMPLETED
+        # The completed callback is no longer executed
+        assert len(await self._get_results(service)) == 2
@@ -821,6 +821,55 @@ class TestStuckDetector:
             assert stuck_detector.is_stuck(headless_mode=False) is False
             mock_warning.assert_not_called()
 
+    def test_long_history_matches_fresh_detector(self, stuck_detector):
+        state = stuck_detector.state
+        events: list[Event] = [cmd_ls_action, cmd_ls_observation, pwd_action]
+        events += [
+            read_file1_action,
+            read_file1_observation,
+            ErrorObservation(content='error'),
+            MessageAction(content='Thinking', wait_for_response=False),
+            AgentCondensationObservation('summary'),
+            NullObservation(content=''),
+        ]
+        user_message = MessageAction(content='Go on', wait_for_response=False)
+        user_message._source = EventSource.USER
+        events.append(user_message)
+
+        for i in range(1200):
+            state.history.append(events[(i * 7 + i // 5) % len(events)])
+            if i % 100 == 0:
+                # loop recovery truncates the history
+                state.history = state.history[: len(state.history) // 2]
+            for headless_mode in (True, False):
+                fresh_detector = StuckDetector(state)
+                is_stuck = stuck_detector.is_stuck(headless_mode)
+                assert is_stuck == fresh_detector.is_stuck(headless_mode)
+                if is_stuck:
+                    assert (
+                        stuck_detector.stuck_analysis == fresh_detector.stuck_analysis
+                    )
+
+    def test_only_new_events_are_processed(self, stuck_detector):
+        state = stuck_detector.state
+        for i in range(1000):
+            state.history.append(CmdRunAction(command=f'ls {i}'))
+            state.history.append(CmdOutputObservation(content='', command=f'ls {i}'))
+        assert stuck_detector.is_stuck() is False
+
+        with patch(
+            'openhands.controller.stuck._RollingHistory.add',
+            autospec=True,
+            side_effect=stuck_detector._history.add.__func__,
+        ) as mock_add:
+            for _ in range(4):
+                state.history.append(cmd_ls_action)
+                state.history.append(cmd_ls_observation)
+                stuck_detector.is_stuck()
+        assert mock_add.call_count == 8
+        assert stuck_detector.stuck_analysis is not None
+        assert stuck_detector.stuck_analysis.loop_start_idx == 2000
+
     @pytest.fixture
     def stuck_detector_mcdc(self):
         return StuckDetector(state=None)
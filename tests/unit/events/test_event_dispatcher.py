@@ -0,0 +1,210 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from pytest import TempPathFactory
+
+from openhands.events import EventSource, EventStream, EventStreamSubscriber
+from openhands.events.event_dispatcher import EventDispatcher, EventDispatcherMode
+from openhands.events.observation import NullObservation
+from openhands.storage import get_file_store
+
+
+@pytest.fixture
+def temp_dir(tmp_path_factory: TempPathFactory) -> str:
+    return str(tmp_path_factory.mktemp('test_event_dispatcher'))
+
+
+@pytest.fixture
+def dispatcher(monkeypatch):
+    dispatcher = EventDispatcher(max_workers=2, max_queue_size=4)
+    monkeypatch.setattr(
+        'openhands.events.stream.get_event_dispatcher', lambda: dispatcher
+    )
+    yield dispatcher
+    dispatcher.shutdown()
+
+
+def _wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'Timed out waiting for condition'
+        time.sleep(0.01)
+
+
+def _create_stream(temp_dir: str, sid: str = 'abc') -> EventStream:
+    return EventStream(
+        sid,
+        get_file_store('local', temp_dir),
+        dispatcher_mode=EventDispatcherMode.ASYNCIO,
+    )
+
+
+def test_no_queue_thread_in_asyncio_mode(temp_dir: str, dispatcher):
+    stream = _create_stream(temp_dir)
+    assert not stream._queue_thread.is_alive()
+    stream.subscribe(EventStreamSubscriber.TEST, lambda event: None, 'callback')
+    assert stream._thread_pools[EventStreamSubscriber.TEST] == {}
+    stream.close()
+
+
+def test_sync_callbacks_receive_events_in_order(temp_dir: str, dispatcher):
+    stream = _create_stream(temp_dir)
+    received: list[int] = []
+
+    def callback(event):
+        # Sync callbacks run on a worker thread with its own event loop
+        asyncio.get_event_loop().run_until_complete(asyncio.sleep(0))
+        received.append(event.id)
+
+    stream.subscribe(EventStreamSubscriber.TEST, callback, 'callback')
+    for i in range(10):
+        stream.add_event(NullObservation(f'event {i}'), EventSource.AGENT)
+
+    _wait_for(lambda: len(received) == 10)
+    assert received == list(range(10))
+    stream.close()
+
+
+def test_async_callbacks_run_on_shared_loop(temp_dir: str, dispatcher):
+    first = _create_stream(temp_dir, 'first')
+    second = _create_stream(temp_dir, 'second')
+    threads: set[str] = set()
+    received: list[tuple[str, int]] = []
+
+    async def callback(event):
+        threads.add(threading.current_thread().name)
+        await asyncio.sleep(0)
+        received.append((event.source, event.id))
+
+    first.subscribe(EventStreamSubscriber.TEST, callback, 'callback')
+    second.subscribe(EventStreamSubscriber.TEST, callback, 'callback')
+    first.add_event(NullObservation(''), EventSource.AGENT)
+    second.add_event(NullObservation(''), EventSource.USER)
+
+    _wait_for(lambda: len(received) == 2)
+    assert threads == {'event-dispatcher'}
+    first.close()
+    second.close()
+
+
+def test_callback_errors_do_not_stop_delivery(temp_dir: str, dispatcher):
+    stream = _create_stream(temp_dir)
+    received: list[int] = []
+
+    def callback(event):
+        if event.id == 0:
+            raise RuntimeError('boom')
+        received.append(event.id)
+
+    stream.subscribe(EventStreamSubscriber.TEST, callback, 'callback')
+    stream.add_event(NullObservation(''), EventSource.AGENT)
+    stream.add_event(NullObservation(''), EventSource.AGENT)
+
+    _wait_for(lambda: received == [1])
+    metrics = dispatcher.get_metrics()['abc/test/callback']
+    assert metrics.errors == 1
+    assert metrics.events_processed == 2
+    stream.close()
+
+
+def test_backpressure_and_metrics(temp_dir: str, dispatcher):
+    stream = _create_stream(temp_dir)
+    release = threading.Event()
+    received: list[int] = []
+
+    def callback(event):
+        release.wait()
+        received.append(event.id)
+
+    stream.subscribe(EventStreamSubscriber.TEST, callback, 'callback')
+    # Fill the queue: one event in the callback and the rest waiting
+    for _ in range(4):
+        stream.add_event(NullObservation(''), EventSource.AGENT)
+
+    producer = threading.Thread(
+        target=stream.add_event, args=(NullObservation(''), EventSource.AGENT)
+    )
+    producer.start()
+    time.sleep(0.2)
+    # The producer is held back until the subscriber catches up
+    assert producer.is_alive()
+
+    release.set()
+    producer.join(timeout=5)
+    assert not producer.is_alive()
+    _wait_for(lambda: len(received) == 5)
+    assert received == list(range(5))
+
+    metrics = dispatcher.get_metrics()['abc/test/callback']
+    assert metrics.backpressure_waits == 1
+    assert metrics.max_queue_depth == 4
+    assert metrics.queue_depth == 0
+    assert metrics.events_processed == 5
+    assert metrics.max_latency > 0
+    stream.close()
+
+
+@pytest.mark.asyncio
+async def test_full_queue_spills_without_blocking_event_loop(temp_dir: str, dispatcher):
+    stream = _create_stream(temp_dir)
+    release = threading.Event()
+    received: list[tuple[int, str]] = []
+
+    def callback(event):
+        release.wait()
+        received.append((event.id, event.content))
+
+    stream.subscribe(EventStreamSubscriber.TEST, callback, 'callback')
+    # Called with a running event loop, so add_event never waits for the queue
+    start = time.monotonic()
+    for i in range(8):
+        stream.add_event(NullObservation(f'event {i}'), EventSource.AGENT)
+    assert time.monotonic() - start < dispatcher.backpressure_timeout
+
+    release.set()
+    await asyncio.to_thread(_wait_for, lambda: len(received) == 8)
+    # Spilled events are loaded from the store, and delivered in order
+    assert received == [(i, f'event {i}') for i in range(8)]
+
+    metrics = dispatcher.get_metrics()['abc/test/callback']
+    assert metrics.backpressure_waits == 0
+    assert metrics.spilled == 4
+    assert metrics.queue_depth == 0
+    stream.close()
+
+
+def test_unsubscribe_stops_delivery(temp_dir: str, dispatcher):
+    stream = _create_stream(temp_dir)
+    received: list[int] = []
+    stream.subscribe(
+        EventStreamSubscriber.TEST, lambda event: received.append(event.id), 'cb'
+    )
+    stream.add_event(NullObservation(''), EventSource.AGENT)
+    _wait_for(lambda: received == [0])
+
+    stream.unsubscribe(EventStreamSubscriber.TEST, 'cb')
+    stream.add_event(NullObservation(''), EventSource.AGENT)
+    time.sleep(0.1)
+    assert received == [0]
+    assert dispatcher.get_metrics() == {}
+    stream.close()
+
+
+def test_async_callback_in_thread_mode(temp_dir: str):
+    stream = EventStream(
+        'abc',
+        get_file_store('local', temp_dir),
+        dispatcher_mode=EventDispatcherMode.THREAD,
+    )
+    received: list[int] = []
+
+    async def callback(event):
+        await asyncio.sleep(0)
+        received.append(event.id)
+
+    stream.subscribe(EventStreamSubscriber.TEST, callback, 'callback')
+    stream.add_event(NullObservation(''), EventSource.AGENT)
+    _wait_for(lambda: received == [0])
+    stream.close()
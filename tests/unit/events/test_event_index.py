@@ -0,0 +1,179 @@
+from unittest.mock import patch
+
+import pytest
+
+from openhands.events import EventSource, EventStream
+from openhands.events.action import CmdRunAction, MessageAction
+from openhands.events.action.action import Action
+from openhands.events.event_filter import EventFilter
+from openhands.events.event_index import EventIndex, EventIndexEntry
+from openhands.events.event_store import EventStore
+from openhands.events.observation import CmdOutputObservation, NullObservation
+from openhands.events.serialization.event import event_from_dict
+from openhands.storage.locations import get_conversation_event_index_dir
+from openhands.storage.memory import InMemoryFileStore
+
+
+def _add_events(event_stream: EventStream, count: int) -> None:
+    for i in range(count):
+        if i % 10 == 0:
+            event_stream.add_event(MessageAction(f'msg{i}'), EventSource.USER)
+        elif i % 2:
+            event_stream.add_event(CmdRunAction(f'echo {i}'), EventSource.AGENT)
+        else:
+            event_stream.add_event(
+                CmdOutputObservation(str(i), command=f'echo {i}', hidden=i % 4 == 0),
+                EventSource.ENVIRONMENT,
+            )
+
+
+def _count_deserialized(event_store: EventStore, **kwargs) -> tuple[list, int]:
+    with patch(
+        'openhands.events.event_store.event_from_dict', wraps=event_from_dict
+    ) as mock_from_dict:
+        events = list(event_store.search_events(**kwargs))
+    return events, mock_from_dict.call_count
+
+
+def test_entry_from_dict():
+    entry = EventIndexEntry.from_dict(
+        {
+            'id': 3,
+            'timestamp': '2025-01-01T00:00:00',
+            'source': 'environment',
+            'observation': 'run',
+            'content': 'hello',
+            'extras': {'hidden': True},
+        },
+        offset=10,
+        length=20,
+    )
+    assert entry == EventIndexEntry(
+        3, 'observation', 'run', 'environment', '2025-01-01T00:00:00', True, 10, 20
+    )
+    assert EventIndexEntry.from_line(entry.to_line()) == entry
+    assert entry.get_event_class() is CmdOutputObservation
+
+
+def test_include_entry():
+    entry = EventIndexEntry(1, 'action', 'run', 'agent', '2025-01-02T00:00:00')
+    assert EventFilter(include_types=(Action,)).include_entry(entry)
+    assert not EventFilter(include_types=(MessageAction,)).include_entry(entry)
+    assert not EventFilter(exclude_types=(CmdRunAction,)).include_entry(entry)
+    assert not EventFilter(source='user').include_entry(entry)
+    assert not EventFilter(start_date='2025-01-03').include_entry(entry)
+    assert not EventFilter(end_date='2025-01-01').include_entry(entry)
+    # The query can only be checked on the event itself
+    assert EventFilter(query='anything').include_entry(entry)
+
+
+def test_index_load_spans_chunks():
+    file_store = InMemoryFileStore()
+    index = EventIndex('abc', file_store, chunk_size=4)
+    for id in range(10):
+        index.append(EventIndexEntry(id, 'action', 'run', 'agent', None))
+    index = EventIndex('abc', file_store, chunk_size=4)
+    assert sorted(index.load(2, 9)) == list(range(2, 9))
+
+
+@pytest.mark.parametrize('log_format', ['file', 'segmented'])
+def test_filtered_search_only_loads_matching_events(monkeypatch, log_format):
+    monkeypatch.setenv('OPENHANDS_EVENT_LOG_FORMAT', log_format)
+    file_store = InMemoryFileStore()
+    _add_events(EventStream('abc', file_store), 100)
+    event_store = EventStore('abc', file_store, None)
+
+    events, num_loaded = _count_deserialized(
+        event_store, filter=EventFilter(include_types=(MessageAction,))
+    )
+    assert [e.id for e in events] == list(range(0, 100, 10))
+    assert num_loaded == 10
+
+    events, num_loaded = _count_deserialized(
+        event_store,
+        reverse=True,
+        limit=3,
+        filter=EventFilter(source='environment', exclude_hidden=True),
+    )
+    assert [e.id for e in events] == [98, 94, 86]
+    assert num_loaded == 3
+
+
+def test_unindexed_prefix_is_still_searched():
+    file_store = InMemoryFileStore()
+    _add_events(EventStream('abc', file_store), 20)
+    # Simulate a conversation created before the index existed
+    file_store.delete(get_conversation_event_index_dir('abc'))
+    _add_events(EventStream('abc', file_store), 20)
+
+    event_store = EventStore('abc', file_store, None)
+    events = event_store.search_events(
+        filter=EventFilter(include_types=(MessageAction,))
+    )
+    assert [e.id for e in events] == [0, 10, 20, 30]
+    events = event_store.search_events(filter=EventFilter(query='echo 13'))
+    assert [e.id for e in events] == [13, 33]
+
+
+def test_missing_entries_are_repaired_on_write():
+    file_store = InMemoryFileStore()
+    _add_events(EventStream('abc', file_store), 5)
+    chunk = f'{get_conversation_event_index_dir("abc")}chunk-0000000000.jsonl'
+    lines = file_store.read(chunk).splitlines(keepends=True)
+    file_store.write(chunk, ''.join(lines[:3]))
+
+    EventStream('abc', file_store).add_event(NullObservation(''), EventSource.AGENT)
+    assert sorted(EventIndex('abc', file_store).load(0, 100)) == list(range(6))
+
+
+def test_ids_missing_within_a_chunk_are_still_searched():
+    file_store = InMemoryFileStore()
+    _add_events(EventStream('abc', file_store), 20)
+    chunk = f'{get_conversation_event_index_dir("abc")}chunk-0000000000.jsonl'
+    lines = file_store.read(chunk).splitlines(keepends=True)
+    file_store.write(chunk, ''.join(lines[:10] + lines[11:]))
+
+    event_store = EventStore('abc', file_store, None)
+    events = event_store.search_events(
+        filter=EventFilter(include_types=(MessageAction,))
+    )
+    assert [e.id for e in events] == [0, 10]
+
+
+class _RewritingFileStore(InMemoryFileStore):
+    """A store without native append, like S3 and GCS."""
+
+    native_append = False
+
+    def append(self, path: str, contents: str) -> None:
+        raise AssertionError(f'Unexpected append to {path}')
+
+
+def test_chunks_are_written_when_full_without_native_append():
+    file_store = _RewritingFileStore()
+    chunk_dir = get_conversation_event_index_dir('abc')
+    event_stream = EventStream('abc', file_store)
+    event_stream._event_index.chunk_size = 10
+    _add_events(event_stream, 5)
+    assert not any(path.startswith(chunk_dir) for path in file_store.files)
+
+    # Events added before a restart are indexed once the chunk is full
+    event_stream = EventStream('abc', file_store)
+    event_stream._event_index.chunk_size = 10
+    with patch.object(file_store, 'write', wraps=file_store.write) as mock_write:
+        _add_events(event_stream, 10)
+    chunk_writes = [
+        call.args[0]
+        for call in mock_write.call_args_list
+        if call.args[0].startswith(chunk_dir)
+    ]
+    assert chunk_writes == [f'{chunk_dir}chunk-0000000000.jsonl']
+
+    index = EventIndex('abc', file_store, chunk_size=10)
+    assert sorted(index.load(0, 15)) == list(range(10))
+    event_store = EventStore('abc', file_store, None)
+    event_store._event_index.chunk_size = 10
+    events = event_store.search_events(
+        filter=EventFilter(include_types=(MessageAction,))
+    )
+    assert [e.id for e in events] == [0, 5]
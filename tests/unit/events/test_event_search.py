@@ -0,0 +1,99 @@
+import json
+from unittest.mock import patch
+
+from openhands.events import EventSource, EventStream
+from openhands.events.action import CmdRunAction, MessageAction
+from openhands.events.event_filter import EventFilter
+from openhands.events.event_store import EventStore
+from openhands.events.observation import CmdOutputObservation
+from openhands.events.serialization.event import event_from_dict
+from openhands.storage.locations import get_conversation_event_filename
+from openhands.storage.memory import InMemoryFileStore
+
+
+def _make_data() -> dict:
+    return {
+        'id': 4,
+        'timestamp': '2025-01-01T00:00:00',
+        'source': 'agent',
+        'message': 'Running command: ls',
+        'action': 'run',
+        'args': {
+            'command': 'ls',
+            'is_input': False,
+            'thought': '',
+            'blocking': False,
+            'is_static': False,
+            'cwd': None,
+            'hidden': False,
+            'confirmation_state': 'confirmed',
+            'security_risk': -1,
+        },
+    }
+
+
+def _make_store() -> tuple[InMemoryFileStore, EventStore]:
+    file_store = InMemoryFileStore()
+    event_stream = EventStream('abc', file_store)
+    event_stream.add_event(MessageAction('hello'), EventSource.USER)
+    event_stream.add_event(CmdRunAction('ls'), EventSource.AGENT)
+    event_stream.add_event(
+        CmdOutputObservation('file.txt', command='ls'), EventSource.ENVIRONMENT
+    )
+    return file_store, EventStore('abc', file_store, None)
+
+
+def test_filter_on_raw_dict():
+    data = _make_data()
+    assert EventFilter(include_types=(CmdRunAction,)).include_dict(data)
+    assert not EventFilter(source='user').include_dict(data)
+    assert EventFilter(query='LS').include_dict(data)
+    assert not EventFilter(query='pwd').include_dict(data)
+    event = event_from_dict(data)
+    assert EventFilter(query='LS').include(event)
+    assert not EventFilter(query='pwd').include(event)
+
+
+def test_search_event_dicts_does_not_deserialize():
+    _, event_store = _make_store()
+    with patch(
+        'openhands.events.event_store.event_from_dict', side_effect=AssertionError
+    ):
+        events = list(event_store.search_event_dicts())
+        assert [e['id'] for e in events] == [0, 1, 2]
+        events = list(
+            event_store.search_event_dicts(filter=EventFilter(query='file.txt'))
+        )
+        assert [e['id'] for e in events] == [2]
+
+
+def test_search_events_skips_excluded_headers_without_deserializing():
+    _, event_store = _make_store()
+    with patch(
+        'openhands.events.event_store.event_from_dict', wraps=event_from_dict
+    ) as mock_from_dict:
+        events = list(
+            event_store.search_events(filter=EventFilter(include_types=(CmdRunAction,)))
+        )
+    assert [e.id for e in events] == [1]
+    assert isinstance(events[0], CmdRunAction)
+    assert mock_from_dict.call_count == 1
+
+
+def test_search_events_query_matches_materialized_events():
+    file_store, event_store = _make_store()
+    # The stored message is regenerated from the command when deserialized
+    filename = get_conversation_event_filename('abc', 1, None)
+    data = json.loads(file_store.read(filename))
+    data['message'] = 'needle'
+    file_store.write(filename, json.dumps(data))
+
+    events = list(event_store.search_events(filter=EventFilter(query='needle')))
+    assert events == []
+    events = list(
+        event_store.search_events(filter=EventFilter(query='running command'), limit=1)
+    )
+    assert [e.id for e in events] == [1]
+    # Raw dicts are matched as stored
+    dicts = list(event_store.search_event_dicts(filter=EventFilter(query='needle')))
+    assert [d['id'] for d in dicts] == [1]
@@ -1,6 +1,16 @@
+from dataclasses import asdict
+
+import pytest
+
 from openhands.events.action import CmdRunAction, MessageAction
 from openhands.events.action.action import ActionSecurityRisk
-from openhands.events.observation import CmdOutputMetadata, CmdOutputObservation
+from openhands.events.observation import (
+    BrowserOutputObservation,
+    CmdOutputMetadata,
+    CmdOutputObservation,
+)
+from openhands.events.observation.agent import MicroagentKnowledge, RecallObservation
+from openhands.events.recall_type import RecallType
 from openhands.events.serialization import event_from_dict, event_to_dict
 from openhands.llm.metrics import Cost, Metrics, ResponseLatency, TokenUsage
 
@@ -150,3 +160,59 @@ def test_action_risk_serialization():
     # Test deserialization
     deserialized = event_from_dict(serialized)
     assert deserialized.security_risk == ActionSecurityRisk.UNKNOWN
+
+
+@pytest.mark.parametrize(
+    'event',
+    [
+        CmdRunAction(command='ls', thought='listing'),
+        MessageAction(content='hi', image_urls=['http://a/b.png']),
+        CmdOutputObservation(
+            command='ls', content='out', metadata=CmdOutputMetadata(exit_code=0)
+        ),
+        BrowserOutputObservation(
+            url='http://example.com',
+            trigger_by_action='browse',
+            content='page',
+            screenshot='data:image/png;base64,AAAA',
+            dom_object={'1': {'tag': 'a', 'children': [{'tag': 'b'}]}},
+            axtree_object={'nodes': [{'role': 'link', 'name': {'value': 'x'}}]},
+            open_pages_urls=['http://example.com'],
+        ),
+        RecallObservation(
+            recall_type=RecallType.KNOWLEDGE,
+            content='',
+            microagent_knowledge=[
+                MicroagentKnowledge(name='git', trigger='git', content='use git')
+            ],
+        ),
+    ],
+)
+def test_event_to_dict_matches_asdict(event):
+    serialized = event_to_dict(event)
+    props = asdict(event)
+    body = serialized['args'] if 'action' in serialized else serialized['extras']
+    for key, value in body.items():
+        expected = props[key]
+        if hasattr(expected, 'value'):
+            expected = expected.value
+        elif hasattr(expected, 'model_dump'):
+            expected = expected.model_dump()
+        assert value == expected, key
+    assert event_from_dict(serialized) == event_from_dict(event_to_dict(event))
+
+
+def test_event_to_dict_does_not_share_containers():
+    obs = BrowserOutputObservation(
+        url='http://example.com',
+        trigger_by_action='browse',
+        content='page',
+        axtree_object={'nodes': [{'role': 'link'}]},
+    )
+    serialized = event_to_dict(obs)
+    serialized['extras']['axtree_object']['nodes'][0]['role'] = 'changed'
+    assert obs.axtree_object == {'nodes': [{'role': 'link'}]}
+
+    restored = event_from_dict(serialized)
+    serialized['extras']['axtree_object']['nodes'].clear()
+    assert restored.axtree_object == {'nodes': [{'role': 'changed'}]}
@@ -762,6 +762,28 @@ def test_secrets_replaced_in_content(temp_dir: str):
     assert 'secret123' not in data_with_secrets_replaced['args']['command']
 
 
+def test_subscribers_receive_masked_event(temp_dir: str):
+    file_store = get_file_store('local', temp_dir)
+    stream = EventStream('test_session', file_store)
+    received = []
+    stream.subscribe(EventStreamSubscriber.TEST, received.append, 'callback')
+
+    # Without secrets the event is not rebuilt from its serialized form
+    action = CmdRunAction(command='ls')
+    stream.add_event(action, EventSource.AGENT)
+
+    stream.set_secrets({'api_key': 'secret123'})
+    stream.add_event(CmdRunAction(command='echo secret123'), EventSource.AGENT)
+
+    deadline = time.time() + 5
+    while len(received) < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    assert received[0] is action
+    assert received[1].command == 'echo <secret_hidden>'
+    assert stream.get_event(1).command == 'echo <secret_hidden>'
+    stream.close()
+
+
 def test_timestamp_not_affected_by_secret_replacement(temp_dir: str):
     """Test that timestamps are not corrupted by secret replacement."""
     file_store = get_file_store('local', temp_dir)
@@ -0,0 +1,109 @@
+import random
+import string
+
+from openhands.events.secret_masker import SECRET_PLACEHOLDER, SecretMasker
+
+
+def test_mask_str():
+    masker = SecretMasker(['abc123', 'xyz'])
+    assert masker.mask_str('key=abc123 other=xyz') == (
+        f'key={SECRET_PLACEHOLDER} other={SECRET_PLACEHOLDER}'
+    )
+    value = 'nothing to hide'
+    assert masker.mask_str(value) is value
+
+
+def test_overlapping_secrets_prefer_longest():
+    masker = SecretMasker(['token', 'token-with-suffix', 'secret'])
+    assert masker.mask_str('token-with-suffix and token') == (
+        f'{SECRET_PLACEHOLDER} and {SECRET_PLACEHOLDER}'
+    )
+    # The placeholder itself is never masked again
+    assert masker.mask_str('secret token') == (
+        f'{SECRET_PLACEHOLDER} {SECRET_PLACEHOLDER}'
+    )
+
+
+def test_overlapping_occurrences_are_masked_together():
+    masker = SecretMasker(['abc', 'bcdef'])
+    assert masker.mask_str('xabcdefx') == f'x{SECRET_PLACEHOLDER}x'
+    assert masker.mask_bytes(b'xabcdefx abc') == (
+        f'x{SECRET_PLACEHOLDER}x {SECRET_PLACEHOLDER}'.encode()
+    )
+    # A secret overlapping itself
+    masker = SecretMasker(['aba'])
+    assert masker.mask_str('ababa aba') == (
+        f'{SECRET_PLACEHOLDER} {SECRET_PLACEHOLDER}'
+    )
+
+
+def test_empty_secrets_are_ignored():
+    masker = SecretMasker(['', ''])
+    assert not masker
+    assert masker.mask({'a': 'value'}) == ({'a': 'value'}, False)
+
+
+def test_mask_nested_values():
+    masker = SecretMasker(['s3cr3t'])
+    data = {
+        'args': {
+            'command': 'echo s3cr3t',
+            'env': ['A=s3cr3t', 'B=public'],
+            'pair': ('s3cr3t', 1),
+            'raw': b'bytes s3cr3t',
+            'count': 3,
+        }
+    }
+    masked, found = masker.mask(data)
+    assert found
+    assert masked is data
+    assert data['args'] == {
+        'command': f'echo {SECRET_PLACEHOLDER}',
+        'env': [f'A={SECRET_PLACEHOLDER}', 'B=public'],
+        'pair': (SECRET_PLACEHOLDER, 1),
+        'raw': f'bytes {SECRET_PLACEHOLDER}'.encode(),
+        'count': 3,
+    }
+    assert masker.mask({'args': {'command': 'ls'}}) == (
+        {'args': {'command': 'ls'}},
+        False,
+    )
+
+
+def test_mask_bytes_with_multiple_secrets():
+    masker = SecretMasker(['one', 'two'])
+    assert masker.mask_bytes(b'one two three') == (
+        f'{SECRET_PLACEHOLDER} {SECRET_PLACEHOLDER} three'.encode()
+    )
+
+
+def test_masking_large_output():
+    """Mask a large command output against many secrets."""
+    rng = random.Random(0)
+    secrets = [
+        ''.join(rng.choices(string.ascii_letters + string.digits, k=32))
+        for _ in range(50)
+    ]
+    lines = [
+        ''.join(rng.choices(string.ascii_letters + ' ', k=80)) for _ in range(10_000)
+    ]
+    lines[5_000] = f'export TOKEN={secrets[10]}'
+    data = {
+        'content': '\n'.join(lines),
+        'extras': {'env': [f'VAR_{i}=value_{i}' for i in range(1_000)]},
+    }
+
+    def replace_each(value):
+        # The previous approach - one replace per secret, for every string
+        if isinstance(value, dict):
+            return {key: replace_each(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [replace_each(item) for item in value]
+        for secret in secrets:
+            value = value.replace(secret, SECRET_PLACEHOLDER)
+        return value
+
+    expected = replace_each(data)
+    masked, found = SecretMasker(secrets).mask(data)
+    assert found
+    assert masked == expected
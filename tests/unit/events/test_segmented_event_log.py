@@ -0,0 +1,169 @@
+import json
+
+import pytest
+from pytest import TempPathFactory
+
+from openhands.events import EventSource, EventStream
+from openhands.events.action import CmdRunAction, NullAction
+from openhands.events.event_filter import EventFilter
+from openhands.events.event_store import EventStore
+from openhands.events.observation import NullObservation
+from openhands.events.segmented_event_log import (
+    EventLogFormat,
+    SegmentedEventLog,
+    migrate_conversation,
+)
+from openhands.storage import get_file_store
+from openhands.storage.locations import (
+    get_conversation_event_log_dir,
+    get_conversation_events_dir,
+)
+from openhands.storage.memory import InMemoryFileStore
+
+
+@pytest.fixture
+def temp_dir(tmp_path_factory: TempPathFactory) -> str:
+    return str(tmp_path_factory.mktemp('test_segmented_event_log'))
+
+
+@pytest.fixture
+def segmented(monkeypatch):
+    monkeypatch.setenv('OPENHANDS_EVENT_LOG_FORMAT', 'segmented')
+
+
+def test_append_and_read():
+    file_store = InMemoryFileStore()
+    log = SegmentedEventLog('abc', file_store, segment_size=3)
+    for id in range(7):
+        log.append(id, json.dumps({'id': id}))
+
+    assert log.list_segments() == [0, 3, 6]
+    assert log.next_id() == 7
+    assert json.loads(log.read(4)) == {'id': 4}
+    assert log.read(7) is None
+    assert sorted(log.read_segment(3)) == [3, 4, 5]
+
+    # A fresh instance reads everything back from storage
+    log = SegmentedEventLog('abc', file_store, segment_size=3)
+    assert log.next_id() == 7
+    assert [json.loads(log.read(id))['id'] for id in range(7)] == list(range(7))
+
+
+def test_missing_index_is_rebuilt_from_segment():
+    file_store = InMemoryFileStore()
+    log = SegmentedEventLog('abc', file_store, segment_size=10)
+    for id in range(4):
+        log.append(id, json.dumps({'id': id}))
+    file_store.delete(f'{get_conversation_event_log_dir("abc")}segment-0000000000.idx')
+
+    log = SegmentedEventLog('abc', file_store, segment_size=10)
+    assert log.next_id() == 4
+    assert json.loads(log.read(2)) == {'id': 2}
+
+
+def test_partial_record_is_truncated_before_append():
+    file_store = InMemoryFileStore()
+    log = SegmentedEventLog('abc', file_store, segment_size=10)
+    log.append(0, json.dumps({'id': 0}))
+    log.append(1, json.dumps({'id': 1}))
+    # Simulate a crash half way through writing a record
+    segment = f'{get_conversation_event_log_dir("abc")}segment-0000000000.log'
+    file_store.append(segment, '2 100\n{"id": ')
+
+    log = SegmentedEventLog('abc', file_store, segment_size=10)
+    assert log.next_id() == 2
+    log.append(2, json.dumps({'id': 2}))
+    assert json.loads(log.read(2)) == {'id': 2}
+    assert json.loads(log.read(1)) == {'id': 1}
+
+
+def test_event_stream_writes_segments(temp_dir: str, segmented):
+    file_store = get_file_store('local', temp_dir)
+    event_stream = EventStream('abc', file_store)
+    assert event_stream.log_format == EventLogFormat.SEGMENTED
+    for i in range(30):
+        event_stream.add_event(NullObservation(f'obs{i}'), EventSource.AGENT)
+
+    with pytest.raises(FileNotFoundError):
+        file_store.list(get_conversation_events_dir('abc'))
+
+    event_store = EventStore('abc', file_store, None)
+    assert event_store.cur_id == 30
+    events = list(event_store.search_events())
+    assert [e.content for e in events] == [f'obs{i}' for i in range(30)]
+    assert event_store.get_event(12).content == 'obs12'
+    reversed_events = list(event_store.search_events(reverse=True, limit=2))
+    assert [e.id for e in reversed_events] == [29, 28]
+
+
+def test_legacy_conversation_continues_in_segments(temp_dir: str, monkeypatch):
+    file_store = get_file_store('local', temp_dir)
+    event_stream = EventStream('abc', file_store)
+    event_stream.add_event(NullAction(), EventSource.AGENT)
+    event_stream.add_event(CmdRunAction('ls'), EventSource.AGENT)
+
+    monkeypatch.setenv('OPENHANDS_EVENT_LOG_FORMAT', 'segmented')
+    event_stream = EventStream('abc', file_store)
+    assert event_stream.cur_id == 2
+    event_stream.add_event(NullObservation('obs'), EventSource.ENVIRONMENT)
+
+    event_store = EventStore('abc', file_store, None)
+    events = list(event_store.search_events())
+    assert [e.id for e in events] == [0, 1, 2]
+    assert isinstance(events[1], CmdRunAction)
+    assert [
+        e.id
+        for e in event_store.search_events(filter=EventFilter(source='environment'))
+    ] == [2]
+
+    # Switching back to per-event files still sees the segmented events
+    monkeypatch.setenv('OPENHANDS_EVENT_LOG_FORMAT', 'file')
+    event_store = EventStore('abc', file_store, None)
+    assert event_store.cur_id == 3
+    assert event_store.get_event(2).content == 'obs'
+
+
+def test_migrate_conversation(temp_dir: str, monkeypatch):
+    file_store = get_file_store('local', temp_dir)
+    event_stream = EventStream('abc', file_store, 'user1')
+    for i in range(5):
+        event_stream.add_event(NullObservation(f'obs{i}'), EventSource.AGENT)
+
+    assert migrate_conversation(file_store, 'abc', 'user1', delete_legacy=True) == 5
+    with pytest.raises(FileNotFoundError):
+        file_store.list(get_conversation_events_dir('abc', 'user1'))
+
+    monkeypatch.setenv('OPENHANDS_EVENT_LOG_FORMAT', 'segmented')
+    event_store = EventStore('abc', file_store, 'user1')
+    assert event_store.cur_id == 5
+    assert [e.content for e in event_store.search_events()] == [
+        f'obs{i}' for i in range(5)
+    ]
+
+
+def test_migrate_conversation_is_resumable():
+    file_store = InMemoryFileStore()
+    event_stream = EventStream('abc', file_store)
+    for i in range(3):
+        event_stream.add_event(NullObservation(f'obs{i}'), EventSource.AGENT)
+    assert migrate_conversation(file_store, 'abc') == 3
+    assert migrate_conversation(file_store, 'abc') == 0
+
+
+class _RewritingFileStore(InMemoryFileStore):
+    """A store which appends by rewriting the whole file, like S3 and GCS."""
+
+    native_append = False
+
+
+def test_segmented_format_needs_native_append(segmented):
+    file_store = _RewritingFileStore()
+    event_stream = EventStream('abc', file_store)
+    assert event_stream.log_format == EventLogFormat.FILE_PER_EVENT
+    event_stream.add_event(NullObservation('obs'), EventSource.AGENT)
+
+    assert file_store.list(get_conversation_events_dir('abc'))
+    event_log_dir = get_conversation_event_log_dir('abc')
+    assert not any(path.startswith(event_log_dir) for path in file_store.files)
+    with pytest.raises(ValueError):
+        migrate_conversation(file_store, 'abc')
@@ -859,6 +859,54 @@ def test_get_token_count_error_handling(
     )
 
 
+def test_get_token_count_matches_litellm(default_config):
+    import litellm
+
+    llm = LLM(default_config, service_id='test-service')
+    messages = [
+        {'role': 'system', 'content': 'You are a helpful assistant.'},
+        {'role': 'user', 'content': [{'type': 'text', 'text': 'Hello there!'}]},
+        {'role': 'assistant', 'content': 'Hi! How can I help?'},
+    ]
+
+    expected = litellm.token_counter(model=default_config.model, messages=messages)
+    assert llm.get_token_count(messages) == expected
+    # cached counts give the same total
+    assert llm.get_token_count(messages) == expected
+    assert llm.get_token_count([]) == litellm.token_counter(
+        model=default_config.model, messages=[]
+    )
+
+    counts = llm.get_token_counts(messages)
+    assert len(counts) == 3
+    assert all(count > 0 for count in counts)
+    assert sum(counts) < expected
+
+
+@patch('openhands.llm.llm.litellm.token_counter')
+def test_get_token_count_only_counts_new_messages(mock_token_counter, default_config):
+    mock_token_counter.side_effect = lambda model, messages, custom_tokenizer: (
+        3 + sum(len(message['content']) for message in messages)
+    )
+    llm = LLM(default_config, service_id='test-service')
+    history = [{'role': 'user', 'content': 'Hello!'}]
+    assert llm.get_token_count(history) == 9
+
+    for i in range(10):
+        history.append({'role': 'assistant', 'content': f'Reply {i}'})
+        llm.get_token_count(history)
+
+    # each message was counted once, plus the count of no messages
+    assert mock_token_counter.call_count == 12
+    assert llm.get_token_count(history) == 3 + 6 + 10 * 7
+    assert llm.get_token_counts(history) == [6] + [7] * 10
+
+    # a changed message is counted again
+    history[0] = {'role': 'user', 'content': 'Hi!'}
+    assert llm.get_token_count(history) == 3 + 3 + 10 * 7
+    assert mock_token_counter.call_count == 13
+
+
 @patch('openhands.llm.llm.litellm_completion')
 def test_llm_token_usage(mock_litellm_completion, default_config):
     # This mock response includes usage details with prompt_tokens,
@@ -1018,6 +1066,81 @@ def test_completion_with_log_completions(mock_litellm_completion, default_config
         assert len(files) == 1
 
 
+@patch('openhands.llm.llm.litellm_completion')
+def test_completion_does_not_copy_messages_without_logging(
+    mock_litellm_completion, default_config
+):
+    from litellm.types.utils import ModelResponse
+
+    mock_response = ModelResponse(
+        id='test-id',
+        choices=[{'message': {'content': 'Test response'}}],
+        model='test-model',
+    )
+    mock_litellm_completion.return_value = mock_response
+    messages = [{'role': 'user', 'content': 'Hello!'}]
+
+    test_llm = LLM(config=default_config, service_id='test-service')
+    with patch('openhands.llm.llm.copy.deepcopy', wraps=copy.deepcopy) as deepcopy:
+        response = test_llm.completion(messages=messages)
+
+    deepcopy.assert_not_called()
+    assert mock_litellm_completion.call_args[1]['messages'][0] is messages[0]
+    assert response is mock_response
+
+
+@patch('openhands.llm.llm.litellm_completion')
+def test_completion_with_log_completions_mocked_function_calling(
+    mock_litellm_completion, default_config
+):
+    import json
+
+    from litellm.types.utils import ModelResponse
+
+    mock_litellm_completion.return_value = ModelResponse(
+        id='test-id',
+        choices=[
+            {
+                'message': {
+                    'role': 'assistant',
+                    'content': '<function=test>\n</function>',
+                }
+            }
+        ],
+        model='test-model',
+    )
+    messages = [
+        {'role': 'system', 'content': 'You are a helpful assistant.'},
+        {'role': 'user', 'content': 'Hello!'},
+    ]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # a model not in FUNCTION_CALLING_SUPPORTED_MODELS
+        default_config.model = 'custom-model'
+        default_config.log_completions = True
+        default_config.log_completions_folder = temp_dir
+        test_llm = LLM(config=default_config, service_id='test-service')
+        response = test_llm.completion(
+            messages=messages,
+            tools=[
+                {
+                    'type': 'function',
+                    'function': {'name': 'test', 'description': 'test'},
+                }
+            ],
+        )
+        [log_file] = list(Path(temp_dir).iterdir())
+        logged = json.loads(log_file.read_text())
+
+    assert response.choices[0].message.tool_calls[0].function.name == 'test'
+    assert logged['fncall_messages'] == messages
+    assert logged['response']['choices'][0]['message']['content'] == (
+        '<function=test>\n</function>'
+    )
+    assert logged['response']['choices'][0]['message'].get('tool_calls') is None
+    assert logged['fncall_response']['choices'][0]['message']['tool_calls']
+
+
 @patch('httpx.get')
 def test_llm_base_url_auto_protocol_patch(mock_get):
     """Test that LLM base_url without protocol is automatically fixed with 'http://'."""
@@ -1717,3 +1717,66 @@ def test_process_events_does_not_reinsert_condensed_initial_message(
         for content in msg.content:
             if hasattr(content, 'text'):
                 assert 'Do task A, B, and C' not in content.text
+
+
+def test_process_events_converts_only_new_events(conversation_memory):
+    """Tests that process_events resumes from the messages of the previous call."""
+    system_message = SystemMessageAction(content='System message')
+    system_message._source = EventSource.AGENT
+    user_message = MessageAction(content='Initial user query')
+    user_message._source = EventSource.USER
+    cmd_action = CmdRunAction(command='ls', thought='Running ls')
+    cmd_action._source = EventSource.AGENT
+    cmd_action.tool_call_metadata = _create_mock_tool_call_metadata(
+        tool_call_id='call_ls_1', function_name='execute_bash', response_id='resp_1'
+    )
+    cmd_obs = CmdOutputObservation(
+        command_id=1, command='ls', content='file1.txt', exit_code=0
+    )
+    cmd_obs._source = EventSource.AGENT
+    cmd_obs.tool_call_metadata = _create_mock_tool_call_metadata(
+        tool_call_id='call_ls_1', function_name='execute_bash', response_id='resp_1'
+    )
+    followup = MessageAction(content='Thanks')
+    followup._source = EventSource.USER
+
+    def process(history: list[Event]):
+        return conversation_memory.process_events(
+            condensed_history=list(history),
+            initial_user_action=user_message,
+            max_message_chars=None,
+            vision_is_active=False,
+        )
+
+    # The tool call is still waiting for its result at the end of the first call
+    first = process([system_message, user_message, cmd_action])
+    assert [m.role for m in first] == ['system', 'user']
+
+    conversation_memory.apply_prompt_caching(first)
+    original_process_action = conversation_memory._process_action
+    conversation_memory._process_action = Mock(side_effect=original_process_action)
+    history = [system_message, user_message, cmd_action, cmd_obs, followup]
+    second = process(history)
+
+    # Only the newly appended action was converted
+    assert conversation_memory._process_action.call_count == 1
+    assert [m.role for m in second] == ['system', 'user', 'assistant', 'tool', 'user']
+    # Prompt caching marks copies, so the cached messages are left unchanged
+    assert second[0].content[-1].cache_prompt is False
+    assert second[1].content[-1].cache_prompt is False
+
+    fresh_memory = ConversationMemory(
+        conversation_memory.agent_config, conversation_memory.prompt_manager
+    )
+    expected = fresh_memory.process_events(
+        condensed_history=list(history),
+        initial_user_action=user_message,
+        max_message_chars=None,
+        vision_is_active=False,
+    )
+    assert second == expected
+
+    # A history which is not an extension of the previous one is converted in full
+    conversation_memory._process_action.reset_mock()
+    process([system_message, user_message, followup])
+    assert conversation_memory._process_action.call_count == 3
@@ -2,7 +2,7 @@ from openhands.events.action.agent import CondensationAction, CondensationReques
 from openhands.events.action.message import MessageAction
 from openhands.events.event import Event
 from openhands.events.observation.agent import AgentCondensationObservation
-from openhands.memory.view import View
+from openhands.memory.view import IncrementalView, View
 
 
 def test_view_preserves_uncondensed_lists() -> None:
@@ -265,3 +265,81 @@ def set_ids(events: list[Event]) -> None:
     """Set the IDs of the events in the list to their index."""
     for i, e in enumerate(events):
         e._id = i  # type: ignore
+
+
+def _assert_same_view(view: View, expected: View) -> None:
+    assert len(view.events) == len(expected.events)
+    for event, expected_event in zip(view.events, expected.events):
+        if isinstance(expected_event, AgentCondensationObservation):
+            assert isinstance(event, AgentCondensationObservation)
+            assert event.content == expected_event.content
+        else:
+            assert event is expected_event
+    assert view.forgotten_event_ids == expected.forgotten_event_ids
+    assert (
+        view.unhandled_condensation_request == expected.unhandled_condensation_request
+    )
+
+
+def test_incremental_view_matches_from_events() -> None:
+    """Tests that applying events one at a time gives the same view as rebuilding."""
+    events: list[Event] = [
+        *[MessageAction(content=f'Event {i}') for i in range(5)],
+        CondensationRequestAction(),
+        CondensationAction(
+            forgotten_event_ids=[1, 2], summary='Summary 1', summary_offset=1
+        ),
+        *[MessageAction(content=f'Event {i}') for i in range(5)],
+        CondensationAction(forgotten_events_start_id=3, forgotten_events_end_id=9),
+        MessageAction(content='After condensation'),
+        CondensationRequestAction(),
+        CondensationAction(
+            forgotten_event_ids=[10], summary='Summary 2', summary_offset=2
+        ),
+        MessageAction(content='Last'),
+    ]
+    set_ids(events)
+
+    incremental_view = IncrementalView()
+    for i in range(len(events) + 1):
+        _assert_same_view(
+            incremental_view.update(events[:i]), View.from_events(events[:i])
+        )
+
+
+def test_incremental_view_reuses_events() -> None:
+    """Tests that updates only apply new events and keep the same event objects."""
+    events: list[Event] = [MessageAction(content=f'Event {i}') for i in range(3)]
+    events.append(
+        CondensationAction(forgotten_event_ids=[0], summary='Sum', summary_offset=0)
+    )
+    set_ids(events)
+
+    incremental_view = IncrementalView()
+    view = incremental_view.update(events)
+    # No new events - the same view is returned
+    assert incremental_view.update(events) is view
+
+    events.append(MessageAction(content='New'))
+    set_ids(events)
+    new_view = incremental_view.update(events)
+    # The summary observation is not re-created
+    assert new_view.events[0] is view.events[0]
+    assert new_view.events[:-1] == view.events
+    assert new_view.events[-1] is events[-1]
+
+
+def test_incremental_view_rebuilds_when_history_replaced() -> None:
+    """Tests that the view is rebuilt if the history was not simply appended to."""
+    events: list[Event] = [MessageAction(content=f'Event {i}') for i in range(4)]
+    set_ids(events)
+    incremental_view = IncrementalView()
+    incremental_view.update(events)
+
+    # Truncated
+    _assert_same_view(incremental_view.update(events[:2]), View.from_events(events[:2]))
+
+    # Replaced by a different history of the same length
+    other: list[Event] = [MessageAction(content=f'Other {i}') for i in range(2)]
+    set_ids(other)
+    _assert_same_view(incremental_view.update(other), View.from_events(other))
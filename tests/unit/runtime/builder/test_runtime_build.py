@@ -9,12 +9,14 @@ from unittest.mock import ANY, MagicMock, mock_open, patch
 import docker
 import pytest
 import toml
+from dirhash import dirhash
 from pytest import TempPathFactory
 
 import openhands
 from openhands import __version__ as oh_version
 from openhands.core.logger import openhands_logger as logger
 from openhands.runtime.builder.docker import DockerRuntimeBuilder
+from openhands.runtime.utils import runtime_build
 from openhands.runtime.utils.runtime_build import (
     BuildFromImageType,
     _generate_dockerfile,
@@ -31,6 +33,11 @@ OH_VERSION = f'oh_v{oh_version}'
 DEFAULT_BASE_IMAGE = 'nikolaik/python-nodejs:python3.12-nodejs22'
 
 
+@pytest.fixture(autouse=True)
+def clear_lock_hashes():
+    runtime_build._lock_hashes.clear()
+
+
 @pytest.fixture
 def temp_dir(tmp_path_factory: TempPathFactory) -> str:
     return str(tmp_path_factory.mktemp('test_runtime_build'))
@@ -136,21 +143,21 @@ def test_get_hash_for_lock_files_different_enable_browser():
         assert hash_true != hash_false  # They should be different
 
 
-def test_get_hash_for_source_files():
-    dirhash_mock = MagicMock()
-    dirhash_mock.return_value = '1f69bd20d68d9e3874d5bf7f7459709b'
-    with patch(f'{get_hash_for_source_files.__module__}.dirhash', dirhash_mock):
+def test_get_hash_for_source_files(tmp_path):
+    with patch('tempfile.tempdir', str(tmp_path)):
         result = get_hash_for_source_files()
-        assert result == truncate_hash(dirhash_mock.return_value)
-        dirhash_mock.assert_called_once_with(
-            Path(openhands.__file__).parent,
-            'md5',
-            ignore=[
-                '.*/',  # hidden directories
-                '__pycache__/',
-                '*.pyc',
-            ],
-        )
+        # The second call reuses the file hashes saved by the first
+        assert get_hash_for_source_files() == result
+    expected = dirhash(
+        Path(openhands.__file__).parent,
+        'md5',
+        ignore=[
+            '.*/',  # hidden directories
+            '__pycache__/',
+            '*.pyc',
+        ],
+    )
+    assert result == truncate_hash(expected)
 
 
 def test_generate_dockerfile_build_from_scratch():
@@ -0,0 +1,139 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+
+from openhands.core.config import OpenHandsConfig
+from openhands.core.exceptions import (
+    AgentRuntimeDisconnectedError,
+    AgentRuntimeError,
+    AgentRuntimeTimeoutError,
+)
+from openhands.events.action import CmdRunAction
+from openhands.events.serialization import event_to_dict
+from openhands.runtime.impl.action_execution.action_channel import ActionChannel
+from openhands.runtime.impl.action_execution.action_execution_client import (
+    ActionExecutionClient,
+)
+from openhands.utils.http_session import HttpSession
+
+sync_server = pytest.importorskip('websockets.sync.server')
+
+
+def _handle(connection) -> None:
+    """Answer each request on its own thread, so later requests can finish first."""
+    send_lock = threading.Lock()
+
+    def send(message: dict) -> None:
+        with send_lock:
+            connection.send(json.dumps(message))
+
+    def run(request: dict) -> None:
+        command = request['action']['args']['command']
+        if command.startswith('sleep '):
+            time.sleep(float(command.split()[1]))
+        if command == 'fail':
+            send({'id': request['id'], 'error': 'command failed'})
+            return
+        if command == 'disconnect':
+            connection.close()
+            return
+        if request['stream_output']:
+            for i in range(3):
+                send({'id': request['id'], 'output': f'{i}\n'})
+        send({'id': request['id'], 'observation': {'content': f'ran {command}'}})
+
+    if connection.request.headers.get('X-Session-API-Key') != 'secret':
+        connection.close()
+        return
+    for raw in connection:
+        threading.Thread(target=run, args=(json.loads(raw),)).start()
+
+
+@pytest.fixture
+def server_url():
+    server = sync_server.serve(_handle, '127.0.0.1', 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.socket.getsockname()
+    yield f'ws://{host}:{port}'
+    server.shutdown()
+    thread.join()
+
+
+@pytest.fixture
+def channel(server_url):
+    channel = ActionChannel(server_url, {'X-Session-API-Key': 'secret'})
+    yield channel
+    channel.close()
+
+
+def _action(command: str) -> dict:
+    return event_to_dict(CmdRunAction(command=command))
+
+
+def test_execute_streams_output(channel):
+    outputs: list[str] = []
+    observation = channel.execute(_action('ls'), 5, output_callback=outputs.append)
+    assert observation == {'content': 'ran ls'}
+    assert outputs == ['0\n', '1\n', '2\n']
+
+
+def test_pipelined_requests_are_matched_by_id(channel):
+    commands = ['sleep 0.3', 'sleep 0.2', 'sleep 0.1', 'echo']
+    with ThreadPoolExecutor(len(commands)) as executor:
+        observations = list(
+            executor.map(lambda c: channel.execute(_action(c), 5), commands)
+        )
+    assert observations == [{'content': f'ran {c}'} for c in commands]
+
+
+def test_execute_error(channel):
+    with pytest.raises(AgentRuntimeError, match='command failed'):
+        channel.execute(_action('fail'), 5)
+    # The channel is still usable after a failed action
+    assert channel.execute(_action('ls'), 5) == {'content': 'ran ls'}
+
+
+def test_execute_timeout(channel):
+    with pytest.raises(AgentRuntimeTimeoutError):
+        channel.execute(_action('sleep 1'), 0.1)
+
+
+def test_disconnect_fails_pending_requests(channel):
+    with pytest.raises(AgentRuntimeDisconnectedError):
+        channel.execute(_action('disconnect'), 5)
+    assert channel.closed
+    with pytest.raises(AgentRuntimeDisconnectedError):
+        channel.execute(_action('ls'), 5)
+
+
+def _runtime(url: str) -> MagicMock:
+    config = OpenHandsConfig()
+    config.sandbox.use_action_channel = True
+    runtime = MagicMock(spec=ActionExecutionClient)
+    runtime.config = config
+    runtime.action_execution_server_url = url
+    runtime.session = HttpSession(headers={'X-Session-API-Key': 'secret'})
+    runtime._action_channel = None
+    runtime._action_channel_unavailable = False
+    return runtime
+
+
+def test_client_connects_action_channel(server_url):
+    runtime = _runtime(server_url.replace('ws://', 'http://'))
+    channel = ActionExecutionClient._get_action_channel(runtime)
+    assert channel is not None
+    assert channel.execute(_action('ls'), 5) == {'content': 'ran ls'}
+    # The channel is reused
+    assert ActionExecutionClient._get_action_channel(runtime) is channel
+    channel.close()
+
+
+def test_client_falls_back_to_http():
+    runtime = _runtime('http://127.0.0.1:1')
+    assert ActionExecutionClient._get_action_channel(runtime) is None
+    assert runtime._action_channel_unavailable
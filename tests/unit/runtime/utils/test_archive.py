@@ -0,0 +1,143 @@
+import io
+import os
+import tarfile
+import zipfile
+
+import pytest
+
+from openhands.runtime.utils.archive import (
+    ZSTD,
+    TarStream,
+    build_manifest,
+    extract_tar_stream,
+    get_available_compressions,
+    iter_zip,
+    walk_files,
+)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / 'proj'
+    (root / 'src' / 'pkg').mkdir(parents=True)
+    (root / 'node_modules' / 'dep').mkdir(parents=True)
+    (root / 'src' / 'main.py').write_text('print(1)')
+    (root / 'src' / 'pkg' / 'util.py').write_text('x = 1')
+    (root / 'src' / 'pkg' / 'util.pyc').write_bytes(b'\x00')
+    (root / 'node_modules' / 'dep' / 'index.js').write_text('js')
+    (root / 'README.md').write_text('readme')
+    (root / 'big.bin').write_bytes(os.urandom(3 * 1024 * 1024 + 7))
+    return root
+
+
+def _files(root) -> dict[str, bytes]:
+    return {relpath: open(path, 'rb').read() for relpath, path in walk_files(str(root))}
+
+
+def test_walk_files_globs(tree):
+    assert [relpath for relpath, _ in walk_files(str(tree))] == [
+        'README.md',
+        'big.bin',
+        'node_modules/dep/index.js',
+        'src/main.py',
+        'src/pkg/util.py',
+        'src/pkg/util.pyc',
+    ]
+    assert [
+        relpath
+        for relpath, _ in walk_files(str(tree), exclude=['node_modules', '*.pyc'])
+    ] == ['README.md', 'big.bin', 'src/main.py', 'src/pkg/util.py']
+    # As with fnmatch, * also matches /
+    assert [relpath for relpath, _ in walk_files(str(tree), include=['src/*.py'])] == [
+        'src/main.py',
+        'src/pkg/util.py',
+    ]
+
+
+def test_tar_stream_roundtrip(tree, tmp_path):
+    dest = tmp_path / 'dest'
+    stream = TarStream(str(tree), arc_prefix='proj', exclude=['node_modules'])
+
+    assert extract_tar_stream(stream, str(dest)) == 5
+    assert stream.files_sent == 5
+    copied = _files(dest / 'proj')
+    expected = _files(tree)
+    del expected['node_modules/dep/index.js']
+    assert copied == expected
+    # Modification times are preserved, so the copy can be resumed
+    assert int(os.stat(dest / 'proj' / 'README.md').st_mtime) == int(
+        os.stat(tree / 'README.md').st_mtime
+    )
+
+
+def test_tar_stream_of_a_file(tree, tmp_path):
+    dest = tmp_path / 'dest'
+    assert extract_tar_stream(TarStream(str(tree / 'README.md')), str(dest)) == 1
+    assert (dest / 'README.md').read_text() == 'readme'
+
+
+def test_resume_skips_unchanged_files(tree, tmp_path):
+    dest = tmp_path / 'dest'
+    extract_tar_stream(TarStream(str(tree)), str(dest))
+    (tree / 'README.md').write_text('changed')
+
+    stream = TarStream(str(tree), manifest=build_manifest(str(dest)))
+    assert extract_tar_stream(stream, str(dest)) == 1
+    assert stream.files_skipped == 5
+    assert (dest / 'README.md').read_text() == 'changed'
+
+
+def test_resume_by_hash_when_mtime_differs(tree, tmp_path):
+    dest = tmp_path / 'dest'
+    extract_tar_stream(TarStream(str(tree)), str(dest))
+    os.utime(dest / 'big.bin', (0, 0))
+
+    manifest = build_manifest(str(dest), with_hashes=True)
+    assert manifest['big.bin']['mtime'] == 0
+    stream = TarStream(str(tree), manifest=manifest)
+    assert extract_tar_stream(stream, str(dest)) == 0
+    assert stream.files_skipped == 6
+
+    # Without hashes, a differing mtime means the file is sent again
+    stream = TarStream(str(tree), manifest=build_manifest(str(dest)))
+    assert extract_tar_stream(stream, str(dest)) == 1
+
+
+def test_tar_stream_can_be_iterated_again(tree):
+    stream = TarStream(str(tree))
+    assert b''.join(stream) == b''.join(stream)
+
+
+@pytest.mark.skipif(
+    ZSTD not in get_available_compressions(), reason='zstandard is not installed'
+)
+def test_zstd_roundtrip(tree, tmp_path):
+    dest = tmp_path / 'dest'
+    stream = TarStream(str(tree), compression=ZSTD)
+    assert extract_tar_stream(stream, str(dest), compression=ZSTD) == 6
+    assert _files(dest) == _files(tree)
+
+
+def test_unsupported_compression(tree, tmp_path):
+    with pytest.raises(ValueError):
+        list(TarStream(str(tree), compression='lz4'))
+    with pytest.raises(ValueError):
+        extract_tar_stream([b''], str(tmp_path), compression='lz4')
+
+
+def test_extract_rejects_paths_outside_dest(tmp_path):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode='w') as tar:
+        info = tarfile.TarInfo('../escape.txt')
+        info.size = 1
+        tar.addfile(info, io.BytesIO(b'x'))
+
+    with pytest.raises(tarfile.OutsideDestinationError):
+        extract_tar_stream([buffer.getvalue()], str(tmp_path / 'dest'))
+    assert not (tmp_path / 'escape.txt').exists()
+
+
+def test_iter_zip(tree):
+    data = b''.join(iter_zip(str(tree)))
+    with zipfile.ZipFile(io.BytesIO(data)) as zipf:
+        assert {name: zipf.read(name) for name in zipf.namelist()} == _files(tree)
@@ -1,10 +1,16 @@
 import os
 import tempfile
+import threading
 import time
+from unittest.mock import MagicMock, patch
 
 from openhands.core.logger import openhands_logger as logger
 from openhands.events.action import CmdRunAction
-from openhands.runtime.utils.bash import BashCommandStatus, BashSession
+from openhands.runtime.utils.bash import (
+    BashCommandStatus,
+    BashSession,
+    PaneOutputLog,
+)
 from openhands.runtime.utils.bash_constants import TIMEOUT_MESSAGE_TEMPLATE
 
 
@@ -386,3 +392,102 @@ def test_python_interactive_input():
     assert session.prev_status == BashCommandStatus.COMPLETED
 
     session.close()
+
+
+def test_pane_output_log_detects_prompt_end_across_reads():
+    pane = MagicMock()
+    pane.cmd.return_value.stderr = []
+    output_log = PaneOutputLog(pane)
+    try:
+        assert pane.cmd.call_args.args[0] == 'pipe-pane'
+        assert output_log.wait(0) == (False, False)
+
+        with open(output_log.path, 'wb', buffering=0) as f:
+            f.write(b'some \x1b[31moutput\x1b[0m\r\n50%\r100%\r\n###PS1')
+            assert output_log.wait(5) == (True, False)
+            assert output_log.read_new() == 'some output\n100%\n'
+            f.write(b'END###\r\n')
+            assert output_log.wait(5) == (True, True)
+            assert output_log.read_new() == '###PS1END###\n'
+            assert output_log.text() == 'some output\n100%\n###PS1END###\n'
+
+        output_log.clear()
+        assert output_log.text() == ''
+        assert output_log.wait(0) == (False, False)
+    finally:
+        output_log.close()
+    assert not os.path.exists(output_log.path)
+
+
+def test_pane_output_log_wait_blocks_until_output():
+    pane = MagicMock()
+    pane.cmd.return_value.stderr = []
+    output_log = PaneOutputLog(pane)
+    try:
+        with open(output_log.path, 'wb', buffering=0) as f:
+            timer = threading.Timer(0.2, f.write, args=(b'late\n',))
+            timer.start()
+            start = time.monotonic()
+            assert output_log.wait(5) == (True, False)
+            assert 0.1 < time.monotonic() - start < 2
+            timer.join()
+    finally:
+        output_log.close()
+
+
+def test_output_log_commands():
+    session = BashSession(work_dir=os.getcwd(), use_output_log=True)
+    session.initialize()
+    assert session._output_log is not None
+
+    obs = session.execute(CmdRunAction("echo 'hello world'"))
+    assert 'hello world' in obs.content
+    assert obs.metadata.exit_code == 0
+    assert session.prev_status == BashCommandStatus.COMPLETED
+
+    obs = session.execute(CmdRunAction('nonexistent_command'))
+    assert obs.metadata.exit_code == 127
+
+    obs = session.execute(CmdRunAction('for i in {1..5000}; do echo "Line $i"; done'))
+    assert 'Line 1\n' in obs.content
+    assert 'Line 5000' in obs.content
+    assert obs.metadata.exit_code == 0
+
+    # The log only prompts a check of the pane, so output that looks like the
+    # end of a prompt does not end the command early
+    obs = session.execute(CmdRunAction("echo 'x###PS1END###' && sleep 1 && echo done"))
+    assert obs.content.endswith('done')
+    assert obs.metadata.exit_code == 0
+
+    log_path = session._output_log.path
+    session.close()
+    assert not os.path.exists(log_path)
+
+
+def test_output_log_no_change_timeout_and_streaming():
+    session = BashSession(
+        work_dir=os.getcwd(), no_change_timeout_seconds=2, use_output_log=True
+    )
+    session.initialize()
+
+    streamed: list[str] = []
+    # Output is read from the log, without capturing the pane
+    with patch.object(
+        session, '_get_pane_content', side_effect=AssertionError
+    ) as get_pane_content:
+        obs = session.execute(
+            CmdRunAction('for i in {1..3}; do echo $i; sleep 1; done; sleep 10'),
+            output_callback=streamed.append,
+        )
+    get_pane_content.assert_not_called()
+    assert session.prev_status == BashCommandStatus.NO_CHANGE_TIMEOUT
+    assert obs.metadata.exit_code == -1
+    assert obs.metadata.suffix == get_no_change_timeout_suffix(2)
+    assert obs.content.endswith('1\n2\n3')
+    assert ''.join(streamed).endswith('1\n2\n3\n')
+
+    obs = session.execute(CmdRunAction('C-c', is_input=True))
+    assert session.prev_status == BashCommandStatus.COMPLETED
+    assert obs.metadata.exit_code == 130
+
+    session.close()
@@ -0,0 +1,104 @@
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from openhands.runtime.utils import git_changes_cache
+from openhands.runtime.utils.git_changes import get_git_changes
+from openhands.runtime.utils.git_changes_cache import GitChangesCache
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == 'win32', reason='Windows is not supported'
+)
+
+
+def _git(cwd: Path, *args: str) -> None:
+    subprocess.run(
+        ['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com', *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    origin = tmp_path / 'origin'
+    origin.mkdir()
+    _git(origin, 'init', '-b', 'main')
+    (origin / 'tracked.txt').write_text('original')
+    _git(origin, 'add', '.')
+    _git(origin, 'commit', '-m', 'initial')
+
+    workspace = tmp_path / 'workspace'
+    workspace.mkdir()
+    for name in ('repo_a', 'repo_b', 'repo_c'):
+        _git(workspace, 'clone', str(origin), name)
+    (workspace / 'repo_a' / 'tracked.txt').write_text('modified')
+    (workspace / 'repo_b' / 'new.txt').write_text('new')
+    return workspace
+
+
+@pytest.fixture
+def changes_in_repo():
+    with patch.object(
+        git_changes_cache,
+        'get_changes_in_repo',
+        wraps=git_changes_cache.get_changes_in_repo,
+    ) as mock:
+        yield mock
+
+
+def test_matches_uncached_changes(workspace):
+    cache = GitChangesCache()
+    expected = [
+        {'status': 'M', 'path': 'repo_a/tracked.txt'},
+        {'status': 'A', 'path': 'repo_b/new.txt'},
+    ]
+    assert get_git_changes(str(workspace)) == expected
+    assert cache.get_git_changes(str(workspace)) == expected
+    # Cached results are not modified by prefixing the repository paths
+    assert cache.get_git_changes(str(workspace)) == expected
+
+
+def test_reuses_changes_until_invalidated(workspace, changes_in_repo):
+    cache = GitChangesCache()
+    cache.get_git_changes(str(workspace))
+    # The workspace itself is not in a repository, so git is not run for it
+    assert changes_in_repo.call_count == 3
+
+    cache.get_git_changes(str(workspace))
+    assert changes_in_repo.call_count == 3
+    assert cache.hits == 3
+
+    (workspace / 'repo_c' / 'tracked.txt').write_text('modified')
+    cache.invalidate()
+    changes = cache.get_git_changes(str(workspace))
+    assert changes_in_repo.call_count == 6
+    assert {'status': 'M', 'path': 'repo_c/tracked.txt'} in changes
+
+
+def test_recomputes_repository_whose_git_state_changed(workspace, changes_in_repo):
+    cache = GitChangesCache()
+    cache.get_git_changes(str(workspace))
+
+    _git(workspace / 'repo_b', 'add', 'new.txt')
+    _git(workspace / 'repo_b', 'commit', '-m', 'add new')
+    changes = cache.get_git_changes(str(workspace))
+    assert changes_in_repo.call_count == 4
+    assert changes_in_repo.call_args.args[0] == str(workspace / 'repo_b')
+    # Changes are relative to origin, so the committed file is still added
+    assert changes == [
+        {'status': 'M', 'path': 'repo_a/tracked.txt'},
+        {'status': 'A', 'path': 'repo_b/new.txt'},
+    ]
+
+
+def test_max_age(workspace, changes_in_repo):
+    cache = GitChangesCache(max_age=0)
+    cache.get_git_changes(str(workspace))
+    cache.get_git_changes(str(workspace))
+    assert changes_in_repo.call_count == 6
+    assert cache.hits == 0
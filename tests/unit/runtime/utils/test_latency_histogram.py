@@ -0,0 +1,40 @@
+from openhands.runtime.utils.latency_histogram import (
+    LatencyHistogram,
+    LatencyHistograms,
+)
+
+
+def test_latency_histogram_buckets_and_quantiles():
+    histogram = LatencyHistogram(buckets=(0.01, 0.1, 1.0))
+    for seconds in [0.005, 0.01, 0.05, 0.05, 0.5, 3.0]:
+        histogram.record(seconds)
+
+    assert histogram.counts == [2, 2, 1, 1]
+    assert histogram.count == 6
+    assert histogram.max == 3.0
+    assert histogram.quantile(0.3) == 0.01
+    assert histogram.quantile(0.5) == 0.1
+    assert histogram.quantile(0.8) == 1.0
+    assert histogram.quantile(1.0) == 3.0
+
+    data = histogram.to_dict()
+    assert data['buckets'] == {'0.01': 2, '0.1': 2, '1.0': 1, '+Inf': 1}
+    assert data['p50'] == 0.1
+
+
+def test_empty_latency_histogram():
+    histogram = LatencyHistogram()
+    assert histogram.quantile(0.99) == 0.0
+    assert histogram.to_dict()['count'] == 0
+
+
+def test_latency_histograms_by_name():
+    histograms = LatencyHistograms()
+    histograms.record('run', 0.02)
+    histograms.record('run', 0.03)
+    histograms.record('read', 0.001)
+
+    data = histograms.to_dict()
+    assert list(data) == ['read', 'run']
+    assert data['run']['count'] == 2
+    assert data['read']['count'] == 1
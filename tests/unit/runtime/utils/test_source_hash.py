@@ -0,0 +1,77 @@
+import os
+
+import pytest
+from dirhash import dirhash
+
+from openhands.runtime.utils.source_hash import FileHashCache, hash_directory
+
+IGNORE = ['.*/', '__pycache__/', '*.pyc']
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / 'src'
+    (root / 'pkg' / 'sub').mkdir(parents=True)
+    (root / 'pkg' / '__pycache__').mkdir()
+    (root / '.git').mkdir()
+    (root / 'empty' / 'nested').mkdir(parents=True)
+    (root / 'main.py').write_text('print(1)')
+    (root / '.env.example').write_text('KEY=value')
+    (root / 'pkg' / '__init__.py').write_text('')
+    (root / 'pkg' / 'sub' / 'util.py').write_text('x = 1')
+    (root / 'pkg' / 'sub' / 'util.pyc').write_bytes(b'\x00')
+    (root / 'pkg' / '__pycache__' / 'mod.cpython-312.pyc').write_bytes(b'\x00')
+    (root / '.git' / 'HEAD').write_text('ref: refs/heads/main')
+    return root
+
+
+def test_matches_dirhash(tree):
+    assert hash_directory(str(tree), IGNORE) == dirhash(tree, 'md5', ignore=IGNORE)
+    assert hash_directory(str(tree), IGNORE, FileHashCache('sha256')) == dirhash(
+        tree, 'sha256', ignore=IGNORE
+    )
+
+
+def test_rehashes_only_changed_files(tree, tmp_path):
+    cache_file = str(tmp_path / 'cache.json')
+    cache = FileHashCache('md5', cache_file)
+    hash_directory(str(tree), IGNORE, cache)
+    cache.save()
+    assert cache.misses == 4
+
+    (tree / 'main.py').write_text('print(2)')
+    (tree / 'pkg' / 'sub' / 'util.py').unlink()
+    cache = FileHashCache('md5', cache_file)
+    result = hash_directory(str(tree), IGNORE, cache)
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert result == dirhash(tree, 'md5', ignore=IGNORE)
+    cache.save()
+
+    # A file rewritten with the same size is rehashed when its mtime changes
+    (tree / 'main.py').write_text('print(3)')
+    os.utime(tree / 'main.py', ns=(0, 0))
+    cache = FileHashCache('md5', cache_file)
+    assert hash_directory(str(tree), IGNORE, cache) == dirhash(
+        tree, 'md5', ignore=IGNORE
+    )
+    assert cache.misses == 1
+
+
+def test_ignores_unreadable_cache_file(tree, tmp_path):
+    cache_file = tmp_path / 'cache.json'
+    cache_file.write_text('not json')
+    cache = FileHashCache('md5', str(cache_file))
+    assert hash_directory(str(tree), IGNORE, cache) == dirhash(
+        tree, 'md5', ignore=IGNORE
+    )
+    cache.save()
+    assert FileHashCache('md5', str(cache_file)).lookup(
+        str(tree / 'main.py'), os.stat(tree / 'main.py')
+    )
+
+
+def test_nothing_to_hash(tmp_path):
+    (tmp_path / '__pycache__').mkdir()
+    (tmp_path / '__pycache__' / 'mod.pyc').write_bytes(b'\x00')
+    with pytest.raises(ValueError):
+        hash_directory(str(tmp_path), IGNORE)
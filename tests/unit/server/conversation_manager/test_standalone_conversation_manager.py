@@ -6,6 +6,13 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
 from openhands.core.config.openhands_config import OpenHandsConfig
+from openhands.core.schema.agent import AgentState
+from openhands.events.observation import (
+    AgentStateChangedObservation,
+    CmdOutputObservation,
+    NullObservation,
+)
+from openhands.llm.metrics import Metrics
 from openhands.server.conversation_manager.standalone_conversation_manager import (
     StandaloneConversationManager,
 )
@@ -127,6 +134,7 @@ async def test_join_local_session():
                 )
     assert session_instance.initialize_agent.call_count == 1
     assert sio.enter_room.await_count == 2
+    assert session_instance.notify_client_joined.call_count == 2
 
 
 @pytest.mark.asyncio
@@ -195,3 +203,102 @@ async def test_cleanup_session_connections():
         assert sio.disconnect.await_count == 2
         sio.disconnect.assert_any_call('conn1')
         sio.disconnect.assert_any_call('conn2')
+
+
+@pytest.mark.asyncio
+async def test_conversation_updates_are_coalesced():
+    sio = get_mock_sio()
+    sio.disconnect = AsyncMock()
+    async with StandaloneConversationManager(
+        sio, OpenHandsConfig(), InMemoryFileStore(), MonitoringListener()
+    ) as conversation_manager:
+        conversation_manager._update_conversation = AsyncMock()
+        callback = conversation_manager._create_conversation_update_callback(
+            'user-id', 'session1', MagicMock(), MagicMock()
+        )
+
+        # The first event is written straight away
+        await asyncio.to_thread(callback, NullObservation(''))
+        assert conversation_manager._update_conversation.await_count == 1
+
+        # Later events are merged until the agent state changes
+        for cost in range(1, 4):
+            observation = NullObservation('')
+            observation.llm_metrics = Metrics()
+            observation.llm_metrics.accumulated_cost = cost
+            await asyncio.to_thread(callback, observation)
+        git_observation = CmdOutputObservation(
+            content='', command='git checkout main', metadata={'exit_code': 0}
+        )
+        await asyncio.to_thread(callback, git_observation)
+        assert conversation_manager._update_conversation.await_count == 1
+
+        await asyncio.to_thread(
+            callback, AgentStateChangedObservation('', AgentState.AWAITING_USER_INPUT)
+        )
+        assert conversation_manager._update_conversation.await_count == 2
+        args = conversation_manager._update_conversation.await_args.args
+        assert args[:2] == ('user-id', 'session1')
+        assert args[5].accumulated_cost == 3
+        assert args[6] is True  # check the branch
+
+        # Pending changes are written when the session closes
+        await asyncio.to_thread(callback, NullObservation(''))
+        assert conversation_manager._update_conversation.await_count == 2
+        await conversation_manager._close_session('session1')
+        assert conversation_manager._update_conversation.await_count == 3
+        args = conversation_manager._update_conversation.await_args.args
+        assert args[5] is None
+        assert args[6] is False
+
+        # Nothing left to write
+        await conversation_manager._close_session('session1')
+        assert conversation_manager._update_conversation.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_conversation_updates_written_after_interval():
+    sio = get_mock_sio()
+    async with StandaloneConversationManager(
+        sio, OpenHandsConfig(), InMemoryFileStore(), MonitoringListener()
+    ) as conversation_manager:
+        conversation_manager._update_conversation = AsyncMock()
+        callback = conversation_manager._create_conversation_update_callback(
+            'user-id', 'session1', MagicMock(), MagicMock()
+        )
+        with patch(
+            'openhands.server.conversation_manager.standalone_conversation_manager._METADATA_UPDATE_INTERVAL',
+            0,
+        ):
+            for _ in range(3):
+                await asyncio.to_thread(callback, NullObservation(''))
+        assert conversation_manager._update_conversation.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_conversation_updates_kept_when_write_fails():
+    sio = get_mock_sio()
+    async with StandaloneConversationManager(
+        sio, OpenHandsConfig(), InMemoryFileStore(), MonitoringListener()
+    ) as conversation_manager:
+        conversation_manager._update_conversation = AsyncMock(
+            side_effect=[OSError('unavailable'), None]
+        )
+        callback = conversation_manager._create_conversation_update_callback(
+            'user-id', 'session1', MagicMock(), MagicMock()
+        )
+        observation = CmdOutputObservation(
+            content='', command='git checkout main', metadata={'exit_code': 0}
+        )
+        observation.llm_metrics = Metrics()
+        observation.llm_metrics.accumulated_cost = 1
+        with pytest.raises(OSError):
+            await asyncio.to_thread(callback, observation)
+
+        # The failed changes are written with the pending update
+        await conversation_manager._close_session('session1')
+        assert conversation_manager._update_conversation.await_count == 2
+        args = conversation_manager._update_conversation.await_args.args
+        assert args[4] is not None
+        assert args[5].accumulated_cost == 1
+        assert args[6] is True
@@ -1,4 +1,5 @@
-from unittest.mock import ANY, AsyncMock, patch
+import asyncio
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 import pytest
 from litellm.exceptions import (
@@ -98,3 +99,97 @@ async def test_notify_on_llm_retry(
         'info', RuntimeStatus.LLM_RETRY, ANY
     )
     await session.close()
+
+
+def _make_session(mock_sio, llm_registry, conversation_stats, client_wait_timeout=30):
+    mock_sio.manager = MagicMock()
+    mock_sio.manager.rooms = {}
+    config = OpenHandsConfig(client_wait_timeout=client_wait_timeout)
+    return Session(
+        sid='test-sid',
+        file_store=InMemoryFileStore({}),
+        config=config,
+        llm_registry=llm_registry,
+        conversation_stats=conversation_stats,
+        sio=mock_sio,
+        user_id='test-user',
+    )
+
+
+def _status(msg_type: str, runtime_status: RuntimeStatus) -> dict:
+    return {
+        'status_update': True,
+        'type': msg_type,
+        'id': runtime_status.value,
+        'message': runtime_status.value,
+    }
+
+
+@pytest.mark.asyncio
+async def test_send_waits_for_client_to_join(
+    mock_sio, llm_registry, conversation_stats
+):
+    session = _make_session(mock_sio, llm_registry, conversation_stats)
+    await session.send({'message': 'first'})
+    await asyncio.sleep(0.05)
+    mock_sio.emit.assert_not_called()
+
+    session.notify_client_joined()
+    await asyncio.sleep(0.01)
+    mock_sio.emit.assert_awaited_once_with(
+        'oh_event', {'message': 'first'}, to='room:test-sid'
+    )
+    await session.close()
+
+
+@pytest.mark.asyncio
+async def test_send_does_not_wait_when_client_in_room(
+    mock_sio, llm_registry, conversation_stats
+):
+    session = _make_session(mock_sio, llm_registry, conversation_stats)
+    mock_sio.manager.rooms = {'/': {'room:test-sid': {'connection-id'}}}
+    await session.send({'message': 'first'})
+    await asyncio.sleep(0.01)
+    mock_sio.emit.assert_awaited_once()
+    await session.close()
+
+
+@pytest.mark.asyncio
+async def test_send_after_client_wait_timeout(
+    mock_sio, llm_registry, conversation_stats
+):
+    session = _make_session(
+        mock_sio, llm_registry, conversation_stats, client_wait_timeout=0
+    )
+    await session.send({'message': 'first'})
+    await asyncio.sleep(0.01)
+    mock_sio.emit.assert_awaited_once()
+    await session.close()
+
+
+@pytest.mark.asyncio
+async def test_queued_status_messages_are_coalesced(
+    mock_sio, llm_registry, conversation_stats
+):
+    session = _make_session(mock_sio, llm_registry, conversation_stats)
+    queued = [
+        _status('info', RuntimeStatus.STARTING_RUNTIME),
+        {'message': 'first'},
+        _status('error', RuntimeStatus.ERROR),
+        _status('info', RuntimeStatus.LLM_RETRY),
+        {'message': 'second'},
+        _status('info', RuntimeStatus.READY),
+    ]
+    for data in queued:
+        await session.send(data)
+    session.notify_client_joined()
+    await asyncio.sleep(0.01)
+
+    emitted = [call.args[1] for call in mock_sio.emit.await_args_list]
+    assert emitted == [
+        {'message': 'first'},
+        _status('error', RuntimeStatus.ERROR),
+        {'message': 'second'},
+        _status('info', RuntimeStatus.READY),
+    ]
+    await session.close()
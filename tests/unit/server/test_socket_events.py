@@ -1,8 +1,24 @@
+import json
+import zlib
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
-from openhands.server.listen_socket import oh_action, oh_user_action
+from openhands.core.schema import AgentState
+from openhands.events import EventSource, EventStream
+from openhands.events.action import CmdRunAction, MessageAction, NullAction
+from openhands.events.action.agent import RecallAction
+from openhands.events.observation import CmdOutputObservation, NullObservation
+from openhands.events.observation.agent import AgentStateChangedObservation
+from openhands.events.recall_type import RecallType
+from openhands.events.serialization import event_to_dict
+from openhands.server.listen_socket import (
+    _get_replay_batch_size,
+    _replay_events,
+    oh_action,
+    oh_user_action,
+)
+from openhands.storage.memory import InMemoryFileStore
 
 
 @pytest.mark.asyncio
@@ -41,3 +57,89 @@ async def test_oh_action():
         mock_manager.send_to_event_stream.assert_called_once_with(
             connection_id, test_data
         )
+
+
+def _make_event_stream() -> EventStream:
+    stream = EventStream('test-replay', InMemoryFileStore())
+    stream.add_event(
+        AgentStateChangedObservation('', AgentState.LOADING), EventSource.ENVIRONMENT
+    )
+    stream.add_event(MessageAction('hello'), EventSource.USER)
+    stream.add_event(
+        RecallAction(RecallType.WORKSPACE_CONTEXT, query='hello'), EventSource.USER
+    )
+    stream.add_event(
+        AgentStateChangedObservation('', AgentState.RUNNING), EventSource.ENVIRONMENT
+    )
+    for i in range(5):
+        stream.add_event(CmdRunAction(command=f'echo {i}'), EventSource.AGENT)
+        stream.add_event(
+            CmdOutputObservation(content=str(i), command=f'echo {i}'),
+            EventSource.AGENT,
+        )
+    stream.add_event(NullObservation(''), EventSource.ENVIRONMENT)
+    return stream
+
+
+def _expected_replay(stream: EventStream, start_id: int = 0) -> list[dict]:
+    events = [
+        event_to_dict(event)
+        for event in stream.search_events(start_id=start_id)
+        if not isinstance(
+            event,
+            (NullAction, NullObservation, RecallAction, AgentStateChangedObservation),
+        )
+    ]
+    agent_state_changes = [
+        event
+        for event in stream.search_events(start_id=start_id)
+        if isinstance(event, AgentStateChangedObservation)
+    ]
+    if agent_state_changes:
+        events.append(event_to_dict(agent_state_changes[-1]))
+    return events
+
+
+@pytest.mark.asyncio
+async def test_replay_events_one_by_one():
+    stream = _make_event_stream()
+    with patch('openhands.server.listen_socket.sio') as mock_sio:
+        mock_sio.emit = AsyncMock()
+        num_events, num_messages = await _replay_events('conn', stream, 0, None)
+
+    emitted = [call.args for call in mock_sio.emit.call_args_list]
+    assert all(name == 'oh_event' for name, _ in emitted)
+    assert [data for _, data in emitted] == _expected_replay(stream)
+    assert num_events == num_messages == len(emitted) == 12
+    assert emitted[-1][1]['extras']['agent_state'] == AgentState.RUNNING
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('batch_size', [1, 4, 11, 12, 100])
+async def test_replay_events_in_batches(batch_size):
+    stream = _make_event_stream()
+    with patch('openhands.server.listen_socket.sio') as mock_sio:
+        mock_sio.emit = AsyncMock()
+        num_events, num_batches = await _replay_events('conn', stream, 2, batch_size)
+
+    events = []
+    for call in mock_sio.emit.call_args_list:
+        name, payload = call.args
+        assert name == 'oh_event_batch'
+        assert call.kwargs == {'to': 'conn'}
+        assert payload['encoding'] == 'zlib'
+        batch = json.loads(zlib.decompress(payload['data']))
+        assert len(batch) == payload['count'] <= batch_size
+        events.extend(batch)
+    assert events == _expected_replay(stream, 2)
+    assert num_events == len(events) == 11
+    assert num_batches == mock_sio.emit.call_count == -(-11 // batch_size)
+
+
+@pytest.mark.parametrize(
+    'value,expected',
+    [(None, None), ('abc', None), ('0', None), ('50', 50), ('1000000', 1000)],
+)
+def test_get_replay_batch_size(value, expected):
+    query_params = {} if value is None else {'replay_batch_size': [value]}
+    assert _get_replay_batch_size(query_params) == expected
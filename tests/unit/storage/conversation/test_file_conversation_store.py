@@ -1,4 +1,7 @@
+import asyncio
 import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
 
 import pytest
 
@@ -200,3 +203,135 @@ async def test_get_all_metadata():
     assert results[0].title == 'First conversation'
     assert results[1].conversation_id == 'conv2'
     assert results[1].title == 'Second conversation'
+
+
+def _metadata(i: int) -> ConversationMetadata:
+    return ConversationMetadata(
+        conversation_id=f'conv{i}',
+        selected_repository='repo1',
+        title=f'Conversation {i}',
+        created_at=datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(hours=i),
+    )
+
+
+@pytest.mark.asyncio
+async def test_search_reads_page_from_index():
+    file_store = InMemoryFileStore({})
+    store = FileConversationStore(file_store)
+    for i in range(50):
+        await store.save_metadata(_metadata(i))
+
+    result = await store.search(limit=5)
+    assert [c.conversation_id for c in result.results] == [
+        f'conv{i}' for i in range(49, 44, -1)
+    ]
+    assert len(store._list_index_records()) == 50
+
+    with patch.object(store, 'get_metadata', wraps=store.get_metadata) as get_metadata:
+        result = await store.search(page_id=result.next_page_id, limit=5)
+    assert [c.conversation_id for c in result.results] == [
+        f'conv{i}' for i in range(44, 39, -1)
+    ]
+    assert get_metadata.call_count == 5
+
+
+@pytest.mark.asyncio
+async def test_save_and_delete_update_index():
+    store = FileConversationStore(InMemoryFileStore({}))
+    await store.save_metadata(_metadata(1))
+    await store.save_metadata(_metadata(2))
+    result = await store.search()
+    assert [c.conversation_id for c in result.results] == ['conv2', 'conv1']
+
+    # a new conversation, and an older creation date for an existing one
+    await store.save_metadata(_metadata(3))
+    metadata = _metadata(2)
+    metadata.created_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    await store.save_metadata(metadata)
+    result = await store.search()
+    assert [c.conversation_id for c in result.results] == ['conv3', 'conv1', 'conv2']
+
+    await store.delete_metadata('conv1')
+    result = await store.search()
+    assert [c.conversation_id for c in result.results] == ['conv3', 'conv2']
+
+
+@pytest.mark.asyncio
+async def test_first_save_indexes_existing_conversations():
+    file_store = InMemoryFileStore(
+        {
+            get_conversation_metadata_filename(f'conv{i}'): json.dumps(
+                {
+                    'conversation_id': f'conv{i}',
+                    'selected_repository': 'repo1',
+                    'created_at': f'2024-12-0{i + 1}T00:00:00Z',
+                }
+            )
+            for i in range(3)
+        }
+    )
+    store = FileConversationStore(file_store)
+    result = await store.search()
+    assert [c.conversation_id for c in result.results] == ['conv2', 'conv1', 'conv0']
+    # searching a store without an index does not create one
+    assert store._list_index_records() == {}
+
+    await store.save_metadata(_metadata(3))
+    assert len(store._list_index_records()) == 4
+    with patch.object(store, 'get_metadata', wraps=store.get_metadata) as get_metadata:
+        result = await store.search(limit=2)
+    assert [c.conversation_id for c in result.results] == ['conv3', 'conv2']
+    assert get_metadata.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_repair_index():
+    file_store = InMemoryFileStore({})
+    store = FileConversationStore(file_store)
+    await store.save_metadata(_metadata(1))
+    await store.save_metadata(_metadata(2))
+
+    # changes made without updating the index
+    file_store.write(
+        get_conversation_metadata_filename('conv3'),
+        json.dumps(
+            {
+                'conversation_id': 'conv3',
+                'selected_repository': 'repo1',
+                'created_at': '2025-02-01T00:00:00Z',
+            }
+        ),
+    )
+    file_store.delete('sessions/conv1')
+    records = store._list_index_records()
+    result = await store.search()
+    assert [c.conversation_id for c in result.results] == ['conv2']
+    # search never writes to the index
+    assert store._list_index_records() == records
+
+    with patch.object(store, 'get_metadata', wraps=store.get_metadata) as get_metadata:
+        await store.repair_index()
+    # only the unindexed conversation was loaded
+    assert get_metadata.call_count == 1
+    assert sorted(store._list_index_records()) == ['conv2', 'conv3']
+    result = await store.search()
+    assert [c.conversation_id for c in result.results] == ['conv3', 'conv2']
+    assert result.next_page_id is None
+
+
+@pytest.mark.asyncio
+async def test_stores_sharing_a_file_store_keep_each_others_updates():
+    file_store = InMemoryFileStore({})
+    stores = [FileConversationStore(file_store) for _ in range(2)]
+    await asyncio.gather(
+        *(stores[i % 2].save_metadata(_metadata(i)) for i in range(10))
+    )
+    with patch.object(
+        stores[0], 'get_metadata', wraps=stores[0].get_metadata
+    ) as get_metadata:
+        result = await stores[0].search(limit=20)
+    assert [c.conversation_id for c in result.results] == [
+        f'conv{i}' for i in range(9, -1, -1)
+    ]
+    # nothing was missing from the index
+    assert get_metadata.call_count == 10
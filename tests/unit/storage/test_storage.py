@@ -39,6 +39,14 @@ class _StorageTest(ABC):
         with self.assertRaises(FileNotFoundError):
             store.read(filename)
 
+    def test_append(self):
+        filename = 'foo/log.txt'
+        store = self.get_store()
+        store.append(filename, 'Hello')
+        store.append(filename, ', world!')
+        self.assertEqual(store.read(filename), 'Hello, world!')
+        store.delete(filename)
+
     def test_complex_path_fileops(self):
         filenames = ['foo.bar.baz', './foo/bar/baz', 'foo/bar/baz', '/foo/bar/baz']
         store = self.get_store()
@@ -171,7 +171,7 @@ async def test_auto_generate_title_no_messages():
 
 @pytest.mark.asyncio
 async def test_update_conversation_with_title():
-    """Test that _update_conversation_for_event updates the title when needed."""
+    """Test that _update_conversation updates the title when needed."""
     # Mock dependencies
     sio = MagicMock()
     sio.emit = AsyncMock()
@@ -214,8 +214,8 @@ async def test_update_conversation_with_title():
         AsyncMock(return_value='Generated Title'),
     ):
         # Call the method
-        await manager._update_conversation_for_event(
-            user_id, conversation_id, settings, llm_registry
+        await manager._update_conversation(
+            user_id, conversation_id, settings, llm_registry, datetime.now(timezone.utc)
         )
 
         # Verify the title was updated
@@ -1,12 +1,38 @@
 import pytest
 
+from openhands.utils import chunk_localizer
 from openhands.utils.chunk_localizer import (
     Chunk,
     create_chunks,
+    get_language_for_file,
     get_top_k_chunk_matches,
+    line_containment,
     normalized_lcs,
 )
 
+PYTHON_SOURCE = """import os
+
+
+def small():
+    return 1
+
+
+def large(x):
+    if x:
+        a = 1
+        b = 2
+        c = 3
+    else:
+        a = 4
+        b = 5
+    return a + b
+
+
+class Foo:
+    def bar(self):
+        pass
+"""
+
 
 def test_chunk_creation():
     chunk = Chunk(text='test chunk', line_range=(1, 1))
@@ -134,3 +160,70 @@ def test_get_top_k_chunk_matches_with_overlapping_chunks():
     assert matches[1].text == 'chunk3\nchunk4'
     assert matches[1].line_range == (3, 4)
     assert matches[0].normalized_lcs == matches[1].normalized_lcs
+
+
+def _check_chunks_cover(chunks, text, size):
+    assert '\n'.join(chunk.text for chunk in chunks) == text
+    for prev, chunk in zip(chunks, chunks[1:]):
+        assert chunk.line_range[0] == prev.line_range[1] + 1
+    for chunk in chunks:
+        assert chunk.line_range[1] - chunk.line_range[0] + 1 <= size
+        chunk.visualize()
+
+
+def test_create_chunks_tree_sitter():
+    chunks = create_chunks(PYTHON_SOURCE, size=6, language='python')
+    _check_chunks_cover(chunks, PYTHON_SOURCE, 6)
+    # Chunks start at definitions and statements rather than every 6 lines
+    assert [chunk.line_range for chunk in chunks] == [
+        (1, 3),
+        (4, 7),
+        (8, 12),
+        (13, 15),
+        (16, 18),
+        (19, 22),
+    ]
+    assert chunks[2].text.startswith('def large(x):')
+    assert chunks[3].text.startswith('    else:')
+    assert chunks[5].text.startswith('class Foo:')
+
+
+def test_create_chunks_tree_sitter_fits_in_one_chunk():
+    chunks = create_chunks(PYTHON_SOURCE, size=100, language='python')
+    assert len(chunks) == 1
+    assert chunks[0].text == PYTHON_SOURCE
+
+
+def test_create_chunks_unsupported_language():
+    text = 'line1\nline2\nline3'
+    assert create_chunks(text, size=2, language='not-a-language') == create_chunks(
+        text, size=2
+    )
+
+
+def test_get_language_for_file():
+    assert get_language_for_file('/workspace/src/main.py') == 'python'
+    assert get_language_for_file('App.TSX') == 'tsx'
+    assert get_language_for_file('README.md') is None
+
+
+def test_line_containment():
+    query_lines = {'a = 1', 'b = 2'}
+    assert line_containment('    a = 1\n\n    c = 3', query_lines) == 0.5
+    assert line_containment('\n  \n', query_lines) == 0.0
+
+
+def test_get_top_k_chunk_matches_prefilters_large_files(monkeypatch):
+    lines = [f'value_{i:03} = compute({i:03}, {i * 7 % 1000:03})' for i in range(500)]
+    text = '\n'.join(lines)
+    draft = lines[300:305]
+    draft[1:4] = ['value = compute_fast(x)'] * 3
+    matches = get_top_k_chunk_matches(text, '\n'.join(draft), k=2, max_chunk_size=5)
+    assert len(matches) == 2
+    assert matches[0].line_range == (301, 305)
+
+    # Without a line in common, the LCS is computed for every chunk
+    query = '\n'.join(line + '  # changed' for line in lines[300:305])
+    matches = get_top_k_chunk_matches(text, query, k=2, max_chunk_size=5)
+    monkeypatch.setattr(chunk_localizer, 'PREFILTER_MIN_CANDIDATES', len(lines))
+    assert matches == get_top_k_chunk_matches(text, query, k=2, max_chunk_size=5)